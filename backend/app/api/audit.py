@@ -3,21 +3,40 @@ Audit API Endpoints
 Query audit logs (super_admin only)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import String, and_, or_, func, cast, literal, select
+from sqlalchemy.dialects.postgresql import JSONPATH
+from sqlalchemy.exc import DBAPIError
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import json
 
+from ..core.config import settings
 from ..core.database import get_db
-from ..models import AuditLog, User
+from ..core.pagination import COUNT_MODES, count_rows, explain_plan, keyset_paginate
+from ..models import AuditLog, AuditChainBreak, AuditExportJob, AuditVerificationCheckpoint, MerkleAnchor, User
+from ..schemas import AuditExportJobCreate
+from ..services.audit_export import AuditExport, job_status, run_export_job
+from ..services.audit_partitions import AuditPartitionService
+from ..services.audit_service import AuditService
+from ..services.audit_stats import AuditStatsService
+from ..services.audit_writer import audit_writer
+from ..services.merkle_service import MERKLE_SOURCES, MerkleService
 from ..api.auth import require_role
 
 router = APIRouter()
 
 
+def _date_range(start_date: Optional[date], end_date: Optional[date]):
+    """Inclusive date filters as a [start, end) datetime range"""
+    start = datetime.combine(start_date, datetime.min.time()) if start_date else None
+    end = datetime.combine(end_date + timedelta(days=1), datetime.min.time()) if end_date else None
+    return start, end
+
+
 @router.get("/logs")
 async def get_audit_logs(
     actor_id: Optional[UUID] = None,
@@ -29,6 +48,8 @@ async def get_audit_logs(
     search: Optional[str] = None,
     limit: int = Query(default=100, le=1000),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    count: str = Query(default="exact", pattern=COUNT_MODES),
     current_user: User = Depends(require_role(['super_admin'])),
     db: Session = Depends(get_db)
 ):
@@ -46,7 +67,9 @@ async def get_audit_logs(
     - end_date: Filter logs up to this date
     - search: Text search in action or entity_type
     - limit: Max results (default 100, max 1000)
-    - offset: Pagination offset
+    - offset: Pagination offset (legacy; ignored when cursor is given)
+    - cursor: Opaque token from a previous page's next_cursor
+    - count: Total count mode - exact, estimated (planner statistics) or none
 
     RBAC: super_admin only
     """
@@ -86,10 +109,17 @@ async def get_audit_logs(
         )
 
     # Get total count
-    total = query.count()
-
-    # Get paginated results
-    results = query.order_by(AuditLog.created_at.desc()).offset(offset).limit(limit).all()
+    total = count_rows(db, query, count)
+
+    # Get paginated results, newest first with audit_id as tie-breaker
+    results, next_cursor = keyset_paginate(
+        query,
+        columns=[AuditLog.created_at, AuditLog.audit_id],
+        key=lambda row: (row[0].created_at, row[0].audit_id),
+        limit=limit,
+        cursor=cursor,
+        offset=offset
+    )
 
     # Format response
     logs = []
@@ -111,6 +141,7 @@ async def get_audit_logs(
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
         "items": logs
     }
 
@@ -156,6 +187,161 @@ async def get_audit_log(
     }
 
 
+def _payload_value(value: str):
+    """A search value as JSON when it parses (numbers, booleans, null), else a string"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _payload_containment(contains: Optional[str], key: Optional[str], value: Optional[str]) -> dict:
+    """Merge the `contains` document and the `key`/`value` pair into one containment document"""
+    document = {}
+    if contains:
+        try:
+            document = json.loads(contains)
+        except ValueError:
+            document = None
+        if not isinstance(document, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="contains must be a JSON object"
+            )
+
+    if key is not None or value is not None:
+        if not key or value is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="key and value must be given together"
+            )
+        # details.project_id=x -> {"details": {"project_id": x}}
+        *parents, leaf = key.split(".")
+        node = document
+        for part in parents:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        node[leaf] = _payload_value(value)
+
+    return document
+
+
+@router.get("/search")
+async def search_audit_logs(
+    contains: Optional[str] = None,
+    key: Optional[str] = None,
+    value: Optional[str] = None,
+    jsonpath: Optional[str] = None,
+    actor_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(default=100, le=1000),
+    cursor: Optional[str] = None,
+    count: str = Query(default="none", pattern=COUNT_MODES),
+    explain: bool = False,
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Search audit logs by payload fields (super_admin only).
+
+    Payload predicates use the containment (@>) and JSON path (@?)
+    operators, which the jsonb_path_ops GIN index on payload serves.
+
+    Query parameters:
+    - contains: JSON object the payload must contain, e.g. {"document_hash": "ab12..."}
+    - key, value: Shorthand containment on one (dotted) key, e.g. key=details.project_id;
+      value is parsed as JSON when possible, otherwise matched as a string
+    - jsonpath: SQL/JSON path that must match, e.g. $.items[*] ? (@.id == "x")
+    - actor_id, action, entity_type, start_date, end_date: As for /logs
+    - limit: Max results (default 100, max 1000)
+    - cursor: Opaque token from a previous page's next_cursor
+    - count: Total count mode - exact, estimated (planner statistics) or none (default)
+    - explain: Return the query plan of the page instead of results
+
+    RBAC: super_admin only
+    """
+    document = _payload_containment(contains, key, value)
+    if not document and not jsonpath:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give a payload predicate: contains, key/value or jsonpath"
+        )
+
+    query = db.query(AuditLog, User.username).outerjoin(
+        User, AuditLog.actor_id == User.user_id
+    )
+
+    if document:
+        query = query.filter(AuditLog.payload.contains(document))
+
+    if jsonpath:
+        path = cast(literal(jsonpath, String), JSONPATH)
+        try:
+            with db.begin_nested():
+                db.execute(select(path))
+        except DBAPIError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid jsonpath expression"
+            )
+        query = query.filter(AuditLog.payload.path_exists(path))
+
+    if actor_id:
+        query = query.filter(AuditLog.actor_id == actor_id)
+
+    if action:
+        query = query.filter(AuditLog.action == action)
+
+    if entity_type:
+        query = query.filter(AuditLog.entity_type == entity_type)
+
+    start, end = _date_range(start_date, end_date)
+    if start:
+        query = query.filter(AuditLog.created_at >= start)
+    if end:
+        query = query.filter(AuditLog.created_at < end)
+
+    if explain:
+        page = query.order_by(AuditLog.created_at.desc(), AuditLog.audit_id.desc()).limit(limit + 1)
+        return {"plan": explain_plan(db, page)}
+
+    total = count_rows(db, query, count)
+
+    results, next_cursor = keyset_paginate(
+        query,
+        columns=[AuditLog.created_at, AuditLog.audit_id],
+        key=lambda row: (row[0].created_at, row[0].audit_id),
+        limit=limit,
+        cursor=cursor
+    )
+
+    logs = []
+    for audit_log, username in results:
+        logs.append({
+            "audit_id": str(audit_log.audit_id),
+            "actor_id": str(audit_log.actor_id) if audit_log.actor_id else None,
+            "actor_username": username,
+            "action": audit_log.action,
+            "entity_type": audit_log.entity_type,
+            "entity_id": str(audit_log.entity_id) if audit_log.entity_id else None,
+            "payload": audit_log.payload,
+            "created_at": audit_log.created_at.isoformat(),
+            "ip_address": audit_log.ip_address,
+            "user_agent": audit_log.user_agent
+        })
+
+    return {
+        "total": total,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": logs
+    }
+
+
 @router.get("/stats/actions")
 async def get_action_statistics(
     start_date: Optional[date] = None,
@@ -174,23 +360,8 @@ async def get_action_statistics(
 
     RBAC: super_admin only
     """
-    # Base query
-    query = db.query(
-        AuditLog.action,
-        func.count(AuditLog.audit_id).label('count')
-    )
-
-    # Apply date filters
-    if start_date:
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(AuditLog.created_at >= start_datetime)
-
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(AuditLog.created_at <= end_datetime)
-
-    # Group by action
-    results = query.group_by(AuditLog.action).order_by(func.count(AuditLog.audit_id).desc()).all()
+    counts = AuditStatsService.counts(["action"], *_date_range(start_date, end_date))
+    results = db.query(counts.c.action, counts.c.event_count).order_by(counts.c.event_count.desc()).all()
 
     # Format response
     action_stats = {action: count for action, count in results}
@@ -223,30 +394,16 @@ async def get_user_activity_statistics(
 
     RBAC: super_admin only
     """
-    # Base query with user join
-    query = db.query(
+    counts = AuditStatsService.counts(["actor_id"], *_date_range(start_date, end_date))
+    results = db.query(
         User.user_id,
         User.username,
         User.role,
-        func.count(AuditLog.audit_id).label('action_count')
+        counts.c.event_count
     ).join(
-        AuditLog, User.user_id == AuditLog.actor_id
-    )
-
-    # Apply date filters
-    if start_date:
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(AuditLog.created_at >= start_datetime)
-
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(AuditLog.created_at <= end_datetime)
-
-    # Group by user and order by activity
-    results = query.group_by(
-        User.user_id, User.username, User.role
+        counts, User.user_id == counts.c.actor_id
     ).order_by(
-        func.count(AuditLog.audit_id).desc()
+        counts.c.event_count.desc()
     ).limit(limit).all()
 
     # Format response
@@ -284,39 +441,18 @@ async def get_timeline_statistics(
 
     RBAC: super_admin only
     """
-    # Determine date truncation based on granularity
-    if granularity == "hour":
-        date_trunc_expr = func.date_trunc('hour', AuditLog.created_at)
-    elif granularity == "day":
-        date_trunc_expr = func.date_trunc('day', AuditLog.created_at)
-    elif granularity == "week":
-        date_trunc_expr = func.date_trunc('week', AuditLog.created_at)
-    else:  # month
-        date_trunc_expr = func.date_trunc('month', AuditLog.created_at)
-
-    # Base query
-    query = db.query(
-        date_trunc_expr.label('time_bucket'),
-        func.count(AuditLog.audit_id).label('count')
-    )
-
-    # Apply date filters
-    if start_date:
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(AuditLog.created_at >= start_datetime)
-
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(AuditLog.created_at <= end_datetime)
-
-    # Group by time bucket
-    results = query.group_by('time_bucket').order_by('time_bucket').all()
+    counts = AuditStatsService.counts(["bucket"], *_date_range(start_date, end_date))
+    time_bucket = func.date_trunc(granularity, counts.c.bucket).label('time_bucket')
+    results = db.query(
+        time_bucket,
+        func.sum(counts.c.event_count)
+    ).group_by('time_bucket').order_by('time_bucket').all()
 
     # Format response
     timeline = [{
-        "timestamp": time_bucket.isoformat() if time_bucket else None,
-        "count": count
-    } for time_bucket, count in results]
+        "timestamp": bucket.isoformat() if bucket else None,
+        "count": int(count)
+    } for bucket, count in results]
 
     return {
         "start_date": start_date.isoformat() if start_date else None,
@@ -436,102 +572,342 @@ async def get_entity_audit_history(
     }
 
 
+def _session_like(db: Session) -> Session:
+    """
+    A new session on the request session's bind, for work that outlives the
+    request's dependencies (streamed bodies, background tasks)
+    """
+    return Session(bind=db.get_bind())
+
+
+def _stream_and_close(export: AuditExport):
+    try:
+        yield from export
+    finally:
+        export.db.close()
+
+
+def _run_export_job(db: Session, job_id: UUID):
+    try:
+        run_export_job(db, job_id)
+    finally:
+        db.close()
+
+
 @router.get("/export")
 async def export_audit_logs(
+    request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    format: str = Query(default="json", regex=r'^(json|csv)$'),
+    format: str = Query(default="json", regex=r'^(json|csv|ndjson|parquet)$'),
+    resume_after: Optional[UUID] = None,
     current_user: User = Depends(require_role(['super_admin'])),
     db: Session = Depends(get_db)
 ):
     """
     Export audit logs (super_admin only).
 
-    Returns audit logs in JSON or CSV format for offline analysis.
+    Streams audit logs in JSON, CSV, NDJSON or Parquet format for offline
+    analysis, oldest first. The body is read through a server-side cursor
+    and written chunk by chunk; text formats are gzip-encoded on the fly when
+    the client accepts it. Ranges of more than AUDIT_EXPORT_STREAM_MAX_ROWS
+    entries are rejected with 413: use POST /export/jobs for those.
 
     Query parameters:
     - start_date: Export logs from this date onwards
     - end_date: Export logs up to this date
-    - format: Export format (json or csv)
+    - format: Export format (json, csv, ndjson or parquet)
+    - resume_after: audit_id of the last entry received by an interrupted
+      export; the export continues after it
 
     RBAC: super_admin only
     """
-    from fastapi.responses import Response
-    import csv
-    from io import StringIO
+    start, end = _date_range(start_date, end_date)
+
+    after = None
+    if resume_after:
+        after = db.query(AuditLog.created_at, AuditLog.audit_id).filter(
+            AuditLog.audit_id == resume_after
+        ).first()
+        if not after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="resume_after does not match an audit log entry"
+            )
+        after = tuple(after)
 
-    # Base query
-    query = db.query(AuditLog, User.username).outerjoin(
-        User, AuditLog.actor_id == User.user_id
+    # Size check from the statistics rollup (cheap at any range)
+    totals = AuditStatsService.counts([], after[0] if after else start, end)
+    expected_rows = db.query(totals.c.event_count).scalar() or 0
+    if expected_rows > settings.AUDIT_EXPORT_STREAM_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Range holds {expected_rows} entries; create an export job (POST /audit/export/jobs) instead"
+        )
+
+    export = AuditExport(
+        _session_like(db),
+        format,
+        start,
+        end,
+        after=after,
+        compress="gzip" in request.headers.get("accept-encoding", ""),
+        meta={
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+        }
     )
 
-    # Apply date filters
-    if start_date:
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(AuditLog.created_at >= start_datetime)
+    headers = {}
+    if format != "json":
+        headers["Content-Disposition"] = (
+            f"attachment; filename=audit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export.encoder.extension}"
+        )
+    if export.compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(_stream_and_close(export), media_type=export.media_type, headers=headers)
+
+
+@router.post("/export/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    job_request: AuditExportJobCreate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Export a large date range to object storage in the background.
+
+    The range is written as one gzipped (or Parquet) object per chunk_days
+    window. Poll GET /export/jobs/{job_id}; completed jobs list a download
+    URL per part. Interrupted jobs are resumed by
+    app/jobs/run_audit_exports.py.
+
+    RBAC: super_admin only
+    """
+    if job_request.end_date < job_request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date"
+        )
+
+    range_start, range_end = _date_range(job_request.start_date, job_request.end_date)
+    job = AuditExportJob(
+        requested_by=current_user.user_id,
+        format=job_request.format,
+        range_start=range_start,
+        range_end=range_end,
+        chunk_days=job_request.chunk_days,
+        status="pending",
+        parts=[],
+        row_count=0
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    background_tasks.add_task(_run_export_job, _session_like(db), job.job_id)
+    return job_status(job)
+
+
+@router.get("/export/jobs/{job_id}")
+async def get_export_job(
+    job_id: UUID,
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Progress of a background export, with download URLs once completed.
+
+    RBAC: super_admin only
+    """
+    job = db.query(AuditExportJob).filter(AuditExportJob.job_id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    return job_status(job)
+
+
+@router.get("/anchors")
+async def list_merkle_anchors(
+    source: Optional[str] = Query(None, regex=r'^(audit_logs|project_progress_logs)$'),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(default=100, le=1000),
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    List daily Merkle anchors (roots) of the audit and progress logs.
 
+    RBAC: super_admin only
+    """
+    query = db.query(MerkleAnchor)
+
+    if source:
+        query = query.filter(MerkleAnchor.source == source)
+    if start_date:
+        query = query.filter(MerkleAnchor.anchor_date >= start_date)
     if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(AuditLog.created_at <= end_datetime)
+        query = query.filter(MerkleAnchor.anchor_date <= end_date)
+
+    anchors = query.order_by(MerkleAnchor.anchor_date.desc(), MerkleAnchor.source).limit(limit).all()
+
+    return {
+        "items": [{
+            "anchor_id": str(anchor.anchor_id),
+            "source": anchor.source,
+            "anchor_date": anchor.anchor_date.isoformat(),
+            "leaf_count": anchor.leaf_count,
+            "root_hash": anchor.root_hash,
+            "created_at": anchor.created_at.isoformat() if anchor.created_at else None
+        } for anchor in anchors]
+    }
+
+
+@router.post("/anchors/run")
+async def run_merkle_anchoring(
+    until: Optional[date] = None,
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Anchor all completed days that have no Merkle root yet.
+
+    Normally run daily by `python -m app.jobs.anchor_merkle`.
+
+    RBAC: super_admin only
+    """
+    created = {}
+    for source in MERKLE_SOURCES:
+        anchors = MerkleService.anchor_pending(db, source, until)
+        created[source] = [anchor.anchor_date.isoformat() for anchor in anchors]
+
+    return {"anchored": created}
+
+
+@router.get("/proofs/{source}/{record_id}")
+async def get_inclusion_proof(
+    source: str = Path(..., regex=r'^(audit_logs|project_progress_logs)$'),
+    record_id: UUID = Path(...),
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Merkle inclusion proof for one audit or progress log entry.
 
-    # Get all results (limited to 10000 for safety)
-    results = query.order_by(AuditLog.created_at.desc()).limit(10000).all()
-
-    if format == "csv":
-        # Create CSV
-        output = StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow([
-            'audit_id', 'actor_id', 'actor_username', 'action',
-            'entity_type', 'entity_id', 'payload', 'created_at',
-            'ip_address', 'user_agent'
-        ])
-
-        # Write rows
-        for audit_log, username in results:
-            writer.writerow([
-                str(audit_log.audit_id),
-                str(audit_log.actor_id) if audit_log.actor_id else '',
-                username or '',
-                audit_log.action,
-                audit_log.entity_type,
-                str(audit_log.entity_id) if audit_log.entity_id else '',
-                json.dumps(audit_log.payload) if audit_log.payload else '',
-                audit_log.created_at.isoformat(),
-                audit_log.ip_address or '',
-                audit_log.user_agent or ''
-            ])
-
-        csv_content = output.getvalue()
-        return Response(
-            content=csv_content,
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=audit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            }
+    Verify by hashing the leaf as H(0x00 || record_hash), folding in each
+    proof hash in order (H(0x01 || left || right)) and comparing the result
+    with root_hash.
+
+    RBAC: super_admin only
+    """
+    try:
+        proof = MerkleService.get_inclusion_proof(db, source, record_id)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    if not proof:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Record not found in any anchor (it may not be anchored yet)"
         )
-    else:
-        # Return JSON
-        logs = []
-        for audit_log, username in results:
-            logs.append({
-                "audit_id": str(audit_log.audit_id),
-                "actor_id": str(audit_log.actor_id) if audit_log.actor_id else None,
-                "actor_username": username,
-                "action": audit_log.action,
-                "entity_type": audit_log.entity_type,
-                "entity_id": str(audit_log.entity_id) if audit_log.entity_id else None,
-                "payload": audit_log.payload,
-                "created_at": audit_log.created_at.isoformat(),
-                "ip_address": audit_log.ip_address,
-                "user_agent": audit_log.user_agent
-            })
+    return proof
 
-        return {
-            "total": len(logs),
-            "start_date": start_date.isoformat() if start_date else None,
-            "end_date": end_date.isoformat() if end_date else None,
-            "logs": logs
-        }
+
+@router.get("/verification")
+async def get_chain_verification_status(
+    limit: int = Query(default=50, le=500),
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Status of the full audit-chain verification job and the broken links found.
+
+    The job itself runs out of band (`python -m app.jobs.verify_audit_chain`).
+
+    RBAC: super_admin only
+    """
+    checkpoint = db.query(AuditVerificationCheckpoint).filter(
+        AuditVerificationCheckpoint.chain_id == "audit"
+    ).first()
+
+    breaks = db.query(AuditChainBreak).order_by(
+        AuditChainBreak.sequence.asc()
+    ).limit(limit).all()
+
+    return {
+        "checkpoint": {
+            "status": checkpoint.status,
+            "verified_sequence": checkpoint.verified_sequence,
+            "rows_checked": checkpoint.rows_checked,
+            "unhashed_rows": checkpoint.unhashed_rows,
+            "broken_count": checkpoint.broken_count,
+            "rows_per_second": float(checkpoint.rows_per_second) if checkpoint.rows_per_second else None,
+            "started_at": checkpoint.started_at.isoformat() if checkpoint.started_at else None,
+            "updated_at": checkpoint.updated_at.isoformat() if checkpoint.updated_at else None
+        } if checkpoint else None,
+        "broken_links": [{
+            "sequence": link.sequence,
+            "audit_id": str(link.audit_id) if link.audit_id else None,
+            "error": link.error,
+            "expected": link.expected,
+            "actual": link.actual,
+            "detected_at": link.detected_at.isoformat() if link.detected_at else None
+        } for link in breaks]
+    }
+
+
+@router.get("/verification/range")
+async def verify_chain_range(
+    from_sequence: int = Query(default=1, ge=1),
+    limit: int = Query(default=10000, ge=1, le=1000000),
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Verify a sequence range of the audit hash chain on demand.
+
+    Hashes are recomputed in the database in a single call, so no audit rows
+    are transferred. Use the verification job for the whole chain.
+
+    RBAC: super_admin only
+    """
+    return AuditService.verify_chain_integrity(db, limit=limit, from_sequence=from_sequence)
+
+
+@router.get("/writer/metrics")
+async def get_audit_writer_metrics(
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Audit writer throughput and backpressure for this API process.
+
+    queue_depth/high_water show how close the in-memory queue is to its
+    capacity; blocked_puts, spilled and dropped count requests that had to
+    wait for it, events that overflowed to the outbox, and events lost.
+    outbox_backlog is shared by all processes.
+
+    RBAC: super_admin only
+    """
+    return audit_writer.metrics(db)
+
+
+@router.get("/partitions")
+async def get_audit_partitions(
+    current_user: User = Depends(require_role(['super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Monthly audit_logs partitions and archived months.
+
+    default_partition_rows counts entries dated outside every partition
+    (should stay 0). Partitions are created and archived by
+    app/jobs/manage_audit_partitions.py.
+
+    RBAC: super_admin only
+    """
+    return AuditPartitionService.status(db)
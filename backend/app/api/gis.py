@@ -3,23 +3,30 @@ GIS API Endpoints
 PostGIS spatial operations, vector tiles
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func, text
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
+import tempfile
 import uuid
 import json
 
+from ..core.config import settings
 from ..core.database import get_db
-from ..models import Project, GISFeature, User, AuditLog, GeofencingRule, Alert
+from ..core.response_cache import invalidate_public_cache, TAG_GIS
+from ..models import Project, GISFeature, User, GeofencingRule, Alert
 from ..schemas import (
     GISFeatureCreate,
     GISFeatureUpdate,
-    GISFeatureResponse
+    GISFeatureResponse,
+    GISFeatureImportResult
 )
 from ..api.auth import get_current_user, require_role
+from ..services.audit_writer import record_audit
+from ..services.gis_import import IMPORT_FORMATS, IMPORT_FORMAT_PATTERN, import_features
 from geoalchemy2.functions import ST_GeomFromGeoJSON, ST_AsGeoJSON, ST_IsValid, ST_Within, ST_AsMVT, ST_AsMVTGeom, ST_TileEnvelope
 
 router = APIRouter()
@@ -42,21 +49,7 @@ async def create_gis_feature(
     - regional_admin: Can create for projects in their region
     - super_admin: Can create for any project
     """
-    # Verify project exists and user has access
-    project = db.query(Project).filter(Project.project_id == feature.project_id).first()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-
-    # RBAC check
-    if current_user.role == "deo_user" and project.deo_id != current_user.deo_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot create GIS features for projects from another DEO"
-        )
+    _check_feature_project(db, current_user, feature.project_id)
 
     # Convert GeoJSON to PostGIS geometry
     geom_geojson = json.dumps(feature.geometry)
@@ -116,8 +109,8 @@ async def create_gis_feature(
     db.add(new_feature)
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="CREATE_GIS_FEATURE",
         entity_type="gis_feature",
@@ -126,12 +119,11 @@ async def create_gis_feature(
             "project_id": str(feature.project_id),
             "feature_type": feature.feature_type,
             "geometry_type": feature.geometry.get('type')
-        },
-        created_at=datetime.utcnow()
+        }
     )
-    db.add(audit_entry)
 
     db.commit()
+    invalidate_public_cache(TAG_GIS)
     db.refresh(new_feature)
 
     # Return with GeoJSON geometry
@@ -147,6 +139,93 @@ async def create_gis_feature(
     )
 
 
+@router.post(
+    "/features/import",
+    response_model=GISFeatureImportResult,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/octet-stream": {"schema": {"type": "string", "format": "binary"}}
+    }}}
+)
+async def import_gis_features(
+    request: Request,
+    project_id: UUID,
+    format: str = Query(..., pattern=IMPORT_FORMAT_PATTERN),
+    feature_type: Optional[str] = Query(default=None, pattern=r'^(road|bridge|drainage|facility|building|other)$'),
+    layer: Optional[str] = Query(default=None, min_length=1, max_length=255),
+    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Import the features of a file (the request body) into a project.
+
+    - format: geojson, shapefile (a .zip of the .shp/.shx/.dbf/.prj),
+      geopackage or kml
+    - feature_type: Type of features without a feature_type attribute
+    - layer: Layer to read (default: the first)
+
+    Geometries are reprojected to WGS 84 and invalid ones repaired.
+    Features that cannot be imported (no geometry, no valid feature_type)
+    are skipped and listed by their position in the file; the rest are
+    imported. Features outside the region boundary raise one alert.
+
+    The body is streamed to a temporary file; the import itself (reading,
+    repair, COPY and INSERT) runs in the threadpool so other requests are
+    served meanwhile.
+
+    RBAC: as for creating a feature
+    """
+    _check_feature_project(db, current_user, project_id)
+
+    max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    with tempfile.NamedTemporaryFile(suffix=IMPORT_FORMATS[format]) as upload:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds {settings.MAX_FILE_SIZE_MB} MB"
+                )
+            upload.write(chunk)
+        upload.flush()
+
+        try:
+            report = await run_in_threadpool(
+                import_features, db, project_id, current_user.user_id, upload.name, format,
+                layer=layer, feature_type=feature_type
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid feature file: {e}"
+            )
+
+    db.commit()
+    if report["imported"]:
+        invalidate_public_cache(TAG_GIS)
+    return report
+
+
+def _check_feature_project(db: Session, user: User, project_id: UUID) -> Project:
+    """Verify the project exists and the user may add features to it"""
+    project = db.query(Project).filter(Project.project_id == project_id).first()
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    # RBAC check
+    if user.role == "deo_user" and project.deo_id != user.deo_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot create GIS features for projects from another DEO"
+        )
+    return project
+
+
 @router.get("/features", response_model=dict)
 async def get_gis_features(
     project_id: Optional[UUID] = None,
@@ -309,18 +388,17 @@ async def update_gis_feature(
     feature.updated_at = datetime.utcnow()
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="UPDATE_GIS_FEATURE",
         entity_type="gis_feature",
         entity_id=feature_id,
-        payload=update_data,
-        created_at=datetime.utcnow()
+        payload=update_data
     )
-    db.add(audit_entry)
 
     db.commit()
+    invalidate_public_cache(TAG_GIS)
     db.refresh(feature)
 
     # Get geometry as GeoJSON
@@ -364,19 +442,18 @@ async def delete_gis_feature(
         )
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="DELETE_GIS_FEATURE",
         entity_type="gis_feature",
         entity_id=feature_id,
-        payload={"feature_type": feature.feature_type},
-        created_at=datetime.utcnow()
+        payload={"feature_type": feature.feature_type}
     )
-    db.add(audit_entry)
 
     db.delete(feature)
     db.commit()
+    invalidate_public_cache(TAG_GIS)
 
     return None
 
@@ -3,11 +3,17 @@ GPS Tracks API Endpoints
 RouteShoot track management with video synchronization
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+import json
+import math
 import uuid
 import boto3
 from botocore.client import Config
@@ -15,11 +21,51 @@ from botocore.exceptions import ClientError
 
 from ..core.database import get_db
 from ..core.config import settings
-from ..models import GpsTrack, MediaAsset, Project, User
+from ..models import GpsTrack, GpsTrackChunk, MediaAsset, Project, User
 from ..schemas import (
+    GpsTrackChunkCreate,
+    GpsTrackChunkReceipt,
     GpsTrackCreate,
     GpsTrackResponse,
-    GpsTrackListResponse
+    GpsTrackListResponse,
+    GpsTrackNearestPoint,
+    GpsTrackOpen,
+    GpsTrackPosition,
+    GpsTrackSummary,
+    GpsWaypointPage
+)
+from ..services.gps_track_encoding import (
+    JSON_MEDIA_TYPE,
+    MEDIA_TYPES,
+    PACKED_MEDIA_TYPE,
+    POLYLINE_MEDIA_TYPE,
+    decode_packed_waypoints,
+    decode_polyline_waypoints,
+    decode_track_upload,
+    encode_packed_waypoints,
+    encode_polyline_waypoints,
+    negotiate
+)
+from ..services.gps_track_files import (
+    FILE_MEDIA_TYPES,
+    XML_MEDIA_TYPES,
+    TrackFileParser,
+    iter_track_file
+)
+from ..services.gps_track_index import get_track_index
+from ..services.gps_track_recording import append_waypoints, chunk_digest, prune_lods
+from ..services.gps_tracks import (
+    arrays_to_waypoints,
+    bounds,
+    build_lods,
+    encode_geometry,
+    encode_video_offsets,
+    length_meters,
+    load_track_arrays,
+    thumbnail_polyline,
+    waypoint_arrays,
+    waypoint_range,
+    zoom_tolerance
 )
 from ..api.auth import get_current_user, require_role
 
@@ -54,21 +100,70 @@ def generate_video_url(media: MediaAsset) -> Optional[str]:
     return f"{settings.API_BASE_URL}/api/v1/media/{media.media_id}/file"
 
 
-@router.post("", response_model=GpsTrackResponse, status_code=status.HTTP_201_CREATED)
-async def create_gps_track(
-    track_data: GpsTrackCreate,
-    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
-    db: Session = Depends(get_db)
-):
-    """
-    Create a new GPS track.
+def _track_response(
+    track: GpsTrack,
+    video_url: Optional[str],
+    waypoints: Optional[List[dict]] = None,
+    lod_tolerance_meters: Optional[float] = None
+) -> GpsTrackResponse:
+    return GpsTrackResponse(
+        track_id=track.track_id,
+        project_id=track.project_id,
+        media_id=track.media_id,
+        track_name=track.track_name,
+        waypoints=waypoints,
+        waypoint_count=track.waypoint_count,
+        total_distance_meters=float(track.total_distance_meters) if track.total_distance_meters is not None else None,
+        start_time=track.start_time,
+        end_time=track.end_time,
+        kml_storage_key=track.kml_storage_key,
+        lod_tolerance_meters=lod_tolerance_meters,
+        is_recording=bool(track.is_recording),
+        video_url=video_url,
+        created_by=track.created_by,
+        created_at=track.created_at
+    )
 
-    RBAC:
-    - deo_user: Can only create for their own DEO's projects
-    - regional_admin/super_admin: Can create for any project
-    """
+
+def _lod_tolerance(tolerance: Optional[float], zoom: Optional[float]) -> Optional[float]:
+    """Requested simplification tolerance in meters (explicit tolerance wins over zoom)"""
+    if tolerance is not None:
+        return tolerance
+    if zoom is not None:
+        return zoom_tolerance(zoom)
+    return None
+
+
+async def _parse_track_upload(request: Request):
+    """GpsTrackCreate fields and waypoint arrays of a JSON, polyline or packed upload"""
+    media_type = request.headers.get("content-type", JSON_MEDIA_TYPE).split(";")[0].strip().lower()
+    if media_type not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(MEDIA_TYPES)}"
+        )
+
+    try:
+        fields, arrays = decode_track_upload(media_type, await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid track body: {e}"
+        )
+
+    if arrays is not None:
+        fields["waypoints"] = []
+    try:
+        track_data = GpsTrackCreate.model_validate(fields)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    return track_data, arrays if arrays is not None else waypoint_arrays(track_data.waypoints)
+
+
+def _check_track_target(db: Session, current_user: User, project_id: UUID, media_id: Optional[UUID]) -> None:
+    """Raise unless the user may add a track (with this video) to the project"""
     # Verify project exists and user has access
-    project = db.query(Project).filter(Project.project_id == track_data.project_id).first()
+    project = db.query(Project).filter(Project.project_id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,31 +178,31 @@ async def create_gps_track(
         )
 
     # Verify media exists if provided
-    if track_data.media_id:
-        media = db.query(MediaAsset).filter(MediaAsset.media_id == track_data.media_id).first()
+    if media_id:
+        media = db.query(MediaAsset).filter(MediaAsset.media_id == media_id).first()
         if not media:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Associated media not found"
             )
-        if media.project_id != track_data.project_id:
+        if media.project_id != project_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Media does not belong to the specified project"
             )
 
-    # Convert waypoints to dict format
-    waypoints_data = [wp.model_dump() for wp in track_data.waypoints]
 
-    # Create GPS track
+def _insert_track(db: Session, current_user: User, track_data: GpsTrackCreate, arrays: dict) -> GpsTrack:
+    # Create GPS track (waypoints stored as a LINESTRINGZM plus video offsets)
     new_track = GpsTrack(
         track_id=uuid.uuid4(),
         project_id=track_data.project_id,
         media_id=track_data.media_id,
         track_name=track_data.track_name,
-        waypoints=waypoints_data,
-        waypoint_count=len(track_data.waypoints),
-        total_distance_meters=track_data.total_distance_meters,
+        geometry=encode_geometry(arrays),
+        video_offsets_ms=encode_video_offsets(arrays),
+        waypoint_count=len(arrays["timestamp"]),
+        **bounds(arrays),
         start_time=track_data.start_time,
         end_time=track_data.end_time,
         kml_storage_key=track_data.kml_storage_key,
@@ -116,8 +211,49 @@ async def create_gps_track(
     )
 
     db.add(new_track)
+    db.flush()
+    # Distance is measured server-side from the stored line
+    if new_track.geometry is not None:
+        new_track.total_distance_meters = length_meters(GpsTrack.geometry)
+    db.add_all(build_lods(new_track.track_id, arrays))
     db.commit()
     db.refresh(new_track)
+    return new_track
+
+
+@router.post(
+    "",
+    response_model=GpsTrackResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        JSON_MEDIA_TYPE: {"schema": GpsTrackCreate.model_json_schema(ref_template="#/components/schemas/{model}")},
+        POLYLINE_MEDIA_TYPE: {"schema": {"type": "object"}},
+        PACKED_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+    }}}
+)
+async def create_gps_track(
+    request: Request,
+    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a new GPS track.
+
+    The body is GpsTrackCreate as JSON, or with compact waypoints
+    (see services/gps_track_encoding.py), chosen by Content-Type:
+    - application/json: waypoints as a list of GpsWaypoint objects
+    - application/vnd.ebarmm.waypoints.polyline+json: "encoded_waypoints"
+      (polyline object) in place of "waypoints"
+    - application/vnd.ebarmm.waypoints.packed: length-prefixed JSON fields
+      followed by packed waypoint arrays
+
+    RBAC:
+    - deo_user: Can only create for their own DEO's projects
+    - regional_admin/super_admin: Can create for any project
+    """
+    track_data, arrays = await _parse_track_upload(request)
+    _check_track_target(db, current_user, track_data.project_id, track_data.media_id)
+    new_track = _insert_track(db, current_user, track_data, arrays)
 
     # Get video URL if media associated
     video_url = None
@@ -125,34 +261,321 @@ async def create_gps_track(
         media = db.query(MediaAsset).filter(MediaAsset.media_id == new_track.media_id).first()
         video_url = generate_video_url(media)
 
-    return GpsTrackResponse(
-        track_id=new_track.track_id,
-        project_id=new_track.project_id,
-        media_id=new_track.media_id,
-        track_name=new_track.track_name,
-        waypoints=new_track.waypoints,
-        waypoint_count=new_track.waypoint_count,
-        total_distance_meters=float(new_track.total_distance_meters) if new_track.total_distance_meters else None,
-        start_time=new_track.start_time,
-        end_time=new_track.end_time,
-        kml_storage_key=new_track.kml_storage_key,
-        video_url=video_url,
-        created_by=new_track.created_by,
-        created_at=new_track.created_at
+    return _track_response(new_track, video_url, arrays_to_waypoints(arrays), 0.0)
+
+
+@router.post(
+    "/import",
+    response_model=GpsTrackResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        media_type: {"schema": {"type": "string", "format": "binary"}} for media_type in XML_MEDIA_TYPES
+    }}}
+)
+async def import_gps_track(
+    request: Request,
+    project_id: UUID,
+    track_name: Optional[str] = Query(default=None, min_length=1, max_length=255),
+    media_id: Optional[UUID] = None,
+    start_time: Optional[datetime] = None,
+    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a GPS track from a GPX or KML file (the request body).
+
+    The file is parsed as it is received, so large recordings are never
+    held as a document, and the upload stops at the first invalid point.
+    Every track segment (GPX trkseg/rte, KML gx:Track/LineString) is
+    appended in file order.
+
+    - track_name: Defaults to the file's first <name>
+    - start_time: Defaults to the first point time; required for files
+      without times (e.g. the mobile app's KML LineString)
+
+    RBAC: as for creating a track
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in XML_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(XML_MEDIA_TYPES)}"
+        )
+    _check_track_target(db, current_user, project_id, media_id)
+
+    start_ms = None
+    if start_time is not None:
+        start_ms = round(start_time.replace(tzinfo=start_time.tzinfo or timezone.utc).timestamp() * 1000)
+    parser = TrackFileParser()
+    try:
+        async for chunk in request.stream():
+            parser.feed(chunk)
+        file_name, arrays = parser.close(start_ms)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid track file: {e}"
+        )
+
+    timestamps = arrays["timestamp"]
+    track_data = GpsTrackCreate(
+        project_id=project_id,
+        media_id=media_id,
+        track_name=track_name or (file_name or "Imported track")[:255],
+        waypoints=[],
+        start_time=start_time or datetime.utcfromtimestamp(timestamps[0] / 1000),
+        end_time=datetime.utcfromtimestamp(timestamps.max() / 1000)
+    )
+    new_track = _insert_track(db, current_user, track_data, arrays)
+
+    video_url = None
+    if new_track.media_id:
+        media = db.query(MediaAsset).filter(MediaAsset.media_id == new_track.media_id).first()
+        video_url = generate_video_url(media)
+
+    return _track_response(new_track, video_url)
+
+
+@router.post("/recordings", response_model=GpsTrackResponse, status_code=status.HTTP_201_CREATED)
+async def open_gps_track_recording(
+    track_data: GpsTrackOpen,
+    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Open an empty GPS track for a chunked upload.
+
+    Long recordings are sent as numbered waypoint chunks with
+    PUT /{track_id}/chunks/{sequence} (1, 2, ...) and closed with
+    POST /{track_id}/finalize. Distance, bounding box and levels of detail
+    are kept up to date as chunks arrive.
+
+    RBAC: as for creating a track
+    """
+    _check_track_target(db, current_user, track_data.project_id, track_data.media_id)
+
+    new_track = GpsTrack(
+        track_id=uuid.uuid4(),
+        project_id=track_data.project_id,
+        media_id=track_data.media_id,
+        track_name=track_data.track_name,
+        waypoint_count=0,
+        total_distance_meters=0,
+        start_time=track_data.start_time,
+        kml_storage_key=track_data.kml_storage_key,
+        is_recording=True,
+        created_by=current_user.user_id,
+        created_at=datetime.utcnow()
     )
+    db.add(new_track)
+    db.commit()
+    db.refresh(new_track)
+
+    return _track_response(new_track, None)
+
+
+def _recording_track(db: Session, current_user: User, track_id: UUID, lock_waypoints: bool = False) -> GpsTrack:
+    """The track, locked for update; only its creator or an admin may change it"""
+    query = db.query(GpsTrack)
+    if lock_waypoints:
+        query = query.options(undefer_group('waypoints'))
+    track = query.filter(GpsTrack.track_id == track_id).with_for_update().first()
+    if not track:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="GPS track not found"
+        )
+    if current_user.role == "deo_user" and track.created_by != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the user recording a GPS track can add to it"
+        )
+    return track
+
+
+async def _parse_chunk_upload(request: Request):
+    """Waypoint arrays of a JSON (GpsTrackChunkCreate), polyline or packed chunk"""
+    media_type = request.headers.get("content-type", JSON_MEDIA_TYPE).split(";")[0].strip().lower()
+    if media_type not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(MEDIA_TYPES)}"
+        )
+
+    body = await request.body()
+    try:
+        if media_type == PACKED_MEDIA_TYPE:
+            arrays = decode_packed_waypoints(body)
+        else:
+            fields = json.loads(body)
+            if media_type == POLYLINE_MEDIA_TYPE:
+                if not isinstance(fields, dict) or not isinstance(fields.get("encoded_waypoints"), dict):
+                    raise ValueError("encoded_waypoints object required")
+                arrays = decode_polyline_waypoints(fields["encoded_waypoints"])
+            else:
+                try:
+                    arrays = waypoint_arrays(GpsTrackChunkCreate.model_validate(fields).waypoints)
+                except ValidationError as e:
+                    raise RequestValidationError(e.errors())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid chunk body: {e}"
+        )
+
+    if len(arrays["timestamp"]) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Chunk has no waypoints"
+        )
+    return arrays
+
+
+@router.put(
+    "/{track_id}/chunks/{sequence}",
+    response_model=GpsTrackChunkReceipt,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        JSON_MEDIA_TYPE: {"schema": GpsTrackChunkCreate.model_json_schema(ref_template="#/components/schemas/{model}")},
+        POLYLINE_MEDIA_TYPE: {"schema": {"type": "object"}},
+        PACKED_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+    }}}
+)
+async def put_gps_track_chunk(
+    track_id: UUID,
+    request: Request,
+    sequence: int = Path(..., ge=1),
+    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Append the next chunk of waypoints to a recording GPS track.
+
+    Chunks must arrive in sequence order (1, 2, ...). Re-sending a stored
+    chunk is a no-op (replayed=true), so uploads can simply be retried
+    after a dropped connection; a different chunk under a stored sequence
+    number is rejected with 409, as is a gap in the sequence.
+
+    The body is a GpsTrackChunkCreate as JSON, or the chunk's waypoints in the
+    polyline ({"encoded_waypoints": ...}) or packed encoding, chosen by
+    Content-Type as for track creation.
+    """
+    arrays = await _parse_chunk_upload(request)
+    digest = chunk_digest(arrays)
+    track = _recording_track(db, current_user, track_id, lock_waypoints=True)
+
+    stored = db.query(GpsTrackChunk).filter(
+        GpsTrackChunk.track_id == track_id,
+        GpsTrackChunk.sequence == sequence
+    ).first()
+    last_sequence = db.query(func.coalesce(func.max(GpsTrackChunk.sequence), 0)).filter(
+        GpsTrackChunk.track_id == track_id
+    ).scalar()
+
+    if stored is not None:
+        if stored.digest != digest:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Chunk {sequence} was already stored with different waypoints"
+            )
+        chunk, replayed = stored, True
+    else:
+        if not track.is_recording:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="GPS track is not recording"
+            )
+        if sequence != last_sequence + 1:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Expected chunk {last_sequence + 1}"
+            )
+
+        chunk = GpsTrackChunk(
+            track_id=track_id,
+            sequence=sequence,
+            first_waypoint=track.waypoint_count,
+            waypoint_count=len(arrays["timestamp"]),
+            digest=digest,
+            received_at=datetime.utcnow()
+        )
+        append_waypoints(db, track, arrays)
+        db.add(chunk)
+        db.commit()
+        db.refresh(track)
+        replayed, last_sequence = False, sequence
+
+    return GpsTrackChunkReceipt(
+        track_id=track_id,
+        sequence=sequence,
+        first_waypoint=chunk.first_waypoint,
+        waypoint_count=chunk.waypoint_count,
+        track_waypoint_count=track.waypoint_count,
+        total_distance_meters=float(track.total_distance_meters) if track.total_distance_meters is not None else None,
+        next_sequence=last_sequence + 1,
+        replayed=replayed
+    )
+
+
+@router.post("/{track_id}/finalize", response_model=GpsTrackResponse)
+async def finalize_gps_track_recording(
+    track_id: UUID,
+    current_user: User = Depends(require_role(['deo_user', 'regional_admin', 'super_admin'])),
+    db: Session = Depends(get_db)
+):
+    """
+    Close a recording GPS track; no more chunks are accepted.
+
+    end_time is set from the last waypoint. Finalizing a finished track
+    returns it unchanged.
+    """
+    track = _recording_track(db, current_user, track_id)
+
+    if track.is_recording:
+        if track.waypoint_count == 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="GPS track has no waypoints"
+            )
+        last_timestamp = db.query(func.ST_M(func.ST_PointN(GpsTrack.geometry, track.waypoint_count))).filter(
+            GpsTrack.track_id == track_id
+        ).scalar()
+        track.end_time = datetime.utcfromtimestamp(last_timestamp / 1000)
+        track.is_recording = False
+        prune_lods(db, track_id)
+        db.commit()
+        db.refresh(track)
+
+    video_url = None
+    if track.media_id:
+        media = db.query(MediaAsset).filter(MediaAsset.media_id == track.media_id).first()
+        video_url = generate_video_url(media)
+
+    return _track_response(track, video_url)
 
 
 @router.get("/project/{project_id}", response_model=List[GpsTrackResponse])
 async def get_project_gps_tracks(
     project_id: UUID,
     limit: int = Query(default=50, le=200),
+    include_waypoints: bool = True,
+    tolerance: Optional[float] = Query(default=None, ge=0),
+    zoom: Optional[float] = Query(default=None, ge=0, le=24),
+    max_points: Optional[int] = Query(default=None, ge=2),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all GPS tracks for a project.
 
-    Returns tracks with presigned video URLs if associated.
+    Returns tracks with presigned video URLs if associated. Waypoints are
+    rebuilt from the stored geometry only with include_waypoints (the
+    default, for existing clients); pass false to skip them.
+
+    Level of detail (Douglas-Peucker, precomputed when a track is created):
+    - tolerance: Max deviation from the recorded path in meters
+    - zoom: Web map zoom level; simplifies to about one screen pixel
+    - max_points: Return at most this many waypoints per track
+    Without any of them every recorded waypoint is returned.
     """
     # Verify project exists
     project = db.query(Project).filter(Project.project_id == project_id).first()
@@ -162,48 +585,99 @@ async def get_project_gps_tracks(
             detail="Project not found"
         )
 
-    # Query tracks
-    tracks = db.query(GpsTrack).filter(
+    # Query tracks with their videos
+    rows = db.query(GpsTrack, MediaAsset).outerjoin(
+        MediaAsset, GpsTrack.media_id == MediaAsset.media_id
+    ).filter(
         GpsTrack.project_id == project_id
     ).order_by(GpsTrack.created_at.desc()).limit(limit).all()
 
+    lods = {}
+    if include_waypoints:
+        lods = load_track_arrays(db, [track for track, _ in rows], _lod_tolerance(tolerance, zoom), max_points)
+
     # Build response with video URLs
     results = []
-    for track in tracks:
-        video_url = None
-        if track.media_id:
-            media = db.query(MediaAsset).filter(MediaAsset.media_id == track.media_id).first()
-            video_url = generate_video_url(media)
+    for track, media in rows:
+        video_url = generate_video_url(media)
+
+        if track.track_id in lods:
+            arrays, lod_tolerance = lods[track.track_id]
+            results.append(_track_response(track, video_url, arrays_to_waypoints(arrays), lod_tolerance))
+        else:
+            results.append(_track_response(track, video_url))
+
+    return results
+
 
-        results.append(GpsTrackResponse(
+@router.get("/project/{project_id}/summary", response_model=List[GpsTrackSummary])
+async def get_project_gps_track_summaries(
+    project_id: UUID,
+    limit: int = Query(default=50, le=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List a project's GPS tracks without waypoints.
+
+    One query returns each track's stored stats, bounding box, a thumbnail
+    polyline (coarsest level of detail) and video URL; fetch waypoints per
+    track from /{track_id} or in pages from /{track_id}/waypoints.
+    """
+    # Verify project exists
+    project = db.query(Project).filter(Project.project_id == project_id).first()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    rows = db.query(GpsTrack, MediaAsset, thumbnail_polyline()).outerjoin(
+        MediaAsset, GpsTrack.media_id == MediaAsset.media_id
+    ).filter(
+        GpsTrack.project_id == project_id
+    ).order_by(GpsTrack.created_at.desc()).limit(limit).all()
+
+    return [
+        GpsTrackSummary(
             track_id=track.track_id,
             project_id=track.project_id,
             media_id=track.media_id,
             track_name=track.track_name,
-            waypoints=track.waypoints,
             waypoint_count=track.waypoint_count,
-            total_distance_meters=float(track.total_distance_meters) if track.total_distance_meters else None,
+            total_distance_meters=float(track.total_distance_meters) if track.total_distance_meters is not None else None,
+            bbox=[
+                float(track.min_longitude), float(track.min_latitude),
+                float(track.max_longitude), float(track.max_latitude)
+            ] if track.min_longitude is not None else None,
             start_time=track.start_time,
             end_time=track.end_time,
-            kml_storage_key=track.kml_storage_key,
-            video_url=video_url,
+            thumbnail_polyline=thumbnail,
+            is_recording=bool(track.is_recording),
+            video_url=generate_video_url(media),
             created_by=track.created_by,
             created_at=track.created_at
-        ))
-
-    return results
+        )
+        for track, media, thumbnail in rows
+    ]
 
 
 @router.get("/{track_id}", response_model=GpsTrackResponse)
 async def get_gps_track(
     track_id: UUID,
+    include_waypoints: bool = True,
+    tolerance: Optional[float] = Query(default=None, ge=0),
+    zoom: Optional[float] = Query(default=None, ge=0, le=24),
+    max_points: Optional[int] = Query(default=None, ge=2),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get a single GPS track by ID.
 
-    Returns track with presigned video URL if associated.
+    Returns track with presigned video URL if associated; waypoints are
+    omitted with include_waypoints=false. tolerance, zoom and max_points
+    select a level of detail as for the project listing.
     """
     track = db.query(GpsTrack).filter(GpsTrack.track_id == track_id).first()
     if not track:
@@ -218,23 +692,185 @@ async def get_gps_track(
         media = db.query(MediaAsset).filter(MediaAsset.media_id == track.media_id).first()
         video_url = generate_video_url(media)
 
-    return GpsTrackResponse(
-        track_id=track.track_id,
-        project_id=track.project_id,
-        media_id=track.media_id,
-        track_name=track.track_name,
-        waypoints=track.waypoints,
-        waypoint_count=track.waypoint_count,
-        total_distance_meters=float(track.total_distance_meters) if track.total_distance_meters else None,
-        start_time=track.start_time,
-        end_time=track.end_time,
-        kml_storage_key=track.kml_storage_key,
-        video_url=video_url,
-        created_by=track.created_by,
-        created_at=track.created_at
+    if not include_waypoints:
+        return _track_response(track, video_url)
+
+    arrays, lod_tolerance = load_track_arrays(db, [track], _lod_tolerance(tolerance, zoom), max_points)[track.track_id]
+    return _track_response(track, video_url, arrays_to_waypoints(arrays), lod_tolerance)
+
+
+@router.get(
+    "/{track_id}/waypoints",
+    response_model=GpsWaypointPage,
+    responses={200: {"content": {POLYLINE_MEDIA_TYPE: {}, PACKED_MEDIA_TYPE: {}}}}
+)
+async def get_gps_track_waypoints(
+    request: Request,
+    track_id: UUID,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=5000, ge=1, le=50000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a range of a GPS track's waypoints at full resolution.
+
+    Long recordings can be fetched in pages: request offset=next_offset
+    until next_offset is null.
+
+    The encoding follows the Accept header: JSON (default), polyline
+    (the page with "encoded_waypoints" in place of "waypoints") or packed
+    (binary waypoints; the page fields are in X-Waypoint-Count,
+    X-Offset and X-Next-Offset headers).
+    """
+    result = waypoint_range(db, track_id, offset, limit)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="GPS track not found"
+        )
+
+    waypoint_count, arrays = result
+    next_offset = offset + limit
+    if next_offset >= waypoint_count:
+        next_offset = None
+
+    media_type = negotiate(request.headers.get("accept"))
+    if media_type == PACKED_MEDIA_TYPE:
+        headers = {"X-Waypoint-Count": str(waypoint_count), "X-Offset": str(offset)}
+        if next_offset is not None:
+            headers["X-Next-Offset"] = str(next_offset)
+        return Response(content=encode_packed_waypoints(arrays), media_type=PACKED_MEDIA_TYPE, headers=headers)
+    if media_type == POLYLINE_MEDIA_TYPE:
+        return JSONResponse(media_type=POLYLINE_MEDIA_TYPE, content={
+            "track_id": str(track_id),
+            "waypoint_count": waypoint_count,
+            "offset": offset,
+            "next_offset": next_offset,
+            "encoded_waypoints": encode_polyline_waypoints(arrays),
+        })
+
+    return GpsWaypointPage(
+        track_id=track_id,
+        waypoint_count=waypoint_count,
+        offset=offset,
+        next_offset=next_offset,
+        waypoints=arrays_to_waypoints(arrays)
+    )
+
+
+@router.get("/{track_id}/export")
+async def export_gps_track(
+    track_id: UUID,
+    format: str = Query(default="gpx", pattern="^(gpx|kml)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download a GPS track as a GPX or KML file.
+
+    All waypoints are included, with millisecond times and video offsets
+    (a GPX extension / KML gx:SimpleArrayData), so the file re-imports
+    losslessly through /import. The document is streamed in blocks.
+    """
+    track = db.query(GpsTrack).filter(GpsTrack.track_id == track_id).first()
+    if not track:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="GPS track not found"
+        )
+
+    arrays, _ = load_track_arrays(db, [track])[track.track_id]
+    return StreamingResponse(
+        iter_track_file(format, track.track_name, arrays),
+        media_type=FILE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=\"track_{track.track_id}.{format}\""}
     )
 
 
+def _indexed_track(db: Session, track_id: UUID):
+    track = db.query(GpsTrack).filter(GpsTrack.track_id == track_id).first()
+    if not track:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="GPS track not found"
+        )
+    if track.waypoint_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="GPS track has no waypoints"
+        )
+    return get_track_index(db, track)
+
+
+@router.get("/{track_id}/position", response_model=List[GpsTrackPosition])
+async def get_gps_track_positions(
+    track_id: UUID,
+    offset_ms: List[int] = Query(..., max_length=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Where the camera was at video offsets (video-sync playback).
+
+    Positions are interpolated between the waypoints around each offset;
+    offsets outside the recording are clamped to its ends. Repeat offset_ms
+    to look up several offsets at once (max 1000). A track without video
+    offsets uses milliseconds since its first waypoint.
+    """
+    index = _indexed_track(db, track_id)
+    positions = index.position_at(offset_ms)
+
+    return [
+        GpsTrackPosition(
+            offset_ms=offset,
+            latitude=float(positions["latitude"][i]),
+            longitude=float(positions["longitude"][i]),
+            altitude=None if math.isnan(positions["altitude"][i]) else float(positions["altitude"][i]),
+            distance_m=float(positions["distance_m"][i]),
+            waypoint_index=int(positions["waypoint_index"][i])
+        )
+        for i, offset in enumerate(offset_ms)
+    ]
+
+
+@router.get("/{track_id}/nearest", response_model=List[GpsTrackNearestPoint])
+async def get_gps_track_nearest_points(
+    track_id: UUID,
+    latitude: List[float] = Query(..., max_length=1000),
+    longitude: List[float] = Query(..., max_length=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    The video offset nearest to map locations (click-to-seek).
+
+    Each location (latitude/longitude pairs, repeated for a batch of up to
+    1000) is snapped to the closest point of the track, and the video
+    offset there is interpolated.
+    """
+    if len(latitude) != len(longitude):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="latitude and longitude must be given the same number of times"
+        )
+
+    index = _indexed_track(db, track_id)
+    points = index.nearest(latitude, longitude)
+
+    return [
+        GpsTrackNearestPoint(
+            latitude=float(points["latitude"][i]),
+            longitude=float(points["longitude"][i]),
+            offset_ms=int(round(points["offset_ms"][i])),
+            distance_m=float(points["distance_m"][i]),
+            distance_from_track_m=float(points["distance_from_track_m"][i]),
+            waypoint_index=int(points["waypoint_index"][i])
+        )
+        for i in range(len(latitude))
+    ]
+
+
 @router.delete("/{track_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_gps_track(
     track_id: UUID,
@@ -10,6 +10,7 @@ from typing import Optional, List
 from uuid import UUID
 
 from ..core.database import get_db
+from ..core.pagination import COUNT_MODES, count_rows, keyset_paginate
 from ..models import User, Group, UserGroup
 from ..schemas import (
     GroupResponse, GroupCreate, GroupUpdate, GroupListResponse,
@@ -27,10 +28,17 @@ async def list_groups(
     limit: int = Query(50, ge=1, le=100),
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    count: str = Query(default="exact", pattern=COUNT_MODES),
     current_user: User = Depends(require_permission("groups", "read")),
     db: Session = Depends(get_db)
 ):
-    """List groups with filtering and pagination."""
+    """
+    List groups with filtering and pagination.
+
+    Pass the returned next_cursor as `cursor` for the following page;
+    `skip` is still honoured when no cursor is given.
+    """
     query = db.query(Group)
 
     if search:
@@ -40,8 +48,18 @@ async def list_groups(
     if is_active is not None:
         query = query.filter(Group.is_active == is_active)
 
-    total = query.count()
-    groups = query.order_by(Group.name).offset(skip).limit(limit).all()
+    total = count_rows(db, query, count)
+
+    # Groups are listed alphabetically; id breaks ties for a stable cursor
+    groups, next_cursor = keyset_paginate(
+        query,
+        columns=[Group.name, Group.id],
+        key=lambda g: (g.name, g.id),
+        limit=limit,
+        cursor=cursor,
+        offset=skip,
+        descending=False
+    )
 
     # Add member counts
     items = []
@@ -56,7 +74,7 @@ async def list_groups(
             member_count=len(group.members)
         ))
 
-    return GroupListResponse(total=total, items=items)
+    return GroupListResponse(total=total, items=items, next_cursor=next_cursor)
 
 
 @router.post("", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
@@ -21,7 +21,8 @@ import threading
 
 from ..core.database import get_db
 from ..core.config import settings
-from ..models import Project, MediaAsset, User, AuditLog
+from ..core.response_cache import invalidate_public_cache, TAG_MEDIA
+from ..models import Project, MediaAsset, User
 from ..schemas import (
     MediaUploadUrlRequest,
     MediaUploadUrlResponse,
@@ -29,6 +30,7 @@ from ..schemas import (
     GeotaggedMediaResponse
 )
 from ..api.auth import get_current_user, require_role
+from ..services.audit_writer import record_audit
 from ..services.thumbnail_service import (
     generate_and_store_thumbnail,
     get_thumbnail,
@@ -276,8 +278,8 @@ async def request_upload_url(
     db.add(new_media)
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="REQUEST_MEDIA_UPLOAD",
         entity_type="media_asset",
@@ -286,12 +288,11 @@ async def request_upload_url(
             "project_id": str(request.project_id),
             "media_type": request.media_type,
             "storage_key": storage_key
-        },
-        created_at=datetime.utcnow()
+        }
     )
-    db.add(audit_entry)
 
     db.commit()
+    invalidate_public_cache(TAG_MEDIA)
 
     return MediaUploadUrlResponse(
         upload_url=presigned_url,
@@ -432,8 +433,8 @@ async def confirm_upload(
         )
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="CONFIRM_MEDIA_UPLOAD",
         entity_type="media_asset",
@@ -441,12 +442,11 @@ async def confirm_upload(
         payload={
             "storage_key": media.storage_key,
             "file_size": media.file_size
-        },
-        created_at=datetime.utcnow()
+        }
     )
-    db.add(audit_entry)
 
     db.commit()
+    invalidate_public_cache(TAG_MEDIA)
     db.refresh(media)
 
     # Generate download URL
@@ -654,8 +654,8 @@ async def delete_media_asset(
         print(f"Warning: Failed to delete from S3: {e}")
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="DELETE_MEDIA_ASSET",
         entity_type="media_asset",
@@ -664,14 +664,13 @@ async def delete_media_asset(
             "project_id": str(media.project_id),
             "storage_key": media.storage_key,
             "media_type": media.media_type
-        },
-        created_at=datetime.utcnow()
+        }
     )
-    db.add(audit_entry)
 
     # Delete from database
     db.delete(media)
     db.commit()
+    invalidate_public_cache(TAG_MEDIA)
 
     return None
 
@@ -911,5 +910,6 @@ async def generate_all_thumbnails(
                 results["errors"].append(f"S3 error for {photo.storage_key}: {str(e)}")
 
     db.commit()
+    invalidate_public_cache(TAG_MEDIA)
 
     return results
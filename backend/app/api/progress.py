@@ -3,23 +3,27 @@ Progress API Endpoints
 Append-only progress reporting with hash chaining
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from typing import List
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 import uuid
 
 from ..core.database import get_db
-from ..models import Project, ProjectProgressLog, User, AuditLog
+from ..models import Project, ProjectProgressLog, User
 from ..schemas import (
     ProgressLogCreate,
     ProgressLogResponse,
     ProgressVerificationResponse
 )
 from ..api.auth import get_current_user, require_role
-from ..core.security import calculate_progress_hash, verify_progress_chain
+from ..core.security import calculate_progress_hash
+from ..core.response_cache import invalidate_public_cache, TAG_PROGRESS
+from ..services.progress_chain import CHAIN_ORDER, verify_project_chain
+from ..services.audit_writer import record_audit
 
 router = APIRouter()
 
@@ -75,14 +79,18 @@ async def log_progress(
     # Get latest progress log for hash chain
     latest_log = db.query(ProjectProgressLog).filter(
         ProjectProgressLog.project_id == project_id
-    ).order_by(ProjectProgressLog.created_at.desc()).first()
+    ).order_by(*[column.desc() for column in CHAIN_ORDER]).first()
 
     prev_hash = latest_log.record_hash if latest_log else None
 
+    # Hash the value as the NUMERIC(5,2) column will store it, so the entry
+    # verifies when read back (and passes the insert trigger, migration 010)
+    reported_percent = Decimal(str(progress.reported_percent)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
     # Calculate hash for this entry
     record_hash = calculate_progress_hash(
         project_id=str(project_id),
-        reported_percent=float(progress.reported_percent),
+        reported_percent=float(reported_percent),
         report_date=str(progress.report_date),
         reported_by=str(current_user.user_id),
         prev_hash=prev_hash
@@ -93,7 +101,7 @@ async def log_progress(
     new_log = ProjectProgressLog(
         progress_id=progress_id,
         project_id=project_id,
-        reported_percent=progress.reported_percent,
+        reported_percent=reported_percent,
         report_date=progress.report_date,
         remarks=progress.remarks,
         reported_by=current_user.user_id,
@@ -105,24 +113,23 @@ async def log_progress(
     db.add(new_log)
 
     # Create audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="LOG_PROGRESS",
         entity_type="progress_log",
         entity_id=progress_id,
         payload={
             "project_id": str(project_id),
-            "reported_percent": float(progress.reported_percent),
+            "reported_percent": float(reported_percent),
             "report_date": str(progress.report_date),
             "prev_hash": prev_hash,
             "record_hash": record_hash
-        },
-        created_at=datetime.utcnow()
+        }
     )
-    db.add(audit_entry)
 
     db.commit()
+    invalidate_public_cache(TAG_PROGRESS)
     db.refresh(new_log)
 
     return ProgressLogResponse(
@@ -150,7 +157,8 @@ async def get_progress_history(
     Get progress history for a project.
 
     Returns all progress log entries ordered chronologically.
-    Includes hash validation status for each entry.
+    Includes hash validation status for each entry; only entries appended
+    since the project's verification checkpoint are re-hashed.
     """
     # Verify project exists and user has access
     project = db.query(Project).filter(Project.project_id == project_id).first()
@@ -168,47 +176,36 @@ async def get_progress_history(
             detail="Access denied to this project"
         )
 
-    # Get all progress logs
-    logs = db.query(ProjectProgressLog).filter(
+    # Get all progress logs with reporter names
+    rows = db.query(ProjectProgressLog, User.username).outerjoin(
+        User, User.user_id == ProjectProgressLog.reported_by
+    ).filter(
         ProjectProgressLog.project_id == project_id
-    ).order_by(ProjectProgressLog.created_at.asc()).all()
-
-    # Verify hash chain and enrich with reporter names
-    prev_hash = None
-    results = []
-
-    for log in logs:
-        # Recalculate expected hash
-        expected_hash = calculate_progress_hash(
-            project_id=str(log.project_id),
-            reported_percent=float(log.reported_percent),
-            report_date=str(log.report_date),
-            reported_by=str(log.reported_by),
-            prev_hash=prev_hash
-        )
-
-        # Check if hash is valid
-        hash_valid = (expected_hash == log.record_hash and log.prev_hash == prev_hash)
+    ).order_by(*CHAIN_ORDER).all()
+    logs = [log for log, _ in rows]
 
-        # Get reporter name
-        reporter = db.query(User).filter(User.user_id == log.reported_by).first()
-        reporter_name = reporter.username if reporter else "Unknown"
+    # Verify hash chain from the last checkpoint
+    chain = verify_project_chain(db, project_id, logs=logs)
 
-        results.append(ProgressLogResponse(
+    results = [
+        ProgressLogResponse(
             progress_id=log.progress_id,
             project_id=log.project_id,
             reported_percent=float(log.reported_percent),
             report_date=log.report_date,
             remarks=log.remarks,
             reported_by=log.reported_by,
-            reporter_name=reporter_name,
+            reporter_name=reporter_name or "Unknown",
             created_at=log.created_at,
             prev_hash=log.prev_hash,
             record_hash=log.record_hash,
-            hash_valid=hash_valid
-        ))
+            hash_valid=chain.entry_valid(log.progress_id)
+        )
+        for log, reporter_name in rows
+    ]
 
-        prev_hash = log.record_hash
+    # Persist the advanced checkpoint
+    db.commit()
 
     return results
 
@@ -216,13 +213,15 @@ async def get_progress_history(
 @router.get("/projects/{project_id}/progress/verify", response_model=ProgressVerificationResponse)
 async def verify_chain(
     project_id: UUID,
+    full: bool = Query(False, description="Re-verify from genesis instead of the last checkpoint"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Verify integrity of progress log hash chain.
 
-    Recalculates all hashes and checks for tampering.
+    Recalculates hashes and checks for tampering. Entries up to the
+    project's verification checkpoint are not re-hashed unless full=true.
     Returns list of broken links if chain is invalid.
 
     This endpoint is critical for audit purposes.
@@ -236,27 +235,15 @@ async def verify_chain(
             detail="Project not found"
         )
 
-    # Get all progress logs
-    logs = db.query(ProjectProgressLog).filter(
-        ProjectProgressLog.project_id == project_id
-    ).order_by(ProjectProgressLog.created_at.asc()).all()
-
-    if not logs:
-        return ProgressVerificationResponse(
-            project_id=project_id,
-            total_logs=0,
-            chain_valid=True,
-            broken_links=[]
-        )
-
     # Verify hash chain
-    chain_valid, broken_links = verify_progress_chain(logs)
+    chain = verify_project_chain(db, project_id, full=full)
+    db.commit()
 
     return ProgressVerificationResponse(
         project_id=project_id,
-        total_logs=len(logs),
-        chain_valid=chain_valid,
-        broken_links=broken_links
+        total_logs=chain.total_logs,
+        chain_valid=chain.chain_valid,
+        broken_links=chain.broken_links
     )
 
 
@@ -280,12 +267,14 @@ async def get_latest_progress(
             detail="Project not found"
         )
 
-    # Get latest log
-    latest_log = db.query(ProjectProgressLog).filter(
+    # Get latest log with its reporter
+    latest = db.query(ProjectProgressLog, User.username).outerjoin(
+        User, User.user_id == ProjectProgressLog.reported_by
+    ).filter(
         ProjectProgressLog.project_id == project_id
-    ).order_by(ProjectProgressLog.created_at.desc()).first()
+    ).order_by(*[column.desc() for column in CHAIN_ORDER]).first()
 
-    if not latest_log:
+    if not latest:
         return {
             "project_id": str(project_id),
             "current_progress": 0.0,
@@ -293,13 +282,12 @@ async def get_latest_progress(
             "remarks": None
         }
 
-    # Get reporter name
-    reporter = db.query(User).filter(User.user_id == latest_log.reported_by).first()
+    latest_log, reporter_name = latest
 
     return {
         "project_id": str(project_id),
         "current_progress": float(latest_log.reported_percent),
         "last_updated": latest_log.report_date,
         "remarks": latest_log.remarks,
-        "reported_by": reporter.username if reporter else "Unknown"
+        "reported_by": reporter_name or "Unknown"
     }
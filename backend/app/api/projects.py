@@ -5,15 +5,23 @@ CRUD operations for infrastructure projects
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import Optional
+from sqlalchemy import cast, func, and_
+from geoalchemy2 import Geography
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
 from ..core.database import get_db
 from ..core.config import settings
-from ..models import Project, DEO, ProjectProgressLog, User, AuditLog, MediaAsset
-from ..schemas import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse
+from ..core.pagination import COUNT_MODES, count_rows, keyset_paginate
+from ..core.response_cache import invalidate_public_cache, TAG_PROJECTS, TAG_MEDIA
+from ..models import (
+    Project, DEO, ProjectGeometrySummary, ProjectLatestProgress, ProjectProgressLog, User, MediaAsset
+)
+from ..schemas import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse, NearbyProjectResponse
+from ..services.search_service import apply_project_search, clear_suggest_cache
+from ..services.facet_service import clear_facet_cache
+from ..services.audit_writer import record_audit
 from ..api.auth import get_current_user, require_role
 import uuid
 import boto3
@@ -46,6 +54,8 @@ async def list_projects(
     project_scale: Optional[str] = None,
     limit: int = Query(default=50, le=500),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    count: str = Query(default="exact", pattern=COUNT_MODES),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -56,13 +66,15 @@ async def list_projects(
     - deo_id: Filter by DEO
     - fund_year: Filter by year
     - status: Filter by status
-    - search: Search in title and location
+    - search: Full-text/fuzzy search in title and location (results ordered by relevance)
     - province: Filter by province (via DEO)
     - fund_source: Filter by fund source
     - mode_of_implementation: Filter by implementation mode
     - project_scale: Filter by project scale
     - limit: Max results (default 50, max 500)
-    - offset: Pagination offset
+    - offset: Pagination offset (legacy; ignored when cursor is given)
+    - cursor: Opaque token from a previous page's next_cursor
+    - count: Total count mode - exact, estimated (planner statistics) or none
     """
     query = db.query(Project).join(DEO)
 
@@ -97,20 +109,34 @@ async def list_projects(
     if project_scale is not None:
         query = query.filter(Project.project_scale == project_scale)
 
+    rank = None
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                Project.project_title.ilike(search_pattern),
-                Project.location.ilike(search_pattern)
-            )
-        )
+        query, rank = apply_project_search(query, search)
 
     # Get total count
-    total = query.count()
-
-    # Get paginated results
-    projects = query.offset(offset).limit(limit).all()
+    total = count_rows(db, query, count)
+
+    if rank is not None:
+        # Most relevant first, project_id as tie-breaker
+        ranked, next_cursor = keyset_paginate(
+            query.add_columns(rank),
+            columns=[rank, Project.project_id],
+            key=lambda row: (row[1], row[0].project_id),
+            limit=limit,
+            cursor=cursor,
+            offset=offset
+        )
+        projects = [row[0] for row in ranked]
+    else:
+        # Newest first with project_id as tie-breaker
+        projects, next_cursor = keyset_paginate(
+            query,
+            columns=[Project.created_at, Project.project_id],
+            key=lambda p: (p.created_at, p.project_id),
+            limit=limit,
+            cursor=cursor,
+            offset=offset
+        )
 
     # Enrich with current progress and DEO name
     items = []
@@ -140,7 +166,89 @@ async def list_projects(
 
         items.append(ProjectResponse(**project_dict))
 
-    return {"total": total, "items": items}
+    return {"total": total, "items": items, "next_cursor": next_cursor}
+
+
+@router.get("/nearby", response_model=List[NearbyProjectResponse])
+async def list_nearby_projects(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(default=5000, gt=0, le=100000),
+    limit: int = Query(default=20, ge=1, le=100),
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Projects nearest to a location, closest first (for field staff on site).
+
+    Distances are geodesic, in meters, to the extent of each project's GIS
+    features (0 when standing inside it); projects whose extents contain
+    the location are ordered by distance to their centroid. Projects
+    without GIS features are not listed.
+
+    The search is a KNN scan of the per-project geometry summary
+    (migration 020), so it does not read the features themselves.
+
+    Query parameters:
+    - latitude, longitude: The location (WGS 84)
+    - radius_m: Search radius in meters (default 5 km, max 100 km)
+    - limit: Max results (default 20, max 100)
+    - status: Filter by status
+    """
+    here = cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography)
+    footprint = cast(ProjectGeometrySummary.bbox, Geography)
+    centroid = cast(ProjectGeometrySummary.centroid, Geography)
+
+    query = db.query(
+        Project,
+        DEO.deo_name,
+        ProjectGeometrySummary.feature_count,
+        func.ST_Y(ProjectGeometrySummary.centroid).label("centroid_latitude"),
+        func.ST_X(ProjectGeometrySummary.centroid).label("centroid_longitude"),
+        func.ST_Distance(footprint, here).label("distance_m"),
+        ProjectLatestProgress.reported_percent
+    ).join(
+        ProjectGeometrySummary, ProjectGeometrySummary.project_id == Project.project_id
+    ).join(DEO).outerjoin(
+        ProjectLatestProgress, ProjectLatestProgress.project_id == Project.project_id
+    ).filter(func.ST_DWithin(footprint, here, radius_m))
+
+    # Same visibility rules as the project list
+    if current_user.role == "regional_admin":
+        query = query.filter(DEO.region == current_user.region)
+    elif current_user.role == "public":
+        query = query.filter(Project.status.not_in(['deleted', 'cancelled']))
+
+    if status is not None:
+        query = query.filter(Project.status == status)
+
+    rows = query.order_by(footprint.op("<->")(here), centroid.op("<->")(here)).limit(limit).all()
+
+    return [
+        NearbyProjectResponse(
+            project_id=project.project_id,
+            deo_id=project.deo_id,
+            deo_name=deo_name,
+            project_title=project.project_title,
+            location=project.location,
+            fund_source=project.fund_source,
+            mode_of_implementation=project.mode_of_implementation,
+            project_cost=float(project.project_cost) if project.project_cost else 0.0,
+            project_scale=project.project_scale,
+            fund_year=project.fund_year,
+            status=project.status,
+            created_at=project.created_at,
+            created_by=project.created_by,
+            updated_at=project.updated_at,
+            current_progress=float(progress) if progress is not None else 0.0,
+            distance_m=round(float(distance_m), 1),
+            centroid_latitude=centroid_latitude,
+            centroid_longitude=centroid_longitude,
+            feature_count=feature_count
+        )
+        for project, deo_name, feature_count, centroid_latitude, centroid_longitude, distance_m, progress in rows
+    ]
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -247,18 +355,19 @@ async def create_project(
     db.add(new_project)
 
     # Create audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="CREATE_PROJECT",
         entity_type="project",
         entity_id=new_project.project_id,
-        payload=project.dict(),
-        created_at=datetime.utcnow()
+        payload=project.dict()
     )
-    db.add(audit_entry)
 
     db.commit()
+    clear_suggest_cache()
+    clear_facet_cache()
+    invalidate_public_cache(TAG_PROJECTS)
     db.refresh(new_project)
 
     return ProjectResponse(
@@ -320,18 +429,19 @@ async def update_project(
     project.updated_at = datetime.utcnow()
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="UPDATE_PROJECT",
         entity_type="project",
         entity_id=project_id,
-        payload=update_data,
-        created_at=datetime.utcnow()
+        payload=update_data
     )
-    db.add(audit_entry)
 
     db.commit()
+    clear_suggest_cache()
+    clear_facet_cache()
+    invalidate_public_cache(TAG_PROJECTS)
     db.refresh(project)
 
     # Get current progress
@@ -382,18 +492,19 @@ async def delete_project(
     project.updated_at = datetime.utcnow()
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="DELETE_PROJECT",
         entity_type="project",
         entity_id=project_id,
-        payload={"soft_delete": True},
-        created_at=datetime.utcnow()
+        payload={"soft_delete": True}
     )
-    db.add(audit_entry)
 
     db.commit()
+    clear_suggest_cache()
+    clear_facet_cache()
+    invalidate_public_cache(TAG_PROJECTS)
 
     return None
 
@@ -498,8 +609,8 @@ async def register_project_media(
     db.add(new_media)
 
     # Audit log
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=current_user.user_id,
         action="REGISTER_MOBILE_MEDIA",
         entity_type="media_asset",
@@ -508,12 +619,11 @@ async def register_project_media(
             "project_id": str(project_id),
             "media_type": media_type,
             "storage_key": media_key
-        },
-        created_at=datetime.utcnow()
+        }
     )
-    db.add(audit_entry)
 
     db.commit()
+    invalidate_public_cache(TAG_MEDIA)
     db.refresh(new_media)
 
     # Generate download URL
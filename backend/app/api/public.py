@@ -16,14 +16,25 @@ import threading
 import json
 
 from ..core.database import get_db
-from ..models import Project, DEO, GISFeature, ProjectProgressLog, MediaAsset
+from ..core.pagination import COUNT_MODES, count_rows, keyset_paginate
+from ..core.response_cache import (
+    CachedRoute, cache_response, TAG_PROJECTS, TAG_PROGRESS, TAG_GIS, TAG_MEDIA
+)
+from ..models import Project, DEO, GISFeature, ProjectGeometrySummary, ProjectProgressLog, MediaAsset
 from ..schemas import PublicProjectResponse, PublicStatsResponse
+from ..services.search_service import apply_project_search, suggest_projects
+from ..services.public_stats_service import get_public_stats_snapshot, get_deo_project_counts
+from ..services.facet_service import compute_facets
+from ..services.merkle_service import MerkleService
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 limiter = Limiter(key_func=get_remote_address)
 
+# geometry_wkt detail levels of the public project list
+GEOMETRY_DETAILS = r'^(none|thumbnail|outline|full)$'
+
 # =============================================================================
 # IP-Based Download Quota System for Public Endpoints
 # Prevents abuse from unauthenticated users
@@ -173,7 +184,25 @@ async def get_public_quota_status(request: Request):
     }
 
 
+def _project_geometries(db: Session, project_ids: List[UUID], detail: str) -> Dict[UUID, str]:
+    """WKT of each project's collected GIS features, in one query for the page"""
+    if detail == "none" or not project_ids:
+        return {}
+    if detail == "full":
+        rows = db.query(
+            GISFeature.project_id, func.ST_AsText(func.ST_Collect(GISFeature.geometry))
+        ).filter(GISFeature.project_id.in_(project_ids)).group_by(GISFeature.project_id)
+    else:
+        # Precomputed by triggers on gis_features (migrations 020-021)
+        outline = ProjectGeometrySummary.outline if detail == "outline" else ProjectGeometrySummary.outline_thumbnail
+        rows = db.query(
+            ProjectGeometrySummary.project_id, func.ST_AsText(outline)
+        ).filter(ProjectGeometrySummary.project_id.in_(project_ids))
+    return {project_id: wkt for project_id, wkt in rows}
+
+
 @router.get("/projects", response_model=dict)
+@cache_response(TAG_PROJECTS, TAG_PROGRESS, TAG_GIS, limiter=limiter)
 @limiter.limit("60/minute")
 async def get_public_projects(
     request: Request,
@@ -187,6 +216,9 @@ async def get_public_projects(
     project_scale: Optional[str] = None,
     limit: int = Query(default=50, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    count: str = Query(default="exact", pattern=COUNT_MODES),
+    geometry: str = Query(default="outline", pattern=GEOMETRY_DETAILS),
     db: Session = Depends(get_db)
 ):
     """
@@ -199,13 +231,18 @@ async def get_public_projects(
     - deo_id: Filter by DEO
     - fund_year: Filter by funding year
     - status: Filter by status (excludes 'deleted')
-    - search: Text search in project title or location
+    - search: Full-text/fuzzy search in project title or location (ordered by relevance)
     - province: Filter by province (via DEO)
     - fund_source: Filter by fund source
     - mode_of_implementation: Filter by mode of implementation
     - project_scale: Filter by project scale
     - limit: Max results (default 50, max 200)
-    - offset: Pagination offset
+    - offset: Pagination offset (legacy; ignored when cursor is given)
+    - cursor: Opaque token from a previous page's next_cursor
+    - count: Total count mode - exact, estimated (planner statistics) or none
+    - geometry: geometry_wkt of each project's GIS features - outline (default;
+      simplified to ~1 m, as drawn on maps), thumbnail (~20 m), full
+      (unsimplified) or none
     """
     # Simple base query - just projects with DEO join
     query = db.query(Project, DEO.deo_name).join(
@@ -224,12 +261,9 @@ async def get_public_projects(
     if status:
         query = query.filter(Project.status == status)
 
+    rank = None
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Project.project_title.ilike(search_term)) |
-            (Project.location.ilike(search_term))
-        )
+        query, rank = apply_project_search(query, search)
 
     if province:
         query = query.filter(DEO.province == province)
@@ -244,12 +278,32 @@ async def get_public_projects(
         query = query.filter(Project.project_scale == project_scale)
 
     # Get total count (simpler query without complex subquery)
-    total = query.count()
-
-    # Get paginated results
-    results = query.order_by(Project.created_at.desc()).offset(offset).limit(limit).all()
+    total = count_rows(db, query, count)
+
+    if rank is not None:
+        # Most relevant first, project_id as tie-breaker
+        ranked, next_cursor = keyset_paginate(
+            query.add_columns(rank),
+            columns=[rank, Project.project_id],
+            key=lambda row: (row[2], row[0].project_id),
+            limit=limit,
+            cursor=cursor,
+            offset=offset
+        )
+        results = [(row[0], row[1]) for row in ranked]
+    else:
+        # Newest first with project_id as tie-breaker
+        results, next_cursor = keyset_paginate(
+            query,
+            columns=[Project.created_at, Project.project_id],
+            key=lambda row: (row[0].created_at, row[0].project_id),
+            limit=limit,
+            cursor=cursor,
+            offset=offset
+        )
 
     # Format response
+    geometries = _project_geometries(db, [project.project_id for project, _ in results], geometry)
     projects = []
     for project, deo_name in results:
         # Get latest progress log
@@ -259,21 +313,6 @@ async def get_public_projects(
 
         current_progress = float(latest_log.reported_percent) if latest_log else 0.0
 
-        # Get all GIS feature geometries combined as WKT
-        geometry_wkt = None
-        try:
-            # Use ST_Collect to combine all geometries for this project
-            wkt_result = db.query(
-                func.ST_AsText(func.ST_Collect(GISFeature.geometry))
-            ).filter(
-                GISFeature.project_id == project.project_id
-            ).scalar()
-            if wkt_result:
-                geometry_wkt = wkt_result
-        except Exception:
-            # Geometry query failed, leave as None
-            pass
-
         projects.append({
             "project_id": str(project.project_id),
             "project_title": project.project_title,
@@ -286,18 +325,41 @@ async def get_public_projects(
             "deo_name": deo_name,
             "current_progress": current_progress,
             "last_updated": latest_log.report_date if latest_log else None,
-            "geometry_wkt": geometry_wkt
+            "geometry_wkt": geometries.get(project.project_id)
         })
 
     return {
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
         "items": projects
     }
 
 
+@router.get("/search/suggest")
+@cache_response(TAG_PROJECTS, limiter=limiter)
+@limiter.limit("120/minute")
+async def get_search_suggestions(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(default=8, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """
+    Autocomplete suggestions for the portal search box (no authentication).
+
+    Tolerates typos and partial words, e.g. "cotabto" suggests "Cotabato".
+
+    Query parameters:
+    - q: Text typed so far (min 2 characters)
+    - limit: Max suggestions per kind (project titles, locations)
+    """
+    return {"query": q, "items": suggest_projects(db, q, limit)}
+
+
 @router.get("/projects/{project_id}")
+@cache_response(TAG_PROJECTS, TAG_PROGRESS, TAG_GIS, TAG_MEDIA, limiter=limiter)
 @limiter.limit("120/minute")
 async def get_public_project(
     request: Request,
@@ -347,10 +409,10 @@ async def get_public_project(
 
     media_summary = {media_type: count for media_type, count in media_counts}
 
-    # Get GIS feature count
-    gis_count = db.query(func.count(GISFeature.feature_id)).filter(
-        GISFeature.project_id == project_id
-    ).scalar()
+    # Get GIS feature count (from the trigger-maintained geometry summary)
+    gis_count = db.query(ProjectGeometrySummary.feature_count).filter(
+        ProjectGeometrySummary.project_id == project_id
+    ).scalar() or 0
 
     # Get current progress
     latest_log = progress_logs[-1] if progress_logs else None
@@ -376,6 +438,7 @@ async def get_public_project(
 
 
 @router.get("/map")
+@cache_response(TAG_PROJECTS, TAG_GIS, limiter=limiter)
 @limiter.limit("60/minute")
 async def get_public_map_features(
     request: Request,
@@ -476,81 +539,45 @@ async def get_public_map_features(
 
 
 @router.get("/stats", response_model=PublicStatsResponse)
+@cache_response(TAG_PROJECTS, TAG_PROGRESS)
 async def get_public_statistics(
     db: Session = Depends(get_db)
 ):
     """
     Get public statistics for dashboard.
 
+    Served from the public_stats snapshot, which triggers keep current as
+    projects and progress reports change.
+
     Returns aggregated statistics:
     - Total projects (excluding deleted)
     - Total project cost
     - Projects by province/DEO
     - Projects by status
-    - Average completion percentage
+    - Average completion percentage (latest report per project)
+    - generated_at: When the snapshot last changed
     """
-    # Total projects (excluding deleted)
-    total_projects = db.query(func.count(Project.project_id)).filter(
-        Project.status != 'deleted'
-    ).scalar()
-
-    # Total cost
-    total_cost = db.query(func.sum(Project.project_cost)).filter(
-        Project.status != 'deleted'
-    ).scalar() or 0.0
-
-    # Projects by DEO/province
-    by_province = {}
-    deo_stats = db.query(
-        DEO.deo_name,
-        func.count(Project.project_id).label('count')
-    ).join(
-        Project, DEO.deo_id == Project.deo_id
-    ).filter(
-        Project.status != 'deleted'
-    ).group_by(DEO.deo_name).all()
-
-    for deo_name, count in deo_stats:
-        by_province[deo_name] = count
+    snapshot = get_public_stats_snapshot(db)
 
-    # Projects by status
-    by_status = {}
-    status_stats = db.query(
-        Project.status,
-        func.count(Project.project_id).label('count')
-    ).filter(
-        Project.status != 'deleted'
-    ).group_by(Project.status).all()
-
-    for status, count in status_stats:
-        by_status[status] = count
-
-    # Average completion (from latest progress logs)
-    avg_completion_query = db.query(
-        func.avg(
-            db.query(ProjectProgressLog.reported_percent)
-            .filter(ProjectProgressLog.project_id == Project.project_id)
-            .order_by(ProjectProgressLog.created_at.desc())
-            .limit(1)
-            .correlate(Project)
-            .scalar_subquery()
-        )
-    ).filter(
-        Project.status != 'deleted'
-    ).scalar()
-
-    avg_completion = float(avg_completion_query) if avg_completion_query else 0.0
+    deo_counts = snapshot.counts('deo')
+    by_province = {
+        deo["deo_name"]: deo["project_count"]
+        for deo in get_deo_project_counts(db, snapshot)
+        if str(deo["deo_id"]) in deo_counts
+    }
 
     return PublicStatsResponse(
-        total_projects=total_projects,
-        total_cost=float(total_cost),
+        total_projects=snapshot.total_projects,
+        total_cost=snapshot.total_cost,
         by_province=by_province,
-        by_status=by_status,
-        avg_completion=avg_completion
+        by_status=snapshot.counts('status'),
+        avg_completion=snapshot.avg_completion,
+        generated_at=snapshot.generated_at
     )
 
 
 @router.get("/filter-options")
+@cache_response(TAG_PROJECTS)
 async def get_filter_options(
     db: Session = Depends(get_db)
 ):
@@ -565,82 +592,74 @@ async def get_filter_options(
     - fund_sources: List of unique fund sources
     - modes_of_implementation: List of unique implementation modes
     - project_scales: List of unique project scales
+    - generated_at: When the statistics snapshot last changed
     """
-    # Get DEOs with project counts
-    deos = db.query(
-        DEO.deo_id,
-        DEO.deo_name,
-        DEO.province,
-        func.count(Project.project_id).label('project_count')
-    ).outerjoin(
-        Project,
-        and_(
-            DEO.deo_id == Project.deo_id,
-            Project.status != 'deleted'
-        )
-    ).group_by(
-        DEO.deo_id,
-        DEO.deo_name,
-        DEO.province
-    ).all()
+    snapshot = get_public_stats_snapshot(db)
+    deos_list = get_deo_project_counts(db, snapshot)
 
-    deos_list = [{
-        "deo_id": deo_id,
-        "deo_name": deo_name,
-        "province": province,
-        "project_count": project_count
-    } for deo_id, deo_name, province, project_count in deos]
-
-    # Get unique provinces
-    provinces = db.query(DEO.province).distinct().order_by(DEO.province).all()
-    provinces_list = [p[0] for p in provinces if p[0]]
+    provinces_list = sorted({deo["province"] for deo in deos_list if deo["province"]})
 
     # Valid statuses (excluding deleted and cancelled for public)
     statuses = ['planning', 'ongoing', 'completed', 'suspended']
 
-    # Get unique fund years from projects
-    fund_years = db.query(Project.fund_year).filter(
-        Project.status != 'deleted',
-        Project.fund_year.isnot(None)
-    ).distinct().order_by(Project.fund_year.desc()).all()
-    fund_years_list = [y[0] for y in fund_years if y[0]]
-
-    # Get unique fund sources
-    fund_sources = db.query(Project.fund_source).filter(
-        Project.status != 'deleted',
-        Project.fund_source.isnot(None),
-        Project.fund_source != ''
-    ).distinct().order_by(Project.fund_source).all()
-    fund_sources_list = [f[0] for f in fund_sources if f[0]]
-
-    # Get unique modes of implementation
-    modes = db.query(Project.mode_of_implementation).filter(
-        Project.status != 'deleted',
-        Project.mode_of_implementation.isnot(None),
-        Project.mode_of_implementation != ''
-    ).distinct().order_by(Project.mode_of_implementation).all()
-    modes_list = [m[0] for m in modes if m[0]]
-
-    # Get unique project scales
-    scales = db.query(Project.project_scale).filter(
-        Project.status != 'deleted',
-        Project.project_scale.isnot(None),
-        Project.project_scale != ''
-    ).distinct().order_by(Project.project_scale).all()
-    scales_list = [s[0] for s in scales if s[0]]
+    fund_years_list = sorted(
+        (int(year) for year in snapshot.counts('fund_year')),
+        reverse=True
+    )
 
     return {
         "deos": deos_list,
         "provinces": provinces_list,
         "statuses": statuses,
         "fund_years": fund_years_list,
-        "fund_sources": fund_sources_list,
-        "modes_of_implementation": modes_list,
-        "project_scales": scales_list
+        "fund_sources": sorted(snapshot.counts('fund_source')),
+        "modes_of_implementation": sorted(snapshot.counts('mode_of_implementation')),
+        "project_scales": sorted(snapshot.counts('project_scale')),
+        "generated_at": snapshot.generated_at
+    }
+
+
+@router.get("/facets")
+@cache_response(TAG_PROJECTS, limiter=limiter)
+@limiter.limit("60/minute")
+async def get_project_facets(
+    request: Request,
+    deo_id: Optional[int] = None,
+    fund_year: Optional[int] = None,
+    status: Optional[str] = Query(None, regex=r'^(planning|ongoing|completed|suspended)$'),
+    search: Optional[str] = None,
+    province: Optional[str] = None,
+    fund_source: Optional[str] = None,
+    mode_of_implementation: Optional[str] = None,
+    project_scale: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get filter facets with counts for the current filter state.
+
+    Accepts the same filters as /projects. Each facet lists its values with
+    the number of matching projects under all other active filters, so one
+    request refreshes the whole filter sidebar.
+
+    Returns:
+    - total: Projects matching all filters
+    - facets: {province, deo_id, status, fund_year, fund_source,
+      mode_of_implementation, project_scale} -> [{value, count}]
+    """
+    filters = {
+        "deo_id": deo_id,
+        "fund_year": fund_year,
+        "status": status,
+        "province": province,
+        "fund_source": fund_source,
+        "mode_of_implementation": mode_of_implementation,
+        "project_scale": project_scale,
     }
+    return compute_facets(db, filters, search)
 
 
 @router.get("/deos")
+@cache_response(TAG_PROJECTS)
 async def get_public_deos(
     db: Session = Depends(get_db)
 ):
@@ -649,34 +668,16 @@ async def get_public_deos(
 
     Returns all DEOs with their project counts (excluding deleted projects).
     """
-    deos = db.query(
-        DEO.deo_id,
-        DEO.deo_name,
-        DEO.province,
-        func.count(Project.project_id).label('project_count')
-    ).outerjoin(
-        Project,
-        and_(
-            DEO.deo_id == Project.deo_id,
-            Project.status != 'deleted'
-        )
-    ).group_by(
-        DEO.deo_id,
-        DEO.deo_name,
-        DEO.province
-    ).all()
+    snapshot = get_public_stats_snapshot(db)
 
     return {
-        "deos": [{
-            "deo_id": deo_id,
-            "deo_name": deo_name,
-            "province": province,
-            "project_count": project_count
-        } for deo_id, deo_name, province, project_count in deos]
+        "deos": get_deo_project_counts(db, snapshot),
+        "generated_at": snapshot.generated_at
     }
 
 
 @router.get("/geotagged-media")
+@cache_response(TAG_PROJECTS, TAG_MEDIA)
 async def get_public_geotagged_media(
     project_id: Optional[UUID] = Query(None, description="Filter by project ID"),
     limit: int = Query(default=100, le=500),
@@ -883,17 +884,50 @@ async def get_public_media_file(
         )
 
 
+@router.get("/progress/{progress_id}/proof")
+@cache_response(TAG_PROGRESS, limiter=limiter)
+@limiter.limit("60/minute")
+async def get_public_progress_proof(
+    request: Request,
+    progress_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    Merkle inclusion proof for a progress report (no authentication).
+
+    Lets anyone check that a published progress entry is covered by the
+    anchored daily root without downloading the project's history.
+    """
+    published = db.query(ProjectProgressLog.progress_id).join(
+        Project, ProjectProgressLog.project_id == Project.project_id
+    ).filter(
+        ProjectProgressLog.progress_id == progress_id,
+        Project.status != 'deleted'
+    ).first()
+
+    proof = MerkleService.get_inclusion_proof(db, "project_progress_logs", progress_id) if published else None
+    if not proof:
+        raise HTTPException(
+            status_code=404,
+            detail="Progress entry not found or not anchored yet"
+        )
+    return proof
+
+
 @router.get("/projects/{project_id}/media")
+@cache_response(TAG_PROJECTS, TAG_MEDIA)
 async def get_public_project_media(
     project_id: UUID,
     media_type: Optional[str] = Query(None, regex=r'^(photo|video|document)$'),
     limit: int = Query(default=50, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get all media assets for a project (public, no authentication).
 
     Returns list of media assets with download URLs for confirmed uploads.
+    Pass the returned next_cursor as `cursor` to fetch the following page.
     """
     from ..api.media import s3_client
     from ..core.config import settings
@@ -920,7 +954,13 @@ async def get_public_project_media(
     # Only return confirmed uploads
     query = query.filter(MediaAsset.attributes['status'].astext == 'confirmed')
 
-    media_assets = query.order_by(MediaAsset.uploaded_at.desc()).limit(limit).all()
+    media_assets, next_cursor = keyset_paginate(
+        query,
+        columns=[MediaAsset.uploaded_at, MediaAsset.media_id],
+        key=lambda m: (m.uploaded_at, m.media_id),
+        limit=limit,
+        cursor=cursor
+    )
 
     # Generate download URLs for each asset
     results = []
@@ -952,5 +992,6 @@ async def get_public_project_media(
 
     return {
         "items": results,
-        "total": len(results)
+        "total": len(results),
+        "next_cursor": next_cursor
     }
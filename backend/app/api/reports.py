@@ -9,13 +9,13 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
-import uuid
 
 from ..core.database import get_db
-from ..models import User, AuditLog
+from ..models import User
 from ..schemas import ReportResponse
 from ..api.auth import get_current_user
 from ..services.report_service import ReportService
+from ..services.audit_writer import record_audit
 
 router = APIRouter()
 
@@ -29,8 +29,8 @@ def _log_report_generation(
     filters: Optional[dict] = None
 ):
     """Create audit log entry for report generation."""
-    audit_entry = AuditLog(
-        audit_id=uuid.uuid4(),
+    record_audit(
+        db,
         actor_id=user.user_id,
         action="GENERATE_REPORT",
         entity_type="report",
@@ -41,9 +41,8 @@ def _log_report_generation(
             "project_id": str(project_id) if project_id else None,
             "filters": filters
         },
-        created_at=datetime.utcnow()
+        durable=False
     )
-    db.add(audit_entry)
     db.commit()
 
 
@@ -12,6 +12,7 @@ from uuid import UUID
 
 from ..core.database import get_db
 from ..core.security import get_password_hash, verify_password
+from ..core.pagination import COUNT_MODES, count_rows, keyset_paginate
 from ..models import User, Group, UserGroup
 from ..schemas import (
     UserResponse, UserAdminCreate, UserAdminUpdate, UserListResponse,
@@ -32,10 +33,17 @@ async def list_users(
     role: Optional[str] = None,
     is_active: Optional[bool] = None,
     include_deleted: bool = False,
+    cursor: Optional[str] = None,
+    count: str = Query(default="exact", pattern=COUNT_MODES),
     current_user: User = Depends(require_permission("users", "read")),
     db: Session = Depends(get_db)
 ):
-    """List users with filtering and pagination."""
+    """
+    List users with filtering and pagination.
+
+    Pass the returned next_cursor as `cursor` for the following page;
+    `skip` is still honoured when no cursor is given.
+    """
     query = db.query(User)
 
     # Exclude soft-deleted unless explicitly requested
@@ -59,10 +67,17 @@ async def list_users(
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
 
-    total = query.count()
-    users = query.order_by(User.created_at.desc()).offset(skip).limit(limit).all()
+    total = count_rows(db, query, count)
+    users, next_cursor = keyset_paginate(
+        query,
+        columns=[User.created_at, User.user_id],
+        key=lambda u: (u.created_at, u.user_id),
+        limit=limit,
+        cursor=cursor,
+        offset=skip
+    )
 
-    return UserListResponse(total=total, items=users)
+    return UserListResponse(total=total, items=users, next_cursor=next_cursor)
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
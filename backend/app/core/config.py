@@ -78,6 +78,30 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Public response cache (in-process LRU + Redis, see core/response_cache.py)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+
+    # Audit writer (see services/audit_writer.py)
+    # sync: audit rows are chained inside each request transaction
+    # async: requests commit outbox rows / queue events; a background writer chains them in batches
+    AUDIT_WRITER_MODE: str = "sync"
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 0.2
+    AUDIT_QUEUE_PUT_TIMEOUT_SECONDS: float = 0.05  # Block this long on a full queue, then spill to the outbox
+
+    # Audit log partitions (see services/audit_partitions.py)
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3  # Monthly partitions created ahead of time
+    AUDIT_RETENTION_MONTHS: int = 24  # Older partitions are archived to object storage and dropped
+    AUDIT_ARCHIVE_PREFIX: str = "audit-archive"
+
+    # Audit export (see services/audit_export.py)
+    AUDIT_EXPORT_CHUNK_ROWS: int = 5000  # Rows per server-side cursor fetch
+    AUDIT_EXPORT_STREAM_MAX_ROWS: int = 1000000  # Larger ranges must use a background export job
+    AUDIT_EXPORT_PREFIX: str = "audit-exports"
+
     # Monitoring
     ENABLE_METRICS: bool = True
     METRICS_PORT: int = 9090
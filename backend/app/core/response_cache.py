@@ -0,0 +1,361 @@
+"""
+Public Response Cache
+Shared cache for anonymous GET endpoints: in-process LRU in front of Redis,
+strong ETags with If-None-Match revalidation, tag-based invalidation and
+single-flight fills to avoid stampedes on expiry
+
+Redis is reached through the sync client, so serve() runs every Redis call
+in the threadpool rather than on the event loop.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from collections import defaultdict
+from urllib.parse import urlencode
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+import redis
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from slowapi import Limiter
+
+from .cache import TTLCache
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ebarmm:public-cache"
+
+# Invalidation tags emitted by write endpoints
+TAG_PROJECTS = "projects"
+TAG_PROGRESS = "progress"
+TAG_GIS = "gis"
+TAG_MEDIA = "media"
+ALL_TAGS = (TAG_PROJECTS, TAG_PROGRESS, TAG_GIS, TAG_MEDIA)
+
+# Seconds to wait before retrying Redis after a connection failure
+REDIS_RETRY_SECONDS = 30
+
+# How long a request waits for another process to fill the same entry
+FILL_WAIT_SECONDS = 2.0
+FILL_POLL_SECONDS = 0.05
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def cache_key(request: Request) -> str:
+    """Path plus query parameters sorted and with empty values dropped"""
+    params = sorted(
+        (name, value) for name, value in request.query_params.multi_items() if value != ''
+    )
+    return f"{request.url.path}?{urlencode(params)}"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    Two-level response cache with versioned tags.
+
+    Every tag has a version counter (in Redis when available, else in
+    process). Entries record the versions of their tags at the time the
+    response was computed; invalidating a tag bumps its counter, so any
+    entry computed before the write is treated as stale by every process.
+    """
+
+    def __init__(self, redis_url: Optional[str], maxsize: int, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._redis_retry_at = 0.0
+        self._local = TTLCache(maxsize, ttl_seconds)
+        self._local_versions: Dict[str, int] = defaultdict(int)
+        self._fill_locks: Dict[str, asyncio.Lock] = {}
+        self.metrics: Dict[str, int] = defaultdict(int)
+
+    # -------------------------------------------------------------------------
+    # Redis access (failures degrade to the in-process cache)
+    # -------------------------------------------------------------------------
+
+    def _client(self) -> Optional[redis.Redis]:
+        if not self._redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(
+                self._redis_url,
+                socket_timeout=0.25,
+                socket_connect_timeout=0.25
+            )
+        return self._redis
+
+    def _redis_failed(self, exc: Exception) -> None:
+        logger.warning(f"Response cache: Redis unavailable, using local cache only: {exc}")
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        self.metrics["redis_errors"] += 1
+
+    def _entry_key(self, key: str) -> str:
+        return f"{KEY_PREFIX}:entry:{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+
+    async def _off_loop(self, func: Callable, *args) -> Any:
+        """Run a Redis-backed method in the threadpool (inline when Redis is not in use)"""
+        if self._client() is None:
+            return func(*args)
+        return await run_in_threadpool(func, *args)
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entry from the local cache, else from Redis without blocking the event loop"""
+        entry = self._local.get(key)
+        if entry is not None:
+            return entry
+        return await self._off_loop(self._load, key)
+
+    # -------------------------------------------------------------------------
+    # Tags
+    # -------------------------------------------------------------------------
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Current version of each tag"""
+        tags = list(tags)
+        client = self._client()
+        if client is not None:
+            try:
+                values = client.mget([f"{KEY_PREFIX}:tag:{tag}" for tag in tags])
+                return {tag: int(value or 0) for tag, value in zip(tags, values)}
+            except redis.RedisError as exc:
+                self._redis_failed(exc)
+        return {tag: self._local_versions[tag] for tag in tags}
+
+    def invalidate(self, *tags: str) -> None:
+        """Mark every entry carrying any of the tags as stale"""
+        for tag in tags:
+            self._local_versions[tag] += 1
+        client = self._client()
+        if client is not None:
+            try:
+                pipe = client.pipeline()
+                for tag in tags:
+                    pipe.incr(f"{KEY_PREFIX}:tag:{tag}")
+                pipe.execute()
+            except redis.RedisError as exc:
+                self._redis_failed(exc)
+        self.metrics["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop local entries and invalidate everything shared"""
+        self._local.clear()
+        self.invalidate(*ALL_TAGS)
+
+    # -------------------------------------------------------------------------
+    # Entries
+    # -------------------------------------------------------------------------
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is not None:
+            return entry
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(self._entry_key(key))
+        except redis.RedisError as exc:
+            self._redis_failed(exc)
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        entry["body"] = entry["body"].encode("utf-8")
+        self._local.put(key, entry)
+        return entry
+
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        self._local.put(key, entry)
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.set(
+                self._entry_key(key),
+                json.dumps({**entry, "body": entry["body"].decode("utf-8")}),
+                ex=self.ttl_seconds
+            )
+        except redis.RedisError as exc:
+            self._redis_failed(exc)
+
+    def _acquire_fill(self, key: str) -> Tuple[bool, bool]:
+        """
+        Try to become the single process filling an entry.
+
+        Returns:
+            (acquired, shared) - shared is False when Redis is unavailable
+        """
+        client = self._client()
+        if client is None:
+            return True, False
+        try:
+            acquired = client.set(
+                f"{self._entry_key(key)}:fill", b"1", nx=True, px=int(FILL_WAIT_SECONDS * 1000)
+            )
+            return bool(acquired), True
+        except redis.RedisError as exc:
+            self._redis_failed(exc)
+            return True, False
+
+    def _release_fill(self, key: str) -> None:
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.delete(f"{self._entry_key(key)}:fill")
+        except redis.RedisError as exc:
+            self._redis_failed(exc)
+
+    async def _wait_for_fill(self, key: str, versions: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """Poll for an entry being filled by another process"""
+        deadline = time.monotonic() + FILL_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(FILL_POLL_SECONDS)
+            entry = await self._get(key)
+            if entry is not None and entry["versions"] == versions:
+                return entry
+        return None
+
+    # -------------------------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------------------------
+
+    def _respond(self, request: Request, entry: Dict[str, Any], state: str) -> Response:
+        headers = {"ETag": entry["etag"], "Cache-Control": CACHE_CONTROL, "X-Cache": state}
+        if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            self.metrics["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry["body"], media_type=entry["media_type"], headers=headers)
+
+    async def serve(
+        self,
+        request: Request,
+        tags: Tuple[str, ...],
+        handler: Callable[[Request], Any]
+    ) -> Response:
+        """Answer a request from cache, or run the handler once and cache its response"""
+        if request.method != "GET":
+            return await handler(request)
+
+        key = cache_key(request)
+        # Versions are read before computing so a write racing with the
+        # fill leaves the new entry already stale
+        versions = await self._off_loop(self.tag_versions, tags)
+
+        entry = await self._get(key)
+        if entry is not None and entry["versions"] == versions:
+            self.metrics["hits"] += 1
+            return self._respond(request, entry, "HIT")
+
+        lock = self._fill_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # A concurrent request in this process may have filled it
+                entry = await self._get(key)
+                if entry is not None and entry["versions"] == versions:
+                    self.metrics["hits"] += 1
+                    return self._respond(request, entry, "HIT")
+
+                acquired, shared = await self._off_loop(self._acquire_fill, key)
+                if not acquired:
+                    entry = await self._wait_for_fill(key, versions)
+                    if entry is not None:
+                        self.metrics["hits"] += 1
+                        return self._respond(request, entry, "HIT")
+
+                try:
+                    response = await handler(request)
+                finally:
+                    if acquired and shared:
+                        await self._off_loop(self._release_fill, key)
+        finally:
+            if not lock.locked():
+                self._fill_locks.pop(key, None)
+
+        self.metrics["misses"] += 1
+        body = getattr(response, "body", None)
+        media_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or body is None or not media_type.startswith("application/json"):
+            return response
+
+        entry = {
+            "body": bytes(body),
+            "media_type": media_type,
+            "etag": make_etag(body),
+            "versions": versions
+        }
+        await self._off_loop(self._store, key, entry)
+        return self._respond(request, entry, "MISS")
+
+
+response_cache = ResponseCache(
+    settings.REDIS_URL,
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+
+def cache_response(*tags: str, limiter: Optional[Limiter] = None):
+    """
+    Mark a GET endpoint as cacheable, invalidated by the given tags.
+
+    Only takes effect on routers created with route_class=CachedRoute.
+    Pass the limiter of an endpoint decorated with @limiter.limit: cached
+    responses are served without running the endpoint, so the route
+    checks the limit itself before the cache lookup.
+    """
+    def decorator(func):
+        func.__response_cache_tags__ = tags
+        func.__response_cache_limiter__ = limiter
+        return func
+    return decorator
+
+
+def invalidate_public_cache(*tags: str) -> None:
+    """Invalidate cached public responses after a committed write"""
+    response_cache.invalidate(*tags)
+
+
+class CachedRoute(APIRoute):
+    """Route class that serves endpoints marked with @cache_response from the cache"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tags = getattr(self.endpoint, "__response_cache_tags__", None)
+        if tags is None or not settings.RESPONSE_CACHE_ENABLED:
+            return handler
+        limiter = getattr(self.endpoint, "__response_cache_limiter__", None)
+        endpoint = self.endpoint
+
+        async def cached_handler(request: Request) -> Response:
+            if limiter is not None and limiter.enabled:
+                # Same check the @limiter.limit wrapper makes (raises
+                # RateLimitExceeded); marking it done stops a cache miss
+                # from counting the request twice
+                limiter._check_request_limit(request, endpoint, False)
+                request.state._rate_limiting_complete = True
+            return await response_cache.serve(request, tags, handler)
+
+        return cached_handler
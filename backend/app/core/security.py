@@ -160,19 +160,20 @@ def calculate_audit_hash(
     return hash_bytes.hex()
 
 
-def verify_progress_chain(logs: list) -> tuple[bool, list]:
+def verify_progress_chain(logs: list, prev_hash: Optional[str] = None) -> tuple[bool, list]:
     """
     Verify integrity of progress log hash chain.
 
     Args:
         logs: List of progress log entries (ordered chronologically)
+        prev_hash: record_hash of the entry preceding logs, when verifying
+            a continuation of an already verified chain (None from genesis)
 
     Returns:
         Tuple of (is_valid, broken_links)
         broken_links contains entries where hash doesn't match
     """
     broken_links = []
-    prev_hash = None
 
     for log in logs:
         # Recalculate expected hash
@@ -0,0 +1,4 @@
+"""
+Jobs Module
+Scheduled/batch entry points, run as `python -m app.jobs.<name>` (e.g. from cron)
+"""
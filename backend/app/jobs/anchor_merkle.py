@@ -0,0 +1,52 @@
+"""
+Merkle Anchoring Job
+Builds daily Merkle roots over audit_logs and project_progress_logs
+
+Usage (daily, after midnight UTC):
+    python -m app.jobs.anchor_merkle [--source audit_logs] [--until 2026-01-31]
+"""
+
+from datetime import date
+import argparse
+import logging
+
+from ..core.database import SessionLocal
+from ..services.merkle_service import MERKLE_SOURCES, MerkleService
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Anchor completed days of the append-only logs")
+    parser.add_argument(
+        "--source",
+        choices=["all", *MERKLE_SOURCES],
+        default="all",
+        help="Log table to anchor"
+    )
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=None,
+        help="Last day to anchor (default: yesterday, UTC)"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    sources = list(MERKLE_SOURCES) if args.source == "all" else [args.source]
+    db = SessionLocal()
+    try:
+        for source in sources:
+            anchors = MerkleService.anchor_pending(db, source, args.until)
+            logger.info(f"{source}: {len(anchors)} day(s) anchored")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
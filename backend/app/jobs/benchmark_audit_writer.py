@@ -0,0 +1,126 @@
+"""
+Audit Writer Benchmark
+Write-request latency with the audit chain appended in-request vs. by the buffered writer
+
+Each simulated request opens a session, does a little work inside its
+transaction, records one audit event and commits, like the mutating
+endpoints. Run against a development database: the benchmark appends
+entity_type='benchmark' rows to the (append-only) audit chain.
+
+Usage:
+    python -m app.jobs.benchmark_audit_writer [--concurrency 16] [--requests 200] [--work-ms 2]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import argparse
+import logging
+import statistics
+import time
+
+from sqlalchemy import text
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..services.audit_writer import audit_writer, record_audit
+
+logger = logging.getLogger(__name__)
+
+# (label, AUDIT_WRITER_MODE, durable)
+SCENARIOS = [
+    ("sync (chain in request)", "sync", True),
+    ("async, outbox (durable)", "async", True),
+    ("async, queue (best effort)", "async", False),
+]
+
+
+def _request(worker: int, i: int, work_ms: float, durable: bool) -> float:
+    """One simulated write request; returns its latency in milliseconds"""
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        record_audit(
+            db,
+            action="BENCHMARK_WRITE",
+            entity_type="benchmark",
+            payload={"worker": worker, "i": i},
+            durable=durable
+        )
+        db.flush()
+        # Request work that follows the audit entry inside the transaction
+        db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": work_ms / 1000})
+        db.commit()
+    finally:
+        db.close()
+    return (time.perf_counter() - started) * 1000
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(mode: str, durable: bool, concurrency: int, requests: int, work_ms: float) -> Dict[str, float]:
+    settings.AUDIT_WRITER_MODE = mode
+    if mode == "async":
+        audit_writer.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(
+            lambda n: _request(n % concurrency, n, work_ms, durable),
+            range(concurrency * requests)
+        ))
+    elapsed = time.perf_counter() - started
+
+    drain_started = time.perf_counter()
+    if mode == "async":
+        audit_writer.stop()
+        audit_writer.flush()
+    drain = time.perf_counter() - drain_started
+
+    return {
+        "requests": len(latencies),
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "requests_per_second": len(latencies) / elapsed,
+        "drain_seconds": drain,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark write-request latency per audit writer mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent simulated requests")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per worker")
+    parser.add_argument("--work-ms", type=float, default=2.0, help="In-transaction work per request")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    original_mode = settings.AUDIT_WRITER_MODE
+    results = {}
+    try:
+        for label, mode, durable in SCENARIOS:
+            logger.info(f"Running: {label}")
+            results[label] = run_scenario(mode, durable, args.concurrency, args.requests, args.work_ms)
+    finally:
+        settings.AUDIT_WRITER_MODE = original_mode
+
+    print(f"\n{'scenario':<28} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'drain s':>8}")
+    for label, r in results.items():
+        print(
+            f"{label:<28} {r['mean_ms']:>8.2f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['p99_ms']:>8.2f} {r['requests_per_second']:>8.0f} {r['drain_seconds']:>8.2f}"
+        )
+    print(f"\nwriter: {audit_writer.metrics()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""
+GPS Track Encoding Benchmark
+Size and encode/decode throughput of the waypoint transfer encodings vs. JSON
+
+Uses a synthetic RouteShoot recording (1 Hz, gently curving road, altitude
+and video offsets on every waypoint). The JSON path includes GpsWaypoint
+validation, as the create endpoint does. No database is needed.
+
+Usage:
+    python -m app.jobs.benchmark_gps_track_encoding [--waypoints 20000] [--repeat 5]
+"""
+
+from typing import Callable, Dict, List
+import argparse
+import gzip
+import json
+import logging
+import statistics
+import time
+
+import numpy as np
+
+from ..schemas import GpsWaypoint
+from ..services.gps_track_encoding import (
+    decode_packed_waypoints,
+    decode_polyline_waypoints,
+    encode_packed_waypoints,
+    encode_polyline_waypoints
+)
+from ..services.gps_tracks import arrays_to_waypoints, waypoint_arrays
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_track(count: int, seed: int = 7) -> Dict[str, np.ndarray]:
+    """A 1 Hz drive at ~10 m/s with a slowly wandering heading"""
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0, 0.02, count))
+    step_deg = 10 / 111320
+    return {
+        "longitude": 124.24 + np.cumsum(np.cos(heading) * step_deg),
+        "latitude": 7.22 + np.cumsum(np.sin(heading) * step_deg),
+        "altitude": np.round(35 + np.cumsum(rng.normal(0, 0.2, count)), 2),
+        "timestamp": 1718000000000 + np.arange(count, dtype=np.int64) * 1000 + rng.integers(-20, 20, count),
+        "video_offset_ms": np.arange(count, dtype=np.int64) * 1000,
+    }
+
+
+def _json_decode(body: bytes):
+    return waypoint_arrays([GpsWaypoint.model_validate(wp) for wp in json.loads(body)])
+
+
+ENCODINGS = {
+    "json": (lambda arrays: json.dumps(arrays_to_waypoints(arrays)).encode("utf-8"), _json_decode),
+    "polyline": (
+        lambda arrays: json.dumps(encode_polyline_waypoints(arrays)).encode("utf-8"),
+        lambda body: decode_polyline_waypoints(json.loads(body))
+    ),
+    "packed": (encode_packed_waypoints, decode_packed_waypoints),
+}
+
+
+def _timed(function: Callable, argument, repeat: int) -> float:
+    """Median wall time of function(argument) in milliseconds"""
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GPS track transfer encodings")
+    parser.add_argument("--waypoints", type=int, default=20000, help="Waypoints in the synthetic track")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (median reported)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    arrays = synthetic_track(args.waypoints)
+    json_size = None
+    print(f"{'encoding':<10} {'bytes':>10} {'gzipped':>10} {'vs json':>8} {'encode ms':>10} {'decode ms':>10} {'decode wp/s':>12}")
+    for name, (encode, decode) in ENCODINGS.items():
+        body = encode(arrays)
+        json_size = json_size or len(body)
+        encode_ms = _timed(encode, arrays, args.repeat)
+        decode_ms = _timed(decode, body, args.repeat)
+        print(
+            f"{name:<10} {len(body):>10} {len(gzip.compress(body)):>10} {len(body) / json_size:>8.1%} "
+            f"{encode_ms:>10.1f} {decode_ms:>10.1f} {args.waypoints / (decode_ms / 1000):>12.0f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+"""
+GPS Track Level-of-Detail Backfill
+Builds the simplified levels of detail for tracks that have none
+
+New tracks get their levels when they are created; run this once after
+migration 017, or with --rebuild after changing LOD_TOLERANCES_M (or to
+re-simplify chunk-uploaded tracks as a whole). Tracks still recording are
+skipped: their levels are extended chunk by chunk.
+
+Usage:
+    python -m app.jobs.build_gps_track_lods [--rebuild] [--batch-size 100]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import undefer_group
+
+from ..core.database import SessionLocal
+from ..models import GpsTrack, GpsTrackLod
+from ..services.gps_tracks import build_lods, track_arrays
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build GPS track levels of detail")
+    parser.add_argument("--rebuild", action="store_true", help="Replace existing levels of every finished track")
+    parser.add_argument("--batch-size", type=int, default=100, help="Tracks per transaction")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    db = SessionLocal()
+    built = 0
+    try:
+        if args.rebuild:
+            db.query(GpsTrackLod).filter(GpsTrackLod.track_id.in_(
+                select(GpsTrack.track_id).where(GpsTrack.is_recording.is_(False))
+            )).delete(synchronize_session=False)
+            db.commit()
+
+        # Walk by track_id: tracks too straight to simplify get no levels
+        # and would otherwise be selected again
+        last_track_id = None
+        while True:
+            query = db.query(GpsTrack).options(undefer_group('waypoints')).filter(
+                GpsTrack.waypoint_count > 2,
+                GpsTrack.is_recording.is_(False),
+                ~exists().where(GpsTrackLod.track_id == GpsTrack.track_id)
+            )
+            if last_track_id is not None:
+                query = query.filter(GpsTrack.track_id > last_track_id)
+            tracks = query.order_by(GpsTrack.track_id).limit(args.batch_size).all()
+            if not tracks:
+                break
+
+            lods = 0
+            for track in tracks:
+                track_lods = build_lods(track.track_id, track_arrays(track))
+                db.add_all(track_lods)
+                lods += len(track_lods)
+            last_track_id = tracks[-1].track_id
+            db.commit()
+            built += len(tracks)
+            logger.info(f"Built {lods} level(s) for {len(tracks)} track(s)")
+    finally:
+        db.close()
+
+    logger.info(f"Processed {built} GPS track(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
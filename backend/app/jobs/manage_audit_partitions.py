@@ -0,0 +1,64 @@
+"""
+Audit Partition Maintenance Job
+Creates upcoming monthly audit_logs partitions and archives expired ones
+
+Run daily (e.g. from cron). Archiving exports each expired month to object
+storage with its Merkle anchors, then detaches and drops the partition.
+
+Usage:
+    python -m app.jobs.manage_audit_partitions [--months-ahead 3] [--archive] [--retention-months 24] [--status]
+"""
+
+import argparse
+import json
+import logging
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..services.audit_partitions import AuditPartitionService
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain audit_logs partitions")
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+        help="Create partitions up to this many months ahead"
+    )
+    parser.add_argument("--archive", action="store_true", help="Archive and drop expired partitions")
+    parser.add_argument(
+        "--retention-months", type=int, default=settings.AUDIT_RETENTION_MONTHS,
+        help="Months kept in the database when archiving"
+    )
+    parser.add_argument("--status", action="store_true", help="Print partitions and archives, then exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    db = SessionLocal()
+    try:
+        if args.status:
+            print(json.dumps(AuditPartitionService.status(db), indent=2))
+            return 0
+
+        created = AuditPartitionService.ensure_partitions(db, months_ahead=args.months_ahead)
+        logger.info(f"{created} partition(s) created")
+
+        if args.archive:
+            archives = AuditPartitionService.archive_expired(db, retention_months=args.retention_months)
+            logger.info(
+                f"{len(archives)} partition(s) archived, "
+                f"{sum(archive.row_count for archive in archives)} rows"
+            )
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""
+Audit Export Job Runner
+Runs pending audit export jobs and resumes interrupted or failed ones
+
+Exports are normally started by POST /api/v1/audit/export/jobs in the API
+process; run this (e.g. from cron) to pick up jobs whose process died. Jobs
+are claimed before they run, so a job still making progress elsewhere is
+left alone.
+
+Usage:
+    python -m app.jobs.run_audit_exports [--job-id UUID] [--stale-minutes 30]
+"""
+
+from datetime import datetime, timedelta
+from uuid import UUID
+import argparse
+import logging
+
+from sqlalchemy import and_, or_
+
+from ..core.database import SessionLocal
+from ..models import AuditExportJob
+from ..services.audit_export import run_export_job
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run or resume audit export jobs")
+    parser.add_argument("--job-id", type=UUID, default=None, help="Run this job only")
+    parser.add_argument(
+        "--stale-minutes", type=int, default=30,
+        help="Resume running jobs without progress for this long"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    db = SessionLocal()
+    failed = 0
+    try:
+        if args.job_id:
+            job_ids = [args.job_id]
+        else:
+            stale = datetime.utcnow() - timedelta(minutes=args.stale_minutes)
+            job_ids = [job_id for job_id, in db.query(AuditExportJob.job_id).filter(
+                or_(
+                    AuditExportJob.status.in_(["pending", "failed"]),
+                    and_(AuditExportJob.status == "running", AuditExportJob.updated_at < stale)
+                )
+            ).order_by(AuditExportJob.created_at).all()]
+
+        for job_id in job_ids:
+            job = run_export_job(db, job_id, stale_after=timedelta(minutes=args.stale_minutes))
+            if job is None:
+                logger.warning(f"Export job {job_id} not found")
+                failed += 1
+            elif job.status == "running":
+                logger.info(f"Export job {job_id} is being run by another process")
+            elif job.status != "completed":
+                failed += 1
+    finally:
+        db.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
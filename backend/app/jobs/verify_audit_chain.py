@@ -0,0 +1,49 @@
+"""
+Audit Chain Verification Job
+Full, resumable verification of the audit_logs hash chain
+
+Usage:
+    python -m app.jobs.verify_audit_chain [--workers 8] [--chunk-size 5000] [--restart] [--max-rows N]
+"""
+
+import argparse
+import logging
+
+from ..services.audit_verification import AuditChainVerifier, DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verify the audit_logs hash chain")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from genesis")
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after about this many rows")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    def report(progress):
+        logger.info(
+            f"verified to sequence {progress['verified_sequence']} - "
+            f"{progress['rows_checked']} rows, {progress['broken_count']} broken, "
+            f"{progress['rows_per_second']:.0f} rows/s"
+        )
+
+    verifier = AuditChainVerifier(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        progress_callback=report
+    )
+    summary = verifier.run(resume=not args.restart, max_rows=args.max_rows)
+    logger.info(f"Verification {summary['status']}: {summary}")
+
+    return 1 if summary["broken_count"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,6 +16,7 @@ import time
 from .core.config import settings
 from .api import auth, projects, progress, gis, media, public, audit, users, groups, access_rights, reports, gps_tracks
 from .core.database import engine, Base
+from .services.audit_writer import audit_writer
 
 # Configure logging
 logging.basicConfig(
@@ -160,6 +161,9 @@ async def startup_event():
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created (DEBUG mode)")
 
+    if settings.AUDIT_WRITER_MODE == "async":
+        audit_writer.start()
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -167,6 +171,9 @@ async def shutdown_event():
     """Application shutdown"""
     logger.info("Shutting down application")
 
+    # Write out queued audit events before exiting
+    audit_writer.stop()
+
 
 if __name__ == "__main__":
     import uvicorn
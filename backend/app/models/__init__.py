@@ -3,9 +3,9 @@ SQLAlchemy Models
 Database table representations
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, Text, Date, BigInteger, ForeignKey, CheckConstraint, UniqueConstraint, TIMESTAMP, Index
-from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, Boolean, DateTime, Numeric, Text, Date, BigInteger, ForeignKey, CheckConstraint, UniqueConstraint, TIMESTAMP, Index, Computed, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, INET, TSVECTOR, ARRAY
+from sqlalchemy.orm import deferred, relationship
 from geoalchemy2 import Geometry
 from datetime import datetime
 import uuid
@@ -66,6 +66,7 @@ class User(Base):
             "role IN ('public', 'deo_user', 'regional_admin', 'super_admin')",
             name="chk_valid_role"
         ),
+        Index('idx_users_created_at_id', 'created_at', 'user_id'),
     )
 
 
@@ -102,6 +103,16 @@ class Project(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Full-text search document (title weighted above location), maintained by PostgreSQL
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(project_title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(location, '')), 'B')",
+            persisted=True
+        )
+    )
+
     # Relationships
     deo = relationship("DEO", back_populates="projects")
     creator = relationship("User", back_populates="projects_created", foreign_keys=[created_by])
@@ -117,6 +128,16 @@ class Project(Base):
             "status IN ('planning', 'ongoing', 'completed', 'suspended', 'cancelled', 'deleted')",
             name="chk_valid_status"
         ),
+        Index('idx_projects_created_at_id', 'created_at', 'project_id'),
+        Index('idx_projects_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(
+            'idx_projects_title_trgm', 'project_title',
+            postgresql_using='gin', postgresql_ops={'project_title': 'gin_trgm_ops'}
+        ),
+        Index(
+            'idx_projects_location_trgm', 'location',
+            postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}
+        ),
     )
 
 
@@ -141,9 +162,23 @@ class ProjectProgressLog(Base):
     __table_args__ = (
         CheckConstraint("reported_percent >= 0 AND reported_percent <= 100", name="chk_valid_percent"),
         UniqueConstraint("project_id", "report_date", name="uq_project_progress_date"),
+        Index('idx_progress_project_chain', 'project_id', 'created_at', 'progress_id'),
     )
 
 
+class ProgressChainCheckpoint(Base):
+    """Verified prefix of a project's progress hash chain"""
+    __tablename__ = "progress_chain_checkpoints"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.project_id", ondelete="CASCADE"), primary_key=True)
+    verified_count = Column(Integer, nullable=False, default=0)  # Entries verified so far
+    verified_progress_id = Column(UUID(as_uuid=True))  # Last verified entry
+    verified_created_at = Column(DateTime)
+    head_hash = Column(Text)  # record_hash of the last verified entry
+    broken_links = Column(JSONB, nullable=False, default=list)  # Breaks found within the verified prefix
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class GISFeature(Base):
     """Spatial features (PostGIS)"""
     __tablename__ = "gis_features"
@@ -170,6 +205,28 @@ class GISFeature(Base):
     )
 
 
+class ProjectGeometrySummary(Base):
+    """Per-project footprint of its GIS features (maintained by triggers, see migration 020)"""
+    __tablename__ = "project_geometry_summary"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.project_id", ondelete="CASCADE"), primary_key=True)
+    feature_count = Column(Integer, nullable=False)
+    centroid = Column(Geometry(geometry_type='POINT', srid=4326, spatial_index=False), nullable=False)
+    # Extent of all features; a point or line when the features have no area extent
+    bbox = Column(Geometry(geometry_type='GEOMETRY', srid=4326, spatial_index=False), nullable=False)
+    # All features collected and simplified (migration 021): ~1 m for maps, ~20 m for list thumbnails
+    outline = deferred(Column(Geometry(geometry_type='GEOMETRY', srid=4326, spatial_index=False)), group='outline')
+    outline_thumbnail = deferred(
+        Column(Geometry(geometry_type='GEOMETRY', srid=4326, spatial_index=False)), group='outline'
+    )
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # KNN (<->) and ST_DWithin in meters for nearest-project lookups
+        Index('idx_project_geometry_summary_bbox', text('(bbox::geography)'), postgresql_using='gist'),
+    )
+
+
 class MediaAsset(Base):
     """Photos, videos, documents"""
     __tablename__ = "media_assets"
@@ -196,11 +253,12 @@ class MediaAsset(Base):
             "media_type IN ('photo', 'video', 'document')",
             name="chk_valid_media_type"
         ),
+        Index('idx_media_uploaded_at_id', 'uploaded_at', 'media_id'),
     )
 
 
 class AuditLog(Base):
-    """Immutable audit trail"""
+    """Immutable audit trail, partitioned by month (migration 012; database PK is audit_id, created_at)"""
     __tablename__ = "audit_logs"
 
     audit_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -211,9 +269,169 @@ class AuditLog(Base):
     payload = Column(JSONB, default={})
     ip_address = Column(INET)
     user_agent = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Partition key
     prev_hash = Column(Text)
     record_hash = Column(Text)
+    sequence = Column(BigInteger, index=True)  # Position in the hash chain (see AuditChainHead)
+
+    __table_args__ = (
+        Index('idx_audit_created_at_id', 'created_at', 'audit_id'),
+        Index('idx_audit_payload_path', 'payload', postgresql_using='gin', postgresql_ops={'payload': 'jsonb_path_ops'}),
+    )
+
+
+class AuditArchive(Base):
+    """audit_logs partition exported to object storage and dropped"""
+    __tablename__ = "audit_archives"
+
+    partition_name = Column(String(63), primary_key=True)
+    range_start = Column(DateTime, nullable=False)
+    range_end = Column(DateTime, nullable=False)
+    row_count = Column(BigInteger, nullable=False)
+    first_sequence = Column(BigInteger)
+    last_sequence = Column(BigInteger, index=True)
+    first_prev_hash = Column(Text)  # Links the archive to the partition before it
+    last_record_hash = Column(Text)  # The live chain continues from here
+    object_key = Column(Text, nullable=False)  # gzipped NDJSON, in sequence order
+    manifest_key = Column(Text, nullable=False)  # Chain boundaries, Merkle anchors, checksum
+    sha256 = Column(String(64), nullable=False)  # Of the compressed object
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AuditChainHead(Base):
+    """Tip of the audit hash chain, row-locked by every append"""
+    __tablename__ = "audit_chain_head"
+
+    chain_id = Column(String(32), primary_key=True, default="audit")
+    last_sequence = Column(BigInteger, nullable=False, default=0)
+    last_hash = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AuditOutbox(Base):
+    """Audit events committed with their request, awaiting the background chain writer"""
+    __tablename__ = "audit_outbox"
+
+    outbox_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    audit_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
+    actor_id = Column(UUID(as_uuid=True))
+    action = Column(String(100), nullable=False)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(UUID(as_uuid=True))
+    payload = Column(JSONB, default={})
+    ip_address = Column(INET)
+    user_agent = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class AuditStatsHourly(Base):
+    """Audit event counts per hour, action, entity type and actor (rollup of audit_logs)"""
+    __tablename__ = "audit_stats_hourly"
+
+    rollup_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    bucket = Column(DateTime, nullable=False)  # created_at truncated to the hour
+    action = Column(String(100), nullable=False)
+    entity_type = Column(String(50), nullable=False)
+    actor_id = Column(UUID(as_uuid=True))
+    event_count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'bucket', 'action', 'entity_type', 'actor_id',
+            name='uq_audit_stats_hourly_key',
+            postgresql_nulls_not_distinct=True
+        ),
+        Index('idx_audit_stats_hourly_actor', 'actor_id', 'bucket'),
+    )
+
+
+class AuditStatsState(Base):
+    """How far audit_stats_hourly has rolled up the audit chain"""
+    __tablename__ = "audit_stats_state"
+
+    chain_id = Column(String(32), primary_key=True, default="audit")
+    rolled_up_sequence = Column(BigInteger, nullable=False, default=0)  # Entries up to here are in the rollup
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AuditExportJob(Base):
+    """Background audit export to object storage, written and resumable part by part"""
+    __tablename__ = "audit_export_jobs"
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.user_id"))
+    format = Column(String(10), nullable=False)  # csv, ndjson, parquet
+    range_start = Column(DateTime, nullable=False)
+    range_end = Column(DateTime, nullable=False)  # Exclusive
+    chunk_days = Column(Integer, nullable=False, default=7)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+    completed_until = Column(DateTime)  # Parts cover range_start up to here
+    parts = Column(JSONB, nullable=False, default=list)  # [{key, range_start, range_end, rows, bytes}]
+    row_count = Column(BigInteger, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AuditVerificationCheckpoint(Base):
+    """Progress of the full audit-chain verification job (resumable)"""
+    __tablename__ = "audit_verification_checkpoints"
+
+    chain_id = Column(String(32), primary_key=True, default="audit")
+    verified_sequence = Column(BigInteger, nullable=False, default=0)  # Last sequence checked
+    verified_hash = Column(Text)  # record_hash at verified_sequence
+    rows_checked = Column(BigInteger, nullable=False, default=0)
+    unhashed_rows = Column(BigInteger, nullable=False, default=0)
+    broken_count = Column(BigInteger, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="running")  # running, completed, failed
+    rows_per_second = Column(Numeric(12, 1))
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AuditChainBreak(Base):
+    """Broken link found by the audit-chain verification job"""
+    __tablename__ = "audit_chain_breaks"
+
+    break_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sequence = Column(BigInteger, nullable=False, index=True)
+    audit_id = Column(UUID(as_uuid=True))
+    error = Column(String(50), nullable=False)  # hash mismatch, prev_hash mismatch, sequence gap
+    expected = Column(Text)
+    actual = Column(Text)
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MerkleAnchor(Base):
+    """Daily Merkle root over one append-only log table"""
+    __tablename__ = "merkle_anchors"
+
+    anchor_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source = Column(String(32), nullable=False)  # audit_logs, project_progress_logs
+    anchor_date = Column(Date, nullable=False)
+    leaf_count = Column(Integer, nullable=False)
+    root_hash = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('source', 'anchor_date', name='uq_merkle_anchor_source_date'),
+    )
+
+
+class MerkleNode(Base):
+    """Node of an anchored Merkle tree (level 0 = leaves)"""
+    __tablename__ = "merkle_nodes"
+
+    anchor_id = Column(UUID(as_uuid=True), ForeignKey("merkle_anchors.anchor_id", ondelete="CASCADE"), primary_key=True)
+    level = Column(SmallInteger, primary_key=True)
+    node_index = Column(Integer, primary_key=True)
+    node_hash = Column(Text, nullable=False)
+    record_id = Column(UUID(as_uuid=True))  # Set on leaves only
+    record_hash = Column(Text)  # Leaves only: proofs outlive archived source rows
+
+    __table_args__ = (
+        Index('idx_merkle_nodes_record_id', 'record_id', postgresql_where=text('record_id IS NOT NULL')),
+    )
 
 
 class GeofencingRule(Base):
@@ -392,12 +610,24 @@ class GpsTrack(Base):
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.project_id", ondelete="CASCADE"), nullable=False, index=True)
     media_id = Column(UUID(as_uuid=True), ForeignKey("media_assets.media_id", ondelete="SET NULL"), nullable=True, index=True)
     track_name = Column(String(255), nullable=False)
-    waypoints = Column(JSONB, nullable=False)  # Array of {lat, lng, alt, timestamp, videoOffsetMs}
+    # x=longitude, y=latitude, z=altitude (NaN if unknown), m=timestamp (Unix ms); see services/gps_tracks.py
+    # Deferred: listings read the precomputed levels in gps_track_lods instead
+    geometry = deferred(
+        Column(Geometry(geometry_type='LINESTRINGZM', srid=4326, dimension=4, spatial_index=False), nullable=True),
+        group='waypoints'
+    )
+    video_offsets_ms = deferred(Column(ARRAY(Integer), nullable=True), group='waypoints')  # Per waypoint, parallel to geometry
     waypoint_count = Column(Integer, nullable=False)
-    total_distance_meters = Column(Numeric(12, 2), nullable=True)
+    total_distance_meters = Column(Numeric(12, 2), nullable=True)  # Geodesic length of geometry
+    # Bounding box of geometry, kept so listings need not read the line
+    min_longitude = Column(Numeric(10, 7), nullable=True)
+    min_latitude = Column(Numeric(10, 7), nullable=True)
+    max_longitude = Column(Numeric(10, 7), nullable=True)
+    max_latitude = Column(Numeric(10, 7), nullable=True)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=True)
     kml_storage_key = Column(Text, nullable=True)  # S3 key for KML file
+    is_recording = Column(Boolean, nullable=False, default=False)  # Open for chunk uploads until finalized
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
@@ -409,4 +639,59 @@ class GpsTrack(Base):
     __table_args__ = (
         Index('idx_gps_tracks_project_id', 'project_id'),
         Index('idx_gps_tracks_media_id', 'media_id'),
+        Index('idx_gps_tracks_geometry', 'geometry', postgresql_using='gist'),
     )
+
+
+class GpsTrackLod(Base):
+    """Simplified levels of detail of a GPS track (see services/gps_tracks.py)"""
+    __tablename__ = "gps_track_lods"
+
+    track_id = Column(UUID(as_uuid=True), ForeignKey("gps_tracks.track_id", ondelete="CASCADE"), primary_key=True)
+    level = Column(SmallInteger, primary_key=True)  # 1 = finest; level 0 is the track itself
+    tolerance_meters = Column(Numeric(10, 2), nullable=False)
+    waypoint_count = Column(Integer, nullable=False)
+    geometry = deferred(
+        Column(Geometry(geometry_type='LINESTRINGZM', srid=4326, dimension=4, spatial_index=False), nullable=False),
+        group='waypoints'
+    )
+    video_offsets_ms = deferred(Column(ARRAY(Integer), nullable=True), group='waypoints')
+
+
+class GpsTrackChunk(Base):
+    """Waypoint chunks appended to a recording GPS track (see services/gps_track_recording.py)"""
+    __tablename__ = "gps_track_chunks"
+
+    track_id = Column(UUID(as_uuid=True), ForeignKey("gps_tracks.track_id", ondelete="CASCADE"), primary_key=True)
+    sequence = Column(Integer, primary_key=True)  # 1, 2, ... in upload order
+    first_waypoint = Column(Integer, nullable=False)  # Index of the chunk's first waypoint in the track
+    waypoint_count = Column(Integer, nullable=False)
+    digest = Column(String(64), nullable=False)  # SHA-256 of the packed waypoints, to recognise retries
+    received_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# =============================================================================
+# Public Statistics Snapshot (maintained by triggers, see migration 005)
+# =============================================================================
+
+class ProjectLatestProgress(Base):
+    """Latest progress report per project"""
+    __tablename__ = "project_latest_progress"
+
+    project_id = Column(UUID(as_uuid=True), primary_key=True)
+    reported_percent = Column(Numeric(5, 2), nullable=False)
+    report_date = Column(Date, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+class PublicStat(Base):
+    """Aggregated public project statistics per (dimension, key)"""
+    __tablename__ = "public_stats"
+
+    dimension = Column(String(32), primary_key=True)  # total, deo, status, fund_year, ...
+    dim_key = Column(Text, primary_key=True)  # '' for the total row and NULL values
+    project_count = Column(BigInteger, nullable=False, default=0)
+    total_cost = Column(Numeric(20, 2), nullable=False, default=0)
+    progress_sum = Column(Numeric(20, 2), nullable=False, default=0)
+    progress_count = Column(BigInteger, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
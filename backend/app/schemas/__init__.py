@@ -159,8 +159,9 @@ class UserAdminUpdate(BaseModel):
 
 class UserListResponse(BaseModel):
     """Paginated user list"""
-    total: int
+    total: Optional[int] = None
     items: List[UserResponse]
+    next_cursor: Optional[str] = None
 
 
 class PasswordChangeRequest(BaseModel):
@@ -222,10 +223,19 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+class NearbyProjectResponse(ProjectResponse):
+    """Project near a location (GET /projects/nearby)"""
+    distance_m: float  # To the extent of the project's GIS features; 0 when inside it
+    centroid_latitude: float
+    centroid_longitude: float
+    feature_count: int
+
+
 class ProjectListResponse(BaseModel):
     """Paginated project list"""
-    total: int
+    total: Optional[int] = None
     items: List[ProjectResponse]
+    next_cursor: Optional[str] = None
 
 
 # =============================================================================
@@ -323,6 +333,21 @@ class GISFeatureResponse(GISFeatureBase):
         from_attributes = True
 
 
+class GISFeatureImportError(BaseModel):
+    """A feature skipped by an import"""
+    row: int  # 1-based position in the file
+    error: str
+
+
+class GISFeatureImportResult(BaseModel):
+    """GIS feature file import report"""
+    imported: int
+    repaired: int
+    skipped: int
+    outside_boundary: int
+    errors: List[GISFeatureImportError]
+
+
 # =============================================================================
 # MEDIA ASSET
 # =============================================================================
@@ -405,6 +430,7 @@ class PublicStatsResponse(BaseModel):
     by_province: Dict[str, int]
     by_status: Dict[str, int]
     avg_completion: float
+    generated_at: Optional[datetime] = None
 
 
 # =============================================================================
@@ -447,6 +473,14 @@ class AuditLogResponse(BaseModel):
         from_attributes = True
 
 
+class AuditExportJobCreate(BaseModel):
+    """Background audit export request (date range is inclusive)"""
+    format: constr(pattern=r'^(csv|ndjson|parquet)$') = "ndjson"
+    start_date: date
+    end_date: date
+    chunk_days: int = Field(default=7, ge=1, le=366)  # Days per exported part
+
+
 # =============================================================================
 # GROUPS
 # =============================================================================
@@ -483,8 +517,9 @@ class GroupResponse(GroupBase):
 
 class GroupListResponse(BaseModel):
     """Paginated group list"""
-    total: int
+    total: Optional[int] = None
     items: List[GroupResponse]
+    next_cursor: Optional[str] = None
 
 
 class GroupMemberResponse(BaseModel):
@@ -623,22 +658,50 @@ class GpsTrackCreate(BaseModel):
     waypoints: List[GpsWaypoint]
     start_time: datetime
     end_time: Optional[datetime] = None
-    total_distance_meters: Optional[float] = None
+    total_distance_meters: Optional[float] = None  # Ignored: computed from the waypoints
+    kml_storage_key: Optional[str] = None
+
+
+class GpsTrackOpen(BaseModel):
+    """Start of a chunked GPS track upload (waypoints follow in chunks)"""
+    project_id: UUID
+    media_id: Optional[UUID] = None
+    track_name: str = Field(..., min_length=1, max_length=255)
+    start_time: datetime
     kml_storage_key: Optional[str] = None
 
 
+class GpsTrackChunkCreate(BaseModel):
+    """A chunk of waypoints for a recording GPS track"""
+    waypoints: List[GpsWaypoint] = Field(..., min_length=1)
+
+
+class GpsTrackChunkReceipt(BaseModel):
+    """Result of storing (or replaying) a waypoint chunk"""
+    track_id: UUID
+    sequence: int
+    first_waypoint: int  # Track index of the chunk's first waypoint
+    waypoint_count: int  # Waypoints in the chunk
+    track_waypoint_count: int
+    total_distance_meters: Optional[float]
+    next_sequence: int
+    replayed: bool = False  # True if this chunk had already been stored
+
+
 class GpsTrackResponse(BaseModel):
     """GPS track response"""
     track_id: UUID
     project_id: UUID
     media_id: Optional[UUID]
     track_name: str
-    waypoints: List[Dict[str, Any]]
+    waypoints: Optional[List[Dict[str, Any]]] = None  # Only when requested (include_waypoints)
     waypoint_count: int
     total_distance_meters: Optional[float]
     start_time: datetime
     end_time: Optional[datetime]
     kml_storage_key: Optional[str]
+    lod_tolerance_meters: Optional[float] = None  # Simplification applied to waypoints (0 = full resolution)
+    is_recording: bool = False  # Still receiving chunks (see PUT /gps-tracks/{id}/chunks/{sequence})
     video_url: Optional[str] = None  # Presigned URL for associated video
     created_by: UUID
     created_at: datetime
@@ -647,6 +710,53 @@ class GpsTrackResponse(BaseModel):
         from_attributes = True
 
 
+class GpsTrackSummary(BaseModel):
+    """GPS track listing entry (no waypoints)"""
+    track_id: UUID
+    project_id: UUID
+    media_id: Optional[UUID]
+    track_name: str
+    waypoint_count: int
+    total_distance_meters: Optional[float]
+    bbox: Optional[List[float]] = None  # [min_lng, min_lat, max_lng, max_lat]
+    start_time: datetime
+    end_time: Optional[datetime]
+    thumbnail_polyline: Optional[str] = None  # Encoded polyline (precision 5) of the coarsest level of detail
+    is_recording: bool = False
+    video_url: Optional[str] = None
+    created_by: UUID
+    created_at: datetime
+
+
+class GpsWaypointPage(BaseModel):
+    """A range of a track's waypoints"""
+    track_id: UUID
+    waypoint_count: int
+    offset: int
+    next_offset: Optional[int] = None  # None after the last waypoint
+    waypoints: List[GpsWaypoint]
+
+
+class GpsTrackPosition(BaseModel):
+    """Interpolated camera position at a video offset"""
+    offset_ms: int
+    latitude: float
+    longitude: float
+    altitude: Optional[float]
+    distance_m: float  # Along the track from its first waypoint
+    waypoint_index: int  # Last waypoint at or before offset_ms
+
+
+class GpsTrackNearestPoint(BaseModel):
+    """Closest point of a track to a map location"""
+    latitude: float  # Snapped onto the track
+    longitude: float
+    offset_ms: int  # Video offset at the snapped point
+    distance_m: float  # Along the track from its first waypoint
+    distance_from_track_m: float
+    waypoint_index: int  # Closest waypoint
+
+
 class GpsTrackListResponse(BaseModel):
     """Paginated GPS track list"""
     total: int
@@ -6,6 +6,9 @@ Business logic layer
 from .permissions import PermissionService, require_permission, require_admin
 from .mfa_service import MFAService
 from .audit_service import AuditService
+from .audit_chain import append_to_chain
+from .audit_writer import audit_writer, record_audit
+from .progress_chain import verify_project_chain
 from .report_service import ReportService
 from .pdf_generator import PDFReportBuilder, calculate_document_hash, generate_qr_code
 
@@ -15,6 +18,10 @@ __all__ = [
     "require_admin",
     "MFAService",
     "AuditService",
+    "append_to_chain",
+    "audit_writer",
+    "record_audit",
+    "verify_project_chain",
     "ReportService",
     "PDFReportBuilder",
     "calculate_document_hash",
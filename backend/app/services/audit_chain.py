@@ -0,0 +1,106 @@
+"""
+Audit Hash Chain
+Appends audit_logs entries to the hash chain under a row lock on the chain head
+"""
+
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+import uuid
+
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.security import calculate_audit_hash
+from ..models import AuditChainHead, AuditLog
+
+AUDIT_CHAIN_ID = "audit"
+
+
+def _uuid_text(value: Any) -> str:
+    """Canonical text of a UUID column value, as it reads back from the database"""
+    if not value:
+        return ""
+    return str(value if isinstance(value, uuid.UUID) else uuid.UUID(str(value)))
+
+
+def audit_record_hash(log: AuditLog, prev_hash: Optional[str]) -> str:
+    """Hash of an audit entry chained to prev_hash"""
+    return calculate_audit_hash(
+        actor_id=_uuid_text(log.actor_id),
+        action=log.action,
+        entity_type=log.entity_type,
+        entity_id=_uuid_text(log.entity_id),
+        payload=log.payload or {},
+        created_at=log.created_at.isoformat() if log.created_at else "",
+        prev_hash=prev_hash
+    )
+
+
+def lock_chain_head(session: Session) -> Tuple[int, Optional[str]]:
+    """
+    Lock the chain head row for the rest of the transaction.
+
+    Concurrent appenders block here until the holder commits or rolls back,
+    so each one sees the head left by the previous and the chain cannot fork.
+
+    Returns:
+        (last_sequence, last_hash)
+    """
+    conn = session.connection()
+    query = select(
+        AuditChainHead.last_sequence, AuditChainHead.last_hash
+    ).where(
+        AuditChainHead.chain_id == AUDIT_CHAIN_ID
+    ).with_for_update()
+
+    head = conn.execute(query).first()
+    if head is None:
+        conn.execute(
+            insert(AuditChainHead)
+            .values(chain_id=AUDIT_CHAIN_ID, last_sequence=0, last_hash=None)
+            .on_conflict_do_nothing(index_elements=["chain_id"])
+        )
+        head = conn.execute(query).first()
+    return head.last_sequence, head.last_hash
+
+
+def append_to_chain(session: Session, logs: List[AuditLog]) -> None:
+    """
+    Assign sequence, prev_hash and record_hash to new audit entries.
+
+    Must run inside the transaction that inserts them: the head row stays
+    locked until commit, and a rollback discards the head update with the
+    entries, so sequences stay gapless.
+    """
+    if not logs:
+        return
+
+    for log in logs:
+        if log.created_at is None:
+            log.created_at = datetime.utcnow()
+    logs = sorted(logs, key=lambda log: log.created_at)
+
+    sequence, prev_hash = lock_chain_head(session)
+    for log in logs:
+        sequence += 1
+        log.sequence = sequence
+        log.prev_hash = prev_hash
+        log.record_hash = audit_record_hash(log, prev_hash)
+        prev_hash = log.record_hash
+
+    session.connection().execute(
+        update(AuditChainHead)
+        .where(AuditChainHead.chain_id == AUDIT_CHAIN_ID)
+        .values(last_sequence=sequence, last_hash=prev_hash, updated_at=datetime.utcnow())
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _chain_pending_audit_logs(session: Session, flush_context, instances) -> None:
+    """Chain every AuditLog added to any session, whichever endpoint created it"""
+    pending = [
+        obj for obj in session.new
+        if isinstance(obj, AuditLog) and obj.sequence is None
+    ]
+    append_to_chain(session, pending)
@@ -0,0 +1,447 @@
+"""
+Audit Export
+Streams audit logs as CSV, NDJSON, JSON or Parquet through a server-side
+cursor, and writes large ranges to object storage as resumable background jobs
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from uuid import UUID
+import csv
+import io
+import json
+import logging
+import tempfile
+import zlib
+
+import boto3
+from botocore.client import Config
+from sqlalchemy import and_, or_, tuple_, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models import AuditExportJob, AuditLog, User
+
+logger = logging.getLogger(__name__)
+
+s3_client = boto3.client(
+    's3',
+    endpoint_url=settings.S3_ENDPOINT,
+    aws_access_key_id=settings.S3_ACCESS_KEY,
+    aws_secret_access_key=settings.S3_SECRET_KEY,
+    region_name=settings.S3_REGION,
+    config=Config(signature_version='s3v4'),
+    use_ssl=settings.S3_USE_SSL
+)
+
+EXPORT_COLUMNS = (
+    "audit_id", "actor_id", "actor_username", "action", "entity_type",
+    "entity_id", "payload", "created_at", "ip_address", "user_agent",
+)
+
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _export_row(audit_log: AuditLog, username: Optional[str]) -> Dict[str, Any]:
+    return {
+        "audit_id": str(audit_log.audit_id),
+        "actor_id": str(audit_log.actor_id) if audit_log.actor_id else None,
+        "actor_username": username,
+        "action": audit_log.action,
+        "entity_type": audit_log.entity_type,
+        "entity_id": str(audit_log.entity_id) if audit_log.entity_id else None,
+        "payload": audit_log.payload,
+        "created_at": audit_log.created_at,
+        "ip_address": str(audit_log.ip_address) if audit_log.ip_address else None,
+        "user_agent": audit_log.user_agent,
+    }
+
+
+def _json_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {**row, "created_at": row["created_at"].isoformat()}
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# =============================================================================
+# Encoders: begin() / encode(rows) / end() -> bytes
+# =============================================================================
+
+class _CsvEncoder:
+    media_type = "text/csv"
+    extension = "csv"
+
+    def begin(self) -> bytes:
+        return self._lines([EXPORT_COLUMNS])
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return self._lines([
+            [
+                row["audit_id"],
+                row["actor_id"] or '',
+                row["actor_username"] or '',
+                row["action"],
+                row["entity_type"],
+                row["entity_id"] or '',
+                json.dumps(row["payload"]) if row["payload"] else '',
+                row["created_at"].isoformat(),
+                row["ip_address"] or '',
+                row["user_agent"] or '',
+            ]
+            for row in rows
+        ])
+
+    def end(self) -> bytes:
+        return b""
+
+    @staticmethod
+    def _lines(rows) -> bytes:
+        output = io.StringIO()
+        csv.writer(output).writerows(rows)
+        return output.getvalue().encode("utf-8")
+
+
+class _NdjsonEncoder:
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def begin(self) -> bytes:
+        return b""
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(json.dumps(_json_row(row)) + "\n" for row in rows).encode("utf-8")
+
+    def end(self) -> bytes:
+        return b""
+
+
+class _JsonEncoder:
+    """The legacy export document ({"logs": [...], "total": n}), written incrementally"""
+    media_type = "application/json"
+    extension = "json"
+
+    def __init__(self, meta: Dict[str, Any]):
+        self.meta = meta
+        self.total = 0
+
+    def begin(self) -> bytes:
+        header = json.dumps(self.meta)[:-1]
+        return (header + (", " if self.meta else "") + '"logs": [').encode("utf-8")
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        body = ", ".join(json.dumps(_json_row(row)) for row in rows)
+        if self.total:
+            body = ", " + body
+        self.total += len(rows)
+        return body.encode("utf-8")
+
+    def end(self) -> bytes:
+        return f'], "total": {self.total}}}'.encode("utf-8")
+
+
+class _ByteSink:
+    """Write-only file object whose contents are drained after each row group"""
+
+    def __init__(self):
+        self._buffers: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._buffers.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._buffers)
+        self._buffers = []
+        return data
+
+
+class _ParquetEncoder:
+    """One Parquet row group per cursor chunk (zstd-compressed internally)"""
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema([
+            (column, pa.timestamp("us") if column == "created_at" else pa.string())
+            for column in EXPORT_COLUMNS
+        ])
+        self._sink = _ByteSink()
+        self._writer = None
+
+    def begin(self) -> bytes:
+        self._writer = self._pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+        return self._sink.drain()
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        table = self._pa.Table.from_pylist(
+            [{**row, "payload": json.dumps(row["payload"]) if row["payload"] is not None else None} for row in rows],
+            schema=self._schema
+        )
+        self._writer.write_table(table)
+        return self._sink.drain()
+
+    def end(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def _encoder(fmt: str, meta: Optional[Dict[str, Any]]):
+    if fmt == "csv":
+        return _CsvEncoder()
+    if fmt == "ndjson":
+        return _NdjsonEncoder()
+    if fmt == "json":
+        return _JsonEncoder(meta or {})
+    if fmt == "parquet":
+        return _ParquetEncoder()
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+class AuditExport:
+    """
+    One export of a created_at range, iterated as bytes.
+
+    Rows are read in (created_at, audit_id) order through a server-side
+    cursor, chunk_rows at a time, and encoded chunk by chunk, so memory stays
+    bounded by the chunk size whatever the range. Text formats can be
+    gzipped on the fly; Parquet is compressed per column already.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        fmt: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        compress: bool = False,
+        meta: Optional[Dict[str, Any]] = None,
+        chunk_rows: int = settings.AUDIT_EXPORT_CHUNK_ROWS
+    ):
+        self.db = db
+        self.start = start
+        self.end = end
+        self.after = after
+        self.compress = compress and fmt != "parquet"
+        self.chunk_rows = chunk_rows
+        self.encoder = _encoder(fmt, meta)
+        self.rows = 0
+
+    @property
+    def media_type(self) -> str:
+        return self.encoder.media_type
+
+    @property
+    def extension(self) -> str:
+        return self.encoder.extension + (".gz" if self.compress else "")
+
+    def _chunks(self) -> Iterator[List[Dict[str, Any]]]:
+        query = self.db.query(AuditLog, User.username).outerjoin(
+            User, AuditLog.actor_id == User.user_id
+        )
+        if self.start is not None:
+            query = query.filter(AuditLog.created_at >= self.start)
+        if self.end is not None:
+            query = query.filter(AuditLog.created_at < self.end)
+        if self.after is not None:
+            query = query.filter(
+                AuditLog.created_at >= self.after[0],
+                tuple_(AuditLog.created_at, AuditLog.audit_id) > tuple(self.after)
+            )
+
+        chunk = []
+        for audit_log, username in query.order_by(
+            AuditLog.created_at, AuditLog.audit_id
+        ).yield_per(self.chunk_rows):
+            chunk.append(_export_row(audit_log, username))
+            if len(chunk) >= self.chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _encoded(self) -> Iterator[bytes]:
+        yield self.encoder.begin()
+        for chunk in self._chunks():
+            self.rows += len(chunk)
+            yield self.encoder.encode(chunk)
+        yield self.encoder.end()
+
+    def __iter__(self) -> Iterator[bytes]:
+        encoded = (data for data in self._encoded() if data)
+        return gzip_chunks(encoded) if self.compress else encoded
+
+
+# =============================================================================
+# Background export jobs
+# =============================================================================
+
+def job_status(job: AuditExportJob, s3=None) -> Dict[str, Any]:
+    """Job progress; completed jobs include pre-signed download URLs"""
+    parts = list(job.parts or [])
+    if job.status == "completed" and parts:
+        s3 = s3 or s3_client
+        parts = [{
+            **part,
+            "download_url": s3.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': settings.S3_BUCKET, 'Key': part["key"]},
+                ExpiresIn=3600
+            )
+        } for part in parts]
+
+    return {
+        "job_id": str(job.job_id),
+        "format": job.format,
+        "range_start": job.range_start.isoformat(),
+        "range_end": job.range_end.isoformat(),
+        "chunk_days": job.chunk_days,
+        "status": job.status,
+        "completed_until": job.completed_until.isoformat() if job.completed_until else None,
+        "row_count": job.row_count,
+        "parts": parts,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+    }
+
+
+# A running job without progress for this long is taken to have lost its runner
+EXPORT_JOB_STALE_AFTER = timedelta(minutes=30)
+
+
+def _claim_export_job(db: Session, job_id: UUID, stale_after: timedelta) -> Optional[datetime]:
+    """
+    Mark a job running for this runner, unless another runner holds it.
+
+    Returns:
+        The claim token (the job's new updated_at), or None if the job is
+        missing, completed, or running with recent progress
+    """
+    token = datetime.utcnow()
+    claimed = db.execute(
+        update(AuditExportJob).where(
+            AuditExportJob.job_id == job_id,
+            or_(
+                AuditExportJob.status.in_(["pending", "failed"]),
+                and_(AuditExportJob.status == "running", AuditExportJob.updated_at < token - stale_after)
+            )
+        ).values(status="running", error=None, updated_at=token).returning(AuditExportJob.job_id)
+    ).first()
+    db.commit()
+    return token if claimed else None
+
+
+def _update_claimed_job(db: Session, job_id: UUID, token: datetime, **values) -> Optional[datetime]:
+    """
+    Write job progress if the claim is still ours (no other runner took the job over).
+
+    Returns:
+        The renewed claim token, or None if the claim was lost
+    """
+    renewed = datetime.utcnow()
+    updated = db.execute(
+        update(AuditExportJob).where(
+            AuditExportJob.job_id == job_id,
+            AuditExportJob.status == "running",
+            AuditExportJob.updated_at == token
+        ).values(updated_at=renewed, **values).returning(AuditExportJob.job_id)
+    ).first()
+    db.commit()
+    return renewed if updated else None
+
+
+def run_export_job(db: Session, job_id: UUID, s3=None,
+                   stale_after: timedelta = EXPORT_JOB_STALE_AFTER) -> Optional[AuditExportJob]:
+    """
+    Write an export job's range to object storage, one part per chunk_days.
+
+    Progress is committed after every part, so running the job again (after
+    a crash or failure) continues at the first unwritten window. Empty
+    windows advance the job without writing a part.
+
+    The job is claimed with a conditional UPDATE first, and each progress
+    write only applies while the claim is held, so the API's background
+    task and the cron runner never both write the same job. A job held by
+    another runner (running, with progress within stale_after) is returned
+    unchanged.
+    """
+    s3 = s3 or s3_client
+    token = _claim_export_job(db, job_id, stale_after)
+    job = db.get(AuditExportJob, job_id)
+    if token is None:
+        return job
+
+    try:
+        parts = list(job.parts or [])
+        row_count = job.row_count
+        window_start = job.completed_until or job.range_start
+        while window_start < job.range_end:
+            window_end = min(window_start + timedelta(days=job.chunk_days), job.range_end)
+            export = AuditExport(db, job.format, window_start, window_end, compress=True)
+            key = f"{settings.AUDIT_EXPORT_PREFIX}/{job.job_id}/part-{len(parts) + 1:05d}.{export.extension}"
+
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+                for data in export:
+                    spool.write(data)
+                size = spool.tell()
+                if export.rows:
+                    spool.seek(0)
+                    s3.upload_fileobj(spool, settings.S3_BUCKET, key, ExtraArgs={"ContentType": export.media_type})
+
+            if export.rows:
+                parts.append({
+                    "key": key,
+                    "range_start": window_start.isoformat(),
+                    "range_end": window_end.isoformat(),
+                    "rows": export.rows,
+                    "bytes": size,
+                })
+                row_count += export.rows
+            token = _update_claimed_job(
+                db, job_id, token, parts=parts, row_count=row_count, completed_until=window_end
+            )
+            if token is None:
+                logger.warning(f"Audit export {job_id} was taken over by another runner")
+                return db.get(AuditExportJob, job_id)
+            window_start = window_end
+
+        _update_claimed_job(db, job_id, token, status="completed")
+        logger.info(f"Audit export {job_id} completed: {row_count} rows in {len(parts)} part(s)")
+    except Exception as e:
+        db.rollback()
+        _update_claimed_job(db, job_id, token, status="failed", error=str(e))
+        logger.exception(f"Audit export {job_id} failed")
+    return db.get(AuditExportJob, job_id)
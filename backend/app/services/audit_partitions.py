@@ -0,0 +1,300 @@
+"""
+Audit Log Partitions
+Monthly partition maintenance and partition-level retention for audit_logs
+"""
+
+from typing import Any, Dict, List
+from datetime import date, datetime, timedelta
+import gzip
+import hashlib
+import json
+import logging
+import re
+import tempfile
+
+import boto3
+from botocore.client import Config
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models import AuditArchive, AuditLog, MerkleAnchor
+from .merkle_service import MerkleService
+
+logger = logging.getLogger(__name__)
+
+s3_client = boto3.client(
+    's3',
+    endpoint_url=settings.S3_ENDPOINT,
+    aws_access_key_id=settings.S3_ACCESS_KEY,
+    aws_secret_access_key=settings.S3_SECRET_KEY,
+    region_name=settings.S3_REGION,
+    config=Config(signature_version='s3v4'),
+    use_ssl=settings.S3_USE_SSL
+)
+
+# audit_logs_partition_name() in migration 012
+PARTITION_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+DEFAULT_PARTITION = "audit_logs_default"
+
+EXPORT_BATCH = 5000
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) month"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding month"""
+    return f"audit_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def _archive_row(log: AuditLog) -> Dict[str, Any]:
+    """One exported entry, with every field the record hash covers"""
+    return {
+        "sequence": log.sequence,
+        "audit_id": str(log.audit_id),
+        "actor_id": str(log.actor_id) if log.actor_id else None,
+        "action": log.action,
+        "entity_type": log.entity_type,
+        "entity_id": str(log.entity_id) if log.entity_id else None,
+        "payload": log.payload,
+        "ip_address": str(log.ip_address) if log.ip_address else None,
+        "user_agent": log.user_agent,
+        "created_at": log.created_at.isoformat(),
+        "prev_hash": log.prev_hash,
+        "record_hash": log.record_hash,
+    }
+
+
+class AuditPartitionService:
+    """Creates future partitions and archives expired ones"""
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int = settings.AUDIT_PARTITION_MONTHS_AHEAD) -> int:
+        """
+        Create the partitions for this month and the next months_ahead months.
+
+        Returns:
+            Number of partitions created
+        """
+        this_month = month_start(datetime.utcnow().date())
+        created = db.execute(
+            text("SELECT ensure_audit_log_partitions(:from_month, :to_month)"),
+            {"from_month": this_month, "to_month": add_months(this_month, months_ahead)}
+        ).scalar()
+        db.commit()
+        if created:
+            logger.info(f"Created {created} audit_logs partition(s)")
+        return created
+
+    @staticmethod
+    def list_partitions(db: Session) -> List[Dict[str, Any]]:
+        """Monthly partitions, oldest first, with planner row estimates and size"""
+        rows = db.execute(text(
+            "SELECT c.relname, c.reltuples::BIGINT AS estimated_rows, "
+            "pg_total_relation_size(c.oid) AS total_bytes "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'audit_logs'::regclass"
+        )).all()
+
+        partitions = []
+        for row in rows:
+            match = PARTITION_NAME.match(row.relname)
+            if not match:
+                continue
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            partitions.append({
+                "partition_name": row.relname,
+                "month": month,
+                "range_start": datetime.combine(month, datetime.min.time()),
+                "range_end": datetime.combine(add_months(month, 1), datetime.min.time()),
+                "estimated_rows": max(row.estimated_rows, 0),
+                "total_bytes": row.total_bytes,
+            })
+        return sorted(partitions, key=lambda partition: partition["month"])
+
+    @staticmethod
+    def _anchor_month(db: Session, month: date) -> List[MerkleAnchor]:
+        """Daily Merkle anchors for every day of the month (existing ones are kept)"""
+        day = month
+        while day < add_months(month, 1):
+            MerkleService.anchor_day(db, "audit_logs", day)
+            day += timedelta(days=1)
+        return db.query(MerkleAnchor).filter(
+            MerkleAnchor.source == "audit_logs",
+            MerkleAnchor.anchor_date >= month,
+            MerkleAnchor.anchor_date < add_months(month, 1)
+        ).order_by(MerkleAnchor.anchor_date).all()
+
+    @staticmethod
+    def archive_partition(db: Session, month: date, s3=None) -> AuditArchive:
+        """
+        Export one month to object storage, then detach and drop its partition.
+
+        The month is anchored first, so inclusion proofs for its entries keep
+        working from merkle_nodes after the rows are gone. The export is
+        gzipped NDJSON in sequence order; a JSON manifest next to it records
+        the chain boundaries (first prev_hash, last record_hash), the daily
+        anchors and the object's SHA-256. Only the oldest partition can be
+        archived, so audit_logs always holds a contiguous tail of the chain.
+
+        Raises:
+            ValueError: If the partition does not exist, is not the oldest,
+                or rows for the month were written to the default partition
+        """
+        s3 = s3 or s3_client
+        month = month_start(month)
+        name = partition_name(month)
+        range_start = datetime.combine(month, datetime.min.time())
+        range_end = datetime.combine(add_months(month, 1), datetime.min.time())
+
+        partitions = [partition["month"] for partition in AuditPartitionService.list_partitions(db)]
+        if month not in partitions:
+            raise ValueError(f"Partition {name} does not exist")
+        if partitions[0] != month:
+            raise ValueError(f"Partition {name} is not the oldest; archive {partition_name(partitions[0])} first")
+        stray = db.execute(
+            text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end"),
+            {"start": range_start, "end": range_end}
+        ).scalar()
+        if stray:
+            raise ValueError(f"{DEFAULT_PARTITION} holds {stray} row(s) for {month:%Y-%m}; move them before archiving")
+
+        anchors = AuditPartitionService._anchor_month(db, month)
+
+        object_key = f"{settings.AUDIT_ARCHIVE_PREFIX}/{name}.ndjson.gz"
+        manifest_key = f"{settings.AUDIT_ARCHIVE_PREFIX}/{name}.manifest.json"
+        row_count, first, last = 0, None, None
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+            with gzip.GzipFile(fileobj=spool, mode="wb") as archive:
+                logs = db.query(AuditLog).filter(
+                    AuditLog.created_at >= range_start,
+                    AuditLog.created_at < range_end
+                ).order_by(AuditLog.sequence).yield_per(EXPORT_BATCH)
+                for log in logs:
+                    row = _archive_row(log)
+                    archive.write(json.dumps(row, separators=(",", ":")).encode("utf-8") + b"\n")
+                    first = first or row
+                    last = row
+                    row_count += 1
+            db.commit()  # end the export transaction before the upload
+
+            digest = hashlib.sha256()
+            spool.seek(0)
+            for chunk in iter(lambda: spool.read(1024 * 1024), b""):
+                digest.update(chunk)
+            spool.seek(0)
+            s3.upload_fileobj(spool, settings.S3_BUCKET, object_key, ExtraArgs={"ContentType": "application/gzip"})
+
+        archive_row = AuditArchive(
+            partition_name=name,
+            range_start=range_start,
+            range_end=range_end,
+            row_count=row_count,
+            first_sequence=first["sequence"] if first else None,
+            last_sequence=last["sequence"] if last else None,
+            first_prev_hash=first["prev_hash"] if first else None,
+            last_record_hash=last["record_hash"] if last else None,
+            object_key=object_key,
+            manifest_key=manifest_key,
+            sha256=digest.hexdigest()
+        )
+        manifest = {
+            "partition_name": name,
+            "range_start": range_start.isoformat(),
+            "range_end": range_end.isoformat(),
+            "row_count": row_count,
+            "first_sequence": archive_row.first_sequence,
+            "last_sequence": archive_row.last_sequence,
+            "first_prev_hash": archive_row.first_prev_hash,
+            "last_record_hash": archive_row.last_record_hash,
+            "object_key": object_key,
+            "sha256": archive_row.sha256,
+            "merkle_anchors": [{
+                "anchor_date": anchor.anchor_date.isoformat(),
+                "leaf_count": anchor.leaf_count,
+                "root_hash": anchor.root_hash,
+            } for anchor in anchors],
+        }
+        s3.put_object(
+            Bucket=settings.S3_BUCKET,
+            Key=manifest_key,
+            Body=json.dumps(manifest, indent=2).encode("utf-8"),
+            ContentType="application/json"
+        )
+
+        # Detaching locks the partition, so the count below is final
+        db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+        detached_rows = db.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        if detached_rows != row_count:
+            db.rollback()
+            raise ValueError(f"{name} changed during export ({detached_rows} rows, {row_count} exported)")
+        db.add(archive_row)
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+
+        logger.info(f"Archived {name}: {row_count} rows to s3://{settings.S3_BUCKET}/{object_key}")
+        return archive_row
+
+    @staticmethod
+    def archive_before(db: Session, cutoff: datetime, s3=None) -> List[AuditArchive]:
+        """
+        Archive every partition whose month ended on or before cutoff, oldest first.
+
+        Returns:
+            The archives written
+        """
+        archives = []
+        for partition in AuditPartitionService.list_partitions(db):
+            if partition["range_end"] > cutoff:
+                break
+            archives.append(AuditPartitionService.archive_partition(db, partition["month"], s3=s3))
+        return archives
+
+    @staticmethod
+    def archive_expired(
+        db: Session,
+        retention_months: int = settings.AUDIT_RETENTION_MONTHS,
+        s3=None
+    ) -> List[AuditArchive]:
+        """Archive the partitions older than the last retention_months months"""
+        cutoff_month = add_months(month_start(datetime.utcnow().date()), -retention_months)
+        return AuditPartitionService.archive_before(
+            db, datetime.combine(cutoff_month, datetime.min.time()), s3=s3
+        )
+
+    @staticmethod
+    def status(db: Session) -> Dict[str, Any]:
+        """Live partitions, rows outside every partition and archived months"""
+        default_rows = db.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar()
+        archives = db.query(AuditArchive).order_by(AuditArchive.range_start).all()
+        archived_rows = db.query(func.coalesce(func.sum(AuditArchive.row_count), 0)).scalar()
+        return {
+            "partitions": [
+                {**partition, "month": partition["month"].isoformat(),
+                 "range_start": partition["range_start"].isoformat(),
+                 "range_end": partition["range_end"].isoformat()}
+                for partition in AuditPartitionService.list_partitions(db)
+            ],
+            "default_partition_rows": default_rows,
+            "archived_rows": int(archived_rows),
+            "archives": [{
+                "partition_name": archive.partition_name,
+                "range_start": archive.range_start.isoformat(),
+                "range_end": archive.range_end.isoformat(),
+                "row_count": archive.row_count,
+                "last_sequence": archive.last_sequence,
+                "object_key": archive.object_key,
+                "archived_at": archive.archived_at.isoformat() if archive.archived_at else None,
+            } for archive in archives],
+        }
@@ -8,8 +8,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text, func
 from datetime import datetime, timedelta
 from contextlib import contextmanager
+from uuid import UUID
 
 from ..models import AuditLog, User
+from .audit_stats import AuditStatsService
+from .audit_writer import record_audit
 
 
 class AuditService:
@@ -49,10 +52,14 @@ class AuditService:
         payload: Optional[Dict] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
-    ) -> AuditLog:
+    ) -> UUID:
         """
         Create an audit log entry.
 
+        The entry is recorded through the audit writer (see audit_writer.py):
+        chained in this transaction, or committed to the outbox with it and
+        chained in the background, depending on AUDIT_WRITER_MODE.
+
         Args:
             db: Database session
             actor: The user performing the action
@@ -64,47 +71,19 @@ class AuditService:
             user_agent: Client user agent
 
         Returns:
-            The created AuditLog entry
+            The audit_id of the entry
         """
-        from ..core.security import calculate_audit_hash
-
-        # Get the previous audit log for hash chaining
-        prev_log = (
-            db.query(AuditLog)
-            .order_by(AuditLog.created_at.desc())
-            .first()
-        )
-        prev_hash = prev_log.record_hash if prev_log else None
-
-        now = datetime.utcnow()
-        record_hash = calculate_audit_hash(
-            actor_id=str(actor.user_id),
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            payload=payload or {},
-            created_at=now.isoformat(),
-            prev_hash=prev_hash
-        )
-
-        audit_log = AuditLog(
+        return record_audit(
+            db,
             actor_id=actor.user_id,
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
-            payload=payload or {},
+            payload=payload,
             ip_address=ip_address,
-            user_agent=user_agent,
-            prev_hash=prev_hash,
-            record_hash=record_hash
+            user_agent=user_agent
         )
 
-        db.add(audit_log)
-        db.commit()
-        db.refresh(audit_log)
-
-        return audit_log
-
     @staticmethod
     def get_audit_logs(
         db: Session,
@@ -215,59 +194,33 @@ class AuditService:
         start_date = datetime.utcnow() - timedelta(days=days)
 
         # Total count
-        total = (
-            db.query(func.count(AuditLog.audit_id))
-            .filter(AuditLog.created_at >= start_date)
-            .scalar()
-        )
+        totals = AuditStatsService.counts([], start_date)
+        total = db.query(totals.c.event_count).scalar()
 
         # Count by action
-        by_action = (
-            db.query(
-                AuditLog.action,
-                func.count(AuditLog.audit_id).label("count")
-            )
-            .filter(AuditLog.created_at >= start_date)
-            .group_by(AuditLog.action)
-            .all()
-        )
+        actions = AuditStatsService.counts(["action"], start_date)
+        by_action = db.query(actions.c.action, actions.c.event_count).all()
 
         # Count by entity type
-        by_entity = (
-            db.query(
-                AuditLog.entity_type,
-                func.count(AuditLog.audit_id).label("count")
-            )
-            .filter(AuditLog.created_at >= start_date)
-            .group_by(AuditLog.entity_type)
-            .all()
-        )
+        entities = AuditStatsService.counts(["entity_type"], start_date)
+        by_entity = db.query(entities.c.entity_type, entities.c.event_count).all()
 
-        # Most active users
+        # Most active users, with usernames in the same query
+        actors = AuditStatsService.counts(["actor_id"], start_date)
         active_users = (
-            db.query(
-                AuditLog.actor_id,
-                func.count(AuditLog.audit_id).label("count")
-            )
-            .filter(
-                AuditLog.created_at >= start_date,
-                AuditLog.actor_id.isnot(None)
-            )
-            .group_by(AuditLog.actor_id)
-            .order_by(func.count(AuditLog.audit_id).desc())
+            db.query(actors.c.actor_id, User.username, actors.c.event_count)
+            .outerjoin(User, User.user_id == actors.c.actor_id)
+            .filter(actors.c.actor_id.isnot(None))
+            .order_by(actors.c.event_count.desc())
             .limit(10)
             .all()
         )
 
-        # Enrich active users with usernames
-        enriched_users = []
-        for user_id, count in active_users:
-            user = db.query(User).filter(User.user_id == user_id).first()
-            enriched_users.append({
-                "user_id": str(user_id),
-                "username": user.username if user else "Unknown",
-                "count": count
-            })
+        enriched_users = [{
+            "user_id": str(user_id),
+            "username": username or "Unknown",
+            "count": count
+        } for user_id, username, count in active_users]
 
         return {
             "period_days": days,
@@ -280,75 +233,71 @@ class AuditService:
     @staticmethod
     def cleanup_old_logs(db: Session, days_to_keep: int = 90) -> int:
         """
-        Delete audit logs older than specified days.
+        Archive and drop audit logs older than specified days.
+
+        audit_logs is append-only, so retention works on whole monthly
+        partitions: months that ended before the cutoff are exported to
+        object storage and dropped (see AuditPartitionService). Entries of
+        the month containing the cutoff are kept.
 
         Args:
             db: Database session
             days_to_keep: Number of days of logs to retain
 
         Returns:
-            Number of logs deleted
+            Number of logs archived
         """
+        from .audit_partitions import AuditPartitionService
+
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
-        result = (
-            db.query(AuditLog)
-            .filter(AuditLog.created_at < cutoff_date)
-            .delete()
-        )
-        db.commit()
-        return result
+        archives = AuditPartitionService.archive_before(db, cutoff_date)
+        return sum(archive.row_count for archive in archives)
 
     @staticmethod
-    def verify_chain_integrity(db: Session, limit: int = 1000) -> Dict[str, Any]:
+    def verify_chain_integrity(
+        db: Session,
+        limit: int = 1000,
+        from_sequence: int = 1
+    ) -> Dict[str, Any]:
         """
-        Verify the integrity of the audit log hash chain.
+        Verify a range of the audit log hash chain, in sequence order.
+
+        Runs server-side in one call (verify_audit_chain(), migrations 010
+        and 023); the range's first entry is checked against the entry
+        before it, or against the newest archive's last entry once older
+        months are archived. Archived sequences are skipped.
+
+        Args:
+            db: Database session
+            limit: Number of sequence positions to check
+            from_sequence: First sequence number of the range
 
         Returns:
             Dict with verification result and any broken links
         """
-        from ..core.security import calculate_audit_hash
-
-        logs = (
-            db.query(AuditLog)
-            .order_by(AuditLog.created_at.asc())
-            .limit(limit)
-            .all()
-        )
-
-        broken_links = []
-        prev_hash = None
-
-        for log in logs:
-            expected_hash = calculate_audit_hash(
-                actor_id=str(log.actor_id) if log.actor_id else "",
-                action=log.action,
-                entity_type=log.entity_type,
-                entity_id=str(log.entity_id) if log.entity_id else "",
-                payload=log.payload or {},
-                created_at=log.created_at.isoformat() if log.created_at else "",
-                prev_hash=prev_hash
-            )
+        to_sequence = from_sequence + limit - 1
 
-            if log.record_hash != expected_hash:
-                broken_links.append({
-                    "audit_id": str(log.audit_id),
-                    "expected_hash": expected_hash,
-                    "actual_hash": log.record_hash,
-                    "created_at": log.created_at.isoformat() if log.created_at else None
-                })
+        logs_checked = db.query(func.count(AuditLog.audit_id)).filter(
+            AuditLog.sequence.between(from_sequence, to_sequence)
+        ).scalar()
 
-            if prev_hash is not None and log.prev_hash != prev_hash:
-                broken_links.append({
-                    "audit_id": str(log.audit_id),
-                    "error": "prev_hash mismatch",
-                    "expected_prev_hash": prev_hash,
-                    "actual_prev_hash": log.prev_hash
-                })
+        rows = db.execute(
+            text("SELECT * FROM verify_audit_chain(:from_sequence, :to_sequence)"),
+            {"from_sequence": from_sequence, "to_sequence": to_sequence}
+        ).all()
 
-            prev_hash = log.record_hash
+        broken_links = [{
+            "sequence": row.sequence,
+            "audit_id": str(row.audit_id),
+            "error": row.error,
+            "expected": row.expected,
+            "actual": row.actual
+        } for row in rows]
 
         return {
             "is_valid": len(broken_links) == 0,
-            "logs_checked": len(logs),
+            "from_sequence": from_sequence,
+            "to_sequence": to_sequence,
+            "logs_checked": logs_checked,
             "broken_links": broken_links
         }
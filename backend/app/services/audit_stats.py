@@ -0,0 +1,160 @@
+"""
+Audit Statistics Rollups
+Hourly audit event counts, advanced incrementally along the audit chain
+"""
+
+from typing import Optional, Sequence
+from datetime import datetime, timedelta
+import logging
+
+from sqlalchemy import BigInteger, and_, func, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models import AuditLog, AuditStatsHourly, AuditStatsState
+
+logger = logging.getLogger(__name__)
+
+CHAIN_ID = "audit"
+REFRESH_BATCH = 100000
+
+# Dimensions a count can be grouped by, as rollup and raw columns
+DIMENSIONS = ("bucket", "action", "entity_type", "actor_id")
+
+
+def _raw_columns():
+    return {
+        "bucket": func.date_trunc('hour', AuditLog.created_at),
+        "action": AuditLog.action,
+        "entity_type": AuditLog.entity_type,
+        "actor_id": AuditLog.actor_id,
+    }
+
+
+def _hour_floor(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _hour_ceil(value: datetime) -> datetime:
+    floor = _hour_floor(value)
+    return floor if floor == value else floor + timedelta(hours=1)
+
+
+class AuditStatsService:
+    """Maintains and reads the hourly audit statistics rollup"""
+
+    @staticmethod
+    def refresh(db: Session, max_rows: Optional[int] = REFRESH_BATCH) -> int:
+        """
+        Roll up audit entries appended since the last refresh.
+
+        One grouped INSERT ... ON CONFLICT per call; the state row is locked
+        so concurrent refreshes queue instead of counting entries twice.
+
+        Args:
+            db: Database session (committed)
+            max_rows: Sequence positions to roll up per call (None: all)
+
+        Returns:
+            Number of sequence positions rolled up
+        """
+        db.execute(
+            insert(AuditStatsState)
+            .values(chain_id=CHAIN_ID, rolled_up_sequence=0)
+            .on_conflict_do_nothing(index_elements=["chain_id"])
+        )
+        state = db.query(AuditStatsState).filter(
+            AuditStatsState.chain_id == CHAIN_ID
+        ).with_for_update().one()
+
+        from_sequence = state.rolled_up_sequence
+        head = db.query(func.max(AuditLog.sequence)).scalar() or 0
+        to_sequence = min(head, from_sequence + max_rows) if max_rows else head
+        if to_sequence <= from_sequence:
+            db.commit()
+            return 0
+
+        raw = _raw_columns()
+        grouped = select(
+            *[raw[dimension] for dimension in DIMENSIONS],
+            func.count()
+        ).where(
+            AuditLog.sequence > from_sequence,
+            AuditLog.sequence <= to_sequence
+        ).group_by(*[raw[dimension] for dimension in DIMENSIONS])
+
+        statement = insert(AuditStatsHourly).from_select([*DIMENSIONS, "event_count"], grouped)
+        db.execute(statement.on_conflict_do_update(
+            constraint="uq_audit_stats_hourly_key",
+            set_={"event_count": AuditStatsHourly.event_count + statement.excluded.event_count}
+        ))
+
+        state.rolled_up_sequence = to_sequence
+        state.updated_at = datetime.utcnow()
+        db.commit()
+
+        logger.info(f"Rolled up audit sequences {from_sequence + 1}..{to_sequence}")
+        return to_sequence - from_sequence
+
+    @staticmethod
+    def counts(
+        dimensions: Sequence[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ):
+        """
+        Event counts grouped by dimensions over [start, end).
+
+        Whole hours below the rollup watermark come from audit_stats_hourly;
+        raw audit rows are only read for the unrolled tail and for partial
+        hours at the edges of the range.
+
+        Args:
+            dimensions: Any of DIMENSIONS (bucket is the hour)
+            start: Inclusive lower bound on created_at
+            end: Exclusive upper bound on created_at
+
+        Returns:
+            Subquery with one column per dimension plus event_count
+        """
+        raw = _raw_columns()
+        watermark = func.coalesce(
+            select(AuditStatsState.rolled_up_sequence)
+            .where(AuditStatsState.chain_id == CHAIN_ID)
+            .scalar_subquery(),
+            0
+        )
+
+        rollup_filters, raw_filters, unrolled = [], [], [AuditLog.sequence > watermark]
+        if start is not None:
+            rollup_filters.append(AuditStatsHourly.bucket >= _hour_ceil(start))
+            raw_filters.append(AuditLog.created_at >= start)
+            if _hour_ceil(start) != start:
+                unrolled.append(AuditLog.created_at < _hour_ceil(start))
+        if end is not None:
+            rollup_filters.append(AuditStatsHourly.bucket < _hour_floor(end))
+            raw_filters.append(AuditLog.created_at < end)
+            if _hour_floor(end) != end:
+                unrolled.append(AuditLog.created_at >= _hour_floor(end))
+
+        rolled_up = select(
+            *[getattr(AuditStatsHourly, dimension).label(dimension) for dimension in dimensions],
+            func.sum(AuditStatsHourly.event_count).label("event_count")
+        ).where(*rollup_filters).group_by(
+            *[getattr(AuditStatsHourly, dimension) for dimension in dimensions]
+        )
+
+        tail = select(
+            *[raw[dimension].label(dimension) for dimension in dimensions],
+            func.count().label("event_count")
+        ).where(and_(*raw_filters, or_(*unrolled))).group_by(
+            *[raw[dimension] for dimension in dimensions]
+        )
+
+        combined = union_all(rolled_up, tail).subquery()
+        return select(
+            *[combined.c[dimension] for dimension in dimensions],
+            func.sum(combined.c.event_count).cast(BigInteger).label("event_count")
+        ).group_by(
+            *[combined.c[dimension] for dimension in dimensions]
+        ).subquery()
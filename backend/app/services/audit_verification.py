@@ -0,0 +1,269 @@
+"""
+Audit Chain Verification Job
+Streams audit_logs in sequence order and re-hashes chunks across a process pool
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+import logging
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from ..core.database import engine as default_engine
+from ..core.security import calculate_audit_hash
+from ..models import AuditArchive, AuditChainBreak, AuditLog, AuditVerificationCheckpoint
+
+logger = logging.getLogger(__name__)
+
+CHAIN_ID = "audit"
+DEFAULT_CHUNK_SIZE = 5000
+
+# Row layout shipped to workers (plain values, cheap to pickle)
+_SEQ, _ID, _ACTOR, _ACTION, _ENTITY_TYPE, _ENTITY_ID, _PAYLOAD, _CREATED, _PREV, _HASH = range(10)
+
+
+def _row_values(row) -> Tuple:
+    """Audit row as the plain values calculate_audit_hash expects"""
+    return (
+        row.sequence,
+        str(row.audit_id),
+        str(row.actor_id) if row.actor_id else "",
+        row.action,
+        row.entity_type,
+        str(row.entity_id) if row.entity_id else "",
+        row.payload or {},
+        row.created_at.isoformat() if row.created_at else "",
+        row.prev_hash,
+        row.record_hash,
+    )
+
+
+def _break(row: Tuple, error: str, expected: Optional[str], actual: Optional[str]) -> Dict[str, Any]:
+    return {
+        "sequence": row[_SEQ],
+        "audit_id": row[_ID],
+        "error": error,
+        "expected": expected,
+        "actual": actual,
+    }
+
+
+def verify_chunk(rows: List[Tuple]) -> Dict[str, Any]:
+    """
+    Verify one sequence-ordered chunk (runs in a worker process).
+
+    Each row's hash is recomputed from its own stored prev_hash, so chunks
+    are independent; links between chunks are checked by the caller from
+    the returned first/last values.
+    """
+    broken = []
+    unhashed = 0
+    prev = None
+
+    for row in rows:
+        if prev is not None:
+            if row[_SEQ] != prev[_SEQ] + 1:
+                broken.append(_break(row, "sequence gap", str(prev[_SEQ] + 1), str(row[_SEQ])))
+            if row[_PREV] != prev[_HASH]:
+                broken.append(_break(row, "prev_hash mismatch", prev[_HASH], row[_PREV]))
+
+        if row[_HASH] is None:
+            # Written before the chain was enforced
+            unhashed += 1
+        else:
+            expected = calculate_audit_hash(
+                actor_id=row[_ACTOR],
+                action=row[_ACTION],
+                entity_type=row[_ENTITY_TYPE],
+                entity_id=row[_ENTITY_ID],
+                payload=row[_PAYLOAD],
+                created_at=row[_CREATED],
+                prev_hash=row[_PREV]
+            )
+            if expected != row[_HASH]:
+                broken.append(_break(row, "hash mismatch", expected, row[_HASH]))
+        prev = row
+
+    return {
+        "first": rows[0],
+        "last_sequence": rows[-1][_SEQ],
+        "last_hash": rows[-1][_HASH],
+        "rows": len(rows),
+        "unhashed": unhashed,
+        "broken": broken,
+    }
+
+
+class AuditChainVerifier:
+    """
+    Full audit-chain verification, resumable from a checkpoint.
+
+    The reader streams rows through a server-side cursor; up to
+    2 x workers chunks are in flight, so memory stays bounded by chunk size.
+    Results are reconciled strictly in sequence order: the first row of each
+    chunk must link to the last row of the previous one. After every chunk
+    the checkpoint and any broken links are committed, so progress and
+    findings are visible while the job runs and a restart resumes there.
+    """
+
+    def __init__(
+        self,
+        bind: Engine = default_engine,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.bind = bind
+        self.chunk_size = chunk_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.progress_callback = progress_callback
+        self._session_factory = sessionmaker(bind=bind)
+
+    def _load_checkpoint(self, session, resume: bool) -> AuditVerificationCheckpoint:
+        checkpoint = session.get(AuditVerificationCheckpoint, CHAIN_ID)
+        if checkpoint is None:
+            checkpoint = AuditVerificationCheckpoint(chain_id=CHAIN_ID)
+            session.add(checkpoint)
+        if not resume:
+            checkpoint.verified_sequence = 0
+            checkpoint.verified_hash = None
+            checkpoint.rows_checked = 0
+            checkpoint.unhashed_rows = 0
+            checkpoint.broken_count = 0
+            session.query(AuditChainBreak).delete()
+
+        # Archived partitions are no longer in audit_logs: the live chain
+        # starts after the newest archive's last entry
+        boundary = session.query(AuditArchive.last_sequence, AuditArchive.last_record_hash).filter(
+            AuditArchive.last_sequence.isnot(None)
+        ).order_by(AuditArchive.last_sequence.desc()).first()
+        if boundary and (checkpoint.verified_sequence or 0) < boundary.last_sequence:
+            checkpoint.verified_sequence, checkpoint.verified_hash = boundary
+
+        checkpoint.status = "running"
+        checkpoint.started_at = datetime.utcnow()
+        session.commit()
+        return checkpoint
+
+    def _reconcile(self, result: Dict[str, Any], carry: Tuple[int, Optional[str]]) -> List[Dict[str, Any]]:
+        """Check the link between the previous chunk and this one"""
+        last_sequence, last_hash = carry
+        first = result["first"]
+        broken = []
+        if first[_SEQ] != last_sequence + 1:
+            broken.append(_break(first, "sequence gap", str(last_sequence + 1), str(first[_SEQ])))
+        if first[_PREV] != last_hash:
+            broken.append(_break(first, "prev_hash mismatch", last_hash, first[_PREV]))
+        return broken + result["broken"]
+
+    def run(self, resume: bool = True, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Verify the chain from the checkpoint (or from genesis).
+
+        Args:
+            resume: Continue after the last checkpoint (after a completed run,
+                this checks only entries appended since) instead of starting over
+            max_rows: Stop after roughly this many rows (for time-boxed runs)
+
+        Returns:
+            Summary with rows checked, broken link count and throughput
+        """
+        session = self._session_factory()
+        checkpoint = self._load_checkpoint(session, resume)
+        resumed_from = checkpoint.verified_sequence
+        carry = (checkpoint.verified_sequence, checkpoint.verified_hash)
+
+        started = time.monotonic()
+        run_rows = 0
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        pending: "deque[Future]" = deque()
+
+        def settle(result: Dict[str, Any]) -> None:
+            nonlocal carry, run_rows
+            broken = self._reconcile(result, carry)
+            for link in broken:
+                session.add(AuditChainBreak(**link))
+                logger.warning(f"Audit chain break at sequence {link['sequence']}: {link['error']}")
+
+            run_rows += result["rows"]
+            carry = (result["last_sequence"], result["last_hash"])
+            elapsed = max(time.monotonic() - started, 1e-6)
+
+            checkpoint.verified_sequence, checkpoint.verified_hash = carry
+            checkpoint.rows_checked += result["rows"]
+            checkpoint.unhashed_rows += result["unhashed"]
+            checkpoint.broken_count += len(broken)
+            checkpoint.rows_per_second = round(run_rows / elapsed, 1)
+            session.commit()
+
+            if self.progress_callback:
+                self.progress_callback({
+                    "verified_sequence": carry[0],
+                    "rows_checked": checkpoint.rows_checked,
+                    "broken_count": checkpoint.broken_count,
+                    "rows_per_second": float(checkpoint.rows_per_second)
+                })
+
+        query = select(
+            AuditLog.sequence, AuditLog.audit_id, AuditLog.actor_id, AuditLog.action,
+            AuditLog.entity_type, AuditLog.entity_id, AuditLog.payload,
+            AuditLog.created_at, AuditLog.prev_hash, AuditLog.record_hash
+        ).where(
+            AuditLog.sequence > carry[0]
+        ).order_by(AuditLog.sequence)
+
+        try:
+            with self.bind.connect() as conn:
+                # Server-side cursor: rows arrive chunk by chunk
+                result = conn.execution_options(yield_per=self.chunk_size).execute(query)
+                read = 0
+                for partition in result.partitions(self.chunk_size):
+                    rows = [_row_values(row) for row in partition]
+                    read += len(rows)
+
+                    if pool is None:
+                        settle(verify_chunk(rows))
+                    else:
+                        pending.append(pool.submit(verify_chunk, rows))
+                        if len(pending) >= self.workers * 2:
+                            settle(pending.popleft().result())
+
+                    if max_rows is not None and read >= max_rows:
+                        break
+
+                while pending:
+                    settle(pending.popleft().result())
+
+            finished = max_rows is None or read < max_rows
+            checkpoint.status = "completed" if finished else "running"
+            session.commit()
+        except Exception:
+            session.rollback()
+            checkpoint = session.get(AuditVerificationCheckpoint, CHAIN_ID)
+            checkpoint.status = "failed"
+            session.commit()
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        elapsed = time.monotonic() - started
+        summary = {
+            "status": checkpoint.status,
+            "resumed_from_sequence": resumed_from,
+            "verified_sequence": checkpoint.verified_sequence,
+            "rows_checked": checkpoint.rows_checked,
+            "rows_this_run": run_rows,
+            "unhashed_rows": checkpoint.unhashed_rows,
+            "broken_count": checkpoint.broken_count,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(run_rows / elapsed, 1) if elapsed > 0 else None,
+        }
+        session.close()
+        return summary
@@ -0,0 +1,380 @@
+"""
+Buffered Audit Writer
+Takes audit-chain appends off the request path and writes them in batches
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from sqlalchemy import delete, event, func, insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import AuditLog, AuditOutbox
+from .audit_chain import append_to_chain
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EVENT_FIELDS = (
+    "audit_id", "actor_id", "action", "entity_type", "entity_id",
+    "payload", "ip_address", "user_agent", "created_at",
+)
+
+# Session.info keys for events waiting on the request transaction
+_PENDING_EVENTS = "audit_pending_events"
+_OUTBOX_WRITTEN = "audit_outbox_written"
+
+
+class AuditWriter:
+    """
+    Background writer for the audit chain.
+
+    Events arrive two ways:
+    - durable events are committed to audit_outbox with the request's own
+      transaction, so they survive a crash; the writer moves them into
+      audit_logs
+    - best-effort events are handed over in memory after the request
+      commits, through a bounded queue; a full queue blocks the caller for
+      up to put_timeout, then spills the event to the outbox
+
+    The writer thread drains both in batches: one chain-head lock and one
+    multi-row insert per batch instead of one lock held across every
+    write request's transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue: int = settings.AUDIT_QUEUE_MAX_SIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        put_timeout: float = settings.AUDIT_QUEUE_PUT_TIMEOUT_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "spilled": 0,
+            "dropped": 0,
+            "blocked_puts": 0,
+            "blocked_seconds": 0.0,
+            "written": 0,
+            "batches": 0,
+            "write_errors": 0,
+            "high_water": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit writer started")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the writer thread after writing everything still queued"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Audit writer stopped")
+
+    # -------------------------------------------------------------------------
+    # Producers
+    # -------------------------------------------------------------------------
+
+    def notify(self) -> None:
+        """Wake the writer: new outbox rows were committed"""
+        self._wake.set()
+
+    def enqueue(self, events: List[Dict[str, Any]]) -> None:
+        """Hand committed best-effort events to the writer, with backpressure"""
+        overflow = []
+        blocked_puts, blocked_seconds = 0, 0.0
+        for audit_event in events:
+            if overflow:
+                # Already waited once for this batch; don't stall the caller again
+                overflow.append(audit_event)
+                continue
+            try:
+                self._queue.put_nowait(audit_event)
+                continue
+            except queue.Full:
+                pass
+
+            started = time.monotonic()
+            try:
+                self._queue.put(audit_event, timeout=self.put_timeout)
+            except queue.Full:
+                overflow.append(audit_event)
+            blocked_puts += 1
+            blocked_seconds += time.monotonic() - started
+
+        self._count(
+            enqueued=len(events) - len(overflow),
+            blocked_puts=blocked_puts,
+            blocked_seconds=blocked_seconds
+        )
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats["high_water"] = max(self._stats["high_water"], depth)
+
+        if overflow:
+            self._spill(overflow)
+        if depth >= self.batch_size:
+            self._wake.set()
+
+    def _spill(self, events: List[Dict[str, Any]]) -> None:
+        """Write events that did not fit in the queue to the outbox"""
+        session = self.session_factory()
+        try:
+            session.execute(insert(AuditOutbox), events)
+            session.commit()
+            self._count(spilled=len(events))
+            self._wake.set()
+        except Exception:
+            session.rollback()
+            self._count(dropped=len(events))
+            logger.exception(f"Dropped {len(events)} audit event(s): queue full and outbox unavailable")
+        finally:
+            session.close()
+
+    # -------------------------------------------------------------------------
+    # Consumer
+    # -------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        backoff = self.flush_interval
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                backoff = self.flush_interval
+            except Exception:
+                logger.exception("Audit writer flush failed; retrying")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            if self._stop.is_set() and self._queue.empty():
+                return
+
+    def flush(self) -> int:
+        """
+        Write everything currently queued or in the outbox.
+
+        Called by the writer thread; safe to call directly (e.g. from a job
+        or a test) since batches are written under a lock.
+
+        Returns:
+            Number of audit rows written
+        """
+        written = 0
+        with self._write_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                written += self._write_batch(batch, from_outbox=False)
+            while True:
+                count = self._drain_outbox_batch()
+                written += count
+                if count < self.batch_size:
+                    break
+        return written
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, events: List[Dict[str, Any]], from_outbox: bool, session: Optional[Session] = None) -> int:
+        """Chain and insert one batch in a single transaction"""
+        own_session = session is None
+        session = session or self.session_factory()
+        started = time.monotonic()
+        try:
+            logs = [AuditLog(**{field: audit_event.get(field) for field in AUDIT_EVENT_FIELDS}) for audit_event in events]
+            append_to_chain(session, logs)
+            session.add_all(logs)
+            if own_session:
+                session.commit()
+        except Exception:
+            if own_session:
+                session.rollback()
+                if not from_outbox:
+                    # Keep the events: spill them so the next flush retries from the outbox
+                    self._spill(events)
+            self._count(write_errors=1)
+            raise
+        finally:
+            if own_session:
+                session.close()
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._stats_lock:
+            self._stats["written"] += len(logs)
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(logs)
+            self._stats["last_flush_ms"] = round(elapsed_ms, 2)
+            self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], round(elapsed_ms, 2))
+        return len(logs)
+
+    def _drain_outbox_batch(self) -> int:
+        """Move one batch of outbox rows into the chain"""
+        session = self.session_factory()
+        try:
+            rows = session.query(AuditOutbox).order_by(
+                AuditOutbox.outbox_id
+            ).with_for_update(skip_locked=True).limit(self.batch_size).all()
+            if not rows:
+                session.rollback()
+                return 0
+
+            events = [{field: getattr(row, field) for field in AUDIT_EVENT_FIELDS} for row in rows]
+            count = self._write_batch(events, from_outbox=True, session=session)
+            session.execute(
+                delete(AuditOutbox).where(AuditOutbox.outbox_id.in_([row.outbox_id for row in rows]))
+            )
+            session.commit()
+            return count
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def _count(self, **increments) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def metrics(self, db: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Backpressure and throughput counters.
+
+        Args:
+            db: If given, the outbox backlog is counted too
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["blocked_seconds"] = round(stats["blocked_seconds"], 3)
+        stats.update({
+            "mode": settings.AUDIT_WRITER_MODE,
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "batch_size": self.batch_size,
+        })
+        if db is not None:
+            stats["outbox_backlog"] = db.query(func.count(AuditOutbox.outbox_id)).scalar()
+        return stats
+
+
+audit_writer = AuditWriter()
+
+
+def record_audit(
+    db: Session,
+    action: str,
+    entity_type: str,
+    entity_id: Any = None,
+    actor_id: Any = None,
+    payload: Optional[Dict[str, Any]] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    durable: bool = True
+) -> uuid.UUID:
+    """
+    Record an audit event as part of the caller's transaction.
+
+    With AUDIT_WRITER_MODE=sync the AuditLog row is added directly and
+    chained when the session flushes. In async mode:
+    - durable events become audit_outbox rows, committed (or rolled back)
+      with the caller's changes and chained by the writer shortly after
+    - best-effort events (durable=False) are queued in memory once the
+      caller commits and discarded if it rolls back; they are lost if the
+      process dies before the writer runs
+
+    Returns:
+        The audit_id the entry will have
+    """
+    values = {
+        "audit_id": uuid.uuid4(),
+        "actor_id": actor_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "payload": payload or {},
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "created_at": datetime.utcnow(),
+    }
+
+    if settings.AUDIT_WRITER_MODE != "async":
+        db.add(AuditLog(**values))
+    elif durable or not audit_writer.running:
+        db.add(AuditOutbox(**values))
+        db.info[_OUTBOX_WRITTEN] = True
+    else:
+        if not db.in_transaction():
+            db.begin()  # so a rollback is seen and discards the event
+        db.info.setdefault(_PENDING_EVENTS, []).append(values)
+
+    return values["audit_id"]
+
+
+@event.listens_for(Session, "after_commit")
+def _release_audit_events(session: Session) -> None:
+    """Hand a committed request's audit events to the writer"""
+    events = session.info.pop(_PENDING_EVENTS, None)
+    if events:
+        audit_writer.enqueue(events)
+    if session.info.pop(_OUTBOX_WRITTEN, False):
+        audit_writer.notify()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_audit_events(session: Session, transaction) -> None:
+    """Events still pending when the transaction ends were rolled back"""
+    if transaction.parent is None:
+        session.info.pop(_PENDING_EVENTS, None)
+        session.info.pop(_OUTBOX_WRITTEN, None)
@@ -0,0 +1,124 @@
+"""
+Project Facet Service
+Filter-sidebar facet values with counts, computed in one GROUPING SETS query
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..models import DEO, Project
+from .search_service import normalize_term, project_search_filter
+
+# Facet name -> grouped column. Facet names double as the public filter
+# query parameter names.
+FACET_COLUMNS = {
+    "province": DEO.province,
+    "deo_id": Project.deo_id,
+    "status": Project.status,
+    "fund_year": Project.fund_year,
+    "fund_source": Project.fund_source,
+    "mode_of_implementation": Project.mode_of_implementation,
+    "project_scale": Project.project_scale,
+}
+
+# Facet results per filter combination; short TTL, also cleared on project writes
+FACET_CACHE_SIZE = 512
+FACET_CACHE_TTL_SECONDS = 60
+
+_facet_cache = TTLCache(FACET_CACHE_SIZE, FACET_CACHE_TTL_SECONDS)
+
+
+def clear_facet_cache() -> None:
+    """Drop all cached facet results (e.g. after project edits)"""
+    _facet_cache.clear()
+
+
+def _count_where(conditions: List) -> Any:
+    """COUNT(*) restricted to rows matching all conditions"""
+    if not conditions:
+        return func.count()
+    return func.count().filter(and_(*conditions))
+
+
+def compute_facets(
+    db: Session,
+    filters: Dict[str, Any],
+    search: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Facet values and counts for the current filter state.
+
+    One scan groups the filtered projects by every facet at once
+    (GROUPING SETS). Each facet's counts apply all *other* active filters
+    but not its own, so the sidebar keeps showing the alternatives to the
+    value already selected. The total applies every filter.
+
+    Args:
+        db: Database session
+        filters: Active facet filters, keyed by FACET_COLUMNS name
+        search: Optional free-text search (applies to every facet)
+
+    Returns:
+        {"total": int, "facets": {name: [{"value", "count"}, ...]}}
+    """
+    active = {name: value for name, value in filters.items()
+              if name in FACET_COLUMNS and value not in (None, '')}
+    normalized_search = normalize_term(search) if search else None
+
+    cache_key = (tuple(sorted(active.items())), normalized_search)
+    cached = _facet_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    conditions = {name: FACET_COLUMNS[name] == value for name, value in active.items()}
+    names = list(FACET_COLUMNS)
+    columns = [FACET_COLUMNS[name] for name in names]
+
+    selected = list(columns)
+    selected += [func.grouping(column).label(f"g_{name}") for name, column in zip(names, columns)]
+    selected += [
+        _count_where([cond for other, cond in conditions.items() if other != name]).label(f"n_{name}")
+        for name in names
+    ]
+    selected.append(_count_where(list(conditions.values())).label("n_total"))
+
+    query = db.query(*selected).select_from(Project).join(
+        DEO, Project.deo_id == DEO.deo_id
+    ).filter(
+        Project.status != 'deleted'
+    )
+    if normalized_search:
+        query = query.filter(project_search_filter(normalized_search))
+
+    # One grouping set per facet plus () for the overall total
+    rows = query.group_by(
+        func.grouping_sets(*columns, literal_column("()"))
+    ).all()
+
+    total = 0
+    facets: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+    for row in rows:
+        mapping = row._mapping
+        grouped = [name for name in names if mapping[f"g_{name}"] == 0]
+        if not grouped:
+            total = mapping["n_total"]
+            continue
+
+        name = grouped[0]
+        value = mapping[FACET_COLUMNS[name]]
+        count = mapping[f"n_{name}"]
+        if value in (None, ''):
+            continue
+        if count == 0 and active.get(name) != value:
+            continue
+        facets[name].append({"value": value, "count": count})
+
+    for values in facets.values():
+        values.sort(key=lambda item: (-item["count"], str(item["value"])))
+
+    result = {"total": total, "facets": facets}
+    _facet_cache.put(cache_key, result)
+    return result
@@ -0,0 +1,312 @@
+"""
+GIS Feature Import
+Bulk loading of GeoJSON, Shapefile, GeoPackage and KML files
+
+A file is read in batches of features (never as one frame) and each batch
+is prepared without the database:
+- reprojected to WGS 84 and reduced to 2D
+- invalid geometries repaired with make_valid; collections left by the
+  repair keep only their highest-dimension parts
+- features with no geometry, an unrepairable one or no valid feature_type
+  are skipped and reported by their 1-based position in the file
+
+Prepared batches are COPYed into a temporary staging table. The boundary
+check then runs as one ST_Within query over the whole import (raising a
+single summary alert), and one INSERT ... SELECT moves the features into
+gis_features, so the project geometry summary triggers run once.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+import io
+import json
+import uuid
+
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import shapely
+from pyogrio.raw import open_arrow
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..models import Alert
+from .audit_writer import record_audit
+
+# Upload format -> temporary file suffix (a Shapefile arrives as a .zip of its parts)
+IMPORT_FORMATS = {
+    "geojson": ".geojson",
+    "shapefile": ".zip",
+    "geopackage": ".gpkg",
+    "kml": ".kml",
+}
+IMPORT_FORMAT_PATTERN = f"^({'|'.join(IMPORT_FORMATS)})$"
+
+FEATURE_TYPES = ("road", "bridge", "drainage", "facility", "building", "other")
+
+# Attribute column that sets a feature's type (overriding the import default);
+# Shapefile field names are cut to 10 characters
+FEATURE_TYPE_FIELD = "feature_type"
+FEATURE_TYPE_FIELDS = (FEATURE_TYPE_FIELD, FEATURE_TYPE_FIELD[:10])
+
+IMPORT_BATCH_FEATURES = 2000
+
+# Per-feature errors returned in the report (all are counted)
+MAX_REPORTED_ERRORS = 1000
+
+# Rows of outside features kept in the geofence alert's metadata
+MAX_ALERT_ROWS = 100
+
+STAGING_COLUMNS = ["feature_id", "row_number", "feature_type", "geometry", "attributes"]
+
+_MULTI_CONSTRUCTORS = {0: shapely.multipoints, 1: shapely.multilinestrings, 2: shapely.multipolygons}
+
+
+def _batch_frame(batch: pa.RecordBatch, geometry_name: str, crs: Optional[str]) -> gpd.GeoDataFrame:
+    """GeoDataFrame of an Arrow batch with a WKB geometry column"""
+    geometries = shapely.from_wkb(batch.column(geometry_name).to_numpy(zero_copy_only=False))
+    attributes = pa.Table.from_batches([batch]).drop_columns([geometry_name]).to_pandas()
+    return gpd.GeoDataFrame(attributes, geometry=geometries, crs=crs)
+
+
+def read_feature_batches(path: str, file_format: str, layer: Optional[str] = None,
+                         batch_size: int = IMPORT_BATCH_FEATURES) -> Iterator[gpd.GeoDataFrame]:
+    """
+    Read a feature file as GeoDataFrames of up to batch_size features.
+
+    The file is read once, front to back, through a single Arrow stream.
+
+    Raises:
+        ValueError: If the file cannot be opened or read
+    """
+    # A zipped Shapefile is read in place (a bare .shp with its parts alongside also works)
+    source = f"zip://{path}" if file_format == "shapefile" and path.lower().endswith(".zip") else path
+    try:
+        with open_arrow(source, layer=layer, batch_size=batch_size, use_pyarrow=True) as (meta, reader):
+            geometry_name = meta["geometry_name"] or "wkb_geometry"
+            for batch in reader:
+                if batch.num_rows:
+                    yield _batch_frame(batch, geometry_name, meta["crs"])
+    except Exception as e:
+        raise ValueError(f"Cannot read {file_format} file: {e}") from e
+
+
+def _drop_collapsed(geometry):
+    """A repaired GeometryCollection reduced to its highest-dimension parts"""
+    parts = shapely.get_parts(shapely.get_parts(geometry))
+    dimensions = shapely.get_dimensions(parts)
+    parts = parts[dimensions == dimensions.max()]
+    if len(parts) == 1:
+        return parts[0]
+    return _MULTI_CONSTRUCTORS[int(dimensions.max())](parts)
+
+
+def prepare_batch(frame: gpd.GeoDataFrame, first_row: int,
+                  default_type: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    """
+    Validate and repair one batch of features.
+
+    Args:
+        frame: Features as read from the file
+        first_row: File position (1-based) of the first feature
+        default_type: feature_type for features without a feature_type value
+
+    Returns:
+        (rows, errors, repaired): rows to stage (row_number, feature_type,
+        geometry as hex EWKB, attributes), errors as {"row", "error"} and
+        the number of geometries repaired
+    """
+    if frame.crs is not None and frame.crs.to_epsg() != 4326:
+        frame = frame.to_crs(4326)
+
+    geometries = shapely.force_2d(np.asarray(frame.geometry.array, dtype=object))
+    missing = shapely.is_missing(geometries) | shapely.is_empty(geometries)
+    invalid = ~missing & ~shapely.is_valid(geometries)
+    if invalid.any():
+        repaired = shapely.make_valid(geometries[invalid])
+        collections = shapely.get_type_id(repaired) == shapely.GeometryType.GEOMETRYCOLLECTION
+        collections &= ~shapely.is_empty(repaired)
+        repaired[collections] = [_drop_collapsed(g) for g in repaired[collections]]
+        geometries[invalid] = repaired
+    unrepairable = invalid & shapely.is_empty(geometries)
+    ewkb = np.full(len(geometries), None, dtype=object)
+    usable = ~missing & ~unrepairable
+    ewkb[usable] = shapely.to_wkb(shapely.set_srid(geometries[usable], 4326), hex=True, include_srid=True)
+
+    attributes = frame.drop(columns=[frame.geometry.name])
+    type_field = next((field for field in FEATURE_TYPE_FIELDS if field in attributes.columns), None)
+    types = attributes.pop(type_field).tolist() if type_field else [None] * len(frame)
+    if len(attributes.columns):
+        records = json.loads(attributes.to_json(orient="records", date_format="iso", default_handler=str))
+    else:
+        records = [{} for _ in range(len(frame))]  # to_json gives no records without columns
+
+    rows, errors = [], []
+    for i, (feature_type, record) in enumerate(zip(types, records)):
+        row_number = first_row + i
+        if missing[i]:
+            errors.append({"row": row_number, "error": "Missing or empty geometry"})
+            continue
+        if unrepairable[i]:
+            errors.append({"row": row_number, "error": "Invalid geometry that cannot be repaired"})
+            continue
+        if isinstance(feature_type, str) and feature_type.strip():
+            feature_type = feature_type.strip().lower()
+        else:
+            feature_type = default_type
+        if feature_type not in FEATURE_TYPES:
+            errors.append({
+                "row": row_number,
+                "error": f"{FEATURE_TYPE_FIELD} must be one of: {', '.join(FEATURE_TYPES)}"
+            })
+            continue
+        rows.append({
+            "row_number": row_number,
+            "feature_type": feature_type,
+            "geometry": ewkb[i],
+            "attributes": record,
+        })
+    return rows, errors, int(invalid.sum() - unrepairable.sum())
+
+
+def _copy_value(value: Any) -> str:
+    """A value in COPY text format"""
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _copy_rows(db: Session, table: str, columns: List[str], rows: List[Tuple]) -> None:
+    """COPY rows into a table on the session's connection (psycopg 3 or psycopg2)"""
+    data = "".join("\t".join(_copy_value(v) for v in row) + "\n" for row in rows)
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    cursor = db.connection().connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):
+            with cursor.copy(statement) as copy:
+                copy.write(data)
+        else:
+            cursor.copy_expert(statement, io.StringIO(data))
+    finally:
+        cursor.close()
+
+
+def import_features(
+    db: Session,
+    project_id: uuid.UUID,
+    created_by: uuid.UUID,
+    path: str,
+    file_format: str,
+    layer: Optional[str] = None,
+    feature_type: Optional[str] = None,
+    source_name: Optional[str] = None,
+    batch_size: int = IMPORT_BATCH_FEATURES
+) -> Dict[str, Any]:
+    """
+    Import every valid feature of a file into a project.
+
+    Features outside the region boundary are imported, as single creates
+    are, with one geofence alert for the whole import. One audit entry
+    summarizes the import. Changes are flushed, not committed.
+
+    Returns:
+        Report with imported, repaired, skipped and outside_boundary
+        counts and the first MAX_REPORTED_ERRORS per-feature errors
+
+    Raises:
+        ValueError: If the file cannot be read
+    """
+    db.execute(text("""
+        CREATE TEMP TABLE gis_feature_import (
+            feature_id UUID NOT NULL,
+            row_number INTEGER NOT NULL,
+            feature_type VARCHAR(30) NOT NULL,
+            geometry GEOMETRY(GEOMETRY, 4326) NOT NULL,
+            attributes JSONB NOT NULL
+        ) ON COMMIT DROP
+    """))
+
+    errors: List[Dict[str, Any]] = []
+    skipped = repaired = read = 0
+    try:
+        for frame in read_feature_batches(path, file_format, layer, batch_size):
+            rows, batch_errors, batch_repaired = prepare_batch(frame, read + 1, feature_type)
+            read += len(frame)
+            repaired += batch_repaired
+            skipped += len(batch_errors)
+            errors.extend(batch_errors[:MAX_REPORTED_ERRORS - len(errors)])
+            if rows:
+                _copy_rows(db, "gis_feature_import", STAGING_COLUMNS, [
+                    (uuid.uuid4(), row["row_number"], row["feature_type"], row["geometry"], json.dumps(row["attributes"]))
+                    for row in rows
+                ])
+    except ValueError:
+        db.execute(text("DROP TABLE gis_feature_import"))
+        raise
+
+    outside = db.execute(text("""
+        WITH boundary AS (
+            SELECT geometry FROM geofencing_rules
+            WHERE rule_type = 'region_boundary' AND is_active AND project_id IS NULL
+            LIMIT 1
+        )
+        SELECT s.row_number FROM gis_feature_import s, boundary b
+        WHERE NOT ST_Within(s.geometry, b.geometry)
+        ORDER BY s.row_number
+    """)).scalars().all()
+
+    now = datetime.utcnow()
+    type_counts = dict(db.execute(text("""
+        WITH inserted AS (
+            INSERT INTO gis_features (
+                feature_id, project_id, feature_type, geometry, attributes, created_by, created_at, updated_at
+            )
+            SELECT feature_id, :project_id, feature_type, geometry, attributes, :created_by, :now, :now
+            FROM gis_feature_import
+            ORDER BY row_number
+            RETURNING feature_type
+        )
+        SELECT feature_type, count(*) FROM inserted GROUP BY feature_type
+    """), {"project_id": project_id, "created_by": created_by, "now": now}).all())
+    db.execute(text("DROP TABLE gis_feature_import"))
+    imported = sum(type_counts.values())
+
+    if outside:
+        db.add(Alert(
+            alert_id=uuid.uuid4(),
+            project_id=project_id,
+            alert_type='geofence_violation',
+            severity='warning',
+            message=f'{len(outside)} imported GIS feature(s) are outside BARMM region boundary',
+            alert_metadata={
+                'feature_count': len(outside),
+                'rows': outside[:MAX_ALERT_ROWS],
+                'source': source_name,
+                'created_by': str(created_by)
+            },
+            triggered_at=now
+        ))
+
+    report = {
+        "imported": imported,
+        "repaired": repaired,
+        "skipped": skipped,
+        "outside_boundary": len(outside),
+        "errors": errors,
+    }
+    record_audit(
+        db,
+        actor_id=created_by,
+        action="IMPORT_GIS_FEATURES",
+        entity_type="project",
+        entity_id=project_id,
+        payload={
+            "source": source_name,
+            "format": file_format,
+            "layer": layer,
+            "feature_types": type_counts,
+            **{key: value for key, value in report.items() if key != "errors"},
+        }
+    )
+    db.flush()
+    return report
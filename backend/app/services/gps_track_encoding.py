@@ -0,0 +1,292 @@
+"""
+GPS Track Transfer Encodings
+Compact alternatives to waypoint JSON for track upload and download
+
+Two encodings, both operating on the column arrays of services/gps_tracks.py:
+
+- polyline (application/vnd.ebarmm.waypoints.polyline+json): a JSON object
+  with coordinates as a Google encoded polyline (precision 6 by default,
+  about 0.1 m) and timestamps, altitudes (cm) and video offsets as
+  base64 zigzag delta varints. Lossy only in coordinate/altitude rounding.
+- packed (application/vnd.ebarmm.waypoints.packed): little-endian columnar
+  arrays behind a 12-byte header, read with numpy.frombuffer. Lossless.
+
+Both encoders and decoders are vectorized: no per-waypoint Python code.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import base64
+import binascii
+import json
+import struct
+
+import numpy as np
+
+JSON_MEDIA_TYPE = "application/json"
+POLYLINE_MEDIA_TYPE = "application/vnd.ebarmm.waypoints.polyline+json"
+PACKED_MEDIA_TYPE = "application/vnd.ebarmm.waypoints.packed"
+MEDIA_TYPES = (JSON_MEDIA_TYPE, POLYLINE_MEDIA_TYPE, PACKED_MEDIA_TYPE)
+
+DEFAULT_PRECISION = 6
+# Decimal places accepted from clients (10^7 * 180 still fits the int64 deltas)
+MAX_PRECISION = 7
+
+# Packed header: magic, version, flags, reserved, waypoint count
+_PACKED_HEADER = struct.Struct("<4sBBHI")
+_PACKED_MAGIC = b"EBWP"
+_PACKED_VERSION = 1
+_HAS_ALTITUDE = 0x01
+_HAS_VIDEO_OFFSETS = 0x02
+
+# Packed track upload: metadata JSON length, metadata JSON, packed waypoints
+_METADATA_LENGTH = struct.Struct("<I")
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """The waypoint media type to respond with for an Accept header"""
+    accept = accept or ""
+    for media_type in (PACKED_MEDIA_TYPE, POLYLINE_MEDIA_TYPE):
+        if media_type in accept:
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+# =============================================================================
+# Variable-length integer groups (shared by polyline and varint encodings)
+# =============================================================================
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return (values >> 1) ^ -(values & 1)
+
+
+def _pack_groups(values: np.ndarray, bits: int, offset: int) -> bytes:
+    """
+    Unsigned integers as little-endian groups of `bits` bits, one byte each,
+    with the next bit up marking "more groups follow" and `offset` added
+    (5/63 is Google's polyline alphabet, 7/0 is LEB128).
+    """
+    values = values.astype(np.uint64)
+    if len(values) == 0:
+        return b""
+    shift = np.uint64(bits)
+    counts = np.ones(len(values), dtype=np.int64)
+    rest = values >> shift
+    while rest.any():
+        counts += rest > 0
+        rest >>= shift
+
+    owner = np.repeat(np.arange(len(values)), counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    groups = (values[owner] >> (position.astype(np.uint64) * shift)) & np.uint64((1 << bits) - 1)
+    groups |= np.where(position < counts[owner] - 1, np.uint64(1 << bits), np.uint64(0))
+    return (groups + np.uint64(offset)).astype(np.uint8).tobytes()
+
+
+def _unpack_groups(data: bytes, bits: int, offset: int) -> np.ndarray:
+    """Inverse of _pack_groups"""
+    groups = np.frombuffer(data, dtype=np.uint8).astype(np.int64) - offset
+    if len(groups) == 0:
+        return np.empty(0, dtype=np.uint64)
+    if groups.min() < 0 or groups.max() >= 1 << (bits + 1):
+        raise ValueError("invalid character in encoded integers")
+    last = (groups & (1 << bits)) == 0
+    if not last[-1]:
+        raise ValueError("truncated encoded integers")
+
+    owner = np.concatenate([[0], np.cumsum(last)[:-1]])
+    starts = np.flatnonzero(np.concatenate([[True], last[:-1]]))
+    position = np.arange(len(groups)) - starts[owner]
+    if position.max() * bits >= 64:
+        raise ValueError("encoded integer out of range")
+    parts = (groups & ((1 << bits) - 1)).astype(np.uint64) << (position.astype(np.uint64) * np.uint64(bits))
+    values = np.zeros(int(last.sum()), dtype=np.uint64)
+    np.bitwise_or.at(values, owner, parts)
+    return values
+
+
+def encode_deltas(values: np.ndarray) -> str:
+    """Integers as base64 zigzag delta LEB128 varints"""
+    deltas = np.diff(values.astype(np.int64), prepend=np.int64(0))
+    return base64.b64encode(_pack_groups(_zigzag(deltas), 7, 0)).decode("ascii")
+
+
+def decode_deltas(text: str, count: int) -> np.ndarray:
+    values = np.cumsum(_unzigzag(_unpack_groups(base64.b64decode(text, validate=True), 7, 0)))
+    if len(values) != count:
+        raise ValueError(f"expected {count} values, got {len(values)}")
+    return values
+
+
+def encode_polyline(latitude: np.ndarray, longitude: np.ndarray, precision: int = 5) -> str:
+    """Google encoded polyline of coordinate arrays"""
+    scaled = np.round(np.column_stack([latitude, longitude]) * 10 ** precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    return _pack_groups(_zigzag(deltas.ravel()), 5, 63).decode("ascii")
+
+
+def decode_polyline(text: str, precision: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude arrays of a Google encoded polyline"""
+    deltas = _unzigzag(_unpack_groups(text.encode("ascii"), 5, 63))
+    if len(deltas) % 2:
+        raise ValueError("polyline has an odd number of values")
+    coords = np.cumsum(deltas.reshape(-1, 2), axis=0) / 10 ** precision
+    return coords[:, 0], coords[:, 1]
+
+
+# =============================================================================
+# Waypoint encodings
+# =============================================================================
+
+def validate_arrays(arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Apply GpsWaypoint's range checks to decoded column arrays"""
+    latitude, longitude = arrays["latitude"], arrays["longitude"]
+    if not (np.isfinite(latitude).all() and np.isfinite(longitude).all()):
+        raise ValueError("coordinates must be finite")
+    if (np.abs(latitude) > 90).any() or (np.abs(longitude) > 180).any():
+        raise ValueError("coordinates out of range")
+    return arrays
+
+
+def encode_polyline_waypoints(arrays: Dict[str, np.ndarray], precision: int = DEFAULT_PRECISION) -> Dict[str, Any]:
+    count = len(arrays["timestamp"])
+    altitude = arrays["altitude"]
+    missing = np.isnan(altitude)
+    offsets = arrays["video_offset_ms"]
+    return {
+        "count": count,
+        "precision": precision,
+        "coordinates": encode_polyline(arrays["latitude"], arrays["longitude"], precision),
+        "timestamps": encode_deltas(arrays["timestamp"]),
+        "altitudes_cm": None if missing.all() else encode_deltas(np.round(np.where(missing, 0, altitude) * 100)),
+        "altitude_missing": base64.b64encode(np.packbits(missing).tobytes()).decode("ascii") if missing.any() and not missing.all() else None,
+        "video_offsets_ms": encode_deltas(offsets) if (offsets >= 0).any() else None,
+    }
+
+
+def decode_polyline_waypoints(payload: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Column arrays from encode_polyline_waypoints output; ValueError if malformed"""
+    try:
+        count = int(payload["count"])
+        precision = int(payload.get("precision", DEFAULT_PRECISION))
+        if not 0 <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between 0 and {MAX_PRECISION}")
+        latitude, longitude = decode_polyline(payload["coordinates"], precision)
+        if len(latitude) != count:
+            raise ValueError(f"expected {count} coordinates, got {len(latitude)}")
+
+        altitude = np.full(count, np.nan)
+        if payload.get("altitudes_cm"):
+            altitude = decode_deltas(payload["altitudes_cm"], count) / 100
+            if payload.get("altitude_missing"):
+                bitmap = np.frombuffer(base64.b64decode(payload["altitude_missing"], validate=True), dtype=np.uint8)
+                altitude[np.unpackbits(bitmap, count=count).astype(bool)] = np.nan
+
+        offsets = np.full(count, -1, dtype=np.int64)
+        if payload.get("video_offsets_ms"):
+            offsets = decode_deltas(payload["video_offsets_ms"], count)
+
+        arrays = {
+            "longitude": longitude,
+            "latitude": latitude,
+            "altitude": altitude,
+            "timestamp": decode_deltas(payload["timestamps"], count),
+            "video_offset_ms": offsets,
+        }
+    except (KeyError, TypeError, UnicodeError, binascii.Error) as e:
+        raise ValueError(f"malformed polyline waypoints: {e}")
+    return validate_arrays(arrays)
+
+
+def encode_packed_waypoints(arrays: Dict[str, np.ndarray]) -> bytes:
+    count = len(arrays["timestamp"])
+    has_altitude = not np.isnan(arrays["altitude"]).all()
+    has_offsets = bool((arrays["video_offset_ms"] >= 0).any())
+    flags = (_HAS_ALTITUDE if has_altitude else 0) | (_HAS_VIDEO_OFFSETS if has_offsets else 0)
+
+    parts = [
+        _PACKED_HEADER.pack(_PACKED_MAGIC, _PACKED_VERSION, flags, 0, count),
+        arrays["longitude"].astype("<f8").tobytes(),
+        arrays["latitude"].astype("<f8").tobytes(),
+    ]
+    if has_altitude:
+        parts.append(arrays["altitude"].astype("<f8").tobytes())
+    parts.append(arrays["timestamp"].astype("<i8").tobytes())
+    if has_offsets:
+        parts.append(arrays["video_offset_ms"].astype("<i4").tobytes())
+    return b"".join(parts)
+
+
+def decode_packed_waypoints(data: bytes) -> Dict[str, np.ndarray]:
+    """Column arrays from encode_packed_waypoints output; ValueError if malformed"""
+    if len(data) < _PACKED_HEADER.size:
+        raise ValueError("packed waypoints too short")
+    magic, version, flags, _, count = _PACKED_HEADER.unpack_from(data)
+    if magic != _PACKED_MAGIC or version != _PACKED_VERSION:
+        raise ValueError("not packed waypoints (version 1)")
+
+    columns = [("longitude", "<f8"), ("latitude", "<f8")]
+    if flags & _HAS_ALTITUDE:
+        columns.append(("altitude", "<f8"))
+    columns.append(("timestamp", "<i8"))
+    if flags & _HAS_VIDEO_OFFSETS:
+        columns.append(("video_offset_ms", "<i4"))
+    expected = _PACKED_HEADER.size + count * sum(np.dtype(dtype).itemsize for _, dtype in columns)
+    if len(data) != expected:
+        raise ValueError(f"packed waypoints should be {expected} bytes, got {len(data)}")
+
+    arrays = {
+        "altitude": np.full(count, np.nan),
+        "video_offset_ms": np.full(count, -1, dtype=np.int64),
+    }
+    position = _PACKED_HEADER.size
+    for name, dtype in columns:
+        values = np.frombuffer(data, dtype=dtype, count=count, offset=position)
+        arrays[name] = values.astype(np.int64 if dtype[1] == "i" else np.float64)
+        position += values.nbytes
+    return validate_arrays(arrays)
+
+
+# =============================================================================
+# Track uploads
+# =============================================================================
+
+def encode_packed_track(metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> bytes:
+    """A packed track upload: GpsTrackCreate fields (minus waypoints) then packed waypoints"""
+    header = json.dumps(metadata, default=str).encode("utf-8")
+    return _METADATA_LENGTH.pack(len(header)) + header + encode_packed_waypoints(arrays)
+
+
+def decode_track_upload(media_type: str, body: bytes) -> Tuple[Dict[str, Any], Optional[Dict[str, np.ndarray]]]:
+    """
+    Split a track upload into GpsTrackCreate fields and waypoint arrays.
+
+    JSON uploads keep their waypoints list (arrays is None); polyline uploads
+    carry an "encoded_waypoints" object instead of "waypoints"; packed
+    uploads are encode_packed_track output.
+
+    Raises:
+        ValueError if the body is malformed
+    """
+    if media_type == PACKED_MEDIA_TYPE:
+        if len(body) < _METADATA_LENGTH.size:
+            raise ValueError("packed track too short")
+        length, = _METADATA_LENGTH.unpack_from(body)
+        end = _METADATA_LENGTH.size + length
+        fields = json.loads(body[_METADATA_LENGTH.size:end])
+        arrays = decode_packed_waypoints(body[end:])
+    else:
+        fields = json.loads(body)
+        arrays = None
+        if media_type == POLYLINE_MEDIA_TYPE:
+            if not isinstance(fields, dict) or not isinstance(fields.get("encoded_waypoints"), dict):
+                raise ValueError("encoded_waypoints object required")
+            arrays = decode_polyline_waypoints(fields.pop("encoded_waypoints"))
+
+    if not isinstance(fields, dict):
+        raise ValueError("track fields must be a JSON object")
+    return fields, arrays
@@ -0,0 +1,373 @@
+"""
+GPS Track Files
+Streaming GPX/KML import and export
+
+Import feeds the request body to an expat parser chunk by chunk with a
+parse target that turns track points into column arrays as they arrive:
+no element tree is built, and an invalid point stops the upload at the
+chunk that contains it. Recognised geometry, in document order:
+
+- GPX: <trk>/<trkseg>/<trkpt> and <rte>/<rtept> (lat, lon, ele, time and
+  an E-BARMM <extensions> video_offset_ms); <wpt> markers are ignored
+- KML: <gx:Track> (<when>/<gx:coord> pairs, plus a gx:SimpleArrayData
+  "video_offset_ms") and <LineString> (the mobile app's export, untimed);
+  <Point> placemarks are ignored
+
+Each segment (trkseg, rte, gx:Track, LineString) is appended to the track.
+Points without a time take the nearest earlier time (the first time in the
+file for leading points, or the caller's start time if the file has none).
+
+Export streams the same formats in blocks of waypoints, with times to the
+millisecond and video offsets, so exported files import losslessly.
+"""
+
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, XMLParser
+from xml.sax.saxutils import escape
+import math
+
+import numpy as np
+
+GPX_MEDIA_TYPE = "application/gpx+xml"
+KML_MEDIA_TYPE = "application/vnd.google-earth.kml+xml"
+FILE_MEDIA_TYPES = {"gpx": GPX_MEDIA_TYPE, "kml": KML_MEDIA_TYPE}
+# Generic XML uploads are accepted; the root element decides the format
+XML_MEDIA_TYPES = (GPX_MEDIA_TYPE, KML_MEDIA_TYPE, "application/xml", "text/xml")
+
+MAX_IMPORT_WAYPOINTS = 1_000_000
+EXPORT_BLOCK_WAYPOINTS = 2000
+
+EBARMM_NAMESPACE = "https://ebarmm.gov.ph/xmlns/routeshoot/1"
+
+_MISSING = -(2 ** 63)
+_POINT_FIELDS = ("ele", "time", "video_offset_ms")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_time(text: str) -> int:
+    """ISO 8601 time (naive = UTC) in Unix milliseconds"""
+    moment = datetime.fromisoformat(text.strip())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return round(moment.timestamp() * 1000)
+
+
+def _format_times(timestamps: np.ndarray) -> np.ndarray:
+    return np.char.add(np.datetime_as_string(timestamps.astype("datetime64[ms]"), unit="ms"), "Z")
+
+
+# Elements whose <name> names the track (not a waypoint's or point's <name>)
+_NAMED_PARENTS = ("metadata", "trk", "rte", "Document", "Folder", "Placemark")
+
+
+class _TrackTarget:
+    """ElementTree parse target accumulating GPX/KML track points"""
+
+    def __init__(self, max_waypoints: int):
+        self.max_waypoints = max_waypoints
+        self.format: Optional[str] = None
+        self.name: Optional[str] = None
+        self.segments = 0
+        self.longitude = array("d")
+        self.latitude = array("d")
+        self.altitude = array("d")
+        self.timestamp = array("q")
+        self.video_offset_ms = array("q")
+
+        self._path: List[str] = []  # Local names of the open elements
+        self._text: Optional[List[str]] = None
+        self._point: Optional[Dict[str, str]] = None
+        self._line_string = False
+        self._coordinates: Optional[str] = None  # Unparsed tail of a LineString <coordinates>
+        self._track: Optional[Dict] = None  # gx:Track being read
+        self._array_name: Optional[str] = None
+
+    # -- parser callbacks ----------------------------------------------------
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        name = _local(tag)
+        self._path.append(name)
+        if len(self._path) == 1:
+            if name not in ("gpx", "kml"):
+                raise ValueError(f"root element must be gpx or kml, not {name}")
+            self.format = name
+        elif name in ("trkpt", "rtept"):
+            self._point = {"lat": attrib.get("lat", ""), "lon": attrib.get("lon", "")}
+        elif name in ("trkseg", "rte"):
+            self.segments += 1
+        elif name == "LineString":
+            self.segments += 1
+            self._line_string = True
+        elif name == "Track":
+            self.segments += 1
+            self._track = {"start": len(self.timestamp), "when": [], "video_offset_ms": array("q")}
+        elif name == "SimpleArrayData":
+            self._array_name = attrib.get("name")
+        elif name == "coordinates" and self._line_string:
+            self._coordinates = ""
+            return
+
+        if name in ("name", "when", "coord", "value") or (self._point is not None and name in _POINT_FIELDS):
+            self._text = []
+
+    def data(self, text: str) -> None:
+        if self._coordinates is not None:
+            # Parse complete "lon,lat[,alt]" tuples as they stream in
+            tuples = (self._coordinates + text).split()
+            self._coordinates = tuples.pop() if tuples and not text[-1:].isspace() else ""
+            for item in tuples:
+                self._add_coordinate_tuple(item)
+        elif self._text is not None:
+            self._text.append(text)
+
+    def end(self, tag: str) -> None:
+        name = _local(tag)
+        self._path.pop()
+        text = "".join(self._text).strip() if self._text is not None else None
+        self._text = None
+
+        if self._coordinates is not None and name == "coordinates":
+            if self._coordinates:
+                self._add_coordinate_tuple(self._coordinates)
+            self._coordinates = None
+        elif name == "LineString":
+            self._line_string = False
+        elif name == "name" and self._point is None and self._path and self._path[-1] in _NAMED_PARENTS:
+            if self.name is None and text:
+                self.name = text
+        elif self._point is not None:
+            if name in ("trkpt", "rtept"):
+                point, self._point = self._point, None
+                self._add_point(
+                    point["lat"], point["lon"], point.get("ele"), point.get("time"), point.get("video_offset_ms")
+                )
+            elif name in _POINT_FIELDS:
+                self._point[name] = text
+        elif self._track is not None:
+            if name == "when":
+                self._track["when"].append(text)
+            elif name == "coord":
+                self._add_track_coord(text)
+            elif name == "value" and self._array_name == "video_offset_ms":
+                self._add_track_video_offset(text)
+            elif name == "Track":
+                self._end_track()
+
+    def close(self) -> None:
+        pass
+
+    # -- point handling ------------------------------------------------------
+
+    def _add_coordinate_tuple(self, item: str) -> None:
+        parts = item.split(",")
+        if len(parts) not in (2, 3):
+            raise ValueError(f"waypoint {len(self.timestamp) + 1}: invalid KML coordinate {item[:40]!r}")
+        self._add_point(parts[1], parts[0], parts[2] if len(parts) == 3 else None, None, None)
+
+    def _add_track_coord(self, coord: Optional[str]) -> None:
+        # <when> elements precede the <gx:coord> elements they pair with
+        whens = self._track["when"]
+        index = len(self.timestamp) - self._track["start"]
+        if whens and index >= len(whens):
+            raise ValueError(f"gx:Track has more <gx:coord> than <when> elements ({len(whens)})")
+        parts = (coord or "").split()
+        if len(parts) not in (2, 3):
+            raise ValueError(f"waypoint {len(self.timestamp) + 1}: invalid gx:coord {coord!r}")
+        self._add_point(parts[1], parts[0], parts[2] if len(parts) == 3 else None, whens[index] if whens else None, None)
+
+    def _add_track_video_offset(self, value: Optional[str]) -> None:
+        try:
+            self._track["video_offset_ms"].append(int(value) if value else -1)
+        except ValueError as e:
+            raise ValueError(f"gx:Track video offset: {e}")
+
+    def _end_track(self) -> None:
+        track, self._track = self._track, None
+        count = len(self.timestamp) - track["start"]
+        if track["when"] and len(track["when"]) != count:
+            raise ValueError(f"gx:Track has {len(track['when'])} <when> but {count} <gx:coord> elements")
+        offsets = track["video_offset_ms"]
+        if offsets:
+            if len(offsets) != count:
+                raise ValueError(f"gx:Track has {len(offsets)} video offsets for {count} points")
+            self.video_offset_ms[track["start"]:] = offsets
+
+    def _add_point(
+        self,
+        lat: str,
+        lon: str,
+        ele: Optional[str],
+        time: Optional[str],
+        video_offset_ms: Optional[str]
+    ) -> None:
+        number = len(self.timestamp) + 1
+        if number > self.max_waypoints:
+            raise ValueError(f"more than {self.max_waypoints} waypoints")
+        try:
+            latitude, longitude = float(lat), float(lon)
+            altitude = float(ele) if ele else math.nan
+            timestamp = _parse_time(time) if time else _MISSING
+            offset = int(video_offset_ms) if video_offset_ms else -1
+        except ValueError as e:
+            raise ValueError(f"waypoint {number}: {e}")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(f"waypoint {number}: coordinates out of range ({latitude}, {longitude})")
+
+        self.latitude.append(latitude)
+        self.longitude.append(longitude)
+        self.altitude.append(altitude)
+        self.timestamp.append(timestamp)
+        self.video_offset_ms.append(offset)
+
+
+class TrackFileParser:
+    """
+    Incremental GPX/KML track reader.
+
+    Call feed() with each chunk of the document, then close(). Both raise
+    ValueError on malformed XML or an invalid point.
+    """
+
+    def __init__(self, max_waypoints: int = MAX_IMPORT_WAYPOINTS):
+        self._target = _TrackTarget(max_waypoints)
+        self._parser = XMLParser(target=self._target)
+
+    def feed(self, chunk: bytes) -> None:
+        try:
+            self._parser.feed(chunk)
+        except ParseError as e:
+            raise ValueError(f"malformed XML: {e}")
+
+    def close(self, start_ms: Optional[int] = None) -> Tuple[Optional[str], Dict[str, np.ndarray]]:
+        """
+        Finish parsing.
+
+        Args:
+            start_ms: Time for the points if the file has no times at all
+
+        Returns:
+            (track name from the file, waypoint column arrays)
+        """
+        try:
+            self._parser.close()
+        except ParseError as e:
+            raise ValueError(f"malformed XML: {e}")
+
+        target = self._target
+        if target.format is None:
+            raise ValueError("empty document")
+        if not len(target.timestamp):
+            raise ValueError(f"no track points in {target.format.upper()} file")
+
+        timestamp = np.array(target.timestamp, dtype=np.int64)
+        timed = timestamp != _MISSING
+        if not timed.any():
+            if start_ms is None:
+                raise ValueError("file has no point times; start_time is required")
+            timestamp[:] = start_ms
+        elif not timed.all():
+            # Forward-fill, then back-fill the leading points
+            last = np.maximum.accumulate(np.where(timed, np.arange(len(timestamp)), 0))
+            first = np.argmax(timed)
+            timestamp = timestamp[np.where(timed[last], last, first)]
+
+        return target.name, {
+            "longitude": np.array(target.longitude, dtype=np.float64),
+            "latitude": np.array(target.latitude, dtype=np.float64),
+            "altitude": np.array(target.altitude, dtype=np.float64),
+            "timestamp": timestamp,
+            "video_offset_ms": np.array(target.video_offset_ms, dtype=np.int64),
+        }
+
+
+def parse_track_file(data: bytes, start_ms: Optional[int] = None) -> Tuple[Optional[str], Dict[str, np.ndarray]]:
+    """Parse a whole GPX/KML document (see TrackFileParser)"""
+    parser = TrackFileParser()
+    parser.feed(data)
+    return parser.close(start_ms)
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def _blocks(arrays: Dict[str, np.ndarray]) -> Iterator[Dict[str, list]]:
+    """Waypoints as formatted text columns, EXPORT_BLOCK_WAYPOINTS at a time"""
+    count = len(arrays["timestamp"])
+    for start in range(0, count, EXPORT_BLOCK_WAYPOINTS):
+        window = slice(start, start + EXPORT_BLOCK_WAYPOINTS)
+        altitude = arrays["altitude"][window]
+        yield {
+            "longitude": [repr(value) for value in arrays["longitude"][window].tolist()],
+            "latitude": [repr(value) for value in arrays["latitude"][window].tolist()],
+            "altitude": [None if value != value else repr(value) for value in altitude.tolist()],
+            "time": _format_times(arrays["timestamp"][window]).tolist(),
+            "video_offset_ms": arrays["video_offset_ms"][window].tolist(),
+        }
+
+
+def iter_gpx(name: str, arrays: Dict[str, np.ndarray]) -> Iterator[bytes]:
+    """A GPX 1.1 document with one track segment, in chunks"""
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="E-BARMM" xmlns="http://www.topografix.com/GPX/1/1" '
+        f'xmlns:ebarmm="{EBARMM_NAMESPACE}">\n'
+        f"  <trk>\n    <name>{escape(name)}</name>\n    <trkseg>\n"
+    ).encode("utf-8")
+
+    for block in _blocks(arrays):
+        lines = []
+        for lon, lat, ele, time, offset in zip(*block.values()):
+            line = f'      <trkpt lat="{lat}" lon="{lon}">'
+            if ele is not None:
+                line += f"<ele>{ele}</ele>"
+            line += f"<time>{time}</time>"
+            if offset >= 0:
+                line += f"<extensions><ebarmm:video_offset_ms>{offset}</ebarmm:video_offset_ms></extensions>"
+            lines.append(line + "</trkpt>\n")
+        yield "".join(lines).encode("utf-8")
+
+    yield b"    </trkseg>\n  </trk>\n</gpx>\n"
+
+
+def iter_kml(name: str, arrays: Dict[str, np.ndarray]) -> Iterator[bytes]:
+    """A KML 2.2 document with the track as a timed gx:Track, in chunks"""
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+        f"  <Document>\n    <name>{escape(name)}</name>\n"
+        f"    <Placemark>\n      <name>{escape(name)}</name>\n      <gx:Track>\n"
+        "        <altitudeMode>absolute</altitudeMode>\n"
+    ).encode("utf-8")
+
+    for block in _blocks(arrays):
+        yield "".join(f"        <when>{time}</when>\n" for time in block["time"]).encode("utf-8")
+    for block in _blocks(arrays):
+        yield "".join(
+            f"        <gx:coord>{lon} {lat}{'' if ele is None else ' ' + ele}</gx:coord>\n"
+            for lon, lat, ele in zip(block["longitude"], block["latitude"], block["altitude"])
+        ).encode("utf-8")
+
+    if (arrays["video_offset_ms"] >= 0).any():
+        yield (
+            "        <ExtendedData>\n          <SchemaData schemaUrl=\"#routeshoot\">\n"
+            "            <gx:SimpleArrayData name=\"video_offset_ms\">\n"
+        ).encode("utf-8")
+        for block in _blocks(arrays):
+            yield "".join(
+                f"              <gx:value>{offset if offset >= 0 else ''}</gx:value>\n"
+                for offset in block["video_offset_ms"]
+            ).encode("utf-8")
+        yield b"            </gx:SimpleArrayData>\n          </SchemaData>\n        </ExtendedData>\n"
+
+    yield b"      </gx:Track>\n    </Placemark>\n  </Document>\n</kml>\n"
+
+
+def iter_track_file(file_format: str, name: str, arrays: Dict[str, np.ndarray]) -> Iterator[bytes]:
+    """Chunks of a track exported as "gpx" or "kml" """
+    return iter_gpx(name, arrays) if file_format == "gpx" else iter_kml(name, arrays)
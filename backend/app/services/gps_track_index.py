@@ -0,0 +1,150 @@
+"""
+GPS Track Video Index
+Video time <-> map position lookups for RouteShoot playback
+
+A TrackIndex holds a track's coordinates, cumulative distance and video
+time axis as NumPy arrays. Lookups are vectorized over batches of queries:
+time -> position by binary search and linear interpolation between the
+bracketing waypoints, map point -> video time by projecting onto every
+segment and interpolating along the nearest one.
+
+Indexes are cached in-process per (track_id, waypoint_count), so a track
+that grows gets a fresh index without explicit invalidation.
+"""
+
+from typing import Dict
+import math
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..models import GpsTrack
+from .gps_tracks import EARTH_RADIUS_M, load_track_arrays
+
+INDEX_CACHE_SIZE = 32
+INDEX_CACHE_TTL_SECONDS = 600
+
+# Upper bound on query x segment distance matrix elements per step
+NEAREST_BLOCK_ELEMENTS = 4_000_000
+
+_index_cache = TTLCache(INDEX_CACHE_SIZE, INDEX_CACHE_TTL_SECONDS)
+
+
+class TrackIndex:
+    """Vectorized position/time lookups over one track's waypoint arrays"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.longitude = arrays["longitude"]
+        self.latitude = arrays["latitude"]
+        self.altitude = arrays["altitude"]
+        self.count = len(self.longitude)
+
+        # Cumulative geodesic (haversine) distance from the first waypoint
+        lat, lng = np.radians(self.latitude), np.radians(self.longitude)
+        h = np.sin(np.diff(lat) / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lng) / 2) ** 2
+        self.distance = np.concatenate([[0.0], np.cumsum(2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(h)))])
+
+        # Video time axis: waypoints with a video offset; a track without
+        # video uses time since its first waypoint
+        offsets = arrays["video_offset_ms"]
+        timed = np.flatnonzero(offsets >= 0)
+        if len(timed):
+            times = offsets[timed]
+        else:
+            timed = np.arange(self.count)
+            times = arrays["timestamp"] - (arrays["timestamp"][0] if self.count else 0)
+        order = np.argsort(times, kind="stable")
+        self.timed = timed[order]
+        self.times = times[order].astype(np.float64)
+
+        # Local planar meters for nearest-point projection
+        lat0 = math.radians(float(self.latitude.mean())) if self.count else 0.0
+        self.x = np.radians(self.longitude) * EARTH_RADIUS_M * math.cos(lat0)
+        self.y = np.radians(self.latitude) * EARTH_RADIUS_M
+
+    def position_at(self, offsets_ms: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Interpolated positions at video offsets (clamped to the recording).
+
+        Returns:
+            Arrays latitude, longitude, altitude, distance_m and
+            waypoint_index (last waypoint at or before each offset)
+        """
+        t = np.clip(np.asarray(offsets_ms, dtype=np.float64), self.times[0], self.times[-1])
+        if len(self.times) == 1:
+            first = np.zeros(len(t), dtype=np.int64)
+            second, fraction = first, np.zeros(len(t))
+        else:
+            first = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 2)
+            second = first + 1
+            span = self.times[second] - self.times[first]
+            fraction = np.divide(t - self.times[first], span, out=np.zeros(len(t)), where=span > 0)
+
+        a, b = self.timed[first], self.timed[second]
+        return {
+            "latitude": self.latitude[a] + fraction * (self.latitude[b] - self.latitude[a]),
+            "longitude": self.longitude[a] + fraction * (self.longitude[b] - self.longitude[a]),
+            "altitude": self.altitude[a] + fraction * (self.altitude[b] - self.altitude[a]),
+            "distance_m": self.distance[a] + fraction * (self.distance[b] - self.distance[a]),
+            "waypoint_index": np.where(fraction >= 1, b, a),
+        }
+
+    def nearest(self, latitudes: np.ndarray, longitudes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        The closest point of the track to each query point.
+
+        Returns:
+            Arrays latitude/longitude (snapped onto the track), distance_m
+            (along the track), distance_from_track_m, offset_ms (video time
+            at the snapped point) and waypoint_index (closest waypoint)
+        """
+        lat0 = math.radians(float(self.latitude.mean()))
+        qx = np.radians(np.asarray(longitudes, dtype=np.float64)) * EARTH_RADIUS_M * math.cos(lat0)
+        qy = np.radians(np.asarray(latitudes, dtype=np.float64)) * EARTH_RADIUS_M
+
+        if self.count == 1:
+            segment = np.zeros(len(qx), dtype=np.int64)
+            fraction = np.zeros(len(qx))
+            gap = np.hypot(qx - self.x[0], qy - self.y[0])
+            a = b = segment
+        else:
+            sx, sy = self.x[:-1], self.y[:-1]
+            dx, dy = np.diff(self.x), np.diff(self.y)
+            length2 = dx * dx + dy * dy
+            segment = np.empty(len(qx), dtype=np.int64)
+            fraction = np.empty(len(qx))
+            gap = np.empty(len(qx))
+            block = max(1, NEAREST_BLOCK_ELEMENTS // len(sx))
+            for start in range(0, len(qx), block):
+                px = qx[start:start + block, None] - sx
+                py = qy[start:start + block, None] - sy
+                f = np.clip(np.divide(px * dx + py * dy, length2, out=np.zeros_like(px), where=length2 > 0), 0, 1)
+                d2 = (px - f * dx) ** 2 + (py - f * dy) ** 2
+                best = np.argmin(d2, axis=1)
+                rows = np.arange(len(best))
+                segment[start:start + block] = best
+                fraction[start:start + block] = f[rows, best]
+                gap[start:start + block] = np.sqrt(d2[rows, best])
+            a, b = segment, segment + 1
+
+        along = self.distance[a] + fraction * (self.distance[b] - self.distance[a])
+        return {
+            "latitude": self.latitude[a] + fraction * (self.latitude[b] - self.latitude[a]),
+            "longitude": self.longitude[a] + fraction * (self.longitude[b] - self.longitude[a]),
+            "distance_m": along,
+            "distance_from_track_m": gap,
+            "offset_ms": np.interp(along, self.distance[self.timed], self.times),
+            "waypoint_index": np.where(fraction >= 0.5, b, a),
+        }
+
+
+def get_track_index(db: Session, track: GpsTrack) -> TrackIndex:
+    """The cached index of a track (with waypoints), built on first use"""
+    key = (track.track_id, track.waypoint_count)
+    index = _index_cache.get(key)
+    if index is None:
+        arrays, _ = load_track_arrays(db, [track])[track.track_id]
+        index = TrackIndex(arrays)
+        _index_cache.put(key, index)
+    return index
@@ -0,0 +1,115 @@
+"""
+GPS Track Recording
+Chunked uploads of long RouteShoot recordings
+
+A recording track is opened empty, receives waypoint chunks in sequence
+order and is finalized when the recording ends. Each chunk updates the
+track's stats from the chunk alone:
+
+- distance: the stored total plus the geodesic length of the chunk joined
+  to the previous last waypoint
+- bbox: the stored box widened by the chunk's bounds
+- levels of detail: every level is extended by simplifying only the new
+  waypoints (from the previous last waypoint on); the join waypoint is
+  kept at every level, so chunk boundaries cost at most one point each
+
+The line and video offsets themselves are rewritten per chunk (a PostGIS
+value is replaced as a whole), but nothing is re-simplified or re-measured.
+"""
+
+from typing import Dict, Optional
+import hashlib
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
+
+from ..models import GpsTrack, GpsTrackLod
+from .gps_track_encoding import encode_packed_waypoints
+from .gps_tracks import (
+    LOD_TOLERANCES_M,
+    bounds,
+    encode_geometry,
+    encode_video_offsets,
+    length_meters,
+    simplify,
+    subset,
+    track_arrays
+)
+
+
+def concat_arrays(first: Dict[str, np.ndarray], second: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {name: np.concatenate([values, second[name]]) for name, values in first.items()}
+
+
+def chunk_digest(arrays: Dict[str, np.ndarray]) -> str:
+    """SHA-256 of a chunk's waypoints (their packed encoding)"""
+    return hashlib.sha256(encode_packed_waypoints(arrays)).hexdigest()
+
+
+def _widen(current: Optional[float], value: float, pick) -> float:
+    return value if current is None else pick(float(current), value)
+
+
+def append_waypoints(db: Session, track: GpsTrack, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Append a chunk of waypoints to a track and its levels of detail.
+
+    The track must be loaded with its 'waypoints' group (and locked by the
+    caller); changes are flushed, not committed.
+    """
+    stored = track_arrays(track)
+    previous = subset(stored, slice(-1, None))  # The join waypoint (empty for the first chunk)
+    joined = concat_arrays(previous, arrays)
+
+    track.geometry = encode_geometry(concat_arrays(stored, arrays))
+    track.video_offsets_ms = encode_video_offsets(concat_arrays(stored, arrays))
+    track.waypoint_count = len(stored["timestamp"]) + len(arrays["timestamp"])
+
+    chunk_bounds = bounds(arrays)
+    track.min_longitude = _widen(track.min_longitude, chunk_bounds["min_longitude"], min)
+    track.min_latitude = _widen(track.min_latitude, chunk_bounds["min_latitude"], min)
+    track.max_longitude = _widen(track.max_longitude, chunk_bounds["max_longitude"], max)
+    track.max_latitude = _widen(track.max_latitude, chunk_bounds["max_latitude"], max)
+
+    track.total_distance_meters = func.coalesce(GpsTrack.total_distance_meters, 0) + length_meters(
+        func.ST_GeomFromEWKB(encode_geometry(joined).data)
+    )
+
+    lods = {lod.level: lod for lod in db.query(GpsTrackLod).options(undefer_group('waypoints')).filter(
+        GpsTrackLod.track_id == track.track_id
+    )}
+    skip = len(previous["timestamp"])
+    level_arrays = joined
+    for level, tolerance in enumerate(LOD_TOLERANCES_M, start=1):
+        # Cascade like build_lods: each level simplifies the finer level's new points
+        level_arrays = simplify(level_arrays, tolerance)
+        added = subset(level_arrays, slice(skip, None))
+        lod = lods.get(level)
+        if lod is None:
+            db.add(GpsTrackLod(
+                track_id=track.track_id,
+                level=level,
+                tolerance_meters=tolerance,
+                waypoint_count=len(added["timestamp"]),
+                geometry=encode_geometry(added),
+                video_offsets_ms=encode_video_offsets(added),
+            ))
+        else:
+            combined = concat_arrays(track_arrays(lod), added)
+            lod.geometry = encode_geometry(combined)
+            lod.video_offsets_ms = encode_video_offsets(combined)
+            lod.waypoint_count = len(combined["timestamp"])
+
+    db.flush()
+
+
+def prune_lods(db: Session, track_id) -> None:
+    """Drop levels that ended up no smaller than the next finer one (as build_lods never stores them)"""
+    finer_count = db.query(GpsTrack.waypoint_count).filter(GpsTrack.track_id == track_id).scalar()
+    for lod in db.query(GpsTrackLod).filter(GpsTrackLod.track_id == track_id).order_by(GpsTrackLod.level):
+        if lod.waypoint_count >= finer_count:
+            db.delete(lod)
+        else:
+            finer_count = lod.waypoint_count
+    db.flush()
@@ -0,0 +1,366 @@
+"""
+GPS Track Storage
+RouteShoot waypoints stored as a PostGIS LINESTRINGZM (x=longitude,
+y=latitude, z=altitude, m=timestamp in ms) plus a parallel video offset array,
+with precomputed Douglas-Peucker levels of detail
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import math
+import struct
+
+import numpy as np
+from geoalchemy2 import Geography, Geometry
+from geoalchemy2.elements import WKBElement
+from sqlalchemy import Integer, Numeric, cast, column, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.orm import Session, undefer_group
+
+from ..models import GpsTrack, GpsTrackLod
+
+SRID = 4326
+EARTH_RADIUS_M = 6371008.8
+
+# Simplification tolerance of each stored level, finest first; each level is
+# simplified from the previous one and only kept if it drops points
+LOD_TOLERANCES_M = (2.0, 10.0, 50.0, 250.0)
+
+# Web Mercator ground resolution at zoom 0 (meters per 256 px tile pixel)
+ZOOM0_METERS_PER_PIXEL = 156543.03
+
+# EWKB type word: LineString with Z, M and SRID flags
+_EWKB_LINESTRING = 2
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+_EWKB_SRID = 0x20000000
+
+
+def waypoint_arrays(waypoints: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Column arrays from waypoints (dicts or GpsWaypoint models).
+
+    Missing altitudes are NaN and missing video offsets are -1 so the
+    arrays stay numeric.
+    """
+    rows = [wp if isinstance(wp, dict) else wp.model_dump() for wp in waypoints]
+    altitudes = [row.get("altitude") for row in rows]
+    offsets = [row.get("video_offset_ms") for row in rows]
+    return {
+        "longitude": np.array([row["longitude"] for row in rows], dtype=np.float64),
+        "latitude": np.array([row["latitude"] for row in rows], dtype=np.float64),
+        "altitude": np.array([np.nan if a is None else a for a in altitudes], dtype=np.float64),
+        "timestamp": np.array([row["timestamp"] for row in rows], dtype=np.int64),
+        "video_offset_ms": np.array([-1 if o is None else o for o in offsets], dtype=np.int64),
+    }
+
+
+def encode_geometry(arrays: Dict[str, np.ndarray]) -> Optional[WKBElement]:
+    """
+    EWKB LINESTRINGZM for column arrays; None for an empty track.
+
+    A line needs two points, so a single waypoint is stored as a degenerate
+    two-point line (waypoint_count tells readers to drop the copy).
+    """
+    count = len(arrays["timestamp"])
+    if count == 0:
+        return None
+
+    coords = np.column_stack([
+        arrays["longitude"], arrays["latitude"], arrays["altitude"], arrays["timestamp"].astype(np.float64)
+    ]).astype("<f8")
+    if count == 1:
+        coords = np.vstack([coords, coords])
+
+    header = struct.pack(
+        "<BIII", 1, _EWKB_LINESTRING | _EWKB_Z | _EWKB_M | _EWKB_SRID, SRID, len(coords)
+    )
+    return WKBElement(header + coords.tobytes(), srid=SRID, extended=True)
+
+
+def encode_video_offsets(arrays: Dict[str, np.ndarray]) -> Optional[List[Optional[int]]]:
+    """Video offsets as an INTEGER[] value; None when no waypoint has one"""
+    offsets = arrays["video_offset_ms"]
+    if not (offsets >= 0).any():
+        return None
+    return [int(o) if o >= 0 else None for o in offsets]
+
+
+def decode_geometry(geometry: Any, count: int) -> np.ndarray:
+    """
+    The (count, 4) x/y/z/m coordinate array of a stored LINESTRINGZM.
+
+    Args:
+        geometry: WKBElement (or raw EWKB bytes) as loaded from the column
+        count: The track's waypoint_count
+    """
+    if geometry is None or count == 0:
+        return np.empty((0, 4), dtype=np.float64)
+
+    data = geometry.data if isinstance(geometry, WKBElement) else geometry
+    data = bytes.fromhex(data) if isinstance(data, str) else bytes(data)
+
+    order = "<" if data[0] == 1 else ">"
+    type_word, = struct.unpack_from(order + "I", data, 1)
+    offset = 5 + (4 if type_word & _EWKB_SRID else 0)
+    points, = struct.unpack_from(order + "I", data, offset)
+    coords = np.frombuffer(data, dtype=order + "f8", count=points * 4, offset=offset + 4)
+    return coords.reshape(points, 4)[:count]
+
+
+def track_arrays(track: Any) -> Dict[str, np.ndarray]:
+    """
+    Column arrays of a stored track or level (the inverse of waypoint_arrays).
+
+    Accepts anything with geometry, waypoint_count and video_offsets_ms:
+    a GpsTrack, a GpsTrackLod or a row selecting those columns.
+    """
+    return _coords_arrays(decode_geometry(track.geometry, track.waypoint_count), track.video_offsets_ms)
+
+
+def _coords_arrays(coords: np.ndarray, video_offsets: Optional[Sequence[Optional[int]]]) -> Dict[str, np.ndarray]:
+    offsets = video_offsets or [None] * len(coords)
+    return {
+        "longitude": coords[:, 0],
+        "latitude": coords[:, 1],
+        "altitude": coords[:, 2],
+        "timestamp": coords[:, 3].astype(np.int64),
+        "video_offset_ms": np.array([-1 if o is None else o for o in offsets[:len(coords)]], dtype=np.int64),
+    }
+
+
+def arrays_to_waypoints(arrays: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Column arrays as waypoints in the GpsWaypoint shape"""
+    return [
+        {
+            "latitude": float(lat),
+            "longitude": float(lng),
+            "altitude": None if np.isnan(alt) else float(alt),
+            "timestamp": int(ts),
+            "video_offset_ms": int(offset) if offset >= 0 else None,
+        }
+        for lng, lat, alt, ts, offset in zip(
+            arrays["longitude"], arrays["latitude"], arrays["altitude"],
+            arrays["timestamp"], arrays["video_offset_ms"]
+        )
+    ]
+
+
+def track_waypoints(track: Any) -> List[Dict[str, Any]]:
+    """Reconstruct a stored track's waypoints in the GpsWaypoint shape"""
+    return arrays_to_waypoints(track_arrays(track))
+
+
+# =============================================================================
+# Levels of detail
+# =============================================================================
+
+def _local_meters(arrays: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Equirectangular projection around the track's mean latitude (meters)"""
+    lat0 = math.radians(float(np.mean(arrays["latitude"])))
+    x = np.radians(arrays["longitude"]) * EARTH_RADIUS_M * math.cos(lat0)
+    y = np.radians(arrays["latitude"]) * EARTH_RADIUS_M
+    return x, y
+
+
+def simplify_indices(arrays: Dict[str, np.ndarray], tolerance_m: float) -> np.ndarray:
+    """
+    Indices of the waypoints kept by Douglas-Peucker at a tolerance.
+
+    Iterative (no recursion limit on long tracks); each split measures the
+    perpendicular distance of a whole span in one vectorized step. The first
+    and last waypoints are always kept.
+    """
+    count = len(arrays["timestamp"])
+    if count <= 2:
+        return np.arange(count)
+
+    x, y = _local_meters(arrays)
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    spans = [(0, count - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1:last] - x[first], y[first + 1:last] - y[first]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            distances = np.hypot(px, py)
+        else:
+            distances = np.abs(px * dy - py * dx) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance_m:
+            split = first + 1 + farthest
+            keep[split] = True
+            spans.append((first, split))
+            spans.append((split, last))
+    return np.flatnonzero(keep)
+
+
+def subset(arrays: Dict[str, np.ndarray], indices: np.ndarray) -> Dict[str, np.ndarray]:
+    return {name: values[indices] for name, values in arrays.items()}
+
+
+def simplify(arrays: Dict[str, np.ndarray], tolerance_m: float) -> Dict[str, np.ndarray]:
+    return subset(arrays, simplify_indices(arrays, tolerance_m))
+
+
+def build_lods(track_id: UUID, arrays: Dict[str, np.ndarray]) -> List[GpsTrackLod]:
+    """Level-of-detail rows for a track's full-resolution arrays"""
+    lods = []
+    level_arrays = arrays
+    for tolerance in LOD_TOLERANCES_M:
+        simplified = simplify(level_arrays, tolerance)
+        if len(simplified["timestamp"]) >= len(level_arrays["timestamp"]):
+            continue
+        level_arrays = simplified
+        lods.append(GpsTrackLod(
+            track_id=track_id,
+            level=len(lods) + 1,
+            tolerance_meters=tolerance,
+            waypoint_count=len(level_arrays["timestamp"]),
+            geometry=encode_geometry(level_arrays),
+            video_offsets_ms=encode_video_offsets(level_arrays),
+        ))
+    return lods
+
+
+def zoom_tolerance(zoom: float) -> float:
+    """Tolerance (meters) of one screen pixel at a web map zoom level"""
+    return ZOOM0_METERS_PER_PIXEL / (2 ** zoom)
+
+
+def _choose_level(
+    levels: List[Tuple[int, float, int]],
+    tolerance: Optional[float],
+    max_points: Optional[int]
+) -> Tuple[int, float, int]:
+    """Pick a (level, tolerance, count); levels are sorted finest (level 0) first"""
+    chosen = levels[0]
+    for level in levels:
+        if tolerance is not None and level[1] > tolerance:
+            break
+        chosen = level
+        if max_points is not None and level[2] <= max_points:
+            break
+    return chosen
+
+
+def load_track_arrays(
+    db: Session,
+    tracks: Sequence[GpsTrack],
+    tolerance: Optional[float] = None,
+    max_points: Optional[int] = None
+) -> Dict[UUID, Tuple[Dict[str, np.ndarray], float]]:
+    """
+    Waypoint arrays of tracks at the requested level of detail.
+
+    With neither tolerance nor max_points, full resolution. Otherwise the
+    coarsest stored level within the tolerance (or the finest level with at
+    most max_points) is read, then simplified further on the fly when the
+    request is coarser than any stored level. At most three queries,
+    whatever the number of tracks.
+
+    Returns:
+        {track_id: (arrays, applied tolerance in meters)}
+    """
+    if not tracks:
+        return {}
+
+    levels = {track.track_id: [(0, 0.0, track.waypoint_count)] for track in tracks}
+    if tolerance is not None or max_points is not None:
+        for track_id, level, level_tolerance, count in db.query(
+            GpsTrackLod.track_id, GpsTrackLod.level, GpsTrackLod.tolerance_meters, GpsTrackLod.waypoint_count
+        ).filter(GpsTrackLod.track_id.in_(levels.keys())).order_by(GpsTrackLod.level):
+            levels[track_id].append((level, float(level_tolerance), count))
+
+    chosen = {track_id: _choose_level(track_levels, tolerance, max_points) for track_id, track_levels in levels.items()}
+
+    stored = {}
+    full = [track_id for track_id, (level, _, _) in chosen.items() if level == 0]
+    if full:
+        for row in db.query(
+            GpsTrack.track_id, GpsTrack.geometry, GpsTrack.video_offsets_ms, GpsTrack.waypoint_count
+        ).filter(GpsTrack.track_id.in_(full)):
+            stored[row.track_id] = track_arrays(row)
+    simplified = [(track_id, level) for track_id, (level, _, _) in chosen.items() if level > 0]
+    if simplified:
+        for lod in db.query(GpsTrackLod).options(undefer_group('waypoints')).filter(
+            tuple_(GpsTrackLod.track_id, GpsTrackLod.level).in_(simplified)
+        ):
+            stored[lod.track_id] = track_arrays(lod)
+
+    results = {}
+    for track_id, arrays in stored.items():
+        applied = chosen[track_id][1]
+        if tolerance is not None and tolerance > applied:
+            arrays, applied = simplify(arrays, tolerance), tolerance
+        if max_points is not None:
+            # Coarser than every stored level: double the tolerance until it fits
+            while len(arrays["timestamp"]) > max_points:
+                applied = max(applied * 2, LOD_TOLERANCES_M[0])
+                arrays = simplify(arrays, applied)
+        results[track_id] = (arrays, applied)
+    return results
+
+
+def bounds(arrays: Dict[str, np.ndarray]) -> Dict[str, Optional[float]]:
+    """GpsTrack bounding box columns for column arrays"""
+    if len(arrays["timestamp"]) == 0:
+        return {"min_longitude": None, "min_latitude": None, "max_longitude": None, "max_latitude": None}
+    return {
+        "min_longitude": float(arrays["longitude"].min()),
+        "min_latitude": float(arrays["latitude"].min()),
+        "max_longitude": float(arrays["longitude"].max()),
+        "max_latitude": float(arrays["latitude"].max()),
+    }
+
+
+def thumbnail_polyline():
+    """
+    SQL expression: encoded polyline of a track's coarsest level of detail.
+
+    Correlated to GpsTrack; tracks without stored levels are short (or not
+    backfilled yet) and use their full line.
+    """
+    coarsest = select(GpsTrackLod.geometry).where(
+        GpsTrackLod.track_id == GpsTrack.track_id
+    ).order_by(GpsTrackLod.level.desc()).limit(1).correlate(GpsTrack).scalar_subquery()
+    return func.ST_AsEncodedPolyline(func.ST_Force2D(func.coalesce(coarsest, GpsTrack.geometry)), 5)
+
+
+def waypoint_range(db: Session, track_id: UUID, offset: int, limit: int) -> Optional[Tuple[int, Dict[str, np.ndarray]]]:
+    """
+    Waypoints [offset, offset + limit) of a track.
+
+    The page is cut out in SQL (points of the line and elements of the
+    offset array), so only the requested waypoints leave the database.
+
+    Returns:
+        (waypoint_count, arrays), or None if the track does not exist
+    """
+    dumped = func.ST_DumpPoints(GpsTrack.geometry).table_valued(
+        column("path", ARRAY(Integer)), column("geom", Geometry), name="point"
+    )
+    page = select(func.ST_MakeLine(aggregate_order_by(dumped.c.geom, dumped.c.path[1]))).select_from(dumped).where(
+        # The line of a single-waypoint track repeats its point
+        dumped.c.path[1].between(offset + 1, func.least(offset + limit, GpsTrack.waypoint_count))
+    ).correlate(GpsTrack).scalar_subquery()
+
+    row = db.query(
+        page.label("geometry"),
+        GpsTrack.waypoint_count,
+        GpsTrack.video_offsets_ms[offset + 1:offset + limit].label("video_offsets_ms")
+    ).filter(GpsTrack.track_id == track_id).first()
+    if row is None:
+        return None
+
+    count = max(0, min(limit, row.waypoint_count - offset))
+    return row.waypoint_count, _coords_arrays(decode_geometry(row.geometry, count), row.video_offsets_ms)
+
+
+def length_meters(geometry):
+    """SQL expression: geodesic length of a track geometry in meters"""
+    return func.round(cast(func.ST_Length(cast(func.ST_Force2D(geometry), Geography)), Numeric), 2)
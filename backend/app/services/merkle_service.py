@@ -0,0 +1,290 @@
+"""
+Merkle Anchoring Service
+Daily Merkle trees over the append-only logs with O(log n) inclusion proofs
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import hashlib
+import logging
+
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.orm import Session
+
+from ..models import AuditArchive, AuditLog, MerkleAnchor, MerkleNode, ProjectProgressLog
+
+logger = logging.getLogger(__name__)
+
+# Leaf/node prefixes follow RFC 6962 (Certificate Transparency) so a leaf
+# can never be passed off as an internal node
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+# Anchored sources: table name -> (model, id column, ordering)
+MERKLE_SOURCES = {
+    "audit_logs": (AuditLog, AuditLog.audit_id, (AuditLog.sequence, AuditLog.audit_id)),
+    "project_progress_logs": (
+        ProjectProgressLog,
+        ProjectProgressLog.progress_id,
+        (ProjectProgressLog.created_at, ProjectProgressLog.progress_id)
+    ),
+}
+
+NODE_INSERT_BATCH = 5000
+
+
+# =============================================================================
+# Tree construction and proofs (pure functions)
+# =============================================================================
+
+def merkle_leaf(record_hash: str) -> bytes:
+    """Leaf hash of a record's hex record_hash"""
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(record_hash)).digest()
+
+
+def merkle_parent(left: bytes, right: bytes) -> bytes:
+    """Internal node hash"""
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def empty_root() -> bytes:
+    """Root of a tree without leaves"""
+    return hashlib.sha256(b'').digest()
+
+
+def build_levels(leaves: List[bytes]) -> List[List[bytes]]:
+    """
+    All levels of the tree, leaves first.
+
+    An unpaired last node is promoted to the next level unchanged (RFC 6962
+    style) rather than paired with itself, which would let two different
+    leaf lists share a root.
+    """
+    if not leaves:
+        return [[empty_root()]]
+
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        current = levels[-1]
+        parents = [
+            merkle_parent(current[i], current[i + 1])
+            for i in range(0, len(current) - 1, 2)
+        ]
+        if len(current) % 2:
+            parents.append(current[-1])
+        levels.append(parents)
+    return levels
+
+
+def proof_path(leaf_index: int, leaf_count: int) -> List[Tuple[int, int, str]]:
+    """
+    Nodes needed to prove a leaf, without looking at any hashes.
+
+    Returns:
+        List of (level, node_index, position) bottom-up; position is 'left'
+        or 'right' relative to the running hash
+    """
+    path = []
+    index, size, level = leaf_index, leaf_count, 0
+    while size > 1:
+        sibling = index ^ 1
+        if sibling < size:
+            path.append((level, sibling, 'left' if sibling < index else 'right'))
+        index //= 2
+        size = (size + 1) // 2
+        level += 1
+    return path
+
+
+def verify_inclusion(record_hash: str, proof: List[Dict[str, str]], root_hash: str) -> bool:
+    """
+    Check an inclusion proof.
+
+    Args:
+        record_hash: Hex record_hash of the entry being proven
+        proof: [{"position": "left"|"right", "hash": hex}] bottom-up
+        root_hash: Hex anchored root
+    """
+    current = merkle_leaf(record_hash)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        if step["position"] == 'left':
+            current = merkle_parent(sibling, current)
+        else:
+            current = merkle_parent(current, sibling)
+    return current.hex() == root_hash
+
+
+# =============================================================================
+# Anchoring and proof retrieval
+# =============================================================================
+
+class MerkleService:
+    """Builds daily anchors and serves inclusion proofs"""
+
+    @staticmethod
+    def _leaf_source_hash(db: Session, source: str, record_id: Any, record_hash: Optional[str]) -> str:
+        """record_hash of a row (recomputed for legacy audit rows stored without one)"""
+        if record_hash:
+            return record_hash
+        from .audit_chain import audit_record_hash
+        log = db.query(AuditLog).filter(AuditLog.audit_id == record_id).one()
+        return audit_record_hash(log, log.prev_hash)
+
+    @staticmethod
+    def anchor_day(db: Session, source: str, day: date) -> MerkleAnchor:
+        """
+        Build and store the Merkle tree for one UTC day of a source table.
+
+        Idempotent: an existing anchor for (source, day) is returned as is.
+        """
+        model, id_column, ordering = MERKLE_SOURCES[source]
+
+        existing = db.query(MerkleAnchor).filter(
+            MerkleAnchor.source == source,
+            MerkleAnchor.anchor_date == day
+        ).first()
+        if existing:
+            return existing
+
+        start = datetime.combine(day, datetime.min.time())
+        rows = db.query(id_column, model.record_hash).filter(
+            model.created_at >= start,
+            model.created_at < start + timedelta(days=1)
+        ).order_by(*ordering).yield_per(NODE_INSERT_BATCH)
+
+        record_ids = []
+        record_hashes = []
+        leaves = []
+        for record_id, record_hash in rows:
+            record_hash = MerkleService._leaf_source_hash(db, source, record_id, record_hash)
+            record_ids.append(record_id)
+            record_hashes.append(record_hash)
+            leaves.append(merkle_leaf(record_hash))
+
+        levels = build_levels(leaves)
+        anchor = MerkleAnchor(
+            source=source,
+            anchor_date=day,
+            leaf_count=len(leaves),
+            root_hash=levels[-1][0].hex()
+        )
+        db.add(anchor)
+        db.flush()
+
+        batch = []
+        for level, nodes in enumerate(levels if leaves else []):
+            for index, node in enumerate(nodes):
+                batch.append({
+                    "anchor_id": anchor.anchor_id,
+                    "level": level,
+                    "node_index": index,
+                    "node_hash": node.hex(),
+                    "record_id": record_ids[index] if level == 0 else None,
+                    "record_hash": record_hashes[index] if level == 0 else None
+                })
+                if len(batch) >= NODE_INSERT_BATCH:
+                    db.execute(insert(MerkleNode), batch)
+                    batch = []
+        if batch:
+            db.execute(insert(MerkleNode), batch)
+
+        db.commit()
+        logger.info(f"Anchored {source} for {day}: {len(leaves)} leaves, root {anchor.root_hash}")
+        return anchor
+
+    @staticmethod
+    def anchor_pending(db: Session, source: str, until: Optional[date] = None) -> List[MerkleAnchor]:
+        """
+        Anchor every completed day not yet anchored.
+
+        Args:
+            until: Last day to anchor (default: yesterday, UTC)
+        """
+        model = MERKLE_SOURCES[source][0]
+        until = until or (datetime.utcnow().date() - timedelta(days=1))
+
+        last_anchored = db.query(func.max(MerkleAnchor.anchor_date)).filter(
+            MerkleAnchor.source == source
+        ).scalar()
+        if last_anchored:
+            day = last_anchored + timedelta(days=1)
+        else:
+            first_record = db.query(func.min(model.created_at)).scalar()
+            if first_record is None:
+                return []
+            day = first_record.date()
+
+        anchors = []
+        while day <= until:
+            anchors.append(MerkleService.anchor_day(db, source, day))
+            day += timedelta(days=1)
+        return anchors
+
+    @staticmethod
+    def get_inclusion_proof(db: Session, source: str, record_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Inclusion proof for one record: its leaf, sibling path and anchored root.
+
+        Two indexed lookups regardless of history size. The leaf's stored
+        record_hash is used, so proofs for archived audit months need no
+        source row.
+
+        Returns:
+            Proof dict, or None if the record is not anchored (yet)
+
+        Raises:
+            LookupError: If the leaf predates stored hashes (migration 022)
+                and its source row has been archived
+        """
+        result = db.query(MerkleNode, MerkleAnchor).join(
+            MerkleAnchor, MerkleNode.anchor_id == MerkleAnchor.anchor_id
+        ).filter(
+            MerkleNode.record_id == record_id,
+            MerkleNode.level == 0,
+            MerkleAnchor.source == source
+        ).first()
+        if not result:
+            return None
+        leaf, anchor = result
+
+        path = proof_path(leaf.node_index, anchor.leaf_count)
+        hashes = {}
+        if path:
+            nodes = db.query(MerkleNode.level, MerkleNode.node_index, MerkleNode.node_hash).filter(
+                MerkleNode.anchor_id == anchor.anchor_id,
+                tuple_(MerkleNode.level, MerkleNode.node_index).in_(
+                    [(level, index) for level, index, _ in path]
+                )
+            ).all()
+            hashes = {(level, index): node_hash for level, index, node_hash in nodes}
+
+        record_hash = leaf.record_hash
+        if not record_hash:
+            model, id_column, _ = MERKLE_SOURCES[source]
+            row = db.query(model.record_hash).filter(id_column == record_id).first()
+            if row is None:
+                day = datetime.combine(anchor.anchor_date, datetime.min.time())
+                archive = db.query(AuditArchive).filter(
+                    AuditArchive.range_start <= day,
+                    AuditArchive.range_end > day
+                ).first() if source == "audit_logs" else None
+                where = f" to {archive.object_key}" if archive else ""
+                raise LookupError(f"Record was archived{where}; take its record_hash from the export")
+            record_hash = MerkleService._leaf_source_hash(db, source, record_id, row[0])
+
+        return {
+            "source": source,
+            "record_id": str(record_id),
+            "record_hash": record_hash,
+            "leaf_index": leaf.node_index,
+            "leaf_hash": leaf.node_hash,
+            "leaf_count": anchor.leaf_count,
+            "anchor_date": anchor.anchor_date.isoformat(),
+            "root_hash": anchor.root_hash,
+            "proof": [
+                {"position": position, "hash": hashes[(level, index)]}
+                for level, index, position in path
+            ],
+            "algorithm": "sha256; leaf = H(0x00 || record_hash), node = H(0x01 || left || right)"
+        }
@@ -0,0 +1,196 @@
+"""
+Progress Chain Verification
+Incremental per-project verification of the progress hash chain
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from uuid import UUID
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..core.security import verify_progress_chain
+from ..models import ProgressChainCheckpoint, ProjectProgressLog
+
+logger = logging.getLogger(__name__)
+
+# Chain order of a project's entries (ties on created_at broken by id)
+CHAIN_ORDER = (ProjectProgressLog.created_at, ProjectProgressLog.progress_id)
+
+# Verification results keyed by (project, head entry, head hash): any append
+# moves the head, so a cached result never outlives the chain it describes
+_status_cache = TTLCache(maxsize=2048, ttl_seconds=300)
+
+
+class ProgressChainStatus:
+    """Verification result for one project's progress chain"""
+
+    def __init__(
+        self,
+        project_id: UUID,
+        total_logs: int,
+        broken_links: List[Dict[str, Any]],
+        head_hash: Optional[str]
+    ):
+        self.project_id = project_id
+        self.total_logs = total_logs
+        self.broken_links = broken_links
+        self.head_hash = head_hash
+        self._broken_ids = {link.get("progress_id") for link in broken_links}
+
+    @property
+    def chain_valid(self) -> bool:
+        return not self.broken_links
+
+    def entry_valid(self, progress_id: Any) -> bool:
+        """Whether one entry's hash and link verified"""
+        return str(progress_id) not in self._broken_ids
+
+
+def clear_progress_chain_cache() -> None:
+    """Drop cached verification results (checkpoints are kept)"""
+    _status_cache.clear()
+
+
+def _checkpoint_intact(
+    db: Session,
+    checkpoint: ProgressChainCheckpoint,
+    logs: Optional[list]
+) -> bool:
+    """
+    Whether the last verified entry is still where the checkpoint left it.
+
+    Progress logs are append-only (see 02_create_triggers.sql), so this is a
+    guard against out-of-band edits, not a re-verification.
+    """
+    if logs is not None:
+        count = checkpoint.verified_count
+        if count == 0 or count > len(logs):
+            return count == 0
+        last = logs[count - 1]
+        return last.progress_id == checkpoint.verified_progress_id and last.record_hash == checkpoint.head_hash
+
+    if checkpoint.verified_progress_id is None:
+        return checkpoint.verified_count == 0
+    record_hash = db.query(ProjectProgressLog.record_hash).filter(
+        ProjectProgressLog.progress_id == checkpoint.verified_progress_id
+    ).scalar()
+    return record_hash is not None and record_hash == checkpoint.head_hash
+
+
+def _save_checkpoint(
+    db: Session,
+    project_id: UUID,
+    verified_count: int,
+    last_progress_id: UUID,
+    last_created_at: datetime,
+    last_hash: str,
+    broken_links: List[Dict[str, Any]]
+) -> None:
+    """Upsert the checkpoint (a concurrent writer's values are equally consistent)"""
+    values = {
+        "verified_count": verified_count,
+        "verified_progress_id": last_progress_id,
+        "verified_created_at": last_created_at,
+        "head_hash": last_hash,
+        "broken_links": broken_links,
+        "updated_at": datetime.utcnow(),
+    }
+    db.execute(
+        insert(ProgressChainCheckpoint)
+        .values(project_id=project_id, **values)
+        .on_conflict_do_update(index_elements=["project_id"], set_=values)
+    )
+
+
+def verify_project_chain(
+    db: Session,
+    project_id: UUID,
+    logs: Optional[list] = None,
+    full: bool = False
+) -> ProgressChainStatus:
+    """
+    Verify a project's progress chain, hashing only entries appended since
+    its checkpoint.
+
+    The checkpoint is written through db; the caller commits.
+
+    Args:
+        db: Database session
+        project_id: Project UUID
+        logs: The project's entries in CHAIN_ORDER if the caller has already
+            loaded them; otherwise the new entries are verified server-side
+            by verify_progress_chain_from() (migration 010) without loading them
+        full: Ignore the checkpoint and cached results and re-verify from genesis
+
+    Returns:
+        ProgressChainStatus for the whole chain
+    """
+    if logs is None:
+        head = db.query(
+            ProjectProgressLog.progress_id, ProjectProgressLog.record_hash
+        ).filter(
+            ProjectProgressLog.project_id == project_id
+        ).order_by(*[column.desc() for column in CHAIN_ORDER]).first()
+    else:
+        head = logs[-1] if logs else None
+
+    if head is None:
+        return ProgressChainStatus(project_id, 0, [], None)
+
+    cache_key = (str(project_id), str(head.progress_id), head.record_hash)
+    if not full:
+        cached = _status_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    checkpoint = None
+    if not full:
+        checkpoint = db.get(ProgressChainCheckpoint, project_id, populate_existing=True)
+        if checkpoint is not None and not _checkpoint_intact(db, checkpoint, logs):
+            logger.warning(f"Progress chain checkpoint for project {project_id} no longer matches; re-verifying")
+            checkpoint = None
+
+    if checkpoint is None:
+        verified_count, prev_hash, broken_links = 0, None, []
+    else:
+        verified_count = checkpoint.verified_count
+        prev_hash = checkpoint.head_hash
+        broken_links = list(checkpoint.broken_links or [])
+
+    if logs is not None:
+        new_logs = logs[verified_count:]
+        checked = len(new_logs)
+        if checked:
+            _, new_broken = verify_progress_chain(new_logs, prev_hash=prev_hash)
+            last = new_logs[-1]
+            tip = (last.progress_id, last.created_at, last.record_hash)
+    else:
+        result = db.execute(
+            text(
+                "SELECT * FROM verify_progress_chain_from("
+                ":project_id, :prev_hash, :after_created_at, :after_progress_id)"
+            ),
+            {
+                "project_id": project_id,
+                "prev_hash": prev_hash,
+                "after_created_at": checkpoint.verified_created_at if checkpoint else None,
+                "after_progress_id": checkpoint.verified_progress_id if checkpoint else None,
+            }
+        ).one()
+        checked = result.checked
+        new_broken = result.broken_links
+        tip = (result.last_progress_id, result.last_created_at, result.last_hash)
+
+    if checked:
+        broken_links = broken_links + new_broken
+        verified_count += checked
+        _save_checkpoint(db, project_id, verified_count, *tip, broken_links)
+
+    status = ProgressChainStatus(project_id, verified_count, broken_links, head.record_hash)
+    _status_cache.put(cache_key, status)
+    return status
@@ -0,0 +1,91 @@
+"""
+Public Statistics Snapshot Service
+Reads the trigger-maintained public_stats summary table (migration 005)
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..models import DEO, PublicStat
+
+logger = logging.getLogger(__name__)
+
+
+class PublicStatsSnapshot:
+    """In-memory view of the public_stats rows"""
+
+    def __init__(self, rows: List[PublicStat]):
+        self._rows: Dict[str, Dict[str, PublicStat]] = {}
+        for row in rows:
+            self._rows.setdefault(row.dimension, {})[row.dim_key] = row
+        self.generated_at: Optional[datetime] = max(
+            (row.refreshed_at for row in rows), default=None
+        )
+
+    def row(self, dimension: str, key: str = '') -> Optional[PublicStat]:
+        """Single aggregate row, or None if no project contributes to it"""
+        return self._rows.get(dimension, {}).get(key)
+
+    def counts(self, dimension: str) -> Dict[str, int]:
+        """Project counts per non-empty key of a dimension"""
+        return {
+            key: row.project_count
+            for key, row in self._rows.get(dimension, {}).items()
+            if key and row.project_count > 0
+        }
+
+    @property
+    def total_projects(self) -> int:
+        total = self.row('total')
+        return total.project_count if total else 0
+
+    @property
+    def total_cost(self) -> float:
+        total = self.row('total')
+        return float(total.total_cost) if total else 0.0
+
+    @property
+    def avg_completion(self) -> float:
+        """Mean latest progress over projects that have reported progress"""
+        total = self.row('total')
+        if not total or not total.progress_count:
+            return 0.0
+        return float(total.progress_sum) / total.progress_count
+
+
+def refresh_public_stats(db: Session) -> None:
+    """Rebuild the snapshot from scratch (see refresh_public_stats() in SQL)"""
+    db.execute(text("SELECT refresh_public_stats()"))
+    db.commit()
+
+
+def get_public_stats_snapshot(db: Session) -> PublicStatsSnapshot:
+    """
+    Load the statistics snapshot.
+
+    The table holds one row per distinct dimension value, so this is
+    independent of the number of projects. An empty table (fresh install)
+    triggers a one-off full rebuild.
+    """
+    rows = db.query(PublicStat).all()
+    if not rows:
+        logger.info("public_stats is empty, rebuilding snapshot")
+        refresh_public_stats(db)
+        rows = db.query(PublicStat).all()
+    return PublicStatsSnapshot(rows)
+
+
+def get_deo_project_counts(db: Session, snapshot: PublicStatsSnapshot) -> List[Dict[str, Any]]:
+    """All DEOs with their (non-deleted) project counts from the snapshot"""
+    counts = snapshot.counts('deo')
+    deos = db.query(DEO.deo_id, DEO.deo_name, DEO.province).order_by(DEO.deo_id).all()
+    return [{
+        "deo_id": deo_id,
+        "deo_name": deo_name,
+        "province": province,
+        "project_count": counts.get(str(deo_id), 0)
+    } for deo_id, deo_name, province in deos]
@@ -13,7 +13,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from ..models import Project, DEO, ProjectProgressLog, User
-from ..core.security import verify_progress_chain
+from .progress_chain import CHAIN_ORDER, verify_project_chain
 from .pdf_generator import (
     PDFReportBuilder,
     calculate_document_hash,
@@ -84,7 +84,7 @@ class ReportService:
 
         latest_log = db.query(ProjectProgressLog).filter(
             ProjectProgressLog.project_id == project_id
-        ).order_by(ProjectProgressLog.created_at.desc()).first()
+        ).order_by(*[column.desc() for column in CHAIN_ORDER]).first()
 
         current_progress = float(latest_log.reported_percent) if latest_log else 0.0
 
@@ -126,17 +126,15 @@ class ReportService:
         # Get DEO info
         deo = db.query(DEO).filter(DEO.deo_id == project.deo_id).first()
 
-        # Get last 5 progress entries
-        recent_logs = db.query(ProjectProgressLog).filter(
+        # Get last 5 progress entries with reporter names
+        recent_rows = db.query(ProjectProgressLog, User.username).outerjoin(
+            User, User.user_id == ProjectProgressLog.reported_by
+        ).filter(
             ProjectProgressLog.project_id == project_id
-        ).order_by(ProjectProgressLog.created_at.desc()).limit(5).all()
+        ).order_by(*[column.desc() for column in CHAIN_ORDER]).limit(5).all()
 
-        # Get reporter names
-        log_reporters = {}
-        for log in recent_logs:
-            if log.reported_by not in log_reporters:
-                reporter = db.query(User).filter(User.user_id == log.reported_by).first()
-                log_reporters[log.reported_by] = reporter.username if reporter else "Unknown"
+        recent_logs = [log for log, _ in recent_rows]
+        log_reporters = {log.reported_by: name or "Unknown" for log, name in recent_rows}
 
         # Generate timestamp
         generated_at = datetime.utcnow()
@@ -285,23 +283,23 @@ class ReportService:
         # Get DEO info
         deo = db.query(DEO).filter(DEO.deo_id == project.deo_id).first()
 
-        # Get all progress logs
-        all_logs = db.query(ProjectProgressLog).filter(
+        # Get all progress logs with reporter names
+        all_rows = db.query(ProjectProgressLog, User.username).outerjoin(
+            User, User.user_id == ProjectProgressLog.reported_by
+        ).filter(
             ProjectProgressLog.project_id == project_id
-        ).order_by(ProjectProgressLog.created_at.asc()).all()
+        ).order_by(*CHAIN_ORDER).all()
 
-        # Verify hash chain
+        all_logs = [log for log, _ in all_rows]
+        log_reporters = {log.reported_by: name or "Unknown" for log, name in all_rows}
+
+        # Verify hash chain (only entries since the project's checkpoint are hashed)
+        chain = None
         chain_valid = True
         broken_links = []
         if all_logs and include_verification:
-            chain_valid, broken_links = verify_progress_chain(all_logs)
-
-        # Get reporter names
-        log_reporters = {}
-        for log in all_logs:
-            if log.reported_by not in log_reporters:
-                reporter = db.query(User).filter(User.user_id == log.reported_by).first()
-                log_reporters[log.reported_by] = reporter.username if reporter else "Unknown"
+            chain = verify_project_chain(db, project_id, logs=all_logs)
+            chain_valid, broken_links = chain.chain_valid, chain.broken_links
 
         # Generate timestamp
         generated_at = datetime.utcnow()
@@ -387,21 +385,8 @@ class ReportService:
                 headers.extend(["Hash", "Valid"])
 
             data = []
-            prev_hash = None
 
             for log in all_logs:
-                # Verify individual hash
-                from ..core.security import calculate_progress_hash
-                expected_hash = calculate_progress_hash(
-                    project_id=str(log.project_id),
-                    reported_percent=float(log.reported_percent),
-                    report_date=str(log.report_date),
-                    reported_by=str(log.reported_by),
-                    prev_hash=prev_hash
-                )
-                hash_valid = (expected_hash == log.record_hash and
-                            (prev_hash is None or log.prev_hash == prev_hash))
-
                 row = [
                     log.report_date.strftime("%Y-%m-%d"),
                     f"{float(log.reported_percent):.1f}%",
@@ -411,10 +396,9 @@ class ReportService:
 
                 if show_hash:
                     row.append(log.record_hash[:10] + "...")
-                    row.append("Yes" if hash_valid else "NO")
+                    row.append("Yes" if chain.entry_valid(log.progress_id) else "NO")
 
                 data.append(row)
-                prev_hash = log.record_hash
 
             col_widths = [0.9*inch, 0.7*inch, 1*inch, 2.2*inch]
             if show_hash:
@@ -0,0 +1,176 @@
+"""
+Project Search Service
+Full-text (tsvector) and trigram (pg_trgm) project search with autocomplete
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from sqlalchemy import Float, cast, func, or_
+from sqlalchemy.orm import Query, Session
+
+from ..core.cache import TTLCache
+from ..models import Project
+
+# Text search configuration used by the projects.search_vector generated column.
+# 'simple' avoids English stemming, which mangles Filipino and Arabic place names.
+SEARCH_CONFIG = 'simple'
+
+# Autocomplete result cache (small LRU with TTL)
+SUGGEST_CACHE_SIZE = 256
+SUGGEST_CACHE_TTL_SECONDS = 300
+
+_suggest_cache = TTLCache(SUGGEST_CACHE_SIZE, SUGGEST_CACHE_TTL_SECONDS)
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase and collapse whitespace in a search term"""
+    return " ".join(term.lower().split())
+
+
+def build_prefix_tsquery(term: str) -> Optional[str]:
+    """
+    Build a prefix-matching tsquery string from free text.
+
+    Every word becomes a prefix term joined with AND, so "cota bri" matches
+    "Cotabato Bridge". Punctuation is dropped, which also keeps user input
+    from injecting tsquery operators.
+
+    Returns:
+        tsquery text, or None if the term has no word characters
+    """
+    tokens = _TOKEN_PATTERN.findall(normalize_term(term))
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def project_search_filter(term: str):
+    """
+    SQL predicate matching projects by full-text prefix or trigram similarity.
+
+    The tsvector branch is served by idx_projects_search_vector; the trigram
+    branches (typo tolerance for place names) by the gin_trgm_ops indexes.
+    """
+    tsquery = build_prefix_tsquery(term)
+    if tsquery is None:
+        pattern = f"%{term}%"
+        return or_(
+            Project.project_title.ilike(pattern),
+            Project.location.ilike(pattern)
+        )
+
+    return or_(
+        Project.search_vector.op('@@')(func.to_tsquery(SEARCH_CONFIG, tsquery)),
+        Project.project_title.op('%>')(term),
+        Project.location.op('%>')(term)
+    )
+
+
+def project_search_rank(term: str):
+    """
+    Relevance score for a search term: text rank plus best trigram similarity.
+    """
+    tsquery = build_prefix_tsquery(term) or ''
+    text_rank = func.ts_rank(
+        Project.search_vector,
+        func.to_tsquery(SEARCH_CONFIG, tsquery)
+    )
+    similarity = func.greatest(
+        func.word_similarity(term, Project.project_title),
+        func.word_similarity(term, func.coalesce(Project.location, ''))
+    )
+    return cast(text_rank + similarity, Float)
+
+
+def apply_project_search(query: Query, term: str) -> Tuple[Query, Any]:
+    """
+    Filter a Project query by a search term.
+
+    Returns:
+        Tuple of (filtered query, rank expression for ordering)
+    """
+    return query.filter(project_search_filter(term)), project_search_rank(term)
+
+
+def clear_suggest_cache() -> None:
+    """Drop all cached autocomplete results (e.g. after project edits)"""
+    _suggest_cache.clear()
+
+
+def suggest_projects(db: Session, term: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Autocomplete suggestions for the portal search box.
+
+    Returns matching project titles and distinct locations ordered by
+    similarity to the typed text. Results are cached per (term, limit).
+
+    Args:
+        db: Database session
+        term: Text typed so far
+        limit: Max suggestions per kind
+
+    Returns:
+        List of {"kind", "label", "project_id", "score"} dicts
+    """
+    normalized = normalize_term(term)
+    if not normalized:
+        return []
+
+    cache_key = (normalized, limit)
+    cached = _suggest_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    public_filter = Project.status.not_in(['deleted', 'cancelled'])
+    search = project_search_filter(normalized)
+
+    title_score = func.word_similarity(normalized, Project.project_title).label('score')
+    titles = db.query(
+        Project.project_id,
+        Project.project_title,
+        title_score
+    ).filter(
+        public_filter,
+        search
+    ).order_by(
+        title_score.desc()
+    ).limit(limit).all()
+
+    location_score = func.max(
+        func.word_similarity(normalized, Project.location)
+    ).label('score')
+    locations = db.query(
+        Project.location,
+        location_score
+    ).filter(
+        public_filter,
+        Project.location.isnot(None),
+        or_(
+            Project.location.op('%>')(normalized),
+            Project.location.ilike(f"{normalized}%")
+        )
+    ).group_by(
+        Project.location
+    ).order_by(
+        location_score.desc()
+    ).limit(limit).all()
+
+    suggestions = [{
+        "kind": "project",
+        "label": title,
+        "project_id": str(project_id),
+        "score": float(score or 0.0)
+    } for project_id, title, score in titles]
+
+    suggestions.extend({
+        "kind": "location",
+        "label": location,
+        "project_id": None,
+        "score": float(score or 0.0)
+    } for location, score in locations)
+
+    _suggest_cache.put(cache_key, suggestions)
+    return suggestions
@@ -0,0 +1,18 @@
+-- Migration: Composite indexes for keyset (cursor) pagination
+-- Created: 2026-10-18
+-- Description: List endpoints page by (sort column, primary key) row values.
+--              These indexes let each page be an index range scan instead of
+--              an OFFSET walk over every preceding row.
+
+CREATE INDEX IF NOT EXISTS idx_projects_created_at_id ON projects(created_at, project_id);
+CREATE INDEX IF NOT EXISTS idx_audit_created_at_id ON audit_logs(created_at, audit_id);
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users(created_at, user_id);
+CREATE INDEX IF NOT EXISTS idx_media_uploaded_at_id ON media_assets(uploaded_at, media_id);
+
+-- Keep planner statistics fresh so ?count=estimated stays close to reality
+ANALYZE projects;
+ANALYZE audit_logs;
+ANALYZE users;
+ANALYZE media_assets;
+
+SELECT 'Migration 003 completed!' as status;
@@ -0,0 +1,24 @@
+-- Migration: Full-text and trigram project search
+-- Created: 2026-10-18
+-- Description: Replaces sequential ILIKE scans on project_title/location with
+--              a generated tsvector column (prefix search, ranking) and
+--              pg_trgm indexes (typo tolerance for place names).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 'simple' configuration: no stemming, so place names are indexed verbatim
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(project_title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_projects_search_vector ON projects USING GIN(search_vector);
+CREATE INDEX IF NOT EXISTS idx_projects_title_trgm ON projects USING GIN(project_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_projects_location_trgm ON projects USING GIN(location gin_trgm_ops);
+
+COMMENT ON COLUMN projects.search_vector IS 'Generated full-text document: title (weight A) + location (weight B)';
+
+ANALYZE projects;
+
+SELECT 'Migration 004 completed!' as status;
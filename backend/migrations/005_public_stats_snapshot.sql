@@ -0,0 +1,207 @@
+-- Migration: Public statistics snapshot
+-- Created: 2026-10-18
+-- Description: Summary tables behind /public/stats, /public/filter-options and
+--              /public/deos. Triggers on projects and project_progress_logs
+--              apply row-level deltas, so the public endpoints read a handful
+--              of pre-aggregated rows instead of scanning every project.
+--
+-- Dimensions kept in public_stats:
+--   total ('')            - all non-deleted projects
+--   deo (deo_id)          - per DEO
+--   status, fund_year, fund_source, mode_of_implementation, project_scale
+-- NULL dimension values are stored as ''.
+
+-- =============================================================================
+-- TABLES
+-- =============================================================================
+
+-- No FK to projects: the delete trigger below must still see this row after
+-- the project is gone (FK cascades would fire before it)
+CREATE TABLE IF NOT EXISTS project_latest_progress (
+    project_id UUID PRIMARY KEY,
+    reported_percent NUMERIC(5,2) NOT NULL,
+    report_date DATE NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS public_stats (
+    dimension VARCHAR(32) NOT NULL,
+    dim_key TEXT NOT NULL,
+    project_count BIGINT NOT NULL DEFAULT 0,
+    total_cost NUMERIC(20,2) NOT NULL DEFAULT 0,
+    progress_sum NUMERIC(20,2) NOT NULL DEFAULT 0,
+    progress_count BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now()),
+    PRIMARY KEY (dimension, dim_key)
+);
+
+COMMENT ON TABLE public_stats IS 'Incrementally maintained public statistics snapshot (see public_stats_apply)';
+
+-- =============================================================================
+-- INCREMENTAL MAINTENANCE
+-- =============================================================================
+
+-- Add (sign = 1) or remove (sign = -1) one project's contribution.
+-- p is a projects row; declared RECORD so the function does not pin the
+-- table's row type (which would block DROP TABLE projects).
+CREATE OR REPLACE FUNCTION public_stats_apply(p RECORD, sign INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    latest NUMERIC;
+BEGIN
+    IF p.status IS NULL OR p.status = 'deleted' THEN
+        RETURN;
+    END IF;
+
+    SELECT reported_percent INTO latest
+    FROM project_latest_progress
+    WHERE project_id = p.project_id;
+
+    -- Rows are always touched in the same order to avoid deadlocks
+    INSERT INTO public_stats AS s (
+        dimension, dim_key, project_count, total_cost,
+        progress_sum, progress_count, refreshed_at
+    )
+    SELECT
+        d.dimension,
+        d.dim_key,
+        sign,
+        sign * coalesce(p.project_cost, 0),
+        sign * coalesce(latest, 0),
+        CASE WHEN latest IS NULL THEN 0 ELSE sign END,
+        timezone('utc', now())
+    FROM (VALUES
+        (1, 'total', ''),
+        (2, 'deo', p.deo_id::text),
+        (3, 'status', coalesce(p.status, '')),
+        (4, 'fund_year', coalesce(p.fund_year::text, '')),
+        (5, 'fund_source', coalesce(p.fund_source, '')),
+        (6, 'mode_of_implementation', coalesce(p.mode_of_implementation, '')),
+        (7, 'project_scale', coalesce(p.project_scale, ''))
+    ) AS d(ord, dimension, dim_key)
+    ORDER BY d.ord
+    ON CONFLICT (dimension, dim_key) DO UPDATE SET
+        project_count = s.project_count + EXCLUDED.project_count,
+        total_cost = s.total_cost + EXCLUDED.total_cost,
+        progress_sum = s.progress_sum + EXCLUDED.progress_sum,
+        progress_count = s.progress_count + EXCLUDED.progress_count,
+        refreshed_at = EXCLUDED.refreshed_at;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public_stats_projects_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public_stats_apply(OLD, -1);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public_stats_apply(NEW, 1);
+    ELSE
+        DELETE FROM project_latest_progress WHERE project_id = OLD.project_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public_stats_progress_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    p projects%ROWTYPE;
+    latest_at TIMESTAMP;
+BEGIN
+    -- Serialize with concurrent project updates; NO KEY UPDATE does not
+    -- conflict with the KEY SHARE lock taken by the progress_logs FK
+    SELECT * INTO p FROM projects
+    WHERE project_id = NEW.project_id
+    FOR NO KEY UPDATE;
+
+    SELECT created_at INTO latest_at
+    FROM project_latest_progress
+    WHERE project_id = NEW.project_id;
+
+    IF latest_at IS NOT NULL AND latest_at > NEW.created_at THEN
+        RETURN NULL;
+    END IF;
+
+    PERFORM public_stats_apply(p, -1);
+
+    INSERT INTO project_latest_progress (project_id, reported_percent, report_date, created_at)
+    VALUES (NEW.project_id, NEW.reported_percent, NEW.report_date, NEW.created_at)
+    ON CONFLICT (project_id) DO UPDATE SET
+        reported_percent = EXCLUDED.reported_percent,
+        report_date = EXCLUDED.report_date,
+        created_at = EXCLUDED.created_at;
+
+    PERFORM public_stats_apply(p, 1);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_public_stats_projects ON projects;
+CREATE TRIGGER trg_public_stats_projects
+    AFTER INSERT OR DELETE OR UPDATE OF deo_id, status, project_cost, fund_year,
+        fund_source, mode_of_implementation, project_scale
+    ON projects
+    FOR EACH ROW
+    EXECUTE FUNCTION public_stats_projects_trigger();
+
+DROP TRIGGER IF EXISTS trg_public_stats_progress ON project_progress_logs;
+CREATE TRIGGER trg_public_stats_progress
+    AFTER INSERT ON project_progress_logs
+    FOR EACH ROW
+    EXECUTE FUNCTION public_stats_progress_trigger();
+
+-- =============================================================================
+-- FULL REBUILD
+-- =============================================================================
+
+-- Recompute the snapshot from scratch (initial load, or repair after bulk
+-- loads with triggers disabled). Blocks trigger writers while it runs.
+CREATE OR REPLACE FUNCTION refresh_public_stats()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE project_latest_progress, public_stats IN EXCLUSIVE MODE;
+
+    DELETE FROM project_latest_progress;
+    INSERT INTO project_latest_progress (project_id, reported_percent, report_date, created_at)
+    SELECT DISTINCT ON (project_id)
+        project_id, reported_percent, report_date, created_at
+    FROM project_progress_logs
+    ORDER BY project_id, created_at DESC;
+
+    DELETE FROM public_stats;
+    INSERT INTO public_stats (
+        dimension, dim_key, project_count, total_cost,
+        progress_sum, progress_count, refreshed_at
+    )
+    SELECT
+        d.dimension,
+        d.dim_key,
+        count(*),
+        sum(coalesce(p.project_cost, 0)),
+        sum(coalesce(lp.reported_percent, 0)),
+        count(lp.reported_percent),
+        timezone('utc', now())
+    FROM projects p
+    LEFT JOIN project_latest_progress lp ON lp.project_id = p.project_id
+    CROSS JOIN LATERAL (VALUES
+        ('total', ''),
+        ('deo', p.deo_id::text),
+        ('status', coalesce(p.status, '')),
+        ('fund_year', coalesce(p.fund_year::text, '')),
+        ('fund_source', coalesce(p.fund_source, '')),
+        ('mode_of_implementation', coalesce(p.mode_of_implementation, '')),
+        ('project_scale', coalesce(p.project_scale, ''))
+    ) AS d(dimension, dim_key)
+    WHERE p.status <> 'deleted'
+    GROUP BY d.dimension, d.dim_key;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_public_stats();
+
+SELECT 'Migration 005 completed!' as status;
@@ -0,0 +1,57 @@
+-- Migration: Audit chain head and sequence numbers
+-- Created: 2026-10-18
+-- Description: Appending to the audit hash chain used to look up the previous
+--              entry with ORDER BY created_at DESC LIMIT 1, which lets two
+--              concurrent writers read the same tip and fork the chain.
+--              Appends now lock a single chain-head row (SELECT ... FOR UPDATE)
+--              in the inserting transaction and number entries with a
+--              gapless, monotonic sequence.
+
+-- =============================================================================
+-- SEQUENCE COLUMN
+-- =============================================================================
+
+ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS sequence BIGINT;
+
+-- Number existing entries in their historical (timestamp) order.
+-- audit_logs is append-only, so the guard trigger is lifted for the backfill.
+ALTER TABLE audit_logs DISABLE TRIGGER prevent_audit_update;
+
+UPDATE audit_logs a
+SET sequence = numbered.seq
+FROM (
+    SELECT audit_id, row_number() OVER (ORDER BY created_at, audit_id) AS seq
+    FROM audit_logs
+) numbered
+WHERE a.audit_id = numbered.audit_id
+  AND a.sequence IS NULL;
+
+ALTER TABLE audit_logs ENABLE TRIGGER prevent_audit_update;
+
+CREATE UNIQUE INDEX IF NOT EXISTS audit_logs_sequence_key ON audit_logs(sequence);
+
+COMMENT ON COLUMN audit_logs.sequence IS 'Position in the audit hash chain (gapless, assigned under the audit_chain_head lock)';
+
+-- =============================================================================
+-- CHAIN HEAD
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS audit_chain_head (
+    chain_id VARCHAR(32) PRIMARY KEY,
+    last_sequence BIGINT NOT NULL DEFAULT 0,
+    last_hash TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMENT ON TABLE audit_chain_head IS 'Tip of the audit hash chain; every append locks this row until commit';
+
+INSERT INTO audit_chain_head (chain_id, last_sequence, last_hash, updated_at)
+SELECT
+    'audit',
+    coalesce(max(sequence), 0),
+    (SELECT record_hash FROM audit_logs ORDER BY sequence DESC LIMIT 1),
+    NOW()
+FROM audit_logs
+ON CONFLICT (chain_id) DO NOTHING;
+
+SELECT 'Migration 006 completed!' as status;
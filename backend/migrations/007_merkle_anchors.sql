@@ -0,0 +1,35 @@
+-- Migration: Merkle anchoring of append-only logs
+-- Created: 2026-10-18
+-- Description: Daily Merkle trees over audit_logs and project_progress_logs.
+--              merkle_anchors holds one root per (source, day); merkle_nodes
+--              holds every tree node so an inclusion proof is a couple of
+--              indexed lookups. Populated by `python -m app.jobs.anchor_merkle`.
+--
+-- Hashing: leaf = sha256(0x00 || record_hash bytes),
+--          node = sha256(0x01 || left || right); an unpaired node is promoted.
+
+CREATE TABLE IF NOT EXISTS merkle_anchors (
+    anchor_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    source VARCHAR(32) NOT NULL CHECK (source IN ('audit_logs', 'project_progress_logs')),
+    anchor_date DATE NOT NULL,
+    leaf_count INT NOT NULL,
+    root_hash TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT uq_merkle_anchor_source_date UNIQUE (source, anchor_date)
+);
+
+CREATE TABLE IF NOT EXISTS merkle_nodes (
+    anchor_id UUID NOT NULL REFERENCES merkle_anchors(anchor_id) ON DELETE CASCADE,
+    level SMALLINT NOT NULL,
+    node_index INT NOT NULL,
+    node_hash TEXT NOT NULL,
+    record_id UUID,
+    PRIMARY KEY (anchor_id, level, node_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_merkle_nodes_record_id ON merkle_nodes(record_id) WHERE record_id IS NOT NULL;
+
+COMMENT ON TABLE merkle_anchors IS 'Daily Merkle roots of append-only log tables';
+COMMENT ON TABLE merkle_nodes IS 'Merkle tree nodes (level 0 = leaves, record_id set on leaves)';
+
+SELECT 'Migration 007 completed!' as status;
@@ -0,0 +1,32 @@
+-- Migration: Audit chain verification checkpoints
+-- Created: 2026-10-18
+-- Description: State for the streaming audit-chain verification job
+--              (`python -m app.jobs.verify_audit_chain`): a resumable
+--              checkpoint and the broken links it has found.
+
+CREATE TABLE IF NOT EXISTS audit_verification_checkpoints (
+    chain_id VARCHAR(32) PRIMARY KEY,
+    verified_sequence BIGINT NOT NULL DEFAULT 0,
+    verified_hash TEXT,
+    rows_checked BIGINT NOT NULL DEFAULT 0,
+    unhashed_rows BIGINT NOT NULL DEFAULT 0,
+    broken_count BIGINT NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed', 'failed')),
+    rows_per_second NUMERIC(12,1),
+    started_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS audit_chain_breaks (
+    break_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    sequence BIGINT NOT NULL,
+    audit_id UUID,
+    error VARCHAR(50) NOT NULL,
+    expected TEXT,
+    actual TEXT,
+    detected_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_chain_breaks_sequence ON audit_chain_breaks(sequence);
+
+SELECT 'Migration 008 completed!' as status;
@@ -0,0 +1,26 @@
+-- Migration: Progress chain verification checkpoints
+-- Created: 2026-10-18
+-- Description: Progress history, chain verification and the progress reports
+--              re-hashed every entry of a project from genesis on each call.
+--              Each project now keeps a checkpoint of its verified prefix
+--              (last verified entry and its record_hash, plus any broken links
+--              found in it), so verification only hashes entries appended
+--              since. Entries are chained in (created_at, progress_id) order.
+
+CREATE TABLE IF NOT EXISTS progress_chain_checkpoints (
+    project_id UUID PRIMARY KEY REFERENCES projects(project_id) ON DELETE CASCADE,
+    verified_count INTEGER NOT NULL DEFAULT 0,
+    verified_progress_id UUID,
+    verified_created_at TIMESTAMP,
+    head_hash TEXT,
+    broken_links JSONB NOT NULL DEFAULT '[]'::jsonb,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMENT ON TABLE progress_chain_checkpoints IS 'Verified prefix of each project''s progress hash chain';
+
+-- Chain-order scans and "entries after the checkpoint" keyset lookups
+CREATE INDEX IF NOT EXISTS idx_progress_project_chain
+    ON project_progress_logs(project_id, created_at, progress_id);
+
+SELECT 'Migration 009 completed!' as status;
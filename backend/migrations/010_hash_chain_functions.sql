@@ -0,0 +1,358 @@
+-- Migration: In-database hash-chain computation and verification
+-- Created: 2026-10-18
+-- Description: SQL (pgcrypto) implementations of the progress and audit
+--              record hashes from app/core/security.py, producing the same
+--              canonical JSON as json.dumps(sort_keys=True,
+--              separators=(',', ':')) with its default ensure_ascii=True:
+--                - keys sorted by code point, no whitespace
+--                - strings escaped as Python does (\uXXXX for DEL and
+--                  non-ASCII, surrogate pairs above the BMP)
+--                - reported_percent rendered as a Python float ("45.5", "100.0")
+--                - timestamps rendered like datetime.isoformat()
+--              Audit payload numbers are rendered as JSONB stores them; floats
+--              that Python writes in exponent form (1e-05, 1e+16) are not
+--              reproduced, so the audit insert trigger only fills in missing
+--              hashes and never rejects one.
+--
+--              Adds:
+--                - BEFORE INSERT triggers: progress entries without a
+--                  record_hash are chained in the database, entries with one
+--                  are rejected if it does not match; audit entries without a
+--                  sequence are appended under the audit_chain_head lock
+--                  (migration 006), as app/services/audit_chain.py does
+--                - verify_progress_chain_from(): one-call, set-based
+--                  verification of a project's chain (optionally after a
+--                  checkpoint)
+--                - verify_audit_chain(): the same for a sequence range of the
+--                  audit chain
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+-- =============================================================================
+-- CANONICAL JSON
+-- =============================================================================
+
+-- JSON string literal as json.dumps(..., ensure_ascii=True) writes it
+CREATE OR REPLACE FUNCTION hash_chain_json_string(p_value TEXT)
+RETURNS TEXT AS $$
+DECLARE
+    v_json TEXT := to_json(p_value)::text;  -- escapes ", \ and control characters like Python
+    v_out TEXT := '';
+    v_char TEXT;
+    v_code INTEGER;
+BEGIN
+    IF octet_length(p_value) = char_length(p_value) AND position(chr(127) IN p_value) = 0 THEN
+        RETURN v_json;
+    END IF;
+
+    FOREACH v_char IN ARRAY regexp_split_to_array(v_json, '') LOOP
+        v_code := ascii(v_char);
+        IF v_code < 127 THEN
+            v_out := v_out || v_char;
+        ELSIF v_code < 65536 THEN
+            v_out := v_out || '\u' || lpad(to_hex(v_code), 4, '0');
+        ELSE
+            v_code := v_code - 65536;
+            v_out := v_out || '\u' || to_hex(55296 + (v_code >> 10))
+                           || '\u' || to_hex(56320 + (v_code & 1023));
+        END IF;
+    END LOOP;
+    RETURN v_out;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE STRICT;
+
+-- Canonical JSON text of a JSONB value (sorted keys, compact separators)
+CREATE OR REPLACE FUNCTION hash_chain_json(p_value JSONB)
+RETURNS TEXT AS $$
+DECLARE
+    v_result TEXT;
+BEGIN
+    CASE jsonb_typeof(p_value)
+        WHEN 'object' THEN
+            SELECT '{' || coalesce(string_agg(
+                       hash_chain_json_string(key) || ':' || hash_chain_json(value), ','
+                       ORDER BY key COLLATE "C"  -- UTF-8 byte order = code point order
+                   ), '') || '}'
+            INTO v_result
+            FROM jsonb_each(p_value);
+        WHEN 'array' THEN
+            SELECT '[' || coalesce(string_agg(hash_chain_json(value), ',' ORDER BY ordinality), '') || ']'
+            INTO v_result
+            FROM jsonb_array_elements(p_value) WITH ORDINALITY;
+        WHEN 'string' THEN
+            v_result := hash_chain_json_string(p_value #>> '{}');
+        ELSE
+            v_result := p_value::text;  -- number, boolean, null
+    END CASE;
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE STRICT;
+
+-- NUMERIC rendered as repr(float(value)) for values without an exponent
+CREATE OR REPLACE FUNCTION hash_chain_float(p_value NUMERIC)
+RETURNS TEXT AS $$
+    SELECT CASE WHEN position('.' IN t) > 0 THEN t ELSE t || '.0' END
+    FROM (SELECT trim_scale(p_value)::text AS t) v;
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+-- datetime.isoformat() of a naive timestamp ('' for NULL)
+CREATE OR REPLACE FUNCTION hash_chain_isoformat(p_value TIMESTAMP)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN p_value IS NULL THEN ''
+        WHEN date_trunc('second', p_value) = p_value THEN to_char(p_value, 'YYYY-MM-DD"T"HH24:MI:SS')
+        ELSE to_char(p_value, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+    END;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================================================
+-- RECORD HASHES (mirror calculate_progress_hash / calculate_audit_hash)
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION progress_record_hash(
+    p_project_id UUID,
+    p_reported_percent NUMERIC,
+    p_report_date DATE,
+    p_reported_by UUID,
+    p_prev_hash TEXT
+)
+RETURNS TEXT AS $$
+    SELECT encode(digest(convert_to(
+        '{"prev_hash":' || hash_chain_json_string(coalesce(p_prev_hash, ''))
+        || ',"project_id":' || hash_chain_json_string(p_project_id::text)
+        || ',"report_date":' || hash_chain_json_string(to_char(p_report_date::timestamp, 'YYYY-MM-DD'))
+        || ',"reported_by":' || hash_chain_json_string(p_reported_by::text)
+        || ',"reported_percent":' || hash_chain_float(p_reported_percent)
+        || '}',
+        'UTF8'), 'sha256'), 'hex');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION audit_record_hash(
+    p_actor_id UUID,
+    p_action TEXT,
+    p_entity_type TEXT,
+    p_entity_id UUID,
+    p_payload JSONB,
+    p_created_at TIMESTAMP,
+    p_prev_hash TEXT
+)
+RETURNS TEXT AS $$
+    SELECT encode(digest(convert_to(
+        '{"action":' || hash_chain_json_string(p_action)
+        || ',"actor_id":' || hash_chain_json_string(coalesce(p_actor_id::text, ''))
+        || ',"created_at":' || hash_chain_json_string(hash_chain_isoformat(p_created_at))
+        || ',"entity_id":' || hash_chain_json_string(coalesce(p_entity_id::text, ''))
+        || ',"entity_type":' || hash_chain_json_string(p_entity_type)
+        || ',"payload":' || hash_chain_json(coalesce(p_payload, '{}'::jsonb))
+        || ',"prev_hash":' || hash_chain_json_string(coalesce(p_prev_hash, ''))
+        || '}',
+        'UTF8'), 'sha256'), 'hex');
+$$ LANGUAGE sql STABLE;
+
+-- =============================================================================
+-- INSERT TRIGGERS
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION progress_chain_insert()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_expected TEXT;
+BEGIN
+    IF NEW.record_hash IS NULL THEN
+        -- Serialize appends to this project's chain, then link to its head
+        PERFORM 1 FROM projects WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+        SELECT record_hash INTO NEW.prev_hash
+        FROM project_progress_logs
+        WHERE project_id = NEW.project_id
+        ORDER BY created_at DESC, progress_id DESC
+        LIMIT 1;
+        NEW.record_hash := progress_record_hash(
+            NEW.project_id, NEW.reported_percent, NEW.report_date, NEW.reported_by, NEW.prev_hash
+        );
+        RETURN NEW;
+    END IF;
+
+    v_expected := progress_record_hash(
+        NEW.project_id, NEW.reported_percent, NEW.report_date, NEW.reported_by, NEW.prev_hash
+    );
+    IF NEW.record_hash <> v_expected THEN
+        RAISE EXCEPTION 'record_hash does not match progress entry % (expected %)', NEW.progress_id, v_expected
+        USING ERRCODE = '23514';  -- check_violation
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS chain_progress_insert ON project_progress_logs;
+CREATE TRIGGER chain_progress_insert
+    BEFORE INSERT ON project_progress_logs
+    FOR EACH ROW
+    EXECUTE FUNCTION progress_chain_insert();
+
+CREATE OR REPLACE FUNCTION audit_chain_insert()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_sequence BIGINT;
+    v_hash TEXT;
+BEGIN
+    -- Entries written through the application arrive already chained
+    IF NEW.sequence IS NOT NULL THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO audit_chain_head (chain_id, last_sequence, last_hash)
+    VALUES ('audit', 0, NULL)
+    ON CONFLICT (chain_id) DO NOTHING;
+
+    SELECT last_sequence, last_hash INTO v_sequence, v_hash
+    FROM audit_chain_head
+    WHERE chain_id = 'audit'
+    FOR UPDATE;
+
+    NEW.created_at := coalesce(NEW.created_at, (NOW() AT TIME ZONE 'UTC'));
+    NEW.sequence := v_sequence + 1;
+    NEW.prev_hash := v_hash;
+    NEW.record_hash := audit_record_hash(
+        NEW.actor_id, NEW.action, NEW.entity_type, NEW.entity_id, NEW.payload, NEW.created_at, NEW.prev_hash
+    );
+
+    UPDATE audit_chain_head
+    SET last_sequence = NEW.sequence, last_hash = NEW.record_hash, updated_at = NOW()
+    WHERE chain_id = 'audit';
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS chain_audit_insert ON audit_logs;
+CREATE TRIGGER chain_audit_insert
+    BEFORE INSERT ON audit_logs
+    FOR EACH ROW
+    EXECUTE FUNCTION audit_chain_insert();
+
+-- =============================================================================
+-- SET-BASED VERIFICATION
+-- =============================================================================
+
+-- Verify a project's progress chain, optionally only the entries after a
+-- checkpoint (p_prev_hash = record_hash of the checkpointed entry). Same
+-- rules and broken-link shape as core.security.verify_progress_chain.
+CREATE OR REPLACE FUNCTION verify_progress_chain_from(
+    p_project_id UUID,
+    p_prev_hash TEXT DEFAULT NULL,
+    p_after_created_at TIMESTAMP DEFAULT NULL,
+    p_after_progress_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    checked BIGINT,
+    last_progress_id UUID,
+    last_created_at TIMESTAMP,
+    last_hash TEXT,
+    broken_links JSONB
+) AS $$
+    WITH entries AS (
+        SELECT
+            l.*,
+            row_number() OVER w AS n,
+            coalesce(lag(l.record_hash) OVER w, p_prev_hash) AS carry
+        FROM project_progress_logs l
+        WHERE l.project_id = p_project_id
+          AND (p_after_progress_id IS NULL
+               OR (l.created_at, l.progress_id) > (p_after_created_at, p_after_progress_id))
+        WINDOW w AS (ORDER BY l.created_at, l.progress_id)
+    ),
+    chain AS (
+        SELECT
+            e.*,
+            progress_record_hash(e.project_id, e.reported_percent, e.report_date, e.reported_by, e.carry) AS expected_hash
+        FROM entries e
+    ),
+    breaks AS (
+        SELECT n, 0 AS kind, jsonb_build_object(
+            'progress_id', progress_id::text,
+            'expected_hash', expected_hash,
+            'actual_hash', record_hash,
+            'report_date', to_char(report_date::timestamp, 'YYYY-MM-DD')
+        ) AS link
+        FROM chain
+        WHERE expected_hash IS DISTINCT FROM record_hash
+        UNION ALL
+        SELECT n, 1, jsonb_build_object(
+            'progress_id', progress_id::text,
+            'error', 'prev_hash mismatch',
+            'expected_prev_hash', carry,
+            'actual_prev_hash', prev_hash
+        )
+        FROM chain
+        WHERE carry IS NOT NULL AND prev_hash IS DISTINCT FROM carry
+    )
+    SELECT
+        (SELECT count(*) FROM chain),
+        tip.progress_id,
+        tip.created_at,
+        tip.record_hash,
+        coalesce((SELECT jsonb_agg(link ORDER BY n, kind) FROM breaks), '[]'::jsonb)
+    FROM (SELECT 1) one
+    LEFT JOIN LATERAL (
+        SELECT progress_id, created_at, record_hash FROM chain ORDER BY n DESC LIMIT 1
+    ) tip ON TRUE;
+$$ LANGUAGE sql STABLE;
+
+-- Broken links in an audit sequence range, with the same checks as the
+-- verification job (app/services/audit_verification.py): sequence gaps,
+-- prev_hash links to the preceding entry, and each record_hash recomputed
+-- from its stored prev_hash. Unhashed legacy rows skip the hash check.
+CREATE OR REPLACE FUNCTION verify_audit_chain(p_from BIGINT, p_to BIGINT)
+RETURNS TABLE (
+    sequence BIGINT,
+    audit_id UUID,
+    error TEXT,
+    expected TEXT,
+    actual TEXT
+) AS $$
+    WITH window_rows AS (
+        (SELECT a.* FROM audit_logs a
+         WHERE a.sequence < p_from
+         ORDER BY a.sequence DESC
+         LIMIT 1)
+        UNION ALL
+        (SELECT a.* FROM audit_logs a
+         WHERE a.sequence BETWEEN p_from AND p_to)
+    ),
+    chain AS (
+        SELECT
+            w.sequence, w.audit_id, w.prev_hash, w.record_hash,
+            w.actor_id, w.action, w.entity_type, w.entity_id, w.payload, w.created_at,
+            lag(w.sequence) OVER (ORDER BY w.sequence) AS prior_sequence,
+            lag(w.record_hash) OVER (ORDER BY w.sequence) AS prior_hash
+        FROM window_rows w
+    ),
+    checks AS (
+        SELECT c.sequence, c.audit_id, 0 AS kind, 'sequence gap' AS error,
+               (coalesce(c.prior_sequence, 0) + 1)::text AS expected, c.sequence::text AS actual
+        FROM chain c
+        WHERE c.sequence >= p_from
+          AND c.sequence <> coalesce(c.prior_sequence, 0) + 1
+        UNION ALL
+        SELECT c.sequence, c.audit_id, 1, 'prev_hash mismatch', c.prior_hash, c.prev_hash
+        FROM chain c
+        WHERE c.sequence >= p_from
+          AND c.prev_hash IS DISTINCT FROM c.prior_hash
+        UNION ALL
+        SELECT c.sequence, c.audit_id, 2, 'hash mismatch', h.expected, c.record_hash
+        FROM chain c
+        CROSS JOIN LATERAL (
+            SELECT audit_record_hash(
+                c.actor_id, c.action, c.entity_type, c.entity_id, c.payload, c.created_at, c.prev_hash
+            ) AS expected
+        ) h
+        WHERE c.sequence >= p_from
+          AND c.record_hash IS NOT NULL
+          AND h.expected <> c.record_hash
+    )
+    SELECT checks.sequence, checks.audit_id, checks.error, checks.expected, checks.actual
+    FROM checks
+    ORDER BY checks.sequence, checks.kind;
+$$ LANGUAGE sql STABLE;
+
+SELECT 'Migration 010 completed!' as status;
@@ -0,0 +1,24 @@
+-- Migration: Audit outbox for the buffered audit writer
+-- Created: 2026-10-18
+-- Description: With AUDIT_WRITER_MODE=async, write requests no longer take the
+--              audit chain-head lock. Durable audit events are inserted here
+--              in the request's own transaction; the background writer
+--              (app/services/audit_writer.py) chains them into audit_logs in
+--              batches and deletes them in the same transaction.
+
+CREATE TABLE IF NOT EXISTS audit_outbox (
+    outbox_id BIGSERIAL PRIMARY KEY,
+    audit_id UUID NOT NULL UNIQUE,
+    actor_id UUID,
+    action VARCHAR(100) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL,
+    entity_id UUID,
+    payload JSONB DEFAULT '{}',
+    ip_address INET,
+    user_agent TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE audit_outbox IS 'Committed audit events not yet appended to the audit hash chain';
+
+SELECT 'Migration 011 completed!' as status;
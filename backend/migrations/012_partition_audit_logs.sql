@@ -0,0 +1,186 @@
+-- Migration: Monthly partitioned audit_logs
+-- Created: 2026-10-18
+-- Description: Converts audit_logs into a table range-partitioned by month on
+--              created_at, so that:
+--                - date-filtered audit queries only touch the partitions in
+--                  their range (partition pruning)
+--                - retention works per partition: a month is exported to
+--                  object storage with its Merkle anchors, detached and
+--                  dropped (app/services/audit_partitions.py), instead of a
+--                  bulk DELETE, which prevent_audit_delete forbids anyway
+--
+--              Unique constraints on a partitioned table must include the
+--              partition key, so the primary key becomes (audit_id, created_at)
+--              and sequence keeps a plain index. Sequence numbers are still
+--              assigned one at a time under the audit_chain_head lock
+--              (migration 006) and gaps or duplicates are reported by chain
+--              verification.
+--
+--              Rows are copied into the new table inside this migration's
+--              transaction; expect it to take as long as a table rewrite.
+--              Requires migration 010 (audit_chain_insert()).
+
+-- =============================================================================
+-- PARTITION MANAGEMENT
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION audit_logs_partition_name(p_month DATE)
+RETURNS TEXT AS $$
+    SELECT 'audit_logs_' || to_char(p_month, '"y"YYYY"m"MM');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Create the monthly partitions covering p_from..p_to that do not exist yet.
+-- A month that already has rows in the default partition (entries dated
+-- outside every partition) is skipped with a warning: creating it would
+-- fail until those rows are moved.
+CREATE OR REPLACE FUNCTION ensure_audit_log_partitions(p_from DATE, p_to DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    v_month DATE := date_trunc('month', p_from)::DATE;
+    v_next DATE;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    WHILE v_month <= p_to LOOP
+        v_next := (v_month + INTERVAL '1 month')::DATE;
+        v_name := audit_logs_partition_name(v_month);
+
+        IF to_regclass(v_name) IS NULL THEN
+            IF EXISTS (
+                SELECT 1 FROM audit_logs_default
+                WHERE created_at >= v_month AND created_at < v_next
+            ) THEN
+                RAISE WARNING 'audit_logs_default holds rows for %; partition % not created', v_month, v_name;
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    v_name, v_month, v_next
+                );
+                v_created := v_created + 1;
+            END IF;
+        END IF;
+
+        v_month := v_next;
+    END LOOP;
+
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================================================
+-- CONVERSION
+-- =============================================================================
+
+DO $$
+DECLARE
+    v_first DATE;
+    v_guards TEXT[];
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'audit_logs'::regclass) = 'p' THEN
+        RAISE NOTICE 'audit_logs is already partitioned';
+        RETURN;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM audit_logs WHERE created_at IS NULL) THEN
+        RAISE EXCEPTION 'audit_logs has rows without created_at; they cannot be routed to a partition';
+    END IF;
+
+    -- Immutability guards (02_create_triggers.sql) are re-created if present
+    SELECT coalesce(array_agg(tgname::TEXT), '{}') INTO v_guards
+    FROM pg_trigger
+    WHERE tgrelid = 'audit_logs'::regclass
+      AND tgname IN ('prevent_audit_update', 'prevent_audit_delete');
+
+    ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned;
+
+    CREATE TABLE audit_logs (
+        audit_id UUID NOT NULL DEFAULT gen_random_uuid(),
+        actor_id UUID REFERENCES users(user_id),
+        action VARCHAR(100) NOT NULL,
+        entity_type VARCHAR(50) NOT NULL,
+        entity_id UUID,
+        payload JSONB DEFAULT '{}',
+        ip_address INET,
+        user_agent TEXT,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        prev_hash TEXT,
+        record_hash TEXT,
+        sequence BIGINT
+    ) PARTITION BY RANGE (created_at);
+
+    CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+    SELECT coalesce(min(created_at), NOW())::DATE INTO v_first FROM audit_logs_unpartitioned;
+    PERFORM ensure_audit_log_partitions(v_first, (NOW() + INTERVAL '3 months')::DATE);
+
+    INSERT INTO audit_logs (
+        audit_id, actor_id, action, entity_type, entity_id, payload,
+        ip_address, user_agent, created_at, prev_hash, record_hash, sequence
+    )
+    SELECT
+        audit_id, actor_id, action, entity_type, entity_id, payload,
+        ip_address, user_agent, created_at, prev_hash, record_hash, sequence
+    FROM audit_logs_unpartitioned;
+
+    DROP TABLE audit_logs_unpartitioned;
+
+    -- Indexes are built after the copy and cascade to every partition
+    ALTER TABLE audit_logs ADD PRIMARY KEY (audit_id, created_at);
+    CREATE INDEX idx_audit_actor_id ON audit_logs(actor_id);
+    CREATE INDEX idx_audit_entity_type ON audit_logs(entity_type);
+    CREATE INDEX idx_audit_entity_id ON audit_logs(entity_id);
+    CREATE INDEX idx_audit_action ON audit_logs(action);
+    CREATE INDEX idx_audit_payload ON audit_logs USING GIN(payload);
+    CREATE INDEX idx_audit_created_at_id ON audit_logs(created_at, audit_id);
+    CREATE INDEX idx_audit_sequence ON audit_logs(sequence);
+
+    CREATE TRIGGER chain_audit_insert
+        BEFORE INSERT ON audit_logs
+        FOR EACH ROW
+        EXECUTE FUNCTION audit_chain_insert();
+
+    IF 'prevent_audit_update' = ANY(v_guards) THEN
+        CREATE TRIGGER prevent_audit_update
+            BEFORE UPDATE ON audit_logs
+            FOR EACH ROW
+            EXECUTE FUNCTION reject_mutation();
+    END IF;
+
+    IF 'prevent_audit_delete' = ANY(v_guards) THEN
+        CREATE TRIGGER prevent_audit_delete
+            BEFORE DELETE ON audit_logs
+            FOR EACH ROW
+            EXECUTE FUNCTION reject_mutation();
+    END IF;
+END;
+$$;
+
+COMMENT ON TABLE audit_logs IS 'System-wide audit trail (immutable), partitioned by month on created_at';
+COMMENT ON COLUMN audit_logs.sequence IS 'Position in the audit hash chain (gapless, assigned under the audit_chain_head lock)';
+
+ANALYZE audit_logs;
+
+-- =============================================================================
+-- ARCHIVED PARTITIONS
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS audit_archives (
+    partition_name VARCHAR(63) PRIMARY KEY,
+    range_start TIMESTAMP NOT NULL,
+    range_end TIMESTAMP NOT NULL,
+    row_count BIGINT NOT NULL,
+    first_sequence BIGINT,
+    last_sequence BIGINT,
+    first_prev_hash TEXT,
+    last_record_hash TEXT,
+    object_key TEXT NOT NULL,
+    manifest_key TEXT NOT NULL,
+    sha256 VARCHAR(64) NOT NULL,
+    archived_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_archives_last_sequence ON audit_archives(last_sequence);
+
+COMMENT ON TABLE audit_archives IS 'audit_logs partitions exported to object storage and dropped; the chain continues after last_sequence';
+
+SELECT 'Migration 012 completed!' as status;
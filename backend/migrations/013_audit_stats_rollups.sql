@@ -0,0 +1,41 @@
+-- Migration: Hourly audit statistics rollups
+-- Created: 2026-10-18
+-- Description: Audit event counts per hour, action, entity type and actor,
+--              so the audit stats endpoints and dashboard summary stop
+--              grouping the raw audit table on every load.
+--
+--              The rollup is advanced along the audit chain: entries up to
+--              audit_stats_state.rolled_up_sequence are counted in
+--              audit_stats_hourly, newer ones (the tail) are counted from
+--              audit_logs at read time. Sequences are assigned and committed
+--              in order under the audit_chain_head lock, so nothing below the
+--              watermark can still appear later.
+--
+--              Run `python -m app.jobs.rollup_audit_stats` to backfill, then
+--              every few minutes (see app/services/audit_stats.py).
+
+CREATE TABLE IF NOT EXISTS audit_stats_hourly (
+    rollup_id BIGSERIAL PRIMARY KEY,
+    bucket TIMESTAMP NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL,
+    actor_id UUID,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT uq_audit_stats_hourly_key UNIQUE NULLS NOT DISTINCT (bucket, action, entity_type, actor_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_stats_hourly_actor ON audit_stats_hourly(actor_id, bucket);
+
+CREATE TABLE IF NOT EXISTS audit_stats_state (
+    chain_id VARCHAR(32) PRIMARY KEY DEFAULT 'audit',
+    rolled_up_sequence BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+INSERT INTO audit_stats_state (chain_id, rolled_up_sequence)
+VALUES ('audit', 0)
+ON CONFLICT (chain_id) DO NOTHING;
+
+COMMENT ON TABLE audit_stats_hourly IS 'Hourly audit event counts for entries up to audit_stats_state.rolled_up_sequence';
+
+SELECT 'Migration 013 completed!' as status;
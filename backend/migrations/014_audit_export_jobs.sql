@@ -0,0 +1,29 @@
+-- Migration: Background audit exports
+-- Created: 2026-10-18
+-- Description: Audit exports too large to stream in one response run as jobs
+--              (app/services/audit_export.py) that write the date range to
+--              object storage as compressed parts, one per chunk_days window.
+--              completed_until and parts are committed after every part, so
+--              an interrupted job resumes at the next window.
+
+CREATE TABLE IF NOT EXISTS audit_export_jobs (
+    job_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    requested_by UUID REFERENCES users(user_id),
+    format VARCHAR(10) NOT NULL CHECK (format IN ('csv', 'ndjson', 'parquet')),
+    range_start TIMESTAMP NOT NULL,
+    range_end TIMESTAMP NOT NULL,
+    chunk_days INTEGER NOT NULL DEFAULT 7,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    completed_until TIMESTAMP,
+    parts JSONB NOT NULL DEFAULT '[]',
+    row_count BIGINT NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_export_jobs_status ON audit_export_jobs(status, created_at);
+
+COMMENT ON TABLE audit_export_jobs IS 'Audit log exports written to object storage in resumable date-range parts';
+
+SELECT 'Migration 014 completed!' as status;
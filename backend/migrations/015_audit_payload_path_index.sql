@@ -0,0 +1,22 @@
+-- Migration: jsonb_path_ops index for audit payload search
+-- Created: 2026-10-18
+-- Description: GET /api/v1/audit/search filters audit entries by payload
+--              containment (payload @> '{"document_hash": "..."}') and
+--              JSON path predicates (payload @? '$.items[*] ? (@.id == "...")').
+--              A jsonb_path_ops GIN index serves exactly these operators and
+--              is several times smaller and faster to update than the default
+--              jsonb_ops index it replaces, which nothing queried (it only
+--              adds key-existence operators).
+--
+--              On the partitioned audit_logs (migration 012) the index is
+--              built on every partition in one statement that blocks audit
+--              writes while it runs; schedule it accordingly.
+
+DROP INDEX IF EXISTS idx_audit_payload;
+
+CREATE INDEX IF NOT EXISTS idx_audit_payload_path
+    ON audit_logs USING GIN (payload jsonb_path_ops);
+
+ANALYZE audit_logs;
+
+SELECT 'Migration 015 completed!' as status;
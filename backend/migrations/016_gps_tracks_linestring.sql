@@ -0,0 +1,76 @@
+-- Migration: Store GPS tracks as PostGIS LINESTRINGZM
+-- Created: 2026-10-18
+-- Description: Replaces the gps_tracks.waypoints JSONB array with a
+--              geometry(LINESTRINGZM, 4326) column: x=longitude, y=latitude,
+--              z=altitude (NaN when unknown), m=waypoint timestamp in Unix
+--              milliseconds. Video offsets, which do not fit in the line,
+--              go to the parallel video_offsets_ms array.
+--
+--              A single-waypoint track is stored as a degenerate two-point
+--              line; waypoint_count stays the number of real waypoints.
+--
+--              total_distance_meters is recomputed from the geometry (geodesic
+--              length) for every migrated track, and the GiST index makes
+--              spatial track queries indexable.
+
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS geometry geometry(LINESTRINGZM, 4326);
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS video_offsets_ms INTEGER[];
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'gps_tracks' AND column_name = 'waypoints'
+    ) THEN
+        -- Older clients posted {lat, lng, alt, videoOffsetMs} keys
+        WITH points AS (
+            SELECT
+                t.track_id,
+                wp.ord,
+                ST_MakePoint(
+                    COALESCE(wp.value->>'longitude', wp.value->>'lng')::float8,
+                    COALESCE(wp.value->>'latitude', wp.value->>'lat')::float8,
+                    COALESCE(wp.value->>'altitude', wp.value->>'alt', 'NaN')::float8,
+                    (wp.value->>'timestamp')::float8
+                ) AS point,
+                COALESCE(wp.value->>'video_offset_ms', wp.value->>'videoOffsetMs')::integer AS video_offset_ms
+            FROM gps_tracks t,
+                 jsonb_array_elements(t.waypoints) WITH ORDINALITY AS wp(value, ord)
+            WHERE t.geometry IS NULL
+        ),
+        lines AS (
+            SELECT
+                track_id,
+                count(*) AS point_count,
+                ST_SetSRID(ST_MakeLine(point ORDER BY ord), 4326) AS line,
+                ST_SetSRID((array_agg(point ORDER BY ord))[1], 4326) AS first_point,
+                array_agg(video_offset_ms ORDER BY ord) AS offsets,
+                bool_or(video_offset_ms IS NOT NULL) AS has_offsets
+            FROM points
+            GROUP BY track_id
+        )
+        UPDATE gps_tracks t
+        SET geometry = CASE
+                WHEN lines.point_count = 1 THEN ST_MakeLine(lines.first_point, lines.first_point)
+                ELSE lines.line
+            END,
+            video_offsets_ms = CASE WHEN lines.has_offsets THEN lines.offsets END,
+            waypoint_count = lines.point_count,
+            total_distance_meters = round(ST_Length(ST_Force2D(lines.line)::geography)::numeric, 2)
+        FROM lines
+        WHERE lines.track_id = t.track_id;
+
+        ALTER TABLE gps_tracks DROP COLUMN waypoints;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_gps_tracks_geometry ON gps_tracks USING GIST (geometry);
+
+ANALYZE gps_tracks;
+
+COMMENT ON COLUMN gps_tracks.geometry IS 'Track line: x=longitude, y=latitude, z=altitude (NaN if unknown), m=timestamp (Unix ms)';
+COMMENT ON COLUMN gps_tracks.video_offsets_ms IS 'Video offset per waypoint (ms), parallel to geometry';
+
+SELECT 'Migration 016 completed!' as status;
@@ -0,0 +1,24 @@
+-- Migration: GPS track levels of detail
+-- Created: 2026-10-18
+-- Description: Douglas-Peucker simplifications of each GPS track, computed
+--              when the track is created, so map overviews read a few hundred
+--              points while the video-sync view still gets full resolution
+--              from gps_tracks.geometry (level 0).
+--
+--              Levels are only stored when they drop points, so short tracks
+--              may have none. Run `python -m app.jobs.build_gps_track_lods`
+--              once to build levels for existing tracks.
+
+CREATE TABLE IF NOT EXISTS gps_track_lods (
+    track_id UUID NOT NULL REFERENCES gps_tracks(track_id) ON DELETE CASCADE,
+    level SMALLINT NOT NULL,
+    tolerance_meters NUMERIC(10, 2) NOT NULL,
+    waypoint_count INTEGER NOT NULL,
+    geometry geometry(LINESTRINGZM, 4326) NOT NULL,
+    video_offsets_ms INTEGER[],
+    PRIMARY KEY (track_id, level)
+);
+
+COMMENT ON TABLE gps_track_lods IS 'Simplified levels of detail of GPS tracks (level 1 = finest)';
+
+SELECT 'Migration 017 completed!' as status;
@@ -0,0 +1,19 @@
+-- Migration: GPS track bounding boxes
+-- Created: 2026-10-18
+-- Description: Stores each track's bounding box next to its stats so the
+--              track summary listing (GET /gps-tracks/project/{id}/summary)
+--              never reads the track lines themselves.
+
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS min_longitude NUMERIC(10, 7);
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS min_latitude NUMERIC(10, 7);
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS max_longitude NUMERIC(10, 7);
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS max_latitude NUMERIC(10, 7);
+
+UPDATE gps_tracks
+SET min_longitude = ST_XMin(geometry),
+    min_latitude = ST_YMin(geometry),
+    max_longitude = ST_XMax(geometry),
+    max_latitude = ST_YMax(geometry)
+WHERE geometry IS NOT NULL AND min_longitude IS NULL;
+
+SELECT 'Migration 018 completed!' as status;
@@ -0,0 +1,20 @@
+-- Migration: Chunked GPS track recording
+-- Created: 2026-10-18
+-- Description: Long RouteShoot recordings are uploaded as sequenced waypoint
+--              chunks (PUT /gps-tracks/{id}/chunks/{sequence}) into a track
+--              that stays open until finalized. gps_track_chunks records each
+--              received chunk so retried uploads are recognised.
+
+ALTER TABLE gps_tracks ADD COLUMN IF NOT EXISTS is_recording BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE TABLE IF NOT EXISTS gps_track_chunks (
+    track_id UUID NOT NULL REFERENCES gps_tracks(track_id) ON DELETE CASCADE,
+    sequence INTEGER NOT NULL,
+    first_waypoint INTEGER NOT NULL,
+    waypoint_count INTEGER NOT NULL,
+    digest VARCHAR(64) NOT NULL,
+    received_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (track_id, sequence)
+);
+
+SELECT 'Migration 019 completed!' as status;
@@ -0,0 +1,109 @@
+-- Migration: Per-project geometry summary
+-- Created: 2026-10-18
+-- Description: One row per project with GIS features: feature count,
+--              centroid and bounding box of all its features. Statement-level
+--              triggers on gis_features recompute the rows of the projects a
+--              statement touched (once per statement, so bulk loads pay per
+--              project, not per feature). Nearest-project lookups
+--              (GET /projects/nearby) run a KNN search on this table alone.
+
+CREATE TABLE IF NOT EXISTS project_geometry_summary (
+    project_id UUID PRIMARY KEY REFERENCES projects(project_id) ON DELETE CASCADE,
+    feature_count INTEGER NOT NULL,
+    centroid geometry(POINT, 4326) NOT NULL,
+    bbox geometry(GEOMETRY, 4326) NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now())
+);
+
+-- Geography so KNN ordering and radius filters are in meters
+CREATE INDEX IF NOT EXISTS idx_project_geometry_summary_bbox
+    ON project_geometry_summary USING gist ((bbox::geography));
+
+COMMENT ON TABLE project_geometry_summary IS 'Footprint of each project''s GIS features (see project_geometry_summary_refresh)';
+
+-- =============================================================================
+-- INCREMENTAL MAINTENANCE
+-- =============================================================================
+
+-- Recompute the summaries of the given projects from their features
+CREATE OR REPLACE FUNCTION project_geometry_summary_refresh(ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    -- Serialize concurrent feature writers per project (same order everywhere
+    -- to avoid deadlocks); later statements then see their committed rows
+    PERFORM 1 FROM projects
+    WHERE project_id = ANY(ids)
+    ORDER BY project_id
+    FOR NO KEY UPDATE;
+
+    DELETE FROM project_geometry_summary WHERE project_id = ANY(ids);
+
+    INSERT INTO project_geometry_summary (project_id, feature_count, centroid, bbox, updated_at)
+    SELECT
+        f.project_id,
+        count(*),
+        ST_Centroid(ST_Collect(f.geometry)),
+        ST_SetSRID(ST_Extent(f.geometry)::geometry, 4326),
+        timezone('utc', now())
+    FROM gis_features f
+    JOIN projects p ON p.project_id = f.project_id
+    WHERE f.project_id = ANY(ids)
+    GROUP BY f.project_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables are only available to single-event triggers, so one
+-- function serves the three triggers below
+CREATE OR REPLACE FUNCTION project_geometry_summary_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT project_id) INTO ids FROM new_features;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(DISTINCT project_id) INTO ids FROM (
+            SELECT project_id FROM old_features
+            UNION
+            SELECT project_id FROM new_features
+        ) changed;
+    ELSE
+        SELECT array_agg(DISTINCT project_id) INTO ids FROM old_features;
+    END IF;
+
+    IF ids IS NOT NULL THEN
+        PERFORM project_geometry_summary_refresh(ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_project_geometry_summary_insert ON gis_features;
+CREATE TRIGGER trg_project_geometry_summary_insert
+    AFTER INSERT ON gis_features
+    REFERENCING NEW TABLE AS new_features
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION project_geometry_summary_trigger();
+
+DROP TRIGGER IF EXISTS trg_project_geometry_summary_update ON gis_features;
+CREATE TRIGGER trg_project_geometry_summary_update
+    AFTER UPDATE ON gis_features
+    REFERENCING OLD TABLE AS old_features NEW TABLE AS new_features
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION project_geometry_summary_trigger();
+
+DROP TRIGGER IF EXISTS trg_project_geometry_summary_delete ON gis_features;
+CREATE TRIGGER trg_project_geometry_summary_delete
+    AFTER DELETE ON gis_features
+    REFERENCING OLD TABLE AS old_features
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION project_geometry_summary_trigger();
+
+-- =============================================================================
+-- BACKFILL
+-- =============================================================================
+
+SELECT project_geometry_summary_refresh(array_agg(DISTINCT project_id))
+FROM gis_features;
+
+SELECT 'Migration 020 completed!' as status;
@@ -0,0 +1,52 @@
+-- Migration: Simplified project outlines
+-- Created: 2026-10-18
+-- Description: Adds each project's collected GIS features, simplified, to
+--              project_geometry_summary (migration 020), so project lists
+--              read one stored outline per row instead of running
+--              ST_Collect over the raw features of every project on a page.
+--
+--   outline            ST_SimplifyPreserveTopology at 0.00001 deg (~1 m):
+--                      indistinguishable from the features on a web map
+--   outline_thumbnail  0.0002 deg (~20 m): list thumbnails and overviews
+
+ALTER TABLE project_geometry_summary ADD COLUMN IF NOT EXISTS outline geometry(GEOMETRY, 4326);
+ALTER TABLE project_geometry_summary ADD COLUMN IF NOT EXISTS outline_thumbnail geometry(GEOMETRY, 4326);
+
+CREATE OR REPLACE FUNCTION project_geometry_summary_refresh(ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    -- Serialize concurrent feature writers per project (same order everywhere
+    -- to avoid deadlocks); later statements then see their committed rows
+    PERFORM 1 FROM projects
+    WHERE project_id = ANY(ids)
+    ORDER BY project_id
+    FOR NO KEY UPDATE;
+
+    DELETE FROM project_geometry_summary WHERE project_id = ANY(ids);
+
+    INSERT INTO project_geometry_summary (
+        project_id, feature_count, centroid, bbox, outline, outline_thumbnail, updated_at
+    )
+    SELECT
+        c.project_id,
+        c.feature_count,
+        ST_Centroid(c.features),
+        ST_SetSRID(ST_Envelope(c.features), 4326),
+        ST_SimplifyPreserveTopology(c.features, 0.00001),
+        ST_SimplifyPreserveTopology(c.features, 0.0002),
+        timezone('utc', now())
+    FROM (
+        SELECT f.project_id, count(*) AS feature_count, ST_Collect(f.geometry) AS features
+        FROM gis_features f
+        JOIN projects p ON p.project_id = f.project_id
+        WHERE f.project_id = ANY(ids)
+        GROUP BY f.project_id
+    ) c;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fill the new columns
+SELECT project_geometry_summary_refresh(array_agg(DISTINCT project_id))
+FROM gis_features;
+
+SELECT 'Migration 021 completed!' as status;
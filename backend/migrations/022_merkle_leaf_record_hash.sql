@@ -0,0 +1,31 @@
+-- Migration: Record hashes on Merkle leaves
+-- Created: 2026-10-18
+-- Description: Leaves keep the record_hash they were built from, so inclusion
+--              proofs for archived audit months (partition detached and
+--              dropped) are served from merkle_nodes alone. Leaves of rows
+--              still present are backfilled; leaves whose rows were archived
+--              before this migration answer 410 with the archive object.
+
+ALTER TABLE merkle_nodes ADD COLUMN IF NOT EXISTS record_hash TEXT;
+
+UPDATE merkle_nodes n
+SET record_hash = a.record_hash
+FROM merkle_anchors m, audit_logs a
+WHERE m.anchor_id = n.anchor_id
+  AND m.source = 'audit_logs'
+  AND n.level = 0
+  AND n.record_hash IS NULL
+  AND a.audit_id = n.record_id
+  AND a.record_hash IS NOT NULL;
+
+UPDATE merkle_nodes n
+SET record_hash = p.record_hash
+FROM merkle_anchors m, project_progress_logs p
+WHERE m.anchor_id = n.anchor_id
+  AND m.source = 'project_progress_logs'
+  AND n.level = 0
+  AND n.record_hash IS NULL
+  AND p.progress_id = n.record_id
+  AND p.record_hash IS NOT NULL;
+
+SELECT 'Migration 022 completed!' as status;
@@ -0,0 +1,93 @@
+-- Migration: Audit range verification across archived months
+-- Created: 2026-10-18
+-- Description: verify_audit_chain() (migration 010) checked a range's first
+--              entry against the live entry before it. Once the oldest
+--              month is archived (partition detached and dropped), the
+--              first live entry has none and was reported as a sequence gap
+--              and a prev_hash mismatch. The newest archive's last entry
+--              (audit_archives.last_sequence/last_record_hash) now stands
+--              in for it, and ranges start after the archived prefix, as
+--              in the verification job.
+
+CREATE OR REPLACE FUNCTION verify_audit_chain(p_from BIGINT, p_to BIGINT)
+RETURNS TABLE (
+    sequence BIGINT,
+    audit_id UUID,
+    error TEXT,
+    expected TEXT,
+    actual TEXT
+) AS $$
+    WITH archived AS (
+        SELECT ar.last_sequence, ar.last_record_hash
+        FROM audit_archives ar
+        WHERE ar.last_sequence IS NOT NULL
+        ORDER BY ar.last_sequence DESC
+        LIMIT 1
+    ),
+    bounds AS (
+        SELECT greatest(p_from, coalesce((SELECT last_sequence FROM archived), 0) + 1) AS first_sequence
+    ),
+    predecessor AS (
+        SELECT p.sequence, p.record_hash
+        FROM (
+            (SELECT a.sequence, a.record_hash
+             FROM audit_logs a, bounds b
+             WHERE a.sequence < b.first_sequence
+             ORDER BY a.sequence DESC
+             LIMIT 1)
+            UNION ALL
+            SELECT last_sequence, last_record_hash FROM archived
+        ) p
+        ORDER BY p.sequence DESC
+        LIMIT 1
+    ),
+    window_rows AS (
+        SELECT
+            p.sequence, NULL::uuid AS audit_id, NULL::text AS prev_hash, p.record_hash,
+            NULL::uuid AS actor_id, NULL::varchar AS action, NULL::varchar AS entity_type,
+            NULL::uuid AS entity_id, NULL::jsonb AS payload, NULL::timestamp AS created_at
+        FROM predecessor p
+        UNION ALL
+        SELECT
+            a.sequence, a.audit_id, a.prev_hash, a.record_hash,
+            a.actor_id, a.action, a.entity_type, a.entity_id, a.payload, a.created_at
+        FROM audit_logs a, bounds b
+        WHERE a.sequence BETWEEN b.first_sequence AND p_to
+    ),
+    chain AS (
+        SELECT
+            w.*,
+            lag(w.sequence) OVER (ORDER BY w.sequence) AS prior_sequence,
+            lag(w.record_hash) OVER (ORDER BY w.sequence) AS prior_hash
+        FROM window_rows w
+    ),
+    checks AS (
+        SELECT c.sequence, c.audit_id, 0 AS kind, 'sequence gap' AS error,
+               (coalesce(c.prior_sequence, 0) + 1)::text AS expected, c.sequence::text AS actual
+        FROM chain c, bounds b
+        WHERE c.sequence >= b.first_sequence
+          AND c.sequence <> coalesce(c.prior_sequence, 0) + 1
+        UNION ALL
+        SELECT c.sequence, c.audit_id, 1, 'prev_hash mismatch', c.prior_hash, c.prev_hash
+        FROM chain c, bounds b
+        WHERE c.sequence >= b.first_sequence
+          AND c.prev_hash IS DISTINCT FROM c.prior_hash
+        UNION ALL
+        SELECT c.sequence, c.audit_id, 2, 'hash mismatch', h.expected, c.record_hash
+        FROM chain c
+        CROSS JOIN bounds b
+        CROSS JOIN LATERAL (
+            SELECT audit_record_hash(
+                c.actor_id, c.action, c.entity_type, c.entity_id, c.payload, c.created_at, c.prev_hash
+            ) AS expected
+        ) h
+        WHERE c.sequence >= b.first_sequence
+          AND c.record_hash IS NOT NULL
+          AND h.expected <> c.record_hash
+    )
+    SELECT checks.sequence, checks.audit_id, checks.error, checks.expected, checks.actual
+    FROM checks
+    ORDER BY checks.sequence, checks.kind;
+$$ LANGUAGE sql STABLE;
+
+SELECT 'Migration 023 completed!' as status;
@@ -23,6 +23,7 @@ from datetime import datetime
 
 from app.main import app
 from app.core.database import Base, get_db
+from app.core.response_cache import response_cache
 from app.models import User, DEO, Project
 from app.core.security import create_access_token, get_password_hash
 
@@ -36,6 +37,19 @@ TEST_DATABASE_URL = os.getenv(
 engine = create_engine(TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Migrations installing triggers/functions the API relies on (012 re-creates
+# audit_logs as a partitioned table, so its later index changes run too)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "migrations")
+TRIGGER_MIGRATIONS = [
+    "005_public_stats_snapshot.sql",
+    "010_hash_chain_functions.sql",
+    "012_partition_audit_logs.sql",
+    "015_audit_payload_path_index.sql",
+    "020_project_geometry_summary.sql",
+    "021_project_geometry_outlines.sql",
+    "023_verify_audit_chain_archives.sql",
+]
+
 
 def override_get_db():
     """Override database dependency for testing"""
@@ -59,9 +73,22 @@ def setup_test_database():
             conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
             conn.commit()
 
+    # Trigram operators/indexes used by project search
+    with engine.connect() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.commit()
+
     # Create all tables
     Base.metadata.create_all(bind=engine)
 
+    # Install database-side objects that models cannot express (triggers, functions)
+    for migration in TRIGGER_MIGRATIONS:
+        with open(os.path.join(MIGRATIONS_DIR, migration)) as f:
+            sql = f.read()
+        with engine.connect() as conn:
+            conn.exec_driver_sql(sql)
+            conn.commit()
+
     yield
 
     # Cleanup after all tests
@@ -85,6 +112,8 @@ def db_session(setup_test_database):
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create test client with overridden database"""
+    # Fixtures write through db_session, bypassing cache invalidation
+    response_cache.clear()
     app.dependency_overrides[get_db] = lambda: db_session
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,184 @@
+"""
+Tests for the audit hash chain
+
+These tests verify:
+- Concurrent writers produce one linear chain (no forks, no gaps)
+- Chain verification follows sequence order
+- The streaming verification job reconciles chunks and finds tampering
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from app.models import AuditChainBreak, AuditChainHead, AuditLog, AuditVerificationCheckpoint
+from app.services.audit_chain import AUDIT_CHAIN_ID, audit_record_hash
+from app.services.audit_verification import AuditChainVerifier, verify_chunk
+
+from .conftest import TestingSessionLocal, engine
+
+STRESS_ENTITY_TYPE = "chain_stress_test"
+WRITERS = 8
+APPENDS_PER_WRITER = 25
+
+
+def _append_entries(writer: int) -> None:
+    """Commit APPENDS_PER_WRITER audit entries, one transaction each"""
+    session = TestingSessionLocal()
+    try:
+        for i in range(APPENDS_PER_WRITER):
+            session.add(AuditLog(
+                audit_id=uuid.uuid4(),
+                action="STRESS_APPEND",
+                entity_type=STRESS_ENTITY_TYPE,
+                entity_id=uuid.uuid4(),
+                payload={"writer": writer, "i": i},
+                created_at=datetime.utcnow()
+            ))
+            session.commit()
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def committed_chain():
+    """Snapshot the chain head, then remove stress entries and restore it"""
+    session = TestingSessionLocal()
+    head = session.get(AuditChainHead, AUDIT_CHAIN_ID)
+    start = (head.last_sequence, head.last_hash) if head else (0, None)
+    session.close()
+
+    yield start
+
+    session = TestingSessionLocal()
+    session.query(AuditLog).filter(AuditLog.entity_type == STRESS_ENTITY_TYPE).delete()
+    head = session.get(AuditChainHead, AUDIT_CHAIN_ID)
+    if head:
+        head.last_sequence, head.last_hash = start
+    session.commit()
+    session.close()
+
+
+class TestAuditChainConcurrency:
+    """Stress test chain appends from parallel writers"""
+
+    def test_parallel_writers_build_linear_chain(self, committed_chain):
+        """Every entry should link to its predecessor with contiguous sequences"""
+        start_sequence, start_hash = committed_chain
+
+        with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+            list(pool.map(_append_entries, range(WRITERS)))
+
+        session = TestingSessionLocal()
+        try:
+            logs = session.query(AuditLog).filter(
+                AuditLog.sequence > start_sequence
+            ).order_by(AuditLog.sequence).all()
+
+            assert len(logs) == WRITERS * APPENDS_PER_WRITER
+            assert [log.sequence for log in logs] == list(
+                range(start_sequence + 1, start_sequence + 1 + len(logs))
+            )
+
+            prev_hash = start_hash
+            for log in logs:
+                assert log.prev_hash == prev_hash
+                assert log.record_hash == audit_record_hash(log, prev_hash)
+                prev_hash = log.record_hash
+
+            head = session.get(AuditChainHead, AUDIT_CHAIN_ID)
+            assert head.last_sequence == logs[-1].sequence
+            assert head.last_hash == logs[-1].record_hash
+        finally:
+            session.close()
+
+    def test_rolled_back_append_leaves_no_gap(self, committed_chain):
+        """A rolled-back transaction must not consume a sequence number"""
+        start_sequence, _ = committed_chain
+
+        session = TestingSessionLocal()
+        session.add(AuditLog(
+            action="STRESS_APPEND",
+            entity_type=STRESS_ENTITY_TYPE,
+            payload={}
+        ))
+        session.flush()
+        session.rollback()
+        session.close()
+
+        _append_entries(0)
+
+        session = TestingSessionLocal()
+        first = session.query(AuditLog).filter(
+            AuditLog.sequence > start_sequence
+        ).order_by(AuditLog.sequence).first()
+        session.close()
+
+        assert first.sequence == start_sequence + 1
+
+
+class TestAuditChainVerificationJob:
+    """Test the streaming, chunked verification job"""
+
+    @pytest.fixture
+    def clean_checkpoint(self):
+        yield
+        session = TestingSessionLocal()
+        session.query(AuditChainBreak).delete()
+        session.query(AuditVerificationCheckpoint).delete()
+        session.commit()
+        session.close()
+
+    def test_parallel_verification_of_valid_chain(self, committed_chain, clean_checkpoint):
+        """Small chunks across worker processes should reconcile without breaks"""
+        for writer in range(3):
+            _append_entries(writer)
+
+        summary = AuditChainVerifier(bind=engine, chunk_size=7, workers=2).run(resume=False)
+
+        assert summary["status"] == "completed"
+        assert summary["broken_count"] == 0
+        assert summary["rows_checked"] >= 3 * APPENDS_PER_WRITER
+
+    def test_resume_checks_only_new_entries(self, committed_chain, clean_checkpoint):
+        """A resumed run should start after the checkpoint"""
+        _append_entries(0)
+        verifier = AuditChainVerifier(bind=engine, chunk_size=10, workers=1)
+        first = verifier.run(resume=False)
+
+        _append_entries(1)
+        second = verifier.run(resume=True)
+
+        assert second["resumed_from_sequence"] == first["verified_sequence"]
+        assert second["rows_this_run"] == APPENDS_PER_WRITER
+        assert second["broken_count"] == 0
+
+    def test_chunk_detects_tampered_payload(self):
+        """A row whose payload no longer matches its hash is reported"""
+        rows = []
+        prev_hash = None
+        for sequence in range(1, 4):
+            log = AuditLog(
+                audit_id=uuid.uuid4(),
+                action="STRESS_APPEND",
+                entity_type=STRESS_ENTITY_TYPE,
+                payload={"n": sequence},
+                created_at=datetime.utcnow()
+            )
+            record_hash = audit_record_hash(log, prev_hash)
+            rows.append((
+                sequence, str(log.audit_id), "", log.action, log.entity_type, "",
+                {"n": sequence}, log.created_at.isoformat(), prev_hash, record_hash
+            ))
+            prev_hash = record_hash
+
+        tampered = list(rows[1])
+        tampered[6] = {"n": 99}
+        rows[1] = tuple(tampered)
+
+        result = verify_chunk(rows)
+
+        assert [link["error"] for link in result["broken"]] == ["hash mismatch"]
+        assert result["broken"][0]["sequence"] == 2
@@ -0,0 +1,147 @@
+"""
+Tests for the streaming audit export
+
+These tests verify:
+- Exports stream every row of the range (no row cap), gzip-encoded on request
+- An interrupted export resumes after the last entry received
+- Background jobs write one part per window and resume where they stopped
+- A job is run by one runner at a time
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from app.models import AuditExportJob, AuditLog
+from app.services.audit_export import AuditExport, run_export_job
+
+from .conftest import get_auth_header
+from .test_audit_partitions import FakeS3
+
+
+def _add_logs(db_session, count, day=1):
+    logs = [
+        AuditLog(
+            action="EXPORT_TEST", entity_type="export_test", payload={"i": i},
+            created_at=datetime(2021, 6, day, 8, 0, i)
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(logs)
+    db_session.flush()
+    return logs
+
+
+class TestAuditExportStream:
+    """Test GET /audit/export"""
+
+    def test_csv_streams_whole_range_gzipped(self, client, db_session, super_admin_user):
+        logs = _add_logs(db_session, 5)
+
+        response = client.get(
+            "/api/v1/audit/export",
+            params={"format": "csv", "start_date": "2021-06-01", "end_date": "2021-06-01"},
+            headers={**get_auth_header(super_admin_user), "Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["audit_id"] for row in rows] == [str(log.audit_id) for log in logs]
+
+    def test_json_keeps_legacy_document_shape(self, client, db_session, super_admin_user):
+        _add_logs(db_session, 3)
+
+        response = client.get(
+            "/api/v1/audit/export",
+            params={"format": "json", "start_date": "2021-06-01", "end_date": "2021-06-01"},
+            headers=get_auth_header(super_admin_user)
+        )
+
+        body = response.json()
+        assert body["total"] == 3
+        assert body["start_date"] == "2021-06-01"
+        assert [log["payload"]["i"] for log in body["logs"]] == [0, 1, 2]
+
+    def test_resume_after_last_received_entry(self, client, db_session, super_admin_user):
+        logs = _add_logs(db_session, 4)
+
+        response = client.get(
+            "/api/v1/audit/export",
+            params={"format": "ndjson", "start_date": "2021-06-01", "resume_after": str(logs[1].audit_id)},
+            headers=get_auth_header(super_admin_user)
+        )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["audit_id"] for line in lines] == [str(log.audit_id) for log in logs[2:]]
+
+    def test_gzip_output_is_a_valid_stream(self, db_session):
+        _add_logs(db_session, 3)
+        export = AuditExport(
+            db_session, "ndjson", datetime(2021, 6, 1), datetime(2021, 6, 2), compress=True, chunk_rows=1
+        )
+
+        lines = gzip.decompress(b"".join(export)).decode("utf-8").splitlines()
+
+        assert export.rows == 3
+        assert export.extension == "ndjson.gz"
+        assert len(lines) == 3
+
+
+class TestAuditExportJobs:
+    """Test background export jobs"""
+
+    def test_job_writes_one_part_per_window_and_resumes(self, db_session, super_admin_user):
+        _add_logs(db_session, 2, day=1)
+        _add_logs(db_session, 3, day=3)
+        job = AuditExportJob(
+            requested_by=super_admin_user.user_id,
+            format="csv",
+            range_start=datetime(2021, 6, 1),
+            range_end=datetime(2021, 6, 4),
+            chunk_days=1,
+            parts=[],
+            row_count=0
+        )
+        db_session.add(job)
+        db_session.flush()
+
+        # Pretend a previous run wrote the first window and then died
+        job.status = "running"
+        job.completed_until = datetime(2021, 6, 2)
+        job.parts = [{"key": "earlier", "rows": 2}]
+        job.row_count = 2
+        job.updated_at = datetime(2021, 6, 2)
+        db_session.flush()
+
+        s3 = FakeS3()
+        job = run_export_job(db_session, job.job_id, s3=s3)
+
+        assert job.status == "completed"
+        assert job.row_count == 5
+        # 2021-06-02 is empty: no part written for it
+        assert [part["key"].rsplit("/", 1)[-1] for part in job.parts[1:]] == ["part-00002.csv.gz"]
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(s3.objects[job.parts[1]["key"]]).decode("utf-8"))))
+        assert len(rows) == 3
+
+    def test_job_held_by_another_runner_is_left_alone(self, db_session, super_admin_user):
+        _add_logs(db_session, 2, day=1)
+        job = AuditExportJob(
+            requested_by=super_admin_user.user_id,
+            format="csv",
+            range_start=datetime(2021, 6, 1),
+            range_end=datetime(2021, 6, 2),
+            status="running",
+            parts=[],
+            row_count=0
+        )
+        db_session.add(job)
+        db_session.flush()
+
+        s3 = FakeS3()
+        job = run_export_job(db_session, job.job_id, s3=s3)
+
+        assert job.status == "running"
+        assert job.parts == [] and not s3.objects
@@ -0,0 +1,141 @@
+"""
+Tests for monthly audit_logs partitions (migration 012)
+
+These tests verify:
+- Entries are routed to their month's partition
+- Date-filtered queries are pruned to the partitions in range
+- Archiving exports a month with its anchors, then drops the partition
+- Inclusion proofs for archived entries are served from the anchors
+- Range verification continues from the archive once a month is dropped
+"""
+
+import gzip
+import json
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.models import AuditArchive, AuditLog
+from app.services.audit_partitions import AuditPartitionService, add_months, month_start, partition_name
+from app.services.audit_service import AuditService
+from app.services.merkle_service import verify_inclusion
+
+from .conftest import get_auth_header
+
+
+class FakeS3:
+    """Records uploads in memory"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        self.objects[key] = fileobj.read()
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[Key] = Body
+
+
+def _add_logs(db_session, created_at, count):
+    logs = [
+        AuditLog(action="PARTITION_TEST", entity_type="test", payload={"i": i}, created_at=created_at)
+        for i in range(count)
+    ]
+    db_session.add_all(logs)
+    db_session.flush()
+    return logs
+
+
+def _partition_of(db_session, audit_id):
+    return db_session.execute(
+        text("SELECT tableoid::regclass::text FROM audit_logs WHERE audit_id = :id"),
+        {"id": audit_id}
+    ).scalar()
+
+
+class TestAuditPartitions:
+    """Test routing, pruning and archival"""
+
+    def test_entries_are_routed_to_their_month(self, db_session):
+        AuditPartitionService.ensure_partitions(db_session, months_ahead=1)
+        this_month = month_start(datetime.utcnow().date())
+
+        log, = _add_logs(db_session, datetime.utcnow(), 1)
+
+        assert _partition_of(db_session, log.audit_id) == partition_name(this_month)
+        months = [partition["month"] for partition in AuditPartitionService.list_partitions(db_session)]
+        assert add_months(this_month, 1) in months
+
+    def test_date_filter_prunes_other_months(self, db_session):
+        AuditPartitionService.ensure_partitions(db_session, months_ahead=2)
+        this_month = month_start(datetime.utcnow().date())
+        next_month = add_months(this_month, 1)
+
+        plan = "\n".join(row[0] for row in db_session.execute(
+            text("EXPLAIN SELECT * FROM audit_logs WHERE created_at >= :start AND created_at < :end"),
+            {"start": datetime.combine(next_month, datetime.min.time()),
+             "end": datetime.combine(add_months(next_month, 1), datetime.min.time())}
+        ))
+
+        assert partition_name(next_month) in plan
+        assert partition_name(this_month) not in plan
+
+    def test_archive_exports_and_drops_oldest_month(self, db_session):
+        month = date(2020, 1, 1)
+        db_session.execute(
+            text("SELECT ensure_audit_log_partitions(:month, :month)"), {"month": month}
+        )
+        logs = _add_logs(db_session, datetime(2020, 1, 15, 8), 3)
+        # Read before the rows are archived away
+        chain = [(log.sequence, log.prev_hash, log.record_hash) for log in logs]
+        s3 = FakeS3()
+
+        archive = AuditPartitionService.archive_partition(db_session, month, s3=s3)
+
+        name = partition_name(month)
+        lines = gzip.decompress(s3.objects[archive.object_key]).decode("utf-8").splitlines()
+        exported = [json.loads(line) for line in lines]
+        assert [row["sequence"] for row in exported] == [sequence for sequence, _, _ in chain]
+        assert exported[-1]["record_hash"] == archive.last_record_hash == chain[-1][2]
+
+        manifest = json.loads(s3.objects[archive.manifest_key])
+        assert manifest["row_count"] == 3
+        assert len(manifest["merkle_anchors"]) == 31
+        assert manifest["first_prev_hash"] == chain[0][1]
+
+        assert db_session.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None
+        assert db_session.get(AuditArchive, name).row_count == 3
+
+    def test_proof_of_archived_entry(self, client, db_session, super_admin_user):
+        month = date(2020, 1, 1)
+        db_session.execute(
+            text("SELECT ensure_audit_log_partitions(:month, :month)"), {"month": month}
+        )
+        log = _add_logs(db_session, datetime(2020, 1, 15, 8), 3)[1]
+        audit_id, record_hash = log.audit_id, log.record_hash
+
+        AuditPartitionService.archive_partition(db_session, month, s3=FakeS3())
+        response = client.get(
+            f"/api/v1/audit/proofs/audit_logs/{audit_id}", headers=get_auth_header(super_admin_user)
+        )
+
+        assert response.status_code == 200
+        proof = response.json()
+        assert proof["record_hash"] == record_hash
+        assert verify_inclusion(record_hash, proof["proof"], proof["root_hash"])
+
+    def test_chain_verifies_after_archive(self, db_session):
+        month = date(2020, 1, 1)
+        db_session.execute(
+            text("SELECT ensure_audit_log_partitions(:month, :month)"), {"month": month}
+        )
+        AuditPartitionService.ensure_partitions(db_session)
+        _add_logs(db_session, datetime(2020, 1, 15, 8), 3)
+
+        AuditPartitionService.archive_partition(db_session, month, s3=FakeS3())
+        live = _add_logs(db_session, datetime.utcnow(), 2)
+        result = AuditService.verify_chain_integrity(db_session)
+
+        assert live[0].sequence == 4
+        assert result["is_valid"], result["broken_links"]
+        assert result["logs_checked"] == 2
@@ -0,0 +1,72 @@
+"""
+Tests for the hourly audit statistics rollup
+
+These tests verify:
+- Counts combine rolled-up hours with the unrolled tail
+- Partial hours at the range edges are counted from raw rows
+- The dashboard summary reads the rollup and names active users
+"""
+
+from datetime import datetime
+
+from app.models import AuditLog, AuditStatsHourly
+from app.services.audit_service import AuditService
+from app.services.audit_stats import AuditStatsService
+
+
+def _log(db_session, action, created_at, actor_id=None):
+    db_session.add(AuditLog(
+        action=action, entity_type="stats_test", actor_id=actor_id, payload={}, created_at=created_at
+    ))
+    db_session.flush()
+
+
+def _action_counts(db_session, start=None, end=None):
+    counts = AuditStatsService.counts(["action"], start, end)
+    return dict(db_session.query(counts.c.action, counts.c.event_count).filter(
+        counts.c.action.like("STATS_%")
+    ).all())
+
+
+class TestAuditStats:
+    """Test rollup maintenance and reads"""
+
+    def test_rollup_and_tail_are_combined(self, db_session):
+        _log(db_session, "STATS_A", datetime(2021, 3, 1, 10, 15))
+        _log(db_session, "STATS_A", datetime(2021, 3, 1, 10, 45))
+        _log(db_session, "STATS_B", datetime(2021, 3, 1, 11, 5))
+        assert AuditStatsService.refresh(db_session) >= 3
+        _log(db_session, "STATS_B", datetime(2021, 3, 1, 11, 30))
+
+        buckets = db_session.query(AuditStatsHourly.bucket, AuditStatsHourly.event_count).filter(
+            AuditStatsHourly.action == "STATS_A"
+        ).all()
+        assert buckets == [(datetime(2021, 3, 1, 10), 2)]
+
+        day = (datetime(2021, 3, 1), datetime(2021, 3, 2))
+        assert _action_counts(db_session, *day) == {"STATS_A": 2, "STATS_B": 2}
+
+        # The next refresh moves the tail into the rollup without double counting
+        AuditStatsService.refresh(db_session)
+        assert _action_counts(db_session, *day) == {"STATS_A": 2, "STATS_B": 2}
+
+    def test_partial_hours_come_from_raw_rows(self, db_session):
+        for minute in (10, 40, 50):
+            _log(db_session, "STATS_EDGE", datetime(2021, 3, 2, 9, minute))
+        AuditStatsService.refresh(db_session)
+
+        assert _action_counts(db_session, datetime(2021, 3, 2, 9, 30), datetime(2021, 3, 2, 9, 45)) == {"STATS_EDGE": 1}
+        assert _action_counts(db_session, datetime(2021, 3, 2, 9, 30)) == {"STATS_EDGE": 2}
+
+    def test_summary_names_active_users(self, db_session, deo_user_1):
+        now = datetime.utcnow()
+        _log(db_session, "STATS_SUMMARY", now, actor_id=deo_user_1.user_id)
+        AuditStatsService.refresh(db_session)
+        _log(db_session, "STATS_SUMMARY", now, actor_id=deo_user_1.user_id)
+
+        summary = AuditService.get_summary(db_session, days=1)
+
+        assert summary["by_action"]["STATS_SUMMARY"] == 2
+        assert {
+            "user_id": str(deo_user_1.user_id), "username": deo_user_1.username, "count": 2
+        } in summary["most_active_users"]
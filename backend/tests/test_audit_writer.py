@@ -0,0 +1,123 @@
+"""
+Tests for the buffered audit writer
+
+These tests verify:
+- Queued and outbox events are chained in batches
+- A full queue spills to the outbox instead of losing events
+- Best-effort events of a rolled-back transaction are discarded
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.models import AuditLog, AuditOutbox
+from app.services.audit_chain import audit_record_hash
+from app.services.audit_writer import AuditWriter, record_audit
+
+from .conftest import TestingSessionLocal
+from .test_audit_chain import STRESS_ENTITY_TYPE, committed_chain  # noqa: F401
+
+
+def _event(i):
+    """An audit event as record_audit builds it"""
+    return {
+        "audit_id": uuid.uuid4(),
+        "actor_id": None,
+        "action": "WRITER_TEST",
+        "entity_type": STRESS_ENTITY_TYPE,
+        "entity_id": None,
+        "payload": {"i": i},
+        "ip_address": None,
+        "user_agent": None,
+        "created_at": datetime.utcnow(),
+    }
+
+
+@pytest.fixture
+def writer(committed_chain):
+    yield AuditWriter(
+        session_factory=TestingSessionLocal,
+        max_queue=4,
+        batch_size=3,
+        flush_interval=0.05,
+        put_timeout=0
+    )
+    session = TestingSessionLocal()
+    session.query(AuditOutbox).filter(AuditOutbox.entity_type == STRESS_ENTITY_TYPE).delete()
+    session.commit()
+    session.close()
+
+
+def _written_chain(start_sequence):
+    session = TestingSessionLocal()
+    try:
+        return session.query(AuditLog).filter(
+            AuditLog.sequence > start_sequence
+        ).order_by(AuditLog.sequence).all()
+    finally:
+        session.close()
+
+
+class TestAuditWriter:
+    """Test batching, backpressure and durability"""
+
+    def test_queued_events_are_chained_in_batches(self, writer, committed_chain):
+        start_sequence, start_hash = committed_chain
+
+        writer.enqueue([_event(i) for i in range(4)])
+        assert writer.flush() == 4
+
+        logs = _written_chain(start_sequence)
+        assert [log.payload["i"] for log in logs] == [0, 1, 2, 3]
+        prev_hash = start_hash
+        for log in logs:
+            assert log.prev_hash == prev_hash
+            assert log.record_hash == audit_record_hash(log, prev_hash)
+            prev_hash = log.record_hash
+
+        metrics = writer.metrics()
+        assert metrics["batches"] == 2
+        assert metrics["queue_depth"] == 0
+
+    def test_full_queue_spills_to_outbox(self, writer, committed_chain):
+        start_sequence, _ = committed_chain
+
+        writer.enqueue([_event(i) for i in range(7)])
+        metrics = writer.metrics()
+        assert metrics["enqueued"] == 4
+        assert metrics["spilled"] == 3
+        assert metrics["dropped"] == 0
+        assert metrics["high_water"] == 4
+
+        assert writer.flush() == 7
+        assert len(_written_chain(start_sequence)) == 7
+
+    def test_background_thread_drains_outbox(self, writer, committed_chain, monkeypatch):
+        start_sequence, _ = committed_chain
+        monkeypatch.setattr(settings, "AUDIT_WRITER_MODE", "async")
+
+        session = TestingSessionLocal()
+        record_audit(session, action="WRITER_TEST", entity_type=STRESS_ENTITY_TYPE, payload={"i": 0})
+        session.commit()
+        session.close()
+
+        writer.start()
+        writer.stop()
+
+        logs = _written_chain(start_sequence)
+        assert [log.action for log in logs] == ["WRITER_TEST"]
+
+    def test_rolled_back_best_effort_events_are_discarded(self, monkeypatch):
+        monkeypatch.setattr(settings, "AUDIT_WRITER_MODE", "async")
+        monkeypatch.setattr(AuditWriter, "running", property(lambda self: True))
+
+        session = TestingSessionLocal()
+        record_audit(session, action="WRITER_TEST", entity_type=STRESS_ENTITY_TYPE, durable=False)
+        assert session.info["audit_pending_events"]
+        session.rollback()
+
+        assert "audit_pending_events" not in session.info
+        session.close()
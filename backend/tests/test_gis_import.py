@@ -0,0 +1,199 @@
+"""
+Tests for bulk GIS feature import
+
+These tests verify:
+- Geometries are reprojected, reduced to 2D and repaired
+- Unusable features are skipped and reported by position in the file
+- Files are read once, in batches, including zipped Shapefiles
+- Every usable feature lands in the project
+- Features outside the region boundary raise a single alert
+- Uploads are imported off the event loop
+"""
+
+import asyncio
+import json
+import shutil
+
+import geopandas as gpd
+import pytest
+import shapely
+from shapely.geometry import LineString, Point, Polygon
+
+from app.models import Alert, GeofencingRule, GISFeature, ProjectGeometrySummary
+from app.api import gis as gis_api
+from app.services.gis_import import import_features, prepare_batch, read_feature_batches
+
+from .conftest import get_auth_header
+
+# Self-intersecting ring: invalid, repaired into two triangles
+BOWTIE = Polygon([(124.0, 7.0), (124.01, 7.01), (124.01, 7.0), (124.0, 7.01), (124.0, 7.0)])
+
+
+def _feature_collection(features):
+    return json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": properties, "geometry": geometry}
+        for properties, geometry in features
+    ]}).encode()
+
+
+class TestFeatureBatchPreparation:
+    """Test validation and repair of a batch"""
+
+    def test_repairs_and_reports(self):
+        frame = gpd.GeoDataFrame(
+            {
+                "feature_type": ["road", None, "Bridge", "tunnel", "road"],
+                "name": ["Access road", "Plaza", "Bridge 1", "Tunnel", "Lost"],
+            },
+            geometry=[
+                LineString([(124.0, 7.0, 5.0), (124.01, 7.0, 6.0)]),
+                BOWTIE,
+                Point(124.0, 7.0),
+                Point(124.0, 7.0),
+                None,
+            ],
+            crs=4326
+        )
+
+        rows, errors, repaired = prepare_batch(frame, first_row=11, default_type="other")
+
+        assert [row["row_number"] for row in rows] == [11, 12, 13]
+        assert [row["feature_type"] for row in rows] == ["road", "other", "bridge"]
+        assert rows[0]["attributes"] == {"name": "Access road"}
+        assert not shapely.has_z(shapely.from_wkb(rows[0]["geometry"]))
+        plaza = shapely.from_wkb(rows[1]["geometry"])
+        assert plaza.is_valid and plaza.geom_type == "MultiPolygon"
+        assert repaired == 1
+        assert [error["row"] for error in errors] == [14, 15]
+        assert "feature_type" in errors[0]["error"]
+
+    def test_reprojected_to_wgs84(self):
+        frame = gpd.GeoDataFrame(geometry=[Point(500000, 774000)], crs=32651)  # UTM zone 51N
+
+        rows, errors, _ = prepare_batch(frame, first_row=1, default_type="facility")
+
+        point = shapely.from_wkb(rows[0]["geometry"])
+        assert not errors
+        assert round(point.x, 3) == 123.0
+        assert 6.9 < point.y < 7.1
+
+
+class TestFeatureFileReading:
+    """Test the single-pass batch reader"""
+
+    def test_batches_in_file_order(self, tmp_path):
+        path = tmp_path / "roads.geojson"
+        path.write_bytes(_feature_collection([
+            ({"name": f"Road {i}"}, {"type": "Point", "coordinates": [124.0, 7.0 + i / 100]}) for i in range(5)
+        ]))
+
+        frames = list(read_feature_batches(str(path), "geojson", batch_size=2))
+
+        assert [len(frame) for frame in frames] == [2, 2, 1]
+        assert [name for frame in frames for name in frame["name"]] == [f"Road {i}" for i in range(5)]
+
+    def test_zipped_shapefile_type_field(self, tmp_path):
+        parts = tmp_path / "parts"
+        parts.mkdir()
+        gpd.GeoDataFrame(
+            {"feature_type": ["bridge"]}, geometry=[Point(124.0, 7.0)], crs=4326
+        ).to_file(parts / "bridges.shp")  # Stored as feature_ty
+        archive = shutil.make_archive(str(tmp_path / "bridges"), "zip", parts)
+
+        frame, = read_feature_batches(archive, "shapefile")
+        rows, errors, _ = prepare_batch(frame, first_row=1)
+
+        assert not errors
+        assert rows[0]["feature_type"] == "bridge"
+
+    def test_unreadable_file(self, tmp_path):
+        path = tmp_path / "broken.gpkg"
+        path.write_bytes(b"not a feature file")
+
+        with pytest.raises(ValueError, match="Cannot read geopackage file"):
+            list(read_feature_batches(str(path), "geopackage"))
+
+
+class TestGisFeatureImport:
+    """Test the import pipeline and POST /gis/features/import"""
+
+    def test_geopackage_in_batches(self, db_session, project_deo_1, deo_user_1, tmp_path):
+        path = tmp_path / "roads.gpkg"
+        gpd.GeoDataFrame(
+            {"name": [f"Road {i}" for i in range(5)]},
+            geometry=[LineString([(124.0 + i / 100, 7.0), (124.0 + i / 100, 7.01)]) for i in range(5)],
+            crs=4326
+        ).to_file(path, driver="GPKG")
+
+        report = import_features(
+            db_session, project_deo_1.project_id, deo_user_1.user_id, str(path), "geopackage",
+            feature_type="road", batch_size=2
+        )
+        db_session.commit()
+
+        assert report["imported"] == 5 and report["skipped"] == 0
+        names = db_session.query(GISFeature.attributes["name"].astext).filter(
+            GISFeature.project_id == project_deo_1.project_id
+        ).all()
+        assert sorted(name for (name,) in names) == [f"Road {i}" for i in range(5)]
+        assert db_session.get(ProjectGeometrySummary, project_deo_1.project_id).feature_count == 5
+
+    def test_geojson_upload(self, client, db_session, project_deo_1, deo_user_1):
+        db_session.add(GeofencingRule(
+            geometry="SRID=4326;POLYGON((123 6, 125 6, 125 8, 123 8, 123 6))",
+            rule_type="region_boundary"
+        ))
+        db_session.commit()
+        body = _feature_collection([
+            ({"feature_type": "bridge"}, {"type": "Point", "coordinates": [124.0, 7.0]}),
+            ({"feature_type": "road"}, {"type": "LineString", "coordinates": [[121.0, 14.5], [121.01, 14.5]]}),
+            ({"feature_type": "road"}, None),
+        ])
+
+        response = client.post(
+            "/api/v1/gis/features/import",
+            params={"project_id": str(project_deo_1.project_id), "format": "geojson"},
+            content=body,
+            headers={**get_auth_header(deo_user_1), "Content-Type": "application/geo+json"}
+        )
+
+        assert response.status_code == 201
+        report = response.json()
+        assert report["imported"] == 2
+        assert report["outside_boundary"] == 1
+        assert report["errors"] == [{"row": 3, "error": "Missing or empty geometry"}]
+        alerts = db_session.query(Alert).filter(Alert.project_id == project_deo_1.project_id).all()
+        assert len(alerts) == 1
+        assert alerts[0].alert_metadata["rows"] == [2]
+
+    def test_rejected_uploads(self, client, project_deo_1, deo_user_1, deo_user_2):
+        params = {"project_id": str(project_deo_1.project_id), "format": "geojson"}
+        body = _feature_collection([({"feature_type": "road"}, {"type": "Point", "coordinates": [124.0, 7.0]})])
+
+        other_deo = client.post(
+            "/api/v1/gis/features/import", params=params, content=body, headers=get_auth_header(deo_user_2)
+        )
+        unreadable = client.post(
+            "/api/v1/gis/features/import", params=params, content=b"not a feature file",
+            headers=get_auth_header(deo_user_1)
+        )
+
+        assert other_deo.status_code == 403
+        assert unreadable.status_code == 400
+
+    def test_import_runs_off_event_loop(self, client, project_deo_1, deo_user_1, monkeypatch):
+        def blocking_import(*args, **kwargs):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()  # Only set on the event loop's thread
+            return import_features(*args, **kwargs)
+
+        monkeypatch.setattr(gis_api, "import_features", blocking_import)
+        response = client.post(
+            "/api/v1/gis/features/import",
+            params={"project_id": str(project_deo_1.project_id), "format": "geojson"},
+            content=_feature_collection([({"feature_type": "road"}, {"type": "Point", "coordinates": [124.0, 7.0]})]),
+            headers=get_auth_header(deo_user_1)
+        )
+
+        assert response.status_code == 201
+        assert response.json()["imported"] == 1
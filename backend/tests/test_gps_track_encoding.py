@@ -0,0 +1,122 @@
+"""
+Tests for the compact GPS track encodings
+
+These tests verify:
+- Polyline output matches Google's reference encoding
+- Polyline and packed waypoints round-trip (packed losslessly)
+- Malformed bodies are rejected
+- Tracks can be uploaded and downloaded in the compact encodings
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.jobs.benchmark_gps_track_encoding import synthetic_track
+from app.services.gps_track_encoding import (
+    PACKED_MEDIA_TYPE,
+    POLYLINE_MEDIA_TYPE,
+    decode_packed_waypoints,
+    decode_polyline,
+    decode_polyline_waypoints,
+    encode_packed_track,
+    encode_packed_waypoints,
+    encode_polyline,
+    encode_polyline_waypoints
+)
+
+from .conftest import get_auth_header
+
+
+def _with_gaps(arrays):
+    arrays = {name: values.copy() for name, values in arrays.items()}
+    arrays["altitude"][::3] = np.nan
+    arrays["video_offset_ms"][:10] = -1
+    return arrays
+
+
+class TestEncodings:
+    """Test encoders and decoders"""
+
+    def test_polyline_reference_vector(self):
+        latitude, longitude = np.array([38.5, 40.7, 43.252]), np.array([-120.2, -120.95, -126.453])
+
+        encoded = encode_polyline(latitude, longitude)
+
+        assert encoded == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+        assert np.allclose(decode_polyline(encoded), [latitude, longitude])
+
+    def test_polyline_round_trip(self):
+        arrays = _with_gaps(synthetic_track(1000))
+
+        decoded = decode_polyline_waypoints(json.loads(json.dumps(encode_polyline_waypoints(arrays))))
+
+        assert np.abs(decoded["latitude"] - arrays["latitude"]).max() <= 0.6e-6
+        assert np.array_equal(np.isnan(decoded["altitude"]), np.isnan(arrays["altitude"]))
+        assert np.nanmax(np.abs(decoded["altitude"] - arrays["altitude"])) <= 0.005
+        assert np.array_equal(decoded["timestamp"], arrays["timestamp"])
+        assert np.array_equal(decoded["video_offset_ms"], arrays["video_offset_ms"])
+
+    def test_packed_round_trip_is_lossless(self):
+        arrays = _with_gaps(synthetic_track(1000))
+
+        body = encode_packed_waypoints(arrays)
+        decoded = decode_packed_waypoints(body)
+
+        assert len(body) == 12 + 1000 * 36
+        for name in ("longitude", "latitude", "timestamp", "video_offset_ms"):
+            assert np.array_equal(decoded[name], arrays[name])
+        assert np.array_equal(decoded["altitude"], arrays["altitude"], equal_nan=True)
+
+    def test_malformed_input_rejected(self):
+        body = encode_packed_waypoints(synthetic_track(10))
+        payload = encode_polyline_waypoints(synthetic_track(10))
+
+        with pytest.raises(ValueError):
+            decode_packed_waypoints(body[:-1])
+        with pytest.raises(ValueError):
+            decode_polyline_waypoints({**payload, "count": 11})
+        with pytest.raises(ValueError):
+            decode_polyline_waypoints({**payload, "coordinates": payload["coordinates"][:-1]})
+        with pytest.raises(ValueError, match="precision"):
+            decode_polyline_waypoints({**payload, "precision": 400})
+
+
+class TestEncodedTransfer:
+    """Test content-negotiated upload and download"""
+
+    def test_packed_upload_polyline_download(self, client, project_deo_1, deo_user_1):
+        arrays = synthetic_track(300)
+        fields = {
+            "project_id": str(project_deo_1.project_id),
+            "track_name": "Packed upload",
+            "start_time": "2024-06-10T06:13:20",
+        }
+        headers = get_auth_header(deo_user_1)
+
+        created = client.post(
+            "/api/v1/gps-tracks",
+            content=encode_packed_track(fields, arrays),
+            headers={**headers, "Content-Type": PACKED_MEDIA_TYPE}
+        )
+        assert created.status_code == 201
+        assert created.json()["waypoint_count"] == 300
+
+        response = client.get(
+            f"/api/v1/gps-tracks/{created.json()['track_id']}/waypoints",
+            headers={**headers, "Accept": POLYLINE_MEDIA_TYPE}
+        )
+        decoded = decode_polyline_waypoints(response.json()["encoded_waypoints"])
+
+        assert response.headers["content-type"].startswith(POLYLINE_MEDIA_TYPE)
+        assert np.array_equal(decoded["timestamp"], arrays["timestamp"])
+
+    def test_invalid_packed_upload_is_rejected(self, client, deo_user_1):
+        response = client.post(
+            "/api/v1/gps-tracks",
+            content=b"\x02\x00\x00\x00{}",
+            headers={**get_auth_header(deo_user_1), "Content-Type": PACKED_MEDIA_TYPE}
+        )
+
+        assert response.status_code == 400
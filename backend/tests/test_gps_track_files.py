@@ -0,0 +1,154 @@
+"""
+Tests for GPX/KML track import and export
+
+These tests verify:
+- Multi-segment GPX and gx:Track KML are read in file order
+- Untimed points are given times, invalid points are rejected
+- Files are imported as tracks and exported losslessly
+"""
+
+import numpy as np
+import pytest
+
+from app.jobs.benchmark_gps_track_encoding import synthetic_track
+from app.services.gps_track_files import (
+    GPX_MEDIA_TYPE,
+    KML_MEDIA_TYPE,
+    TrackFileParser,
+    iter_track_file,
+    parse_track_file
+)
+
+from .conftest import get_auth_header
+
+GPX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+  <metadata><name>Survey run</name></metadata>
+  <wpt lat="1.0" lon="1.0"><name>Marker</name></wpt>
+  <trk>
+    <trkseg>
+      <trkpt lat="7.0" lon="124.0"><ele>12.5</ele></trkpt>
+      <trkpt lat="7.001" lon="124.0"><time>2024-06-10T06:13:20Z</time></trkpt>
+    </trkseg>
+    <trkseg>
+      <trkpt lat="7.002" lon="124.0"><time>2024-06-10T06:13:22.500Z</time></trkpt>
+    </trkseg>
+  </trk>
+</gpx>
+"""
+
+# The mobile app's export: an untimed LineString plus start/end markers
+MOBILE_KML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <name>Mobile run</name>
+    <Placemark>
+      <LineString>
+        <coordinates>
+          124.0,7.0,0
+          124.0,7.001,0
+          124.0,7.002,0
+        </coordinates>
+      </LineString>
+    </Placemark>
+    <Placemark><name>Start</name><Point><coordinates>124.0,7.0,0</coordinates></Point></Placemark>
+  </Document>
+</kml>
+"""
+
+
+class TestTrackFileParsing:
+    """Test the streaming GPX/KML reader"""
+
+    def test_gpx_segments_in_order(self):
+        name, arrays = parse_track_file(GPX)
+
+        assert name == "Survey run"
+        assert arrays["latitude"].tolist() == [7.0, 7.001, 7.002]
+        # The leading untimed point takes the first time in the file
+        assert arrays["timestamp"].tolist() == [1718000000000, 1718000000000, 1718000002500]
+        assert arrays["altitude"][0] == 12.5 and np.isnan(arrays["altitude"][1])
+
+    def test_point_names_do_not_name_the_track(self):
+        gpx = GPX.replace(b"<metadata><name>Survey run</name></metadata>", b"").replace(
+            b'<ele>12.5</ele>', b'<ele>12.5</ele><name>Point 1</name>'
+        )
+
+        name, arrays = parse_track_file(gpx)
+
+        assert name is None
+        assert len(arrays["latitude"]) == 3
+
+    def test_fed_in_small_chunks(self):
+        parser = TrackFileParser()
+        for start in range(0, len(MOBILE_KML), 7):
+            parser.feed(MOBILE_KML[start:start + 7])
+
+        name, arrays = parser.close(start_ms=1718000000000)
+
+        assert name == "Mobile run"
+        assert arrays["latitude"].tolist() == [7.0, 7.001, 7.002]
+        assert (arrays["timestamp"] == 1718000000000).all()
+
+    def test_invalid_files_rejected(self):
+        with pytest.raises(ValueError, match="waypoint 3"):
+            parse_track_file(GPX.replace(b'lat="7.002"', b'lat="97.002"'))
+        with pytest.raises(ValueError, match="start_time"):
+            parse_track_file(MOBILE_KML)
+        with pytest.raises(ValueError):
+            parse_track_file(GPX[:-20])
+        with pytest.raises(ValueError):
+            parse_track_file(b"<html/>")
+
+    @pytest.mark.parametrize("file_format", ["gpx", "kml"])
+    def test_export_round_trip(self, file_format):
+        arrays = synthetic_track(3000)
+        arrays["altitude"][::5] = np.nan
+        arrays["video_offset_ms"][:4] = -1
+
+        _, decoded = parse_track_file(b"".join(iter_track_file(file_format, "R&D <run>", arrays)))
+
+        for name in ("longitude", "latitude", "timestamp", "video_offset_ms"):
+            assert np.array_equal(decoded[name], arrays[name])
+        assert np.array_equal(decoded["altitude"], arrays["altitude"], equal_nan=True)
+
+
+class TestTrackFileApi:
+    """Test the import and export endpoints"""
+
+    def test_import_then_export(self, client, project_deo_1, deo_user_1):
+        headers = get_auth_header(deo_user_1)
+
+        created = client.post(
+            "/api/v1/gps-tracks/import",
+            params={"project_id": str(project_deo_1.project_id)},
+            content=GPX,
+            headers={**headers, "Content-Type": GPX_MEDIA_TYPE}
+        )
+        assert created.status_code == 201
+        track = created.json()
+        assert track["track_name"] == "Survey run"
+        assert track["waypoint_count"] == 3
+
+        exported = client.get(
+            f"/api/v1/gps-tracks/{track['track_id']}/export", params={"format": "kml"}, headers=headers
+        )
+        assert exported.headers["content-type"].startswith(KML_MEDIA_TYPE)
+        _, arrays = parse_track_file(exported.content)
+        assert arrays["timestamp"].tolist() == [1718000000000, 1718000000000, 1718000002500]
+
+    def test_untimed_kml_needs_start_time(self, client, project_deo_1, deo_user_1):
+        headers = {**get_auth_header(deo_user_1), "Content-Type": KML_MEDIA_TYPE}
+        params = {"project_id": str(project_deo_1.project_id)}
+
+        rejected = client.post("/api/v1/gps-tracks/import", params=params, content=MOBILE_KML, headers=headers)
+        created = client.post(
+            "/api/v1/gps-tracks/import",
+            params={**params, "start_time": "2024-06-10T06:13:20"},
+            content=MOBILE_KML,
+            headers=headers
+        )
+
+        assert rejected.status_code == 400
+        assert created.status_code == 201
+        assert created.json()["waypoint_count"] == 3
@@ -0,0 +1,260 @@
+"""
+Tests for GPS track storage
+
+These tests verify:
+- Waypoints round-trip through the LINESTRINGZM geometry and offset array
+- Single-waypoint tracks survive the degenerate-line encoding
+- Track distance is measured server-side from the stored geometry
+- Levels of detail are stored on creation and selected per request
+- Video offsets map to positions and map points back to video offsets
+- Chunked recordings append idempotently and keep their stats up to date
+"""
+
+import math
+
+from app.models import GpsTrackLod
+from app.services.gps_tracks import (
+    decode_geometry,
+    encode_geometry,
+    encode_video_offsets,
+    simplify_indices,
+    waypoint_arrays
+)
+
+from .conftest import get_auth_header
+
+WAYPOINTS = [
+    {"latitude": 7.0, "longitude": 124.0, "altitude": 12.5, "timestamp": 1718000000000, "video_offset_ms": 0},
+    {"latitude": 7.001, "longitude": 124.0, "altitude": None, "timestamp": 1718000001000, "video_offset_ms": None},
+    {"latitude": 7.002, "longitude": 124.0, "altitude": 13.0, "timestamp": 1718000002000, "video_offset_ms": 2000},
+]
+
+# ~5.5 km northbound with a 30 m sideways wiggle every 100 points
+LONG_WAYPOINTS = [
+    {
+        "latitude": 7.0 + i * 0.0001,
+        "longitude": 124.0 + 0.0003 * math.sin(i * math.pi / 50),
+        "timestamp": 1718000000000 + i * 1000,
+        "video_offset_ms": i * 1000,
+    }
+    for i in range(500)
+]
+
+
+def _create_track(client, project, user, waypoints=WAYPOINTS):
+    return client.post(
+        "/api/v1/gps-tracks",
+        json={
+            "project_id": str(project.project_id),
+            "track_name": "Survey run",
+            "waypoints": waypoints,
+            "start_time": "2024-06-10T06:13:20",
+            "total_distance_meters": 999999,
+        },
+        headers=get_auth_header(user)
+    )
+
+
+class TestGpsTrackGeometry:
+    """Test the waypoint <-> geometry encoding"""
+
+    def test_geometry_round_trip(self):
+        arrays = waypoint_arrays(WAYPOINTS)
+
+        coords = decode_geometry(encode_geometry(arrays), len(WAYPOINTS))
+
+        assert coords[:, 1].tolist() == [7.0, 7.001, 7.002]
+        assert coords[1, 2] != coords[1, 2]  # Missing altitude is NaN
+        assert coords[:, 3].astype("int64").tolist() == [wp["timestamp"] for wp in WAYPOINTS]
+        assert encode_video_offsets(arrays) == [0, None, 2000]
+
+    def test_single_waypoint_and_empty_track(self):
+        assert decode_geometry(encode_geometry(waypoint_arrays(WAYPOINTS[:1])), 1).shape == (1, 4)
+        assert encode_geometry(waypoint_arrays([])) is None
+
+
+class TestGpsTrackApi:
+    """Test track creation and retrieval"""
+
+    def test_waypoints_rebuilt_on_request(self, client, project_deo_1, deo_user_1):
+        created = _create_track(client, project_deo_1, deo_user_1)
+        assert created.status_code == 201
+        track_id = created.json()["track_id"]
+
+        full = client.get(f"/api/v1/gps-tracks/{track_id}", headers=get_auth_header(deo_user_1)).json()
+        bare = client.get(
+            f"/api/v1/gps-tracks/{track_id}", params={"include_waypoints": False},
+            headers=get_auth_header(deo_user_1)
+        ).json()
+
+        assert full["waypoints"] == WAYPOINTS
+        assert bare["waypoints"] is None
+        assert bare["waypoint_count"] == 3
+
+    def test_distance_is_computed_server_side(self, client, project_deo_1, deo_user_1):
+        track = _create_track(client, project_deo_1, deo_user_1).json()
+
+        # 0.002 degrees of latitude near the equator is about 221 m
+        assert 215 < track["total_distance_meters"] < 227
+
+
+class TestGpsTrackLevelsOfDetail:
+    """Test simplification and level selection"""
+
+    def test_douglas_peucker_keeps_corners(self):
+        # An L shape: straight runs collapse, the corner survives
+        waypoints = [{"latitude": 7.0 + i * 0.0001, "longitude": 124.0, "timestamp": i} for i in range(10)]
+        waypoints += [{"latitude": 7.0009, "longitude": 124.0 + i * 0.0001, "timestamp": 10 + i} for i in range(1, 10)]
+
+        assert simplify_indices(waypoint_arrays(waypoints), 1.0).tolist() == [0, 9, 18]
+
+    def test_levels_stored_and_selected(self, client, db_session, project_deo_1, deo_user_1):
+        track_id = _create_track(client, project_deo_1, deo_user_1, LONG_WAYPOINTS).json()["track_id"]
+        headers = get_auth_header(deo_user_1)
+
+        counts = [count for count, in db_session.query(GpsTrackLod.waypoint_count).filter(
+            GpsTrackLod.track_id == track_id
+        ).order_by(GpsTrackLod.level)]
+        assert counts and counts == sorted(counts, reverse=True) and counts[0] < 500
+
+        overview = client.get(f"/api/v1/gps-tracks/{track_id}", params={"max_points": 20}, headers=headers).json()
+        full = client.get(f"/api/v1/gps-tracks/{track_id}", headers=headers).json()
+
+        assert len(overview["waypoints"]) <= 20
+        assert overview["lod_tolerance_meters"] > 0
+        assert overview["waypoints"][-1] == LONG_WAYPOINTS[-1] | {"altitude": None}
+        assert len(full["waypoints"]) == 500
+        assert full["lod_tolerance_meters"] == 0
+
+
+class TestGpsTrackListing:
+    """Test the summary listing and waypoint pages"""
+
+    def test_summary_has_no_waypoints(self, client, project_deo_1, deo_user_1):
+        _create_track(client, project_deo_1, deo_user_1, LONG_WAYPOINTS)
+
+        summaries = client.get(
+            f"/api/v1/gps-tracks/project/{project_deo_1.project_id}/summary",
+            headers=get_auth_header(deo_user_1)
+        ).json()
+
+        assert len(summaries) == 1
+        summary = summaries[0]
+        assert "waypoints" not in summary
+        assert summary["waypoint_count"] == 500
+        assert summary["bbox"][1] == 7.0 and round(summary["bbox"][3], 4) == 7.0499
+        assert 0 < len(summary["thumbnail_polyline"]) < 500
+
+    def test_waypoints_in_pages(self, client, project_deo_1, deo_user_1):
+        track_id = _create_track(client, project_deo_1, deo_user_1, LONG_WAYPOINTS).json()["track_id"]
+        headers = get_auth_header(deo_user_1)
+
+        pages, offset = [], 0
+        while offset is not None:
+            page = client.get(
+                f"/api/v1/gps-tracks/{track_id}/waypoints", params={"offset": offset, "limit": 200}, headers=headers
+            ).json()
+            pages.append(page["waypoints"])
+            offset = page["next_offset"]
+
+        assert [len(page) for page in pages] == [200, 200, 100]
+        assert pages[2][-1]["video_offset_ms"] == 499000
+
+
+class TestGpsTrackVideoIndex:
+    """Test video time <-> position lookups"""
+
+    def test_position_interpolated_and_clamped(self, client, project_deo_1, deo_user_1):
+        track_id = _create_track(client, project_deo_1, deo_user_1).json()["track_id"]
+
+        positions = client.get(
+            f"/api/v1/gps-tracks/{track_id}/position",
+            params={"offset_ms": [500, 1000, 99999]},
+            headers=get_auth_header(deo_user_1)
+        ).json()
+
+        # The waypoint without a video offset is skipped on the time axis
+        assert round(positions[0]["latitude"], 6) == 7.0005
+        assert positions[0]["waypoint_index"] == 0
+        assert round(positions[1]["latitude"], 6) == 7.001
+        assert positions[2]["latitude"] == 7.002
+        assert positions[2]["altitude"] == 13.0
+        assert positions[2]["waypoint_index"] == 2
+
+    def test_nearest_point_gives_video_offset(self, client, project_deo_1, deo_user_1):
+        track_id = _create_track(client, project_deo_1, deo_user_1, LONG_WAYPOINTS).json()["track_id"]
+
+        # Beside the track, level with waypoint 250
+        nearest = client.get(
+            f"/api/v1/gps-tracks/{track_id}/nearest",
+            params={"latitude": [7.025], "longitude": [124.001]},
+            headers=get_auth_header(deo_user_1)
+        ).json()[0]
+
+        assert abs(nearest["offset_ms"] - 250000) <= 2000
+        assert 100 < nearest["distance_from_track_m"] < 115
+
+    def test_mismatched_coordinates_rejected(self, client, project_deo_1, deo_user_1):
+        track_id = _create_track(client, project_deo_1, deo_user_1).json()["track_id"]
+
+        response = client.get(
+            f"/api/v1/gps-tracks/{track_id}/nearest",
+            params={"latitude": [7.0, 7.001], "longitude": [124.0]},
+            headers=get_auth_header(deo_user_1)
+        )
+
+        assert response.status_code == 400
+
+
+class TestGpsTrackRecording:
+    """Test chunked uploads"""
+
+    def _open(self, client, project, user):
+        return client.post(
+            "/api/v1/gps-tracks/recordings",
+            json={"project_id": str(project.project_id), "track_name": "Long run", "start_time": "2024-06-10T06:13:20"},
+            headers=get_auth_header(user)
+        ).json()["track_id"]
+
+    def test_chunks_build_the_track(self, client, project_deo_1, deo_user_1):
+        headers = get_auth_header(deo_user_1)
+        track_id = self._open(client, project_deo_1, deo_user_1)
+        url = f"/api/v1/gps-tracks/{track_id}/chunks"
+
+        receipts = [
+            client.put(f"{url}/{sequence}", json={"waypoints": LONG_WAYPOINTS[start:start + 200]}, headers=headers)
+            for sequence, start in enumerate(range(0, 500, 200), start=1)
+        ]
+        finalized = client.post(f"/api/v1/gps-tracks/{track_id}/finalize", headers=headers).json()
+        single = _create_track(client, project_deo_1, deo_user_1, LONG_WAYPOINTS).json()
+        full = client.get(f"/api/v1/gps-tracks/{track_id}", headers=headers).json()
+        overview = client.get(f"/api/v1/gps-tracks/{track_id}", params={"max_points": 50}, headers=headers).json()
+
+        assert [r.json()["first_waypoint"] for r in receipts] == [0, 200, 400]
+        assert receipts[-1].json()["track_waypoint_count"] == 500
+        assert finalized["is_recording"] is False
+        assert finalized["end_time"].startswith("2024-06-10T06:21:39")
+        assert abs(finalized["total_distance_meters"] - single["total_distance_meters"]) < 0.1
+        assert full["waypoints"] == [wp | {"altitude": None} for wp in LONG_WAYPOINTS]
+        assert 0 < len(overview["waypoints"]) <= 50
+
+    def test_retries_and_gaps(self, client, project_deo_1, deo_user_1):
+        headers = get_auth_header(deo_user_1)
+        track_id = self._open(client, project_deo_1, deo_user_1)
+        url = f"/api/v1/gps-tracks/{track_id}/chunks"
+        first = {"waypoints": LONG_WAYPOINTS[:10]}
+
+        client.put(f"{url}/1", json=first, headers=headers)
+        retry = client.put(f"{url}/1", json=first, headers=headers)
+        changed = client.put(f"{url}/1", json={"waypoints": LONG_WAYPOINTS[:11]}, headers=headers)
+        gap = client.put(f"{url}/3", json={"waypoints": LONG_WAYPOINTS[10:20]}, headers=headers)
+
+        assert retry.status_code == 200
+        assert retry.json()["replayed"] is True
+        assert retry.json()["track_waypoint_count"] == 10
+        assert changed.status_code == 409
+        assert gap.status_code == 409
+
+        client.post(f"/api/v1/gps-tracks/{track_id}/finalize", headers=headers)
+        late = client.put(f"{url}/2", json={"waypoints": LONG_WAYPOINTS[10:20]}, headers=headers)
+        assert late.status_code == 409
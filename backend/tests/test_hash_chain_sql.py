@@ -0,0 +1,198 @@
+"""
+Tests for the in-database hash-chain functions (migration 010)
+
+These tests verify:
+- SQL record hashes match the Python implementation byte for byte
+- Insert triggers chain rows written without hashes and reject bad hashes
+- Set-based verification finds the same breaks as the Python verifiers
+"""
+
+import json
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.core.security import calculate_progress_hash
+from app.models import AuditLog, ProjectProgressLog
+from app.services.audit_chain import audit_record_hash
+from app.services.audit_service import AuditService
+
+PAYLOADS = [
+    {},
+    {"b": 1, "a": [1, 2.5, None, True, False], "c": {"z": "", "y": 100.0}},
+    {"quote": "say \"hi\"\\", "control": "line\nbreak\ttab\x01\x7f"},
+    {"unicode": "Cotabato – Maguindanao ñ", "emoji": "road 🚧", "é": "key order"},
+    {"nested": [{"b": {"d": 1, "c": 2}}, [], {}], "Zeta": 1, "alpha": 2, "_": 3},
+]
+
+
+def _sql_audit_hash(db_session, log, prev_hash):
+    return db_session.execute(
+        text(
+            "SELECT audit_record_hash(:actor_id, :action, :entity_type, :entity_id, "
+            "CAST(:payload AS JSONB), :created_at, :prev_hash)"
+        ),
+        {
+            "actor_id": log.actor_id,
+            "action": log.action,
+            "entity_type": log.entity_type,
+            "entity_id": log.entity_id,
+            "payload": json.dumps(log.payload),
+            "created_at": log.created_at,
+            "prev_hash": prev_hash,
+        }
+    ).scalar()
+
+
+class TestHashCrossCheck:
+    """SQL and Python must produce identical record hashes"""
+
+    @pytest.mark.parametrize("percent", ["0", "0.01", "12.34", "33.33", "45.5", "99.99", "100"])
+    def test_progress_hash_matches_python(self, db_session, percent):
+        project_id, reporter = uuid.uuid4(), uuid.uuid4()
+        for prev_hash in (None, "ab" * 32):
+            expected = calculate_progress_hash(
+                project_id=str(project_id),
+                reported_percent=float(percent),
+                report_date="2024-02-29",
+                reported_by=str(reporter),
+                prev_hash=prev_hash
+            )
+            actual = db_session.execute(
+                text("SELECT progress_record_hash(:project_id, CAST(:percent AS NUMERIC(5,2)), :report_date, :reported_by, :prev_hash)"),
+                {
+                    "project_id": project_id,
+                    "percent": percent,
+                    "report_date": date(2024, 2, 29),
+                    "reported_by": reporter,
+                    "prev_hash": prev_hash,
+                }
+            ).scalar()
+            assert actual == expected
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    @pytest.mark.parametrize("created_at", [datetime(2026, 1, 2, 3, 4, 5), datetime(2026, 1, 2, 3, 4, 5, 60)])
+    def test_audit_hash_matches_python(self, db_session, payload, created_at):
+        log = AuditLog(
+            actor_id=uuid.uuid4(),
+            action="UPDATE_PROJECT",
+            entity_type="project",
+            entity_id=None,
+            payload=payload,
+            created_at=created_at
+        )
+        for prev_hash in (None, "cd" * 32):
+            assert _sql_audit_hash(db_session, log, prev_hash) == audit_record_hash(log, prev_hash)
+
+
+class TestHashChainTriggers:
+    """Test the insert triggers"""
+
+    def test_progress_insert_without_hash_is_chained(self, db_session, project_deo_1, deo_user_1):
+        for day in (1, 2):
+            db_session.execute(
+                text(
+                    "INSERT INTO project_progress_logs "
+                    "(progress_id, project_id, reported_percent, report_date, reported_by, created_at) "
+                    "VALUES (:progress_id, :project_id, :percent, :report_date, :reported_by, :created_at)"
+                ),
+                {
+                    "progress_id": uuid.uuid4(),
+                    "project_id": project_deo_1.project_id,
+                    "percent": 10 * day,
+                    "report_date": date(2024, 3, day),
+                    "reported_by": deo_user_1.user_id,
+                    "created_at": datetime(2024, 3, day, 8),
+                }
+            )
+
+        first, second = db_session.query(ProjectProgressLog).filter(
+            ProjectProgressLog.project_id == project_deo_1.project_id
+        ).order_by(ProjectProgressLog.created_at).all()
+
+        assert first.prev_hash is None
+        assert second.prev_hash == first.record_hash
+        assert second.record_hash == calculate_progress_hash(
+            project_id=str(project_deo_1.project_id),
+            reported_percent=20.0,
+            report_date="2024-03-02",
+            reported_by=str(deo_user_1.user_id),
+            prev_hash=first.record_hash
+        )
+
+    def test_progress_insert_with_wrong_hash_is_rejected(self, db_session, project_deo_1, deo_user_1):
+        with pytest.raises(IntegrityError):
+            with db_session.begin_nested():
+                db_session.add(ProjectProgressLog(
+                    project_id=project_deo_1.project_id,
+                    reported_percent=5,
+                    report_date=date(2024, 3, 1),
+                    reported_by=deo_user_1.user_id,
+                    record_hash="0" * 64
+                ))
+                db_session.flush()
+
+
+class TestSetBasedVerification:
+    """Test verify_progress_chain_from() and verify_audit_chain()"""
+
+    def test_progress_chain_verifies_in_one_call(self, db_session, project_deo_1, deo_user_1):
+        prev_hash = None
+        for day in (1, 2, 3):
+            record_hash = calculate_progress_hash(
+                project_id=str(project_deo_1.project_id),
+                reported_percent=float(day),
+                report_date=str(date(2024, 4, day)),
+                reported_by=str(deo_user_1.user_id),
+                prev_hash=prev_hash
+            )
+            db_session.add(ProjectProgressLog(
+                project_id=project_deo_1.project_id,
+                reported_percent=day,
+                report_date=date(2024, 4, day),
+                reported_by=deo_user_1.user_id,
+                created_at=datetime(2024, 4, day, 9),
+                prev_hash=prev_hash,
+                record_hash=record_hash
+            ))
+            prev_hash = record_hash
+        db_session.flush()
+
+        db_session.execute(
+            text("UPDATE project_progress_logs SET reported_percent = 50 WHERE project_id = :id AND report_date = :day"),
+            {"id": project_deo_1.project_id, "day": date(2024, 4, 2)}
+        )
+        result = db_session.execute(
+            text("SELECT * FROM verify_progress_chain_from(:id)"),
+            {"id": project_deo_1.project_id}
+        ).one()
+
+        assert result.checked == 3
+        assert result.last_hash == prev_hash
+        assert [link.get("error") for link in result.broken_links] == [None]
+        assert result.broken_links[0]["report_date"] == "2024-04-02"
+
+    def test_audit_range_reports_tampered_entry(self, db_session):
+        logs = []
+        for i in range(3):
+            log = AuditLog(action="SQL_VERIFY_TEST", entity_type="test", payload={"i": i})
+            db_session.add(log)
+            db_session.flush()
+            logs.append(log)
+
+        db_session.execute(
+            text("UPDATE audit_logs SET payload = CAST(:payload AS JSONB) WHERE audit_id = :id"),
+            {"payload": json.dumps({"i": 99}), "id": logs[1].audit_id}
+        )
+
+        result = AuditService.verify_chain_integrity(
+            db_session, limit=3, from_sequence=logs[0].sequence
+        )
+
+        assert result["logs_checked"] == 3
+        assert [(link["sequence"], link["error"]) for link in result["broken_links"]] == [
+            (logs[1].sequence, "hash mismatch")
+        ]
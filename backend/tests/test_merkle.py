@@ -0,0 +1,62 @@
+"""
+Tests for Merkle anchoring
+
+These tests verify:
+- Inclusion proofs verify for every leaf of trees of any size
+- Tampered records or proofs fail verification
+"""
+
+import hashlib
+
+import pytest
+
+from app.services.merkle_service import (
+    build_levels, merkle_leaf, proof_path, verify_inclusion
+)
+
+
+def _record_hashes(count):
+    return [hashlib.sha256(f"record-{i}".encode()).hexdigest() for i in range(count)]
+
+
+def _proof(levels, index, leaf_count):
+    return [
+        {"position": position, "hash": levels[level][node].hex()}
+        for level, node, position in proof_path(index, leaf_count)
+    ]
+
+
+class TestMerkleProofs:
+    """Test tree construction and inclusion proofs"""
+
+    @pytest.mark.parametrize("leaf_count", [1, 2, 3, 5, 8, 13, 64, 100])
+    def test_every_leaf_verifies(self, leaf_count):
+        """Each leaf's proof should fold up to the root"""
+        hashes = _record_hashes(leaf_count)
+        levels = build_levels([merkle_leaf(h) for h in hashes])
+        root = levels[-1][0].hex()
+
+        for index, record_hash in enumerate(hashes):
+            proof = _proof(levels, index, leaf_count)
+            assert verify_inclusion(record_hash, proof, root)
+
+    def test_proof_is_logarithmic(self):
+        """Proof length should be ceil(log2(n))"""
+        assert len(proof_path(0, 1000)) == 10
+        assert len(proof_path(999, 1000)) <= 10
+
+    def test_tampered_record_fails(self):
+        """A different record_hash must not verify against the root"""
+        hashes = _record_hashes(10)
+        levels = build_levels([merkle_leaf(h) for h in hashes])
+        proof = _proof(levels, 3, 10)
+
+        assert not verify_inclusion(hashes[4], proof, levels[-1][0].hex())
+
+    def test_duplicated_last_leaf_changes_root(self):
+        """Odd trees must not share a root with the last leaf duplicated"""
+        hashes = _record_hashes(3)
+        odd = build_levels([merkle_leaf(h) for h in hashes])[-1][0]
+        padded = build_levels([merkle_leaf(h) for h in hashes + hashes[-1:]])[-1][0]
+
+        assert odd != padded
@@ -0,0 +1,140 @@
+"""
+Tests for incremental progress-chain verification
+
+These tests verify:
+- Verification resumes from the per-project checkpoint
+- History and verification endpoints agree with a full re-verification
+- Tampering with the verified prefix is caught
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.core.security import calculate_progress_hash
+from app.models import ProgressChainCheckpoint, ProjectProgressLog
+from app.services.progress_chain import clear_progress_chain_cache, verify_project_chain
+
+from .conftest import get_auth_header
+
+
+def _append_logs(db_session, project, reporter, count, start=0):
+    """Append correctly chained progress entries"""
+    last = db_session.query(ProjectProgressLog).filter(
+        ProjectProgressLog.project_id == project.project_id
+    ).order_by(ProjectProgressLog.created_at.desc()).first()
+    prev_hash = last.record_hash if last else None
+    base = datetime.utcnow()
+
+    for i in range(start, start + count):
+        report_date = date(2024, 1, 1) + timedelta(days=i)
+        record_hash = calculate_progress_hash(
+            project_id=str(project.project_id),
+            reported_percent=float(i),
+            report_date=str(report_date),
+            reported_by=str(reporter.user_id),
+            prev_hash=prev_hash
+        )
+        db_session.add(ProjectProgressLog(
+            progress_id=uuid.uuid4(),
+            project_id=project.project_id,
+            reported_percent=i,
+            report_date=report_date,
+            reported_by=reporter.user_id,
+            created_at=base + timedelta(seconds=i),
+            prev_hash=prev_hash,
+            record_hash=record_hash
+        ))
+        prev_hash = record_hash
+    db_session.commit()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_progress_chain_cache()
+    yield
+    clear_progress_chain_cache()
+
+
+class TestProgressChainCheckpoints:
+    """Test checkpointed verification"""
+
+    def test_checkpoint_advances_with_new_entries(self, db_session, project_deo_1, deo_user_1):
+        """Only entries after the checkpoint should be read and hashed"""
+        _append_logs(db_session, project_deo_1, deo_user_1, 3)
+        first = verify_project_chain(db_session, project_deo_1.project_id)
+        db_session.commit()
+
+        checkpoint = db_session.get(ProgressChainCheckpoint, project_deo_1.project_id)
+        assert first.chain_valid
+        assert checkpoint.verified_count == 3
+
+        _append_logs(db_session, project_deo_1, deo_user_1, 2, start=3)
+        second = verify_project_chain(db_session, project_deo_1.project_id)
+        db_session.commit()
+
+        db_session.refresh(checkpoint)
+        assert second.chain_valid
+        assert second.total_logs == 5
+        assert checkpoint.verified_count == 5
+        assert checkpoint.head_hash == second.head_hash
+
+    def test_tampered_verified_entry_forces_full_verification(self, db_session, project_deo_1, deo_user_1):
+        """Editing the checkpointed head must not be masked by the checkpoint"""
+        _append_logs(db_session, project_deo_1, deo_user_1, 3)
+        verify_project_chain(db_session, project_deo_1.project_id)
+        db_session.commit()
+
+        head = db_session.query(ProjectProgressLog).filter(
+            ProjectProgressLog.project_id == project_deo_1.project_id
+        ).order_by(ProjectProgressLog.created_at.desc()).first()
+        head.record_hash = "0" * 64
+        db_session.commit()
+
+        status = verify_project_chain(db_session, project_deo_1.project_id)
+
+        assert not status.chain_valid
+        assert not status.entry_valid(head.progress_id)
+
+    def test_full_verification_matches_incremental(self, db_session, project_deo_1, deo_user_1):
+        """A from-genesis run should agree with the checkpointed result"""
+        _append_logs(db_session, project_deo_1, deo_user_1, 2)
+        verify_project_chain(db_session, project_deo_1.project_id)
+        _append_logs(db_session, project_deo_1, deo_user_1, 2, start=2)
+        incremental = verify_project_chain(db_session, project_deo_1.project_id)
+
+        full = verify_project_chain(db_session, project_deo_1.project_id, full=True)
+
+        assert (full.total_logs, full.chain_valid) == (incremental.total_logs, incremental.chain_valid)
+
+
+class TestProgressHistoryEndpoint:
+    """Test the history and verify endpoints on top of checkpoints"""
+
+    def test_history_reports_reporter_and_validity(self, client, db_session, project_deo_1, deo_user_1):
+        _append_logs(db_session, project_deo_1, deo_user_1, 4)
+
+        response = client.get(
+            f"/api/v1/progress/projects/{project_deo_1.project_id}/progress",
+            headers=get_auth_header(deo_user_1)
+        )
+
+        assert response.status_code == 200
+        entries = response.json()
+        assert len(entries) == 4
+        assert all(entry["hash_valid"] for entry in entries)
+        assert {entry["reporter_name"] for entry in entries} == {deo_user_1.username}
+
+    def test_verify_endpoint_uses_checkpoint(self, client, db_session, project_deo_1, deo_user_1):
+        _append_logs(db_session, project_deo_1, deo_user_1, 3)
+        headers = get_auth_header(deo_user_1)
+        url = f"/api/v1/progress/projects/{project_deo_1.project_id}/progress/verify"
+
+        assert client.get(url, headers=headers).json()["chain_valid"]
+        _append_logs(db_session, project_deo_1, deo_user_1, 1, start=3)
+        response = client.get(url, headers=headers)
+
+        assert response.json()["total_logs"] == 4
+        assert response.json()["chain_valid"]
+        assert client.get(url, params={"full": True}, headers=headers).json()["total_logs"] == 4
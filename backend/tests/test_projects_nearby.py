@@ -0,0 +1,63 @@
+"""
+Tests for nearest-project lookups
+
+These tests verify:
+- The geometry summary follows GIS feature inserts and deletes
+- Nearby projects are ordered by distance and limited to the radius
+"""
+
+import uuid
+
+from app.models import GISFeature, ProjectGeometrySummary
+
+from .conftest import get_auth_header
+
+
+def _add_feature(db_session, project, user, wkt):
+    feature = GISFeature(
+        feature_id=uuid.uuid4(),
+        project_id=project.project_id,
+        feature_type="road",
+        geometry=f"SRID=4326;{wkt}",
+        created_by=user.user_id,
+    )
+    db_session.add(feature)
+    db_session.commit()
+    return feature
+
+
+class TestProjectGeometrySummary:
+    """Test trigger maintenance of the summary"""
+
+    def test_summary_follows_features(self, db_session, project_deo_1, deo_user_1):
+        _add_feature(db_session, project_deo_1, deo_user_1, "LINESTRING(124.0 7.0, 124.02 7.0)")
+        last = _add_feature(db_session, project_deo_1, deo_user_1, "POINT(124.01 7.01)")
+
+        summary = db_session.get(ProjectGeometrySummary, project_deo_1.project_id)
+        assert summary.feature_count == 2
+
+        db_session.delete(last)
+        db_session.commit()
+        db_session.expire_all()
+        assert db_session.get(ProjectGeometrySummary, project_deo_1.project_id).feature_count == 1
+
+
+class TestNearbyProjects:
+    """Test GET /projects/nearby"""
+
+    def test_ordered_by_distance_within_radius(
+        self, client, db_session, project_deo_1, project_deo_2, deo_user_1, deo_user_2
+    ):
+        # A road running through the location, and a bridge ~1.1 km north
+        _add_feature(db_session, project_deo_1, deo_user_1, "LINESTRING(123.99 7.0, 124.01 7.0)")
+        _add_feature(db_session, project_deo_2, deo_user_2, "POINT(124.0 7.01)")
+        params = {"latitude": 7.0, "longitude": 124.0}
+        headers = get_auth_header(deo_user_1)
+
+        nearby = client.get("/api/v1/projects/nearby", params=params, headers=headers).json()
+        close = client.get("/api/v1/projects/nearby", params={**params, "radius_m": 500}, headers=headers).json()
+
+        assert [p["project_id"] for p in nearby] == [str(project_deo_1.project_id), str(project_deo_2.project_id)]
+        assert nearby[0]["distance_m"] == 0
+        assert 1050 < nearby[1]["distance_m"] < 1150
+        assert [p["project_id"] for p in close] == [str(project_deo_1.project_id)]
@@ -4,10 +4,17 @@ Tests for Public API endpoints
 These tests verify:
 - Public projects endpoint respects max limit (200)
 - Public endpoints don't require authentication
+- Project list geometry comes from the precomputed, simplified outlines
 """
 
+import uuid
+
 import pytest
 
+from app.models import GISFeature
+
+from .conftest import get_auth_header
+
 
 class TestPublicProjectsAPI:
     """Test public projects endpoint"""
@@ -82,3 +89,209 @@ class TestPublicMapAPI:
         response = client.get("/api/v1/public/map?limit=3000")
 
         assert response.status_code == 422
+
+
+class TestPublicProjectsPagination:
+    """Test keyset (cursor) pagination on the public projects endpoint"""
+
+    def test_cursor_pages_do_not_overlap(self, client, project_deo_1, project_deo_2):
+        """Following next_cursor should return the remaining projects once each"""
+        first = client.get("/api/v1/public/projects?limit=1").json()
+        assert len(first["items"]) == 1
+        assert first["next_cursor"]
+
+        second = client.get(
+            f"/api/v1/public/projects?limit=1&cursor={first['next_cursor']}"
+        ).json()
+        assert len(second["items"]) == 1
+        assert second["items"][0]["project_id"] != first["items"][0]["project_id"]
+
+    def test_last_page_has_no_cursor(self, client, project_deo_1):
+        """A page that exhausts the results should not return a cursor"""
+        response = client.get("/api/v1/public/projects?limit=50")
+
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+
+    def test_invalid_cursor_rejected(self, client, deo_1):
+        """A malformed cursor should be rejected with 400"""
+        response = client.get("/api/v1/public/projects?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    def test_count_none_omits_total(self, client, project_deo_1):
+        """count=none should skip the total count"""
+        response = client.get("/api/v1/public/projects?count=none")
+
+        assert response.status_code == 200
+        assert response.json()["total"] is None
+
+
+class TestPublicProjectSearch:
+    """Test full-text/trigram search and autocomplete"""
+
+    def test_prefix_search_matches(self, client, project_deo_1, project_deo_2):
+        """Partial words should match via prefix full-text search"""
+        response = client.get("/api/v1/public/projects?search=proj deo")
+
+        assert response.status_code == 200
+        titles = [item["project_title"] for item in response.json()["items"]]
+        assert "Test Project DEO 1" in titles
+
+    def test_search_tolerates_typos(self, client, project_deo_1):
+        """A misspelled location should still match via trigram similarity"""
+        response = client.get("/api/v1/public/projects?search=Locaton")
+
+        assert response.status_code == 200
+        ids = [item["project_id"] for item in response.json()["items"]]
+        assert str(project_deo_1.project_id) in ids
+
+    def test_suggest_returns_titles(self, client, project_deo_1):
+        """Autocomplete should suggest matching project titles"""
+        from app.services.search_service import clear_suggest_cache
+        clear_suggest_cache()
+
+        response = client.get("/api/v1/public/search/suggest?q=test proj")
+
+        assert response.status_code == 200
+        labels = [item["label"] for item in response.json()["items"]]
+        assert "Test Project DEO 1" in labels
+
+    def test_suggest_requires_two_characters(self, client, deo_1):
+        """Single-character queries should be rejected"""
+        response = client.get("/api/v1/public/search/suggest?q=t")
+
+        assert response.status_code == 422
+
+
+class TestPublicStatsSnapshot:
+    """Test the trigger-maintained public statistics snapshot"""
+
+    def test_stats_reflect_new_projects(self, client, project_deo_1, project_deo_2):
+        """Inserted projects should be counted without a manual refresh"""
+        response = client.get("/api/v1/public/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_projects"] == 2
+        assert data["by_status"]["ongoing"] >= 1
+        assert data["generated_at"] is not None
+
+    def test_deleted_projects_leave_snapshot(self, client, db_session, project_deo_1):
+        """Soft-deleting a project should remove it from the statistics"""
+        project_deo_1.status = "deleted"
+        db_session.commit()
+
+        response = client.get("/api/v1/public/deos")
+
+        assert response.status_code == 200
+        counts = {d["deo_id"]: d["project_count"] for d in response.json()["deos"]}
+        assert counts[project_deo_1.deo_id] == 0
+
+
+class TestPublicFacets:
+    """Test faceted filter counts"""
+
+    def test_facets_without_filters(self, client, project_deo_1, project_deo_2):
+        """All facet values should be counted when nothing is selected"""
+        from app.services.facet_service import clear_facet_cache
+        clear_facet_cache()
+
+        response = client.get("/api/v1/public/facets")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        statuses = {f["value"]: f["count"] for f in data["facets"]["status"]}
+        assert statuses == {"ongoing": 1, "planning": 1}
+
+    def test_facet_ignores_its_own_filter(self, client, project_deo_1, project_deo_2):
+        """Selecting a status narrows other facets but not the status facet"""
+        from app.services.facet_service import clear_facet_cache
+        clear_facet_cache()
+
+        response = client.get("/api/v1/public/facets?status=ongoing")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        statuses = {f["value"]: f["count"] for f in data["facets"]["status"]}
+        assert statuses == {"ongoing": 1, "planning": 1}
+        sources = {f["value"]: f["count"] for f in data["facets"]["fund_source"]}
+        assert sources == {"GAA": 1}
+
+
+class TestPublicResponseCache:
+    """Test ETag revalidation and tag invalidation of cached public responses"""
+
+    def test_etag_revalidation_returns_304(self, client, project_deo_1):
+        """A matching If-None-Match should produce 304 without a body"""
+        first = client.get("/api/v1/public/stats")
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        second = client.get("/api/v1/public/stats", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        assert second.content == b""
+
+    def test_query_order_does_not_split_cache(self, client, project_deo_1):
+        """Equivalent queries with different parameter order share an entry"""
+        client.get("/api/v1/public/projects?limit=5&fund_year=2024")
+
+        response = client.get("/api/v1/public/projects?fund_year=2024&limit=5")
+
+        assert response.headers["X-Cache"] == "HIT"
+
+    def test_write_invalidates_tagged_entries(self, client, project_deo_1, deo_user_1):
+        """Updating a project should invalidate cached project listings"""
+        client.get("/api/v1/public/projects")
+        client.patch(
+            f"/api/v1/projects/{project_deo_1.project_id}",
+            json={"project_title": "Renamed Project"},
+            headers=get_auth_header(deo_user_1)
+        )
+
+        response = client.get("/api/v1/public/projects")
+
+        assert response.headers["X-Cache"] == "MISS"
+        titles = [item["project_title"] for item in response.json()["items"]]
+        assert "Renamed Project" in titles
+
+    def test_cache_hits_count_against_rate_limit(self, client, project_deo_1):
+        """Cached responses should not bypass the endpoint's rate limit (60/minute)"""
+        from app.api.public import limiter
+        limiter.reset()
+        try:
+            statuses = [client.get("/api/v1/public/projects").status_code for _ in range(61)]
+        finally:
+            limiter.reset()
+
+        assert statuses[:60] == [200] * 60
+        assert statuses[60] == 429
+
+
+class TestPublicProjectGeometry:
+    """Test geometry_wkt detail levels of the public project list"""
+
+    def test_outline_levels(self, client, db_session, project_deo_1, deo_user_1):
+        # A 1 km road drawn with a vertex every ~10 m and a 5 cm wobble
+        points = ", ".join(f"{124.0 + i * 0.0001} {7.0 + (i % 2) * 0.0000005}" for i in range(91))
+        db_session.add(GISFeature(
+            feature_id=uuid.uuid4(),
+            project_id=project_deo_1.project_id,
+            feature_type="road",
+            geometry=f"SRID=4326;LINESTRING({points})",
+            created_by=deo_user_1.user_id,
+        ))
+        db_session.commit()
+
+        def wkt(detail):
+            items = client.get("/api/v1/public/projects", params={"geometry": detail}).json()["items"]
+            return items[0]["geometry_wkt"]
+
+        assert wkt("full").count(",") == 90
+        assert wkt("outline").count(",") < 90
+        assert wkt("thumbnail").count(",") == 1
+        assert wkt("none") is None